@@ -21,7 +21,34 @@ DEFAULT_LOGGING_CONFIG = {
 
 DEFAULT_APP_CONFIG = {
     'nifi': {
-        'servers': [] # Default to empty list
+        'servers': [], # Default to empty list
+        'token_refresh_margin_seconds': 60,
+        'http_client': {
+            'max_connections': 100,
+            'max_keepalive_connections': 20,
+            'keepalive_expiry': 30.0,
+            'timeout': 30.0,
+            'connect_timeout': 10.0,
+            'operation_timeouts': {}
+        },
+        'traversal_max_concurrency': 8,
+        'flow_build_max_concurrency': 8,
+        'operation_max_concurrency': 8,
+        'purge_max_concurrency': 8,
+        'component_cache': {
+            'enabled': True,
+            'ttl_seconds': 30.0,
+            'max_entries': 5000
+        },
+        'async_request_polling': {
+            'initial_interval_seconds': 0.1,
+            'max_interval_seconds': 2.0,
+            'backoff_factor': 2.0
+        },
+        'provenance_content': {
+            'chunk_size_bytes': 65536,
+            'compare_max_bytes': 67108864
+        }
     },
     'llm': {
         'google': {'api_key': None, 'models': ['gemini-1.5-pro-latest']},
@@ -36,6 +63,18 @@ DEFAULT_APP_CONFIG = {
         'auto_delete_enabled': True,
         'auto_purge_enabled': True
     },
+    'mcp_api_client': {
+        'max_connections': 20,
+        'max_keepalive_connections': 10,
+        'keepalive_expiry': 30.0,
+        'connect_timeout': 5.0,
+        'connect_retries': 2,
+        'tool_timeout': 60.0,
+        'tools_timeout': 30.0,
+        'config_timeout': 15.0,
+        'tools_cache_ttl_seconds': 300.0,
+        'tool_call_concurrency': 4
+    },
     'logging': {
         'llm_enqueue_enabled': True
     },
@@ -109,6 +148,67 @@ def get_nifi_server_config(server_id: str) -> dict | None:
     print(f"Warning: NiFi server configuration not found for ID: {server_id}")
     return None
 
+def get_nifi_http_client_config(server_id: str | None = None) -> dict:
+    """Returns HTTP connection pool and timeout settings for NiFi clients.
+
+    Global defaults come from `nifi.http_client`; a server entry may override any of them
+    with its own `http_client` mapping.
+    """
+    http_config = dict(DEFAULT_APP_CONFIG['nifi']['http_client'])
+    http_config.update(_APP_CONFIG.get('nifi', {}).get('http_client', {}) or {})
+    if server_id:
+        server_conf = get_nifi_server_config(server_id) or {}
+        http_config.update(server_conf.get('http_client', {}) or {})
+    return http_config
+
+def get_nifi_token_refresh_margin_seconds() -> float:
+    """Returns how many seconds before JWT expiry a cached NiFi client re-authenticates."""
+    return _APP_CONFIG.get('nifi', {}).get('token_refresh_margin_seconds', DEFAULT_APP_CONFIG['nifi']['token_refresh_margin_seconds'])
+
+def get_nifi_traversal_max_concurrency() -> int:
+    """Returns the process-wide cap on concurrent NiFi requests made by recursive flow traversals."""
+    value = _APP_CONFIG.get('nifi', {}).get('traversal_max_concurrency', DEFAULT_APP_CONFIG['nifi']['traversal_max_concurrency'])
+    return max(1, int(value))
+
+def get_nifi_flow_build_max_concurrency() -> int:
+    """Returns the cap on concurrent NiFi requests within one dependency wave of create_complete_nifi_flow."""
+    value = _APP_CONFIG.get('nifi', {}).get('flow_build_max_concurrency', DEFAULT_APP_CONFIG['nifi']['flow_build_max_concurrency'])
+    return max(1, int(value))
+
+def get_nifi_operation_max_concurrency() -> int:
+    """Returns the cap on concurrent state changes or deletions issued by one operate_nifi_objects or delete_nifi_objects batch."""
+    value = _APP_CONFIG.get('nifi', {}).get('operation_max_concurrency', DEFAULT_APP_CONFIG['nifi']['operation_max_concurrency'])
+    return max(1, int(value))
+
+def get_nifi_purge_max_concurrency() -> int:
+    """Returns the cap on concurrent drop requests issued by one batch purge."""
+    value = _APP_CONFIG.get('nifi', {}).get('purge_max_concurrency', DEFAULT_APP_CONFIG['nifi']['purge_max_concurrency'])
+    return max(1, int(value))
+
+def get_component_cache_config() -> dict:
+    """Returns the shared NiFi component cache settings (enabled, ttl_seconds, max_entries)."""
+    cache_config = dict(DEFAULT_APP_CONFIG['nifi']['component_cache'])
+    cache_config.update(_APP_CONFIG.get('nifi', {}).get('component_cache', {}) or {})
+    return cache_config
+
+def get_async_request_polling_config() -> dict:
+    """Returns the polling schedule for NiFi drop, listing and provenance requests (initial_interval_seconds, max_interval_seconds, backoff_factor)."""
+    polling_config = dict(DEFAULT_APP_CONFIG['nifi']['async_request_polling'])
+    polling_config.update(_APP_CONFIG.get('nifi', {}).get('async_request_polling', {}) or {})
+    return polling_config
+
+def get_provenance_content_config() -> dict:
+    """Returns how provenance content is streamed (chunk_size_bytes) and the largest content hashed to compare input and output (compare_max_bytes)."""
+    content_config = dict(DEFAULT_APP_CONFIG['nifi']['provenance_content'])
+    content_config.update(_APP_CONFIG.get('nifi', {}).get('provenance_content', {}) or {})
+    return content_config
+
+def get_mcp_api_client_config() -> dict:
+    """Returns connection pool, retry, timeout, tool-definition caching and tool-call concurrency settings for the chat UI's client of the MCP API server."""
+    client_config = dict(DEFAULT_APP_CONFIG['mcp_api_client'])
+    client_config.update(_APP_CONFIG.get('mcp_api_client', {}) or {})
+    return client_config
+
 # --- MCP Feature Flags --- Accessors ---
 def get_feature_auto_stop_enabled(headers: dict | None = None) -> bool:
     """Returns whether the Auto-Stop feature is enabled, checking header override first."""
@@ -14,6 +14,8 @@ from loguru import logger
 
 from nifi_mcp_server.workflows.core.event_system import get_event_emitter, EventTypes
 from nifi_mcp_server.workflows.registry import get_workflow_registry
+from nifi_chat_ui.mcp_handler import close_mcp_async_client
+from nifi_chat_ui.llm.utils.http_pool import close_llm_http_client
 
 
 class AsyncWorkflowUI:
@@ -179,6 +181,9 @@ def run_async_workflow_with_ui(workflow_name: str, provider: str, model_name: st
                 result_container["error"] = str(e)
                 result_container["completed"] = True
             finally:
+                # Release the pooled MCP and LLM API connections opened on this loop before closing it
+                loop.run_until_complete(close_mcp_async_client())
+                loop.run_until_complete(close_llm_http_client())
                 loop.close()
         
         # Start async execution in background thread
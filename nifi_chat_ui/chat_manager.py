@@ -457,6 +457,7 @@ def get_formatted_tool_definitions(
                         "processor_name": "STRING",
                         "service_name": "STRING",
                         "question": "STRING",
+                        "detail_level": "STRING",
                         
                         # Fields that should be NUMBER but might be incorrectly typed
                         "timeout_seconds": "NUMBER",
@@ -501,6 +502,7 @@ def get_formatted_tool_definitions(
                         "relationships": "ARRAY",
                         "auto_terminated_relationships": "ARRAY",
                         "property_names_to_delete": "ARRAY",
+                        "fields": "ARRAY",
                     }
                     
                     # Check if this field needs specific correction
@@ -513,7 +515,7 @@ def get_formatted_tool_definitions(
                             if corrected_type == "ARRAY" and "items" not in prop_schema:
                                 if prop_name_lower in ["operations", "objects", "updates", "processors", "ports", "connections", "controller_services", "nifi_objects"]:
                                     prop_schema["items"] = {"type": "OBJECT"}
-                                elif prop_name_lower in ["relationships", "auto_terminated_relationships", "property_names_to_delete"]:
+                                elif prop_name_lower in ["relationships", "auto_terminated_relationships", "property_names_to_delete", "fields"]:
                                     prop_schema["items"] = {"type": "STRING"}
                                 else:
                                     prop_schema["items"] = {"type": "OBJECT"}
@@ -557,7 +559,7 @@ def get_formatted_tool_definitions(
                         if "items" not in prop_schema:
                             if prop_name_lower in ["operations", "objects", "updates", "processors", "ports", "connections", "controller_services", "nifi_objects"]:
                                 prop_schema["items"] = {"type": "OBJECT"}
-                            elif prop_name_lower in ["relationships", "auto_terminated_relationships", "property_names_to_delete"]:
+                            elif prop_name_lower in ["relationships", "auto_terminated_relationships", "property_names_to_delete", "fields"]:
                                 prop_schema["items"] = {"type": "STRING"}
                             else:
                                 prop_schema["items"] = {"type": "OBJECT"}
@@ -5,11 +5,16 @@ This module defines the abstract base classes and data structures that all LLM p
 must implement, ensuring consistent interfaces across different providers.
 """
 
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from loguru import logger
 
+from .utils.http_pool import get_llm_http_client
+from .utils.streaming import TokenCallback, deliver_token
+
 
 @dataclass
 class LLMResponse:
@@ -48,6 +53,8 @@ class LLMProvider(ABC):
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.logger = logger.bind(provider=self.__class__.__name__)
+        # event loop -> (shared HTTP client, SDK async client built on it)
+        self._async_sdk_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
     
     @abstractmethod
     def send_message(
@@ -75,6 +82,55 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def send_message_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]] = None,
+        user_request_id: Optional[str] = None,
+        action_id: Optional[str] = None,
+        on_token: Optional[TokenCallback] = None
+    ) -> LLMResponse:
+        """
+        Async counterpart of send_message.
+        
+        Providers with an async SDK override this to await the API on the shared connection
+        pool (see `_async_client`) and, when `on_token` is given, stream the response text to
+        it as it is generated. This default runs send_message on a worker thread and hands
+        the complete text to `on_token` once.
+        
+        Args:
+            messages, system_prompt, model_name, tools, user_request_id, action_id: As for send_message
+            on_token: Optional callback (plain or async) receiving each text fragment
+            
+        Returns:
+            LLMResponse object with standardized format
+        """
+        response = await asyncio.to_thread(
+            self.send_message, messages, system_prompt, model_name, tools, user_request_id, action_id
+        )
+        await deliver_token(on_token, response.content)
+        return response
+    
+    def _create_async_client(self, http_client) -> Any:
+        """
+        Build this provider's SDK async client on the given shared httpx.AsyncClient.
+        
+        Returns None for providers without one, which keep the thread-based send_message_async.
+        """
+        return None
+    
+    def _async_client(self) -> Any:
+        """The SDK async client for the running event loop, rebuilt if the shared pool was closed."""
+        loop = asyncio.get_running_loop()
+        http_client = get_llm_http_client()
+        cached = self._async_sdk_clients.get(loop)
+        if cached is None or cached[0] is not http_client:
+            cached = (http_client, self._create_async_client(http_client))
+            self._async_sdk_clients[loop] = cached
+        return cached[1]
+    
     @abstractmethod
     def format_tools(self, tools: List[Dict[str, Any]]) -> Any:
         """
@@ -5,6 +5,7 @@ This module provides a clean interface to the LLM providers through the
 new modular architecture, replacing the complex monolithic chat_manager.py.
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
@@ -13,6 +14,7 @@ from .providers.factory import LLMProviderFactory
 from .mcp.client import MCPClient
 from .utils.token_counter import TokenCounter
 from .utils.error_handler import LLMErrorHandler
+from .utils.streaming import TokenCallback
 
 
 class ChatManager:
@@ -76,39 +78,9 @@ class ChatManager:
         bound_logger = self.logger.bind(user_request_id=user_request_id, action_id=action_id)
         
         try:
-            # Get provider instance
-            provider_instance = self.providers.get(provider)
-            if not provider_instance:
-                raise ValueError(f"Provider {provider} not available")
-            
-            # Check if provider supports tools
-            if not provider_instance.supports_tools():
-                bound_logger.info(f"Provider {provider} doesn't support tools - running in Q&A mode")
-                tools = None
-                # Add a note about Q&A mode for providers that don't support tools
-                qa_note = f"\n\n**ℹ️ Q&A Mode**: You're using {provider.title()} which operates in Q&A mode only. I can provide guidance and explanations, but cannot execute NiFi operations directly. For full tool support, try OpenAI or Anthropic models."
-                system_prompt += qa_note
-            else:
-                # Handle tools parameter correctly
-                if tools == "auto":
-                    # Default behavior: fetch from MCP
-                    bound_logger.info("No pre-filtered tools provided, fetching from MCP")
-                    # Get tools from MCP with provider-specific schema validation
-                    tools = self.mcp_client.get_tools_for_provider(provider, user_request_id, selected_nifi_server_id)
-                    
-                    if not tools:
-                        bound_logger.warning("No tools available from MCP server")
-                elif tools is None:
-                    # Explicitly set to None - don't fetch tools
-                    bound_logger.info("Tools explicitly set to None - no tools will be used")
-                    tools = None
-                elif isinstance(tools, list):
-                    # Pre-filtered tools provided
-                    bound_logger.info(f"Using pre-filtered tools ({len(tools)} tools)")
-                else:
-                    # Invalid tools parameter
-                    bound_logger.warning(f"Invalid tools parameter: {type(tools)}, defaulting to no tools")
-                    tools = None
+            provider_instance, system_prompt, tools = self._prepare_request(provider, system_prompt, tools, bound_logger)
+            if tools == "auto":
+                tools = self._fetch_tools(provider, user_request_id, selected_nifi_server_id, bound_logger)
             
             # Send message to provider, always pass model_name
             response = provider_instance.send_message(
@@ -124,6 +96,92 @@ class ChatManager:
             bound_logger.error(f"Error getting LLM response: {e}", exc_info=True)
             return {"error": str(e)}
     
+    async def get_llm_response_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        provider: str,
+        model_name: str,
+        user_request_id: Optional[str] = None,
+        action_id: Optional[str] = None,
+        selected_nifi_server_id: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = "auto",
+        on_token: Optional[TokenCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of get_llm_response for callers running on an event loop.
+        
+        The provider call is awaited through its async SDK client, so no thread is held while
+        waiting for the model. With `on_token`, the response text is also passed to the
+        callback as it is generated. Fetching tools for `tools="auto"` still uses the blocking
+        MCP client and runs on a worker thread.
+        """
+        bound_logger = self.logger.bind(user_request_id=user_request_id, action_id=action_id)
+        
+        try:
+            provider_instance, system_prompt, tools = self._prepare_request(provider, system_prompt, tools, bound_logger)
+            if tools == "auto":
+                tools = await asyncio.to_thread(
+                    self._fetch_tools, provider, user_request_id, selected_nifi_server_id, bound_logger
+                )
+            
+            response = await provider_instance.send_message_async(
+                messages, system_prompt, model_name, tools, user_request_id, action_id, on_token=on_token
+            )
+            
+            result = response.to_dict()
+            
+            bound_logger.info(f"Successfully got response from {provider}")
+            return result
+        except Exception as e:
+            bound_logger.error(f"Error getting LLM response: {e}", exc_info=True)
+            return {"error": str(e)}
+    
+    def _prepare_request(self, provider: str, system_prompt: str, tools: Any, bound_logger):
+        """
+        Resolves the provider and the tools to send.
+        
+        Returns the provider instance, the (possibly extended) system prompt and the tools;
+        tools stay "auto" when they still have to be fetched from MCP.
+        """
+        # Get provider instance
+        provider_instance = self.providers.get(provider)
+        if not provider_instance:
+            raise ValueError(f"Provider {provider} not available")
+        
+        # Check if provider supports tools
+        if not provider_instance.supports_tools():
+            bound_logger.info(f"Provider {provider} doesn't support tools - running in Q&A mode")
+            tools = None
+            # Add a note about Q&A mode for providers that don't support tools
+            qa_note = f"\n\n**ℹ️ Q&A Mode**: You're using {provider.title()} which operates in Q&A mode only. I can provide guidance and explanations, but cannot execute NiFi operations directly. For full tool support, try OpenAI or Anthropic models."
+            system_prompt += qa_note
+        else:
+            # Handle tools parameter correctly
+            if tools == "auto":
+                # Default behavior: fetch from MCP
+                bound_logger.info("No pre-filtered tools provided, fetching from MCP")
+            elif tools is None:
+                # Explicitly set to None - don't fetch tools
+                bound_logger.info("Tools explicitly set to None - no tools will be used")
+                tools = None
+            elif isinstance(tools, list):
+                # Pre-filtered tools provided
+                bound_logger.info(f"Using pre-filtered tools ({len(tools)} tools)")
+            else:
+                # Invalid tools parameter
+                bound_logger.warning(f"Invalid tools parameter: {type(tools)}, defaulting to no tools")
+                tools = None
+        return provider_instance, system_prompt, tools
+    
+    def _fetch_tools(self, provider: str, user_request_id: Optional[str], selected_nifi_server_id: Optional[str], bound_logger) -> List[Dict[str, Any]]:
+        """Gets tools from MCP with provider-specific schema validation."""
+        tools = self.mcp_client.get_tools_for_provider(provider, user_request_id, selected_nifi_server_id)
+        
+        if not tools:
+            bound_logger.warning("No tools available from MCP server")
+        return tools
+    
     def get_available_providers(self) -> List[str]:
         """Get list of available providers."""
         return list(self.providers.keys())
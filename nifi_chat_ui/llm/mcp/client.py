@@ -5,20 +5,22 @@ This module provides a wrapper around the existing MCP handler to integrate
 with the new LLM architecture.
 """
 
-from typing import List, Dict, Any, Optional
+import copy
+from typing import List, Dict, Any, Optional, Tuple
 from loguru import logger
 
 # Import the existing MCP handler
 try:
-    from ...mcp_handler import get_available_tools, execute_mcp_tool
+    from ...mcp_handler import get_available_tools, execute_mcp_tool, get_cached_tools_etag
 except ImportError:
     # Fallback if run as script or structure changes
     try:
-        from mcp_handler import get_available_tools, execute_mcp_tool
+        from mcp_handler import get_available_tools, execute_mcp_tool, get_cached_tools_etag
     except ImportError:
         logger.error("Could not import mcp_handler. MCP functionality will be limited.")
         get_available_tools = None
         execute_mcp_tool = None
+        get_cached_tools_etag = None
 
 from .schema_validator import MCPSchemaValidator
 
@@ -26,6 +28,10 @@ from .schema_validator import MCPSchemaValidator
 class MCPClient:
     """Wrapper for MCP server communication with schema validation."""
     
+    # Validated tools per provider, with the ETag of the tool list they were built from.
+    # Shared by all instances: the UI builds a new client on every rerun.
+    _provider_tools: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+    
     def __init__(self):
         self.schema_validator = MCPSchemaValidator()
         self.logger = logger.bind(component="MCPClient")
@@ -57,8 +63,17 @@ class MCPClient:
                 self.logger.warning("No tools received from MCP server")
                 return []
             
+            # Reuse the corrections made for this provider while the tool list is unchanged
+            etag = get_cached_tools_etag() if get_cached_tools_etag else None
+            cached = self._provider_tools.get(provider)
+            if etag and cached and cached[0] == etag:
+                self.logger.debug(f"Using {len(cached[1])} cached validated tools for {provider}")
+                return copy.deepcopy(cached[1])
+            
             # Apply provider-specific schema corrections
             corrected_tools = self.schema_validator.validate_tools_list(raw_tools, provider)
+            if etag:
+                self._provider_tools[provider] = (etag, copy.deepcopy(corrected_tools))
             
             self.logger.info(f"Retrieved and validated {len(corrected_tools)} tools for {provider}")
             return corrected_tools
@@ -76,6 +76,7 @@ class MCPSchemaValidator:
             "question": "STRING",
             "query": "STRING",
             "filter_process_group_id": "STRING",
+            "detail_level": "STRING",
             "bulletin_limit": "INTEGER",
             "max_content_bytes": "INTEGER",
             "event_id": "INTEGER",
@@ -101,6 +102,7 @@ class MCPSchemaValidator:
             "relationships": "ARRAY",
             "auto_terminated_relationships": "ARRAY",
             "property_names_to_delete": "ARRAY",
+            "fields": "ARRAY",
         }
         
         return MCPSchemaValidator._apply_corrections(schema, field_corrections, type_mapping)
@@ -134,6 +136,7 @@ class MCPSchemaValidator:
             "question": "string",
             "query": "string",
             "filter_process_group_id": "string",
+            "detail_level": "string",
             "bulletin_limit": "integer",
             "max_content_bytes": "integer",
             "event_id": "integer",
@@ -159,6 +162,7 @@ class MCPSchemaValidator:
             "relationships": "array",
             "auto_terminated_relationships": "array",
             "property_names_to_delete": "array",
+            "fields": "array",
         }
         
         return MCPSchemaValidator._apply_corrections(schema, field_corrections, {})
@@ -193,7 +197,7 @@ class MCPSchemaValidator:
                         if corrected_type.lower() == "array" and "items" not in prop:
                             if field in ["operations", "objects", "updates", "processors", "ports", "connections", "controller_services", "nifi_objects"]:
                                 prop["items"] = {"type": "object"}
-                            elif field in ["relationships", "auto_terminated_relationships", "property_names_to_delete"]:
+                            elif field in ["relationships", "auto_terminated_relationships", "property_names_to_delete", "fields"]:
                                 prop["items"] = {"type": "string"}
                             else:
                                 prop["items"] = {"type": "object"}
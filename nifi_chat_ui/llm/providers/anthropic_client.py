@@ -10,6 +10,7 @@ import json
 from loguru import logger
 from ..base import LLMProvider, LLMResponse
 from ..utils.token_counter import TokenCounter
+from ..utils.streaming import TokenCallback, deliver_token
 from ..mcp.tool_formatter import ToolFormatter
 from ..utils.message_converter import MessageConverter
 
@@ -39,6 +40,49 @@ class AnthropicClient(LLMProvider):
         user_request_id: Optional[str] = None,
         action_id: Optional[str] = None
     ) -> LLMResponse:
+        request_params = self._build_request(messages, system_prompt, model_name, tools)
+        try:
+            response = self.client.messages.create(**request_params)
+            return self._parse_response(response)
+        except Exception as e:
+            self.logger.error(f"Anthropic API error: {e}")
+            raise
+    
+    async def send_message_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]] = None,
+        user_request_id: Optional[str] = None,
+        action_id: Optional[str] = None,
+        on_token: Optional[TokenCallback] = None
+    ) -> LLMResponse:
+        request_params = self._build_request(messages, system_prompt, model_name, tools)
+        client = self._async_client()
+        try:
+            if on_token is None:
+                response = await client.messages.create(**request_params)
+                return self._parse_response(response)
+            async with client.messages.stream(**request_params) as stream:
+                async for text in stream.text_stream:
+                    await deliver_token(on_token, text)
+                response = await stream.get_final_message()
+            return self._parse_response(response)
+        except Exception as e:
+            self.logger.error(f"Anthropic API error: {e}")
+            raise
+    
+    def _create_async_client(self, http_client) -> anthropic.AsyncAnthropic:
+        return anthropic.AsyncAnthropic(api_key=self.api_key, http_client=http_client)
+    
+    def _build_request(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]]
+    ) -> Dict[str, Any]:
         # Convert messages to Anthropic format
         anthropic_messages = MessageConverter.convert_to_anthropic_format(messages)
         
@@ -48,52 +92,53 @@ class AnthropicClient(LLMProvider):
             if len(tools) > 0:
                 self.logger.debug(f"First tool structure: {tools[0]}")
         
-        try:
-            response = self.client.messages.create(
-                model=model_name,
-                max_tokens=4096,
-                system=system_prompt,
-                messages=anthropic_messages,
-                tools=tools if tools else None,
-            )
-            # Convert Anthropic response back to OpenAI-compatible format
-            content = ""
-            tool_calls = []
-            for content_block in response.content:
-                if hasattr(content_block, 'type'):
-                    if content_block.type == "text":
-                        content += getattr(content_block, 'text', '')
-                    elif content_block.type == "tool_use":
-                        # Get the input arguments from Anthropic's tool_use block
-                        input_args = getattr(content_block, 'input', {})
-                        
-                        # Properly JSON-encode the arguments
-                        try:
-                            arguments_json = json.dumps(input_args)
-                        except (TypeError, ValueError) as e:
-                            self.logger.warning(f"Failed to JSON encode tool arguments: {e}")
-                            arguments_json = "{}"
-                        
-                        tool_call = {
-                            "id": getattr(content_block, 'id', None),
-                            "type": "function",
-                            "function": {
-                                "name": getattr(content_block, 'name', ''),
-                                "arguments": arguments_json
-                            }
+        request_params = {
+            "model": model_name,
+            "max_tokens": 4096,
+            "system": system_prompt,
+            "messages": anthropic_messages,
+        }
+        # Omit the key entirely rather than sending tools=None
+        if tools:
+            request_params["tools"] = tools
+        return request_params
+    
+    def _parse_response(self, response) -> LLMResponse:
+        # Convert Anthropic response back to OpenAI-compatible format
+        content = ""
+        tool_calls = []
+        for content_block in response.content:
+            if hasattr(content_block, 'type'):
+                if content_block.type == "text":
+                    content += getattr(content_block, 'text', '')
+                elif content_block.type == "tool_use":
+                    # Get the input arguments from Anthropic's tool_use block
+                    input_args = getattr(content_block, 'input', {})
+                    
+                    # Properly JSON-encode the arguments
+                    try:
+                        arguments_json = json.dumps(input_args)
+                    except (TypeError, ValueError) as e:
+                        self.logger.warning(f"Failed to JSON encode tool arguments: {e}")
+                        arguments_json = "{}"
+                    
+                    tool_call = {
+                        "id": getattr(content_block, 'id', None),
+                        "type": "function",
+                        "function": {
+                            "name": getattr(content_block, 'name', ''),
+                            "arguments": arguments_json
                         }
-                        tool_calls.append(tool_call)
-            token_count_in = getattr(response.usage, 'input_tokens', 0)
-            token_count_out = getattr(response.usage, 'output_tokens', 0)
-            return LLMResponse(
-                content=content or None,
-                tool_calls=tool_calls if tool_calls else None,
-                token_count_in=token_count_in,
-                token_count_out=token_count_out
-            )
-        except Exception as e:
-            self.logger.error(f"Anthropic API error: {e}")
-            raise
+                    }
+                    tool_calls.append(tool_call)
+        token_count_in = getattr(response.usage, 'input_tokens', 0)
+        token_count_out = getattr(response.usage, 'output_tokens', 0)
+        return LLMResponse(
+            content=content or None,
+            tool_calls=tool_calls if tool_calls else None,
+            token_count_in=token_count_in,
+            token_count_out=token_count_out
+        )
     
     def format_tools(self, tools: List[Dict[str, Any]]) -> Any:
         return ToolFormatter.format_tools_for_provider(tools, "anthropic")
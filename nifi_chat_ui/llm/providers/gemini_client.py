@@ -12,6 +12,7 @@ from loguru import logger
 from ..base import LLMProvider, LLMResponse
 from ..utils.token_counter import TokenCounter
 from ..utils.error_handler import LLMErrorHandler
+from ..utils.streaming import TokenCallback, deliver_token
 
 # Import Google ADK components
 try:
@@ -128,8 +129,70 @@ class GeminiClient(LLMProvider):
             bound_logger.error(f"ADK execution error: {e}", exc_info=True)
             raise
     
+    async def send_message_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]] = None,
+        user_request_id: Optional[str] = None,
+        action_id: Optional[str] = None,
+        on_token: Optional[TokenCallback] = None
+    ) -> LLMResponse:
+        """
+        Send message to Gemini without blocking the event loop.
+        
+        The manual implementation awaits google.generativeai's async API, which talks gRPC
+        and therefore keeps its own channel instead of the shared HTTP pool. The response is
+        not streamed: its text is handed to `on_token` once, after tool calls are parsed.
+        The ADK path has no async API and runs on a worker thread.
+        """
+        if self.adk_agent and ADK_AVAILABLE:
+            return await super().send_message_async(
+                messages, system_prompt, model_name, tools, user_request_id, action_id, on_token
+            )
+        
+        bound_logger = self.logger.bind(user_request_id=user_request_id, action_id=action_id)
+        try:
+            model_instance, gemini_history, token_count_in = self._create_manual_model(
+                messages, system_prompt, model_name, tools, bound_logger
+            )
+            try:
+                generate_kwargs, function_declarations = self._prepare_manual_request(messages, model_name, tools, bound_logger)
+                response = await model_instance.generate_content_async(gemini_history, **generate_kwargs)
+                parsed_response = self._parse_manual_response(
+                    response, tools, token_count_in, bound_logger, function_declarations
+                )
+            except Exception as e:
+                parsed_response = self._manual_error_response(e, token_count_in, bound_logger)
+        except Exception as e:
+            bound_logger.error(f"Gemini API error: {e}", exc_info=True)
+            error_message = LLMErrorHandler.handle_error(e, "Gemini")
+            return LLMResponse(
+                content=None,
+                tool_calls=None,
+                token_count_in=0,
+                token_count_out=0,
+                error=error_message
+            )
+        await deliver_token(on_token, parsed_response.content)
+        return parsed_response
+    
     def _send_with_manual_implementation(self, messages: List[Dict[str, Any]], system_prompt: str, model_name: str, tools: Optional[List[Any]], bound_logger) -> LLMResponse:
         """Fallback to manual implementation with enhanced error diagnostics."""
+        model_instance, gemini_history, token_count_in = self._create_manual_model(
+            messages, system_prompt, model_name, tools, bound_logger
+        )
+        
+        try:
+            generate_kwargs, function_declarations = self._prepare_manual_request(messages, model_name, tools, bound_logger)
+            response = model_instance.generate_content(gemini_history, **generate_kwargs)
+            return self._parse_manual_response(response, tools, token_count_in, bound_logger, function_declarations)
+        except Exception as e:
+            return self._manual_error_response(e, token_count_in, bound_logger)
+    
+    def _create_manual_model(self, messages: List[Dict[str, Any]], system_prompt: str, model_name: str, tools: Optional[List[Any]], bound_logger):
+        """Creates the google.generativeai model; returns it with the converted history and input token count."""
         bound_logger.warning("Using manual Gemini implementation (ADK not available)")
         
         # Import here to avoid dependency issues
@@ -152,106 +215,108 @@ class GeminiClient(LLMProvider):
         token_count_in = self.token_counter.calculate_input_tokens(
             messages, "gemini", model_name, tools
         )
+        return model_instance, gemini_history, token_count_in
+    
+    def _prepare_manual_request(self, messages: List[Dict[str, Any]], model_name: str, tools: Optional[List[Any]], bound_logger):
+        """Formats the tools and generation config; returns the generate_content kwargs and the function declarations."""
+        import google.generativeai as genai
         
-        # Initialize function_declarations in broader scope for error handling
         function_declarations = None
         
-        try:
-            # Enhanced debugging for tools
-            if tools:
-                bound_logger.debug(f"Received {len(tools)} raw tools from MCP for formatting")
-                for i, tool in enumerate(tools[:3]):  # Log first 3 tools
-                    # Extract tool name from MCP format
-                    tool_name = tool.get("function", {}).get("name", "unknown") if isinstance(tool, dict) else getattr(tool, 'name', 'unknown')
-                    bound_logger.debug(f"Raw tool {i+1}: {tool_name}")
-            else:
-                bound_logger.debug("No tools being sent to Gemini model")
-            
-            # Generate content with enhanced error handling
-            # For Gemini, tools need to be formatted and wrapped in a list of Tool objects
-            formatted_tools = None
-            if tools:
-                # Format tools using the ToolFormatter first
-                function_declarations = self.format_tools(tools)
-                formatted_tools = [genai.types.Tool(function_declarations=function_declarations)]
-                bound_logger.debug(f"Formatted and wrapped {len(function_declarations)} function declarations in Tool object")
-            
-            # LLM Debug Logging - Log the request being sent to Gemini
-            llm_request_data = {
-                "provider": "gemini",
-                "model": model_name,
-                "messages": messages,
-                "tools": [{"name": getattr(t, 'name', 'unknown'), "description": getattr(t, 'description', 'N/A')} for t in function_declarations] if function_declarations else None
-            }
-            bound_logger.bind(interface="llm", direction="request", data=llm_request_data).debug("Calling Gemini LLM")
-            
-            # Create generation config with appropriate settings
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.3,
-            )
-            
-            # Enable function calling if tools are provided
-            if formatted_tools:
-                # Some models support explicit function calling mode
-                try:
-                    generation_config.function_calling_mode = "AUTO"
-                    bound_logger.debug("Set function calling mode to AUTO")
-                except:
-                    # If function_calling_mode is not supported, continue without it
-                    bound_logger.debug("Function calling mode not supported, continuing without it")
-            
-            response = model_instance.generate_content(
-                gemini_history,
-                tools=formatted_tools,
-                generation_config=generation_config
-            )
-            
-            # Debug log the raw response structure
-            bound_logger.debug(f"Raw response type: {type(response)}")
-            if hasattr(response, 'candidates'):
-                bound_logger.debug(f"Response has {len(response.candidates)} candidates")
-                for i, candidate in enumerate(response.candidates):
-                    if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
-                        bound_logger.debug(f"Candidate {i} has {len(candidate.content.parts)} parts")
-            else:
-                bound_logger.debug("Response has no candidates attribute")
-            
-            # Enhanced response validation and parsing
-            parsed_response = self._parse_gemini_response_with_diagnostics(
-                response, tools, token_count_in, bound_logger, function_declarations
-            )
-            
-            # LLM Debug Logging - Log the response received from Gemini
-            llm_response_data = {
-                "content_length": len(parsed_response.content) if parsed_response.content else 0,
-                "tool_calls_count": len(parsed_response.tool_calls) if parsed_response.tool_calls else 0,
-                "token_count_in": parsed_response.token_count_in,
-                "token_count_out": parsed_response.token_count_out,
-                "error": parsed_response.error,
-                "full_response": parsed_response.content if parsed_response.content else None
-            }
-            bound_logger.bind(interface="llm", direction="response", data=llm_response_data).debug("llm-response")
-            
-            return parsed_response
-            
-        except Exception as e:
-            bound_logger.error(f"Gemini API call failed: {e}", exc_info=True)
-            
-            # LLM Debug Logging - Log the error response
-            llm_error_data = {
-                "error": str(e),
-                "token_count_in": token_count_in,
-                "token_count_out": 0
-            }
-            bound_logger.bind(interface="llm", direction="response", data=llm_error_data).debug("Received error from Gemini LLM")
-            
-            return LLMResponse(
-                content=None,
-                tool_calls=None,
-                token_count_in=token_count_in,
-                token_count_out=0,
-                error=f"Gemini API error: {str(e)}"
-            )
+        # Enhanced debugging for tools
+        if tools:
+            bound_logger.debug(f"Received {len(tools)} raw tools from MCP for formatting")
+            for i, tool in enumerate(tools[:3]):  # Log first 3 tools
+                # Extract tool name from MCP format
+                tool_name = tool.get("function", {}).get("name", "unknown") if isinstance(tool, dict) else getattr(tool, 'name', 'unknown')
+                bound_logger.debug(f"Raw tool {i+1}: {tool_name}")
+        else:
+            bound_logger.debug("No tools being sent to Gemini model")
+        
+        # Generate content with enhanced error handling
+        # For Gemini, tools need to be formatted and wrapped in a list of Tool objects
+        formatted_tools = None
+        if tools:
+            # Format tools using the ToolFormatter first
+            function_declarations = self.format_tools(tools)
+            formatted_tools = [genai.types.Tool(function_declarations=function_declarations)]
+            bound_logger.debug(f"Formatted and wrapped {len(function_declarations)} function declarations in Tool object")
+        
+        # LLM Debug Logging - Log the request being sent to Gemini
+        llm_request_data = {
+            "provider": "gemini",
+            "model": model_name,
+            "messages": messages,
+            "tools": [{"name": getattr(t, 'name', 'unknown'), "description": getattr(t, 'description', 'N/A')} for t in function_declarations] if function_declarations else None
+        }
+        bound_logger.bind(interface="llm", direction="request", data=llm_request_data).debug("Calling Gemini LLM")
+        
+        # Create generation config with appropriate settings
+        generation_config = genai.types.GenerationConfig(
+            temperature=0.3,
+        )
+        
+        # Enable function calling if tools are provided
+        if formatted_tools:
+            # Some models support explicit function calling mode
+            try:
+                generation_config.function_calling_mode = "AUTO"
+                bound_logger.debug("Set function calling mode to AUTO")
+            except:
+                # If function_calling_mode is not supported, continue without it
+                bound_logger.debug("Function calling mode not supported, continuing without it")
+        
+        return {"tools": formatted_tools, "generation_config": generation_config}, function_declarations
+    
+    def _parse_manual_response(self, response, tools, token_count_in, bound_logger, function_declarations) -> LLMResponse:
+        """Parses a generate_content response and logs it."""
+        # Debug log the raw response structure
+        bound_logger.debug(f"Raw response type: {type(response)}")
+        if hasattr(response, 'candidates'):
+            bound_logger.debug(f"Response has {len(response.candidates)} candidates")
+            for i, candidate in enumerate(response.candidates):
+                if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
+                    bound_logger.debug(f"Candidate {i} has {len(candidate.content.parts)} parts")
+        else:
+            bound_logger.debug("Response has no candidates attribute")
+        
+        # Enhanced response validation and parsing
+        parsed_response = self._parse_gemini_response_with_diagnostics(
+            response, tools, token_count_in, bound_logger, function_declarations
+        )
+        
+        # LLM Debug Logging - Log the response received from Gemini
+        llm_response_data = {
+            "content_length": len(parsed_response.content) if parsed_response.content else 0,
+            "tool_calls_count": len(parsed_response.tool_calls) if parsed_response.tool_calls else 0,
+            "token_count_in": parsed_response.token_count_in,
+            "token_count_out": parsed_response.token_count_out,
+            "error": parsed_response.error,
+            "full_response": parsed_response.content if parsed_response.content else None
+        }
+        bound_logger.bind(interface="llm", direction="response", data=llm_response_data).debug("llm-response")
+        
+        return parsed_response
+    
+    def _manual_error_response(self, e: Exception, token_count_in: int, bound_logger) -> LLMResponse:
+        """Logs a failed generate_content call and turns it into an error response."""
+        bound_logger.error(f"Gemini API call failed: {e}", exc_info=True)
+        
+        # LLM Debug Logging - Log the error response
+        llm_error_data = {
+            "error": str(e),
+            "token_count_in": token_count_in,
+            "token_count_out": 0
+        }
+        bound_logger.bind(interface="llm", direction="response", data=llm_error_data).debug("Received error from Gemini LLM")
+        
+        return LLMResponse(
+            content=None,
+            tool_calls=None,
+            token_count_in=token_count_in,
+            token_count_out=0,
+            error=f"Gemini API error: {str(e)}"
+        )
     
     def _convert_messages_to_adk_format(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert OpenAI format messages to ADK format."""
@@ -5,10 +5,11 @@ This module implements the LLMProvider interface for Groq using the Groq SDK.
 """
 
 from typing import List, Dict, Any, Optional
-from groq import Groq
+from groq import AsyncGroq, Groq
 from loguru import logger
 from ..base import LLMProvider, LLMResponse
 from ..utils.token_counter import TokenCounter
+from ..utils.streaming import TokenCallback, collect_chat_completion_stream
 from ..mcp.tool_formatter import ToolFormatter
 
 
@@ -42,6 +43,53 @@ class GroqClient(LLMProvider):
         user_request_id: Optional[str] = None,
         action_id: Optional[str] = None
     ) -> LLMResponse:
+        request_params = self._build_request(messages, system_prompt, model_name, tools)
+        try:
+            response = self.client.chat.completions.create(**request_params)
+            return self._parse_response(response)
+        except Exception as e:
+            self._log_error(e)
+            raise
+    
+    async def send_message_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]] = None,
+        user_request_id: Optional[str] = None,
+        action_id: Optional[str] = None,
+        on_token: Optional[TokenCallback] = None
+    ) -> LLMResponse:
+        request_params = self._build_request(messages, system_prompt, model_name, tools)
+        client = self._async_client()
+        try:
+            if on_token is None:
+                response = await client.chat.completions.create(**request_params)
+                return self._parse_response(response)
+            # Groq reports usage of a streamed completion in the final chunk's x_groq field
+            stream = await client.chat.completions.create(**request_params, stream=True)
+            completion = await collect_chat_completion_stream(stream, on_token)
+            return self._log_response(LLMResponse(
+                content=completion.content,
+                tool_calls=completion.tool_calls,
+                token_count_in=completion.token_count_in,
+                token_count_out=completion.token_count_out
+            ))
+        except Exception as e:
+            self._log_error(e)
+            raise
+    
+    def _create_async_client(self, http_client) -> AsyncGroq:
+        return AsyncGroq(api_key=self.api_key, http_client=http_client)
+    
+    def _build_request(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]]
+    ) -> Dict[str, Any]:
         # Prepend system prompt as the first message if not already present
         groq_messages = messages.copy()
         if not groq_messages or groq_messages[0]["role"] != "system":
@@ -56,64 +104,62 @@ class GroqClient(LLMProvider):
         }
         self.logger.bind(interface="llm", direction="request", data=llm_request_data).debug("Calling Groq LLM")
         
-        try:
-            # Prepare the request parameters
-            request_params = {
-                "model": model_name,
-                "messages": groq_messages,
-            }
-            
-            # Add tools if provided
-            if tools:
-                request_params["tools"] = tools
-                request_params["tool_choice"] = "auto"
-            
-            response = self.client.chat.completions.create(**request_params)
-            response_message = response.choices[0].message
-            response_content = response_message.content
-            response_tool_calls = response_message.tool_calls
-            
-            # Format tool calls if present
-            if response_tool_calls:
-                response_tool_calls = [
-                    {
-                        "id": tc.id,
-                        "type": tc.type,
-                        "function": {"name": tc.function.name, "arguments": tc.function.arguments}
-                    } for tc in response_tool_calls
-                ]
-            
-            # Get token counts
-            token_count_in = getattr(response.usage, 'prompt_tokens', 0)
-            token_count_out = getattr(response.usage, 'completion_tokens', 0)
-            
-            # LLM Debug Logging - Log the response received from Groq
-            llm_response_data = {
-                "content_length": len(response_content) if response_content else 0,
-                "tool_calls_count": len(response_tool_calls) if response_tool_calls else 0,
-                "token_count_in": token_count_in,
-                "token_count_out": token_count_out,
-                "error": None,
-                "full_response": response_content
-            }
-            self.logger.bind(interface="llm", direction="response", data=llm_response_data).debug("llm-response")
-            
-            return LLMResponse(
-                content=response_content,
-                tool_calls=response_tool_calls,
-                token_count_in=token_count_in,
-                token_count_out=token_count_out
-            )
-        except Exception as e:
-            self.logger.error(f"Groq API error: {e}")
-            # LLM Debug Logging - Log the error response
-            llm_error_data = {
-                "error": str(e),
-                "token_count_in": 0,
-                "token_count_out": 0
-            }
-            self.logger.bind(interface="llm", direction="response", data=llm_error_data).debug("Received error from Groq LLM")
-            raise
+        # Prepare the request parameters
+        request_params = {
+            "model": model_name,
+            "messages": groq_messages,
+        }
+        
+        # Add tools if provided
+        if tools:
+            request_params["tools"] = tools
+            request_params["tool_choice"] = "auto"
+        return request_params
+    
+    def _parse_response(self, response) -> LLMResponse:
+        response_message = response.choices[0].message
+        response_content = response_message.content
+        response_tool_calls = response_message.tool_calls
+        
+        # Format tool calls if present
+        if response_tool_calls:
+            response_tool_calls = [
+                {
+                    "id": tc.id,
+                    "type": tc.type,
+                    "function": {"name": tc.function.name, "arguments": tc.function.arguments}
+                } for tc in response_tool_calls
+            ]
+        
+        return self._log_response(LLMResponse(
+            content=response_content,
+            tool_calls=response_tool_calls,
+            token_count_in=getattr(response.usage, 'prompt_tokens', 0),
+            token_count_out=getattr(response.usage, 'completion_tokens', 0)
+        ))
+    
+    def _log_response(self, response: LLMResponse) -> LLMResponse:
+        # LLM Debug Logging - Log the response received from Groq
+        llm_response_data = {
+            "content_length": len(response.content) if response.content else 0,
+            "tool_calls_count": len(response.tool_calls) if response.tool_calls else 0,
+            "token_count_in": response.token_count_in,
+            "token_count_out": response.token_count_out,
+            "error": None,
+            "full_response": response.content
+        }
+        self.logger.bind(interface="llm", direction="response", data=llm_response_data).debug("llm-response")
+        return response
+    
+    def _log_error(self, e: Exception):
+        self.logger.error(f"Groq API error: {e}")
+        # LLM Debug Logging - Log the error response
+        llm_error_data = {
+            "error": str(e),
+            "token_count_in": 0,
+            "token_count_out": 0
+        }
+        self.logger.bind(interface="llm", direction="response", data=llm_error_data).debug("Received error from Groq LLM")
     
     def format_tools(self, tools: List[Dict[str, Any]]) -> Any:
         return ToolFormatter.format_tools_for_provider(tools, "groq")
@@ -5,10 +5,11 @@ This module implements the LLMProvider interface for Perplexity using the OpenAI
 """
 
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from loguru import logger
 from ..base import LLMProvider, LLMResponse
 from ..utils.token_counter import TokenCounter
+from ..utils.streaming import TokenCallback, collect_chat_completion_stream
 from ..mcp.tool_formatter import ToolFormatter
 
 
@@ -39,6 +40,52 @@ class PerplexityClient(LLMProvider):
         user_request_id: Optional[str] = None,
         action_id: Optional[str] = None
     ) -> LLMResponse:
+        request_params = self._build_request(messages, system_prompt, model_name, tools)
+        try:
+            response = self.client.chat.completions.create(**request_params)
+            return self._parse_response(response)
+        except Exception as e:
+            self.logger.error(f"Perplexity API error: {e}")
+            raise
+    
+    async def send_message_async(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]] = None,
+        user_request_id: Optional[str] = None,
+        action_id: Optional[str] = None,
+        on_token: Optional[TokenCallback] = None
+    ) -> LLMResponse:
+        request_params = self._build_request(messages, system_prompt, model_name, tools)
+        client = self._async_client()
+        try:
+            if on_token is None:
+                response = await client.chat.completions.create(**request_params)
+                return self._parse_response(response)
+            stream = await client.chat.completions.create(**request_params, stream=True)
+            completion = await collect_chat_completion_stream(stream, on_token)
+            return LLMResponse(
+                content=completion.content,
+                tool_calls=completion.tool_calls,
+                token_count_in=completion.token_count_in,
+                token_count_out=completion.token_count_out
+            )
+        except Exception as e:
+            self.logger.error(f"Perplexity API error: {e}")
+            raise
+    
+    def _create_async_client(self, http_client) -> AsyncOpenAI:
+        return AsyncOpenAI(api_key=self.api_key, base_url="https://api.perplexity.ai", http_client=http_client)
+    
+    def _build_request(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        model_name: str,
+        tools: Optional[List[Any]]
+    ) -> Dict[str, Any]:
         # Perplexity doesn't support function calling/tools
         if tools:
             self.logger.warning("Perplexity models don't support function calling. Tools will be ignored.")
@@ -71,34 +118,30 @@ Please keep this in mind when asking questions. I'll provide helpful guidance an
         if not perplexity_messages or perplexity_messages[0]["role"] != "system":
             perplexity_messages.insert(0, {"role": "system", "content": system_prompt})
         
-        try:
-            response = self.client.chat.completions.create(
-                model=model_name,
-                messages=perplexity_messages,
-                # Don't send tools to Perplexity
-            )
-            response_message = response.choices[0].message
-            response_content = response_message.content
-            response_tool_calls = response_message.tool_calls
-            if response_tool_calls:
-                response_tool_calls = [
-                    {
-                        "id": tc.id,
-                        "type": tc.type,
-                        "function": {"name": tc.function.name, "arguments": tc.function.arguments}
-                    } for tc in response_tool_calls
-                ]
-            token_count_in = getattr(response.usage, 'prompt_tokens', 0)
-            token_count_out = getattr(response.usage, 'completion_tokens', 0)
-            return LLMResponse(
-                content=response_content,
-                tool_calls=response_tool_calls,
-                token_count_in=token_count_in,
-                token_count_out=token_count_out
-            )
-        except Exception as e:
-            self.logger.error(f"Perplexity API error: {e}")
-            raise
+        return {
+            "model": model_name,
+            "messages": perplexity_messages,
+            # Don't send tools to Perplexity
+        }
+    
+    def _parse_response(self, response) -> LLMResponse:
+        response_message = response.choices[0].message
+        response_content = response_message.content
+        response_tool_calls = response_message.tool_calls
+        if response_tool_calls:
+            response_tool_calls = [
+                {
+                    "id": tc.id,
+                    "type": tc.type,
+                    "function": {"name": tc.function.name, "arguments": tc.function.arguments}
+                } for tc in response_tool_calls
+            ]
+        return LLMResponse(
+            content=response_content,
+            tool_calls=response_tool_calls,
+            token_count_in=getattr(response.usage, 'prompt_tokens', 0),
+            token_count_out=getattr(response.usage, 'completion_tokens', 0)
+        )
     
     def format_tools(self, tools: List[Dict[str, Any]]) -> Any:
         return ToolFormatter.format_tools_for_provider(tools, "perplexity")
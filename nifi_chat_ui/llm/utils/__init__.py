@@ -5,12 +5,13 @@ This package contains utility functions for token counting, error handling,
 message conversion, and other common operations across LLM providers.
 """
 
-from .token_counter import TokenCounter
+from .token_counter import TokenCounter, TokenLedger
 from .error_handler import LLMErrorHandler
 from .message_converter import MessageConverter
 
 __all__ = [
     "TokenCounter",
+    "TokenLedger",
     "LLMErrorHandler", 
     "MessageConverter"
 ] 
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Shared HTTP connection pool for the async LLM provider clients.
+
+The async SDK clients (AsyncOpenAI, AsyncAnthropic, AsyncGroq) accept an
+`httpx.AsyncClient`. Handing every provider the same one lets all workflows running on an
+event loop reuse keep-alive connections to the LLM APIs instead of each SDK client opening
+its own pool. httpx clients are bound to the loop they are first used on, so there is one
+pool per event loop.
+"""
+
+import asyncio
+import weakref
+
+import httpx
+
+# LLM responses can take minutes to generate; connecting should not
+LLM_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """Returns the pooled LLM API client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=LLM_HTTP_TIMEOUT, limits=LLM_HTTP_LIMITS, follow_redirects=True)
+        _clients[loop] = client
+    return client
+
+
+async def close_llm_http_client() -> None:
+    """Closes the running event loop's LLM API client. Call before closing a loop that made async LLM calls."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
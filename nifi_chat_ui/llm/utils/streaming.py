@@ -0,0 +1,80 @@
+"""
+Streaming helpers shared by the async LLM provider clients.
+
+Providers stream a response when the caller passes an `on_token` callback: every text
+fragment is handed to the callback as it arrives, and the fragments are assembled into the
+same LLMResponse the non-streaming call returns.
+"""
+
+import inspect
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional, Union
+
+# Called with each text fragment of a streamed response; may be a plain function or a coroutine function
+TokenCallback = Callable[[str], Union[None, Awaitable[None]]]
+
+
+async def deliver_token(on_token: Optional[TokenCallback], text: Optional[str]) -> None:
+    """Passes one text fragment to the callback, awaiting it if it is async."""
+    if on_token is None or not text:
+        return
+    result = on_token(text)
+    if inspect.isawaitable(result):
+        await result
+
+
+@dataclass
+class StreamedCompletion:
+    """A chat completion assembled from its streamed chunks."""
+    content: Optional[str]
+    tool_calls: Optional[List[Dict[str, Any]]]
+    token_count_in: int = 0
+    token_count_out: int = 0
+
+
+async def collect_chat_completion_stream(
+    stream: AsyncIterable[Any],
+    on_token: Optional[TokenCallback] = None
+) -> StreamedCompletion:
+    """
+    Consumes an OpenAI-compatible chat completion stream (OpenAI, Groq, Perplexity).
+
+    Content deltas are forwarded to `on_token` and concatenated; tool call deltas are merged
+    by their index into OpenAI-format tool calls. Usage is read from the final chunk
+    (`stream_options={"include_usage": True}`) or from Groq's `x_groq.usage`.
+    """
+    content_parts: List[str] = []
+    tool_calls: Dict[int, Dict[str, Any]] = {}
+    usage = None
+
+    async for chunk in stream:
+        chunk_usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+        if chunk_usage is not None:
+            usage = chunk_usage
+        for choice in getattr(chunk, "choices", None) or []:
+            delta = getattr(choice, "delta", None)
+            if delta is None:
+                continue
+            text = getattr(delta, "content", None)
+            if text:
+                content_parts.append(text)
+                await deliver_token(on_token, text)
+            for fragment in getattr(delta, "tool_calls", None) or []:
+                call = tool_calls.setdefault(
+                    fragment.index, {"id": None, "type": "function", "function": {"name": "", "arguments": ""}}
+                )
+                if getattr(fragment, "id", None):
+                    call["id"] = fragment.id
+                if getattr(fragment, "type", None):
+                    call["type"] = fragment.type
+                function = getattr(fragment, "function", None)
+                if function is not None:
+                    call["function"]["name"] += getattr(function, "name", None) or ""
+                    call["function"]["arguments"] += getattr(function, "arguments", None) or ""
+
+    return StreamedCompletion(
+        content="".join(content_parts) or None,
+        tool_calls=[tool_calls[index] for index in sorted(tool_calls)] or None,
+        token_count_in=getattr(usage, "prompt_tokens", 0) or 0,
+        token_count_out=getattr(usage, "completion_tokens", 0) or 0
+    )
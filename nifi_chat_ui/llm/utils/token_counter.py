@@ -3,12 +3,121 @@ Token counting utilities for different LLM providers.
 
 This module consolidates token counting logic from the original chat_manager.py
 and provides provider-specific token counting methods.
+
+Counting is memoized so that budget checks and pruning on long conversations do not
+re-tokenize the whole history on every call: tiktoken encoders are cached per model,
+message counts per (model, content hash) and tool-definition counts per (hash of the
+serialized tool set, provider, model). `TokenLedger` keeps running prefix sums over a
+conversation's per-message counts.
 """
 
+import hashlib
+import json
+import threading
+import time
+from typing import List, Dict, Any, Hashable, Optional, Tuple
+
 import tiktoken
-from typing import List, Dict, Any, Optional
 from loguru import logger
 
+# Bounded so that long-running UIs do not grow the caches without limit; entries are small ints
+MESSAGE_CACHE_SIZE = 16384
+TOOL_CACHE_SIZE = 256
+
+
+class _CountCache:
+    """
+    Bounded map from a hashable key to a token count; the oldest entries are evicted first.
+    Lookups take no lock, so counting a long history stays a series of dict reads.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._counts: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[int]:
+        return self._counts.get(key)
+    
+    def put(self, key: Hashable, count: int):
+        with self._lock:
+            self._counts[key] = count
+            while len(self._counts) > self.maxsize:
+                del self._counts[next(iter(self._counts))]
+    
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+# Shared by every TokenCounter instance (providers, ChatManager and the UI each create one)
+_message_token_cache = _CountCache(MESSAGE_CACHE_SIZE)
+_tool_token_cache = _CountCache(TOOL_CACHE_SIZE)
+
+
+# tiktoken downloads an encoding on first use; after a failure, use the approximation for a while
+ENCODING_RETRY_SECONDS = 300.0
+
+_encoders: Dict[str, Any] = {}  # model name -> tiktoken encoding
+_encoder_failures: Dict[str, float] = {}  # model name -> time of the last failed lookup
+
+
+def _encoding_for_model(model: str):
+    """The tiktoken encoding for a model, or None when only the approximation is possible."""
+    encoding = _encoders.get(model)
+    if encoding is not None:
+        return encoding
+    failed_at = _encoder_failures.get(model)
+    if failed_at is not None and time.monotonic() - failed_at < ENCODING_RETRY_SECONDS:
+        return None
+    encoding = _load_encoding(model)
+    if encoding is None:
+        _encoder_failures[model] = time.monotonic()
+    else:
+        _encoders[model] = encoding
+        _encoder_failures.pop(model, None)
+    return encoding
+
+
+def _load_encoding(model: str):
+    try:
+        # First, try the standard model mapping
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # If standard mapping fails, try the common encoding for GPT-4 and new models
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.error(f"Failed to get 'cl100k_base' encoding: {e}. Using approximation.")
+            return None
+    except Exception as e:
+        logger.warning(f"Unexpected error getting tiktoken encoding for model {model}: {e}. Using approximation.")
+        return None
+
+
+_tool_set_digests: Dict[int, Tuple[List[Any], str]] = {}  # id(tools) -> (tools, digest)
+
+
+def _tool_set_key(tools: List[Any]) -> str:
+    """
+    Identifies a tool list by a hash of its full serialized definitions, so a parameter
+    schema change in the server's versioned tool catalog gets a fresh count. The digest is
+    memoized per list object (which is held so its id is not reused); tool lists are not
+    modified in place once built.
+    """
+    cached = _tool_set_digests.get(id(tools))
+    if cached is not None and cached[0] is tools:
+        return cached[1]
+    serialized = json.dumps(tools, sort_keys=True, default=repr)
+    digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    _tool_set_digests[id(tools)] = (tools, digest)
+    while len(_tool_set_digests) > TOOL_CACHE_SIZE:
+        del _tool_set_digests[next(iter(_tool_set_digests))]
+    return digest
+
 
 class TokenCounter:
     """Centralized token counting for all LLM providers."""
@@ -41,30 +150,13 @@ class TokenCounter:
             # Fallback to approximation if tiktoken isn't available
             return len(text.split())
         
-        encoding = None
+        encoding = _encoding_for_model(model)
+        if encoding is None:
+            return len(text.split())
         try:
-            # First, try the standard model mapping
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            # If standard mapping fails, try the common encoding for GPT-4 and new models
-            try:
-                encoding = tiktoken.get_encoding("cl100k_base")
-            except Exception as e:
-                logger.error(f"Failed to get 'cl100k_base' encoding: {e}. Using approximation.")
-                return len(text.split())
+            return len(encoding.encode(text))
         except Exception as e:
-            logger.warning(f"Unexpected error getting tiktoken encoding for model {model}: {e}. Using approximation.")
-            return len(text.split())
-
-        # If we successfully got an encoding
-        if encoding:
-            try:
-                return len(encoding.encode(text))
-            except Exception as e:
-                logger.warning(f"Error encoding text with tiktoken for model {model}: {e}. Using approximation.")
-                return len(text.split())
-        else:
-            logger.error(f"Failed to obtain any tiktoken encoding for model {model}. Using approximation.")
+            logger.warning(f"Error encoding text with tiktoken for model {model}: {e}. Using approximation.")
             return len(text.split())
     
     def count_tokens_gemini(self, text: str) -> int:
@@ -109,87 +201,226 @@ class TokenCounter:
         # Roughly 4 characters per token is a common approximation
         return len(text) // 4
     
-    def calculate_input_tokens(
-        self,
-        messages: List[Dict],
-        provider: str,
-        model_name: str,
-        tools: Optional[List[Any]] = None
-    ) -> int:
+    def message_tokens(self, message: Dict, provider: str, model_name: str) -> int:
         """
-        Calculate total input tokens based on message history, provider, and tools.
+        Tokens of one message, memoized by content hash for tokenizer-based providers.
+        
+        Args:
+            message: Message dictionary
+            provider: LLM provider name
+            model_name: Model name for provider-specific token counting
+            
+        Returns:
+            Number of tokens for the message content or its tool calls
+        """
+        return self.message_token_counts([message], provider, model_name)[0]
+    
+    def message_token_counts(self, messages: List[Dict], provider: str, model_name: str) -> List[int]:
+        """
+        Tokens of each message, resolving the provider's counting method once for the list.
         
         Args:
             messages: List of message dictionaries
             provider: LLM provider name
             model_name: Model name for provider-specific token counting
-            tools: Optional list of tool definitions
             
         Returns:
-            Total number of input tokens
+            Number of tokens per message, in message order
         """
-        total_tokens = 0
         provider_lower = provider.lower()
-
-        # Calculate tokens for messages
+        use_tiktoken = provider_lower in ("openai", "perplexity")
+        encoding_name = None
+        if use_tiktoken and self.tiktoken_available:
+            # Approximated counts are keyed apart from tokenizer counts
+            encoding_name = getattr(_encoding_for_model(model_name), "name", None)
+        
+        counts = []
         for message in messages:
             content = message.get("content", "")
             if isinstance(content, str):
-                if provider_lower == "openai":
-                    total_tokens += self.count_tokens_openai(content, model_name)
-                elif provider_lower == "perplexity":
-                    total_tokens += self.count_tokens_perplexity(content, model_name)
+                if use_tiktoken:
+                    # str caches its hash, so keying a message already in the history is O(1)
+                    key = (encoding_name, len(content), hash(content))
+                    count = _message_token_cache.get(key)
+                    if count is None:
+                        count = self.count_tokens_openai(content, model_name)
+                        _message_token_cache.put(key, count)
                 elif provider_lower == "anthropic":
-                    total_tokens += self.count_tokens_anthropic(content)
+                    count = self.count_tokens_anthropic(content)
                 else:  # gemini or others
-                    total_tokens += self.count_tokens_gemini(content)
+                    count = self.count_tokens_gemini(content)
             elif message.get("role") == "tool":
                 # Simple approximation for tool results
-                total_tokens += len(str(content)) // 4
+                count = len(str(content)) // 4
             elif isinstance(message.get("tool_calls"), list):
                 # Simple approximation for tool requests
-                import json
-                total_tokens += len(json.dumps(message["tool_calls"])) // 4
+                count = self._tool_calls_tokens(message["tool_calls"])
+            else:
+                count = 0
+            counts.append(count)
+        return counts
+    
+    def _tool_calls_tokens(self, tool_calls: List[Dict]) -> int:
+        try:
+            key = ("tool_calls",) + tuple(
+                (call.get("id"), call["function"].get("name"), call["function"].get("arguments")) for call in tool_calls
+            )
+            hash(key)
+        except Exception:
+            return len(json.dumps(tool_calls)) // 4
+        count = _message_token_cache.get(key)
+        if count is None:
+            count = len(json.dumps(tool_calls)) // 4
+            _message_token_cache.put(key, count)
+        return count
+    
+    def tool_tokens(self, tools: Optional[List[Any]], provider: str, model_name: str) -> int:
+        """
+        Tokens of the tool definitions sent with a request, cached per (tool set, provider, model).
+        
+        Args:
+            tools: Tool definitions in the provider's format
+            provider: LLM provider name
+            model_name: Model name for provider-specific token counting
             
-        # Calculate tokens for tool definitions
-        if tools:
+        Returns:
+            Number of tokens for the serialized tool definitions
+        """
+        if not tools:
+            return 0
+        provider_lower = provider.lower()
+        encoding = None
+        if provider_lower in ("openai", "perplexity") and self.tiktoken_available:
+            encoding = _encoding_for_model(model_name)
+        try:
+            key = (provider_lower, model_name, getattr(encoding, "name", None), _tool_set_key(tools))
+            hash(key)
+        except Exception:
+            key = None
+        if key is not None:
+            count = _tool_token_cache.get(key)
+            if count is not None:
+                return count
+        
+        tool_tokens = 0
+        try:
             tools_str = ""
-            try:
-                import json
-                if provider_lower in ["openai", "perplexity"]:
-                    # OpenAI and Perplexity tools are already JSON-serializable dicts
-                    tools_str = json.dumps(tools)
+            if provider_lower in ["openai", "perplexity"]:
+                # OpenAI and Perplexity tools are already JSON-serializable dicts
+                tools_str = json.dumps(tools)
+            elif provider_lower == "anthropic":
+                # Anthropic tools are dicts with input_schema, should be JSON-serializable
+                tools_str = json.dumps(tools)
+            elif provider_lower == "gemini":
+                # Gemini tools are FunctionDeclaration objects, need safe serialization
+                tool_dicts = []
+                for declaration in tools:
+                    # Basic dict representation for token counting
+                    tool_dicts.append({
+                        "name": getattr(declaration, 'name', ''),
+                        "description": getattr(declaration, 'description', ''),
+                    })
+                tools_str = json.dumps(tool_dicts)
+            else:
+                logger.warning(f"Token calculation for tools not implemented for provider: {provider}")
+            
+            # Count tokens for the serialized tool string
+            if tools_str:
+                if provider_lower == "openai":
+                    tool_tokens = self.count_tokens_openai(tools_str, model_name)
+                elif provider_lower == "perplexity":
+                    tool_tokens = self.count_tokens_perplexity(tools_str, model_name)
                 elif provider_lower == "anthropic":
-                    # Anthropic tools are dicts with input_schema, should be JSON-serializable
-                    tools_str = json.dumps(tools)
-                elif provider_lower == "gemini":
-                    # Gemini tools are FunctionDeclaration objects, need safe serialization
-                    tool_dicts = []
-                    for declaration in tools:
-                        # Basic dict representation for token counting
-                        tool_dicts.append({
-                            "name": getattr(declaration, 'name', ''),
-                            "description": getattr(declaration, 'description', ''),
-                        })
-                    tools_str = json.dumps(tool_dicts)
-                else:
-                    logger.warning(f"Token calculation for tools not implemented for provider: {provider}")
-
-                # Count tokens for the serialized tool string
-                if tools_str:
-                    tool_tokens = 0
-                    if provider_lower == "openai":
-                        tool_tokens = self.count_tokens_openai(tools_str, model_name)
-                    elif provider_lower == "perplexity":
-                        tool_tokens = self.count_tokens_perplexity(tools_str, model_name)
-                    elif provider_lower == "anthropic":
-                        tool_tokens = self.count_tokens_anthropic(tools_str)
-                    else:  # Assume Gemini or other
-                        tool_tokens = self.count_tokens_gemini(tools_str)
-                    
-                    total_tokens += tool_tokens
-                    
-            except Exception as e:
-                logger.warning(f"Error estimating token count for tool definitions: {e}")
-
-        return total_tokens 
\ No newline at end of file
+                    tool_tokens = self.count_tokens_anthropic(tools_str)
+                else:  # Assume Gemini or other
+                    tool_tokens = self.count_tokens_gemini(tools_str)
+        except Exception as e:
+            logger.warning(f"Error estimating token count for tool definitions: {e}")
+            return 0
+        
+        if key is not None:
+            _tool_token_cache.put(key, tool_tokens)
+        return tool_tokens
+    
+    def ledger(
+        self,
+        messages: List[Dict],
+        provider: str,
+        model_name: str,
+        tools: Optional[List[Any]] = None
+    ) -> "TokenLedger":
+        """Creates a TokenLedger over the messages and tools."""
+        return TokenLedger(self, provider, model_name, messages, tools)
+    
+    def calculate_input_tokens(
+        self,
+        messages: List[Dict],
+        provider: str,
+        model_name: str,
+        tools: Optional[List[Any]] = None
+    ) -> int:
+        """
+        Calculate total input tokens based on message history, provider, and tools.
+        
+        Args:
+            messages: List of message dictionaries
+            provider: LLM provider name
+            model_name: Model name for provider-specific token counting
+            tools: Optional list of tool definitions
+            
+        Returns:
+            Total number of input tokens
+        """
+        total_tokens = sum(self.message_token_counts(messages, provider, model_name))
+        return total_tokens + self.tool_tokens(tools, provider, model_name)
+
+
+class TokenLedger:
+    """
+    Per-message token counts of one conversation with running prefix sums.
+    
+    Counting a message is a cache lookup once its content has been seen, and the tokens
+    of any contiguous slice of the conversation are a difference of two prefix sums, so
+    budget checks and pruning do not re-tokenize the history.
+    """
+    
+    def __init__(
+        self,
+        counter: TokenCounter,
+        provider: str,
+        model_name: str,
+        messages: Optional[List[Dict]] = None,
+        tools: Optional[List[Any]] = None
+    ):
+        self.counter = counter
+        self.provider = provider
+        self.model_name = model_name
+        self.tool_tokens = counter.tool_tokens(tools, provider, model_name)
+        self.message_tokens: List[int] = []
+        self._prefix: List[int] = [0]
+        self.extend(messages or [])
+    
+    def append(self, message: Dict) -> int:
+        """Adds a message to the end of the conversation and returns its token count."""
+        self.extend([message])
+        return self.message_tokens[-1]
+    
+    def extend(self, messages: List[Dict]):
+        running = self._prefix[-1]
+        for count in self.counter.message_token_counts(messages, self.provider, self.model_name):
+            running += count
+            self.message_tokens.append(count)
+            self._prefix.append(running)
+    
+    def tokens(self, start: int = 0, end: Optional[int] = None) -> int:
+        """Tokens of messages[start:end], without tool definitions."""
+        end = len(self.message_tokens) if end is None else end
+        return self._prefix[end] - self._prefix[start]
+    
+    @property
+    def total(self) -> int:
+        """Tokens of all messages plus the tool definitions, as calculate_input_tokens counts them."""
+        return self._prefix[-1] + self.tool_tokens
+    
+    def __len__(self) -> int:
+        return len(self.message_tokens)
@@ -3,14 +3,30 @@
 
 import streamlit as st
 import requests # Use requests for HTTP calls
+import httpx # Native async calls from workflow nodes
+import asyncio
+import copy
 import json
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 import os
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 # Remove standard logging import
 # import logging 
 from loguru import logger # Import Loguru logger
 from google.protobuf.internal.containers import MessageMap # Import the type if possible
 
+# Add parent directory to Python path so we can import config
+_parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent_dir not in sys.path:
+    sys.path.insert(0, _parent_dir)
+from config import settings as config
+
 def _convert_mapcomposite_to_dict(value):
     """
     Recursively convert MapComposite objects and other Google Proto objects to serializable dictionaries.
@@ -72,6 +88,136 @@ API_BASE_URL = "http://localhost:8001"
 # (Imports like ClientSession, stdio_client, websocket_client, McpError, ToolError removed)
 # (Helpers like get_server_params, run_async_in_thread removed)
 
+# --- Connection Pooling --- #
+# Every call used to open (and tear down) its own connection to the API server. One
+# keep-alive session is shared by the synchronous functions below, and one httpx client
+# per event loop by their async variants, so workflow nodes can await tool calls directly
+# instead of hopping to a worker thread. Both retry only when a connection cannot be
+# established, so a request that may have reached the server is never sent twice.
+
+_sync_session: requests.Session | None = None
+_sync_session_lock = threading.Lock()
+# httpx connections cannot be shared across event loops (the UI runs each async workflow on its own loop)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _timeout(client_config: dict, timeout_key: str) -> tuple[float, float]:
+    """(connect, read) timeouts in seconds for one kind of API call."""
+    return float(client_config['connect_timeout']), float(client_config[timeout_key])
+
+def get_mcp_session() -> requests.Session:
+    """Returns the process-wide keep-alive session used for synchronous API calls."""
+    global _sync_session
+    if _sync_session is None:
+        with _sync_session_lock:
+            if _sync_session is None:
+                client_config = config.get_mcp_api_client_config()
+                retries = Retry(
+                    total=None, connect=int(client_config['connect_retries']),
+                    read=0, redirect=0, status=0, other=0,
+                    backoff_factor=0.5, raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_maxsize=int(client_config['max_keepalive_connections']), max_retries=retries)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sync_session = session
+    return _sync_session
+
+def get_mcp_async_client() -> httpx.AsyncClient:
+    """Returns the pooled async client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client_config = config.get_mcp_api_client_config()
+        # A custom transport ignores the client's `limits`, so the pool is configured on the transport.
+        # httpx transport retries cover connection failures only.
+        client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=int(client_config['max_connections']),
+                    max_keepalive_connections=int(client_config['max_keepalive_connections']),
+                    keepalive_expiry=float(client_config['keepalive_expiry'])
+                ),
+                retries=int(client_config['connect_retries'])
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+def close_mcp_session() -> None:
+    """Closes the shared synchronous session; the next call opens a new one."""
+    global _sync_session
+    with _sync_session_lock:
+        session, _sync_session = _sync_session, None
+    if session is not None:
+        session.close()
+
+async def close_mcp_async_client() -> None:
+    """Closes the running event loop's async client. Call before closing a loop that made async API calls."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+# --- Tool Definition Cache --- #
+# The server formats its tool catalog once, serves each phase's list with an ETag and stamps
+# every response with the catalog version. A cached list is reused without any request while
+# that version is unchanged, and revalidated with If-None-Match once it is older than the TTL.
+TOOL_CATALOG_VERSION_HEADER = "X-Tool-Catalog-Version"
+
+@dataclass
+class _CachedTools:
+    tools: list[dict]
+    etag: str
+    version: str | None
+    validated_at: float
+
+_tools_cache: dict[str, _CachedTools] = {} # Keyed by request URL (one per phase)
+_latest_catalog_version: str | None = None # Last version seen on any API response
+
+def _note_catalog_version(response) -> None:
+    global _latest_catalog_version
+    version = response.headers.get(TOOL_CATALOG_VERSION_HEADER)
+    if version:
+        _latest_catalog_version = version
+
+def _current_cached_tools(url: str) -> list[dict] | None:
+    """A copy of the cached tools for `url` if no newer catalog has been seen and the TTL holds."""
+    cached = _tools_cache.get(url)
+    if cached is None or cached.version != _latest_catalog_version:
+        return None
+    ttl = float(config.get_mcp_api_client_config()['tools_cache_ttl_seconds'])
+    if time.monotonic() - cached.validated_at >= ttl:
+        return None
+    return copy.deepcopy(cached.tools)
+
+def get_cached_tools_etag(phase: str | None = None) -> str | None:
+    """ETag of the cached tool list for `phase`; it changes whenever that list does."""
+    cached = _tools_cache.get(_tools_url(phase))
+    return cached.etag if cached else None
+
+def clear_tools_cache() -> None:
+    """Forgets every cached tool list, e.g. after pointing the UI at another API server."""
+    _tools_cache.clear()
+
+def _error_detail(response) -> str:
+    """The API's `detail` message from an error response (requests or httpx), or its raw text."""
+    try:
+        body = response.json()
+    except json.JSONDecodeError:
+        return response.text
+    return body.get("detail", response.text) if isinstance(body, dict) else response.text
+
+def _context_headers(selected_nifi_server_id: str | None, user_request_id: str | None, action_id: str | None) -> dict:
+    headers = {
+        "X-Request-ID": user_request_id or "-",
+        "X-Action-ID": action_id or "-",
+        "Content-Type": "application/json"
+    }
+    # Add the NiFi Server ID header if provided
+    if selected_nifi_server_id:
+        headers["X-Nifi-Server-Id"] = selected_nifi_server_id
+    return headers
+
 # --- New Function: Get NiFi Server List --- #
 def get_nifi_servers() -> List[Dict[str, str]]:
     """Fetches the list of configured NiFi servers (ID and Name) from the API."""
@@ -79,7 +225,7 @@ def get_nifi_servers() -> List[Dict[str, str]]:
     bound_logger = logger # Use base logger for this config call for now
     bound_logger.info(f"Fetching configured NiFi servers from: {url}")
     try:
-        response = requests.get(url, timeout=15)
+        response = get_mcp_session().get(url, timeout=_timeout(config.get_mcp_api_client_config(), 'config_timeout'))
         response.raise_for_status()
         servers = response.json()
         if isinstance(servers, list):
@@ -94,11 +240,7 @@ def get_nifi_servers() -> List[Dict[str, str]]:
             bound_logger.error(f"API Error: Unexpected format received for server list (expected list, got {type(servers)}). URL: {url}")
             return []
     except requests.exceptions.HTTPError as e:
-        error_detail = "Unknown API error"
-        try:
-            error_detail = e.response.json().get("detail", e.response.text)
-        except json.JSONDecodeError:
-            error_detail = e.response.text
+        error_detail = _error_detail(e.response)
         bound_logger.error(f"API Error fetching NiFi servers: {e.response.status_code} - {error_detail}. URL: {url}")
         return []
     except requests.exceptions.ConnectionError as e:
@@ -111,18 +253,16 @@ def get_nifi_servers() -> List[Dict[str, str]]:
         bound_logger.exception(f"Unexpected error fetching NiFi servers. URL: {url}") # Includes traceback
         return []
 
-# --- Tool Execution (Synchronous HTTP) --- #
-def execute_mcp_tool(
-    tool_name: str, 
+# --- Tool Execution --- #
+def _prepare_tool_request(
+    tool_name: str,
     params: dict,
-    selected_nifi_server_id: str | None, # Added parameter
-    user_request_id: str | None = None, # Added context ID
-    action_id: str | None = None # Added context ID
-) -> dict | str:
-    """Executes a tool call via the REST API."""
-    # Bind context IDs for logging within this function call
-    bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, nifi_server_id=selected_nifi_server_id)
-    
+    selected_nifi_server_id: str | None,
+    user_request_id: str | None,
+    action_id: str | None,
+    bound_logger
+) -> tuple[str, dict, dict]:
+    """Builds the URL, payload and headers of a tool call and logs the outgoing request."""
     url = f"{API_BASE_URL}/tools/{tool_name}"
 
     # Log context IDs explicitly for debugging
@@ -145,25 +285,16 @@ def execute_mcp_tool(
     }
 
     # Create headers with context IDs
-    headers = {
-        "X-Request-ID": user_request_id or "-",
-        "X-Action-ID": action_id or "-",
-        "Content-Type": "application/json"
-    }
-    # Add the NiFi Server ID header if provided
-    if selected_nifi_server_id:
-        headers["X-Nifi-Server-Id"] = selected_nifi_server_id
-    else:
+    headers = _context_headers(selected_nifi_server_id, user_request_id, action_id)
+    if not selected_nifi_server_id:
         # Log a warning or error if the ID is missing, as it's now required by the backend
         bound_logger.error("Missing NiFi Server ID for tool execution request. This is required.")
-        # Optionally raise an error or return an error message immediately
         # For now, let the API call proceed and likely fail on the backend
-        # return {"status": "error", "message": "Missing required NiFi Server ID selection in the UI."} 
-    
+
     bound_logger.info(f"Executing tool '{tool_name}' via API: {url}")
     bound_logger.debug(f"Payload for tool '{tool_name}': {payload}")
     bound_logger.debug(f"Headers for tool '{tool_name}': {headers}")
-    
+
     # --- Log MCP Request ---
     bound_logger.bind(
         interface="mcp", 
@@ -171,45 +302,24 @@ def execute_mcp_tool(
         data={"url": url, "payload": payload, "headers": headers}
     ).debug("Sending request to MCP API")
     # -----------------------
-    
-    try:
-        response = requests.post(url, json=payload, headers=headers, timeout=60) # Add timeout
-        response.raise_for_status() # Raise exception for bad status codes (4xx or 5xx)
-        
-        result_data = response.json()
-        bound_logger.info(f"Received successful response from API for tool '{tool_name}'.")
-        bound_logger.debug(f"API Response data: {result_data}")
-        
-        # --- Log MCP Response (Success) ---
-        bound_logger.bind(
-            interface="mcp", 
-            direction="response", 
-            data={"status_code": response.status_code, "body": result_data}
-        ).debug("Received successful response from MCP API")
-        # --------------------------------
-        
-        return result_data
+    return url, payload, headers
+
+def _tool_result(tool_name: str, response, bound_logger) -> dict | str:
+    """Turns a tool call's HTTP response (requests or httpx) into the value returned to callers."""
+    _note_catalog_version(response)
+    if response.status_code >= 400:
+        error_detail = _error_detail(response)
 
-    except requests.exceptions.HTTPError as e:
-        error_detail = "Unknown API error"
-        error_body = None
-        try:
-            error_body = e.response.json()
-            error_detail = error_body.get("detail", e.response.text)
-        except json.JSONDecodeError:
-            error_detail = e.response.text 
-            error_body = {"raw_text": error_detail} # Store raw text if not JSON
-            
         # Check if this is a validation error (LLM input mistake) vs system error
         is_validation_error = (
-            e.response.status_code == 400 and 
+            response.status_code == 400 and 
             ("validation error" in error_detail.lower() or 
              "field required" in error_detail.lower() or
              "invalid" in error_detail.lower() or
              "expected" in error_detail.lower() or
              "parameter" in error_detail.lower())
         )
-        
+
         if is_validation_error:
             # Log the validation error for debugging but don't show in UI
             bound_logger.info(f"LLM parameter validation error (not shown in UI): {error_detail}")
@@ -221,132 +331,236 @@ def execute_mcp_tool(
                 "details": error_detail,  # LLM can still see the details
                 "ui_message": "Adjusting parameters..."  # Friendly message for UI
             }
-        else:
-            # This is a real system error that should be shown
-            bound_logger.error(f"API Error executing tool '{tool_name}': {e.response.status_code} - {error_detail}")
-            raise Exception(f"API Error executing tool '{tool_name}': {e.response.status_code} - {error_detail}")
-        
-    except requests.exceptions.ConnectionError as e:
-        error_message = f"Connection Error: Could not connect to the MCP API server at {API_BASE_URL}. Is it running?"
-        # Replace logging with logger
-        bound_logger.error(f"{error_message} ({e})")
-        # logging.error(f"{error_message} ({e})") # Use logging
-        st.error(error_message) # Keep UI error
-        return error_message
-        
-    except requests.exceptions.Timeout:
-        error_message = f"Timeout connecting to MCP API server for tool '{tool_name}'."
-        # Replace logging with logger
-        bound_logger.error(error_message)
-        # logging.error(error_message) # Use logging
-        st.error(error_message) # Keep UI error
-        return error_message
-        
+        # This is a real system error that should be shown
+        bound_logger.error(f"API Error executing tool '{tool_name}': {response.status_code} - {error_detail}")
+        raise Exception(f"API Error executing tool '{tool_name}': {response.status_code} - {error_detail}")
+
+    try:
+        result_data = response.json()
     except Exception as e:
-        # Catch other unexpected errors (e.g., JSON decoding of success response)
+        # e.g. JSON decoding of a success response
         error_message = f"Unexpected error during tool execution API call for '{tool_name}'"
-        # Replace logging.exception with logger.exception
         bound_logger.exception(error_message) # Includes traceback
-        # logging.exception(error_message) # Use logging.exception to include traceback
         st.error(f"{error_message}: {e}") # Also show brief error in UI
         return f"{error_message}: {e}" # Return error string
 
-# --- Tool Definitions (Synchronous HTTP) --- #
-# @st.cache_data # Consider caching this
-def get_available_tools(
+    bound_logger.info(f"Received successful response from API for tool '{tool_name}'.")
+    bound_logger.debug(f"API Response data: {result_data}")
+
+    # --- Log MCP Response (Success) ---
+    bound_logger.bind(
+        interface="mcp", 
+        direction="response", 
+        data={"status_code": response.status_code, "body": result_data}
+    ).debug("Received successful response from MCP API")
+    # --------------------------------
+    return result_data
+
+def _tool_connection_error(bound_logger, e: Exception) -> str:
+    error_message = f"Connection Error: Could not connect to the MCP API server at {API_BASE_URL}. Is it running?"
+    bound_logger.error(f"{error_message} ({e})")
+    st.error(error_message) # Keep UI error
+    return error_message
+
+def _tool_timeout_error(tool_name: str, bound_logger) -> str:
+    error_message = f"Timeout connecting to MCP API server for tool '{tool_name}'."
+    bound_logger.error(error_message)
+    st.error(error_message) # Keep UI error
+    return error_message
+
+def _tool_unexpected_error(tool_name: str, bound_logger, e: Exception) -> str:
+    error_message = f"Unexpected error during tool execution API call for '{tool_name}'"
+    bound_logger.exception(error_message) # Includes traceback
+    st.error(f"{error_message}: {e}") # Also show brief error in UI
+    return f"{error_message}: {e}" # Return error string
+
+def execute_mcp_tool(
+    tool_name: str, 
+    params: dict,
     selected_nifi_server_id: str | None, # Added parameter
+    user_request_id: str | None = None, # Added context ID
+    action_id: str | None = None # Added context ID
+) -> dict | str:
+    """Executes a tool call via the REST API over the shared keep-alive session."""
+    # Bind context IDs for logging within this function call
+    bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, nifi_server_id=selected_nifi_server_id)
+    url, payload, headers = _prepare_tool_request(tool_name, params, selected_nifi_server_id, user_request_id, action_id, bound_logger)
+
+    try:
+        response = get_mcp_session().post(
+            url, json=payload, headers=headers,
+            timeout=_timeout(config.get_mcp_api_client_config(), 'tool_timeout')
+        )
+    except requests.exceptions.ConnectionError as e:
+        return _tool_connection_error(bound_logger, e)
+    except requests.exceptions.Timeout:
+        return _tool_timeout_error(tool_name, bound_logger)
+    except Exception as e:
+        return _tool_unexpected_error(tool_name, bound_logger, e)
+    return _tool_result(tool_name, response, bound_logger)
+
+async def execute_mcp_tool_async(
+    tool_name: str, 
+    params: dict,
+    selected_nifi_server_id: str | None,
     user_request_id: str | None = None,
-    action_id: str | None = None,
-    phase: str | None = None # Add phase parameter
-) -> list[dict]:
-    """Fetches tool definitions from the REST API, optionally filtered by phase."""
+    action_id: str | None = None
+) -> dict | str:
+    """Async variant of `execute_mcp_tool`, over the running event loop's pooled client."""
+    bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, nifi_server_id=selected_nifi_server_id)
+    url, payload, headers = _prepare_tool_request(tool_name, params, selected_nifi_server_id, user_request_id, action_id, bound_logger)
+    connect_timeout, read_timeout = _timeout(config.get_mcp_api_client_config(), 'tool_timeout')
+
+    try:
+        response = await get_mcp_async_client().post(
+            url, json=payload, headers=headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+    except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+        return _tool_connection_error(bound_logger, e)
+    except httpx.TimeoutException:
+        return _tool_timeout_error(tool_name, bound_logger)
+    except Exception as e:
+        return _tool_unexpected_error(tool_name, bound_logger, e)
+    return _tool_result(tool_name, response, bound_logger)
+
+# --- Tool Definitions --- #
+def _tools_url(phase: str | None) -> str:
     # Construct URL with optional phase parameter
     if phase and phase.lower() != "all":
-        url = f"{API_BASE_URL}/tools?phase={phase}" # Pass phase if specified
-    else:
-        url = f"{API_BASE_URL}/tools"
-    
-    # Bind context IDs for logging within this function call
-    bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, nifi_server_id=selected_nifi_server_id)
-    
-    # Use logger instead of print
+        return f"{API_BASE_URL}/tools?phase={phase}" # Pass phase if specified
+    return f"{API_BASE_URL}/tools"
+
+def _prepare_tools_request(
+    url: str,
+    selected_nifi_server_id: str | None,
+    user_request_id: str | None,
+    action_id: str | None,
+    bound_logger
+) -> dict:
+    """Logs a tool-definitions request and returns its headers."""
     bound_logger.info(f"Fetching available tools from API: {url}")
-    
-    # --- ADD LOGGING HERE ---
     bound_logger.debug(f"Constructed request URL for tools: {url}")
-    # ------------------------
-    
-    try:
-        # Create headers with context IDs
-        headers = {
-            "X-Request-ID": user_request_id or "-",
-            "X-Action-ID": action_id or "-",
-            "Content-Type": "application/json"
-        }
-        # Add the NiFi Server ID header if provided
-        if selected_nifi_server_id:
-            headers["X-Nifi-Server-Id"] = selected_nifi_server_id
-        else:
-            # Log a warning if the ID is missing, as /tools endpoint might work without it but /tools/{tool_name} won't
-            bound_logger.warning("NiFi Server ID not provided for get_available_tools request. Backend might default or error.")
-        
-        # Log headers for debugging
-        bound_logger.debug(f"Headers for tools request: {headers}")
-        
-        response = requests.get(url, headers=headers, timeout=30) # Add timeout and headers
-        response.raise_for_status() # Raise exception for bad status codes
-        
-        tools = response.json() # Expecting a list of tool dicts
-        if isinstance(tools, list):
-            # Use logger instead of print
-            bound_logger.info(f"Successfully retrieved {len(tools)} tool definitions from API.")
-            return tools
-        else:
-            error_message = f"API Error: Unexpected format received for tools list (expected list, got {type(tools)})."
-            # Use logger instead of print
-            bound_logger.error(error_message)
-            st.error(error_message) # Keep UI error
-            return []
-            
-    except requests.exceptions.HTTPError as e:
-        error_detail = "Unknown API error"
-        try:
-            error_detail = e.response.json().get("detail", e.response.text)
-        except json.JSONDecodeError:
-            error_detail = e.response.text
-            
-        error_message = f"API Error fetching tools: {e.response.status_code} - {error_detail}"
-        # Replace logging with logger
+
+    # Create headers with context IDs
+    headers = _context_headers(selected_nifi_server_id, user_request_id, action_id)
+    if not selected_nifi_server_id:
+        # Log a warning if the ID is missing, as /tools endpoint might work without it but /tools/{tool_name} won't
+        bound_logger.warning("NiFi Server ID not provided for get_available_tools request. Backend might default or error.")
+
+    cached = _tools_cache.get(url)
+    if cached:
+        # Revalidate rather than refetch: an unchanged catalog answers 304 with no body
+        headers["If-None-Match"] = cached.etag
+
+    # Log headers for debugging
+    bound_logger.debug(f"Headers for tools request: {headers}")
+    return headers
+
+def _tools_result(url: str, response, bound_logger) -> list[dict]:
+    """Turns a tool-definitions HTTP response (requests or httpx) into the list of tools, caching it."""
+    _note_catalog_version(response)
+    cached = _tools_cache.get(url)
+    if response.status_code == 304 and cached:
+        cached.validated_at = time.monotonic()
+        cached.version = response.headers.get(TOOL_CATALOG_VERSION_HEADER, cached.version)
+        bound_logger.debug(f"Tool definitions unchanged (ETag {cached.etag}); using cached list.")
+        return copy.deepcopy(cached.tools)
+
+    if response.status_code >= 400:
+        error_message = f"API Error fetching tools: {response.status_code} - {_error_detail(response)}"
         bound_logger.error(error_message)
-        # logging.error(error_message) # Use logging
         st.error(error_message) # Keep UI error
         return []
-        
+
+    tools = response.json() # Expecting a list of tool dicts
+    if isinstance(tools, list):
+        bound_logger.info(f"Successfully retrieved {len(tools)} tool definitions from API.")
+        etag = response.headers.get("ETag")
+        if etag:
+            _tools_cache[url] = _CachedTools(
+                tools=copy.deepcopy(tools),
+                etag=etag,
+                version=response.headers.get(TOOL_CATALOG_VERSION_HEADER),
+                validated_at=time.monotonic()
+            )
+        return tools
+    error_message = f"API Error: Unexpected format received for tools list (expected list, got {type(tools)})."
+    bound_logger.error(error_message)
+    st.error(error_message) # Keep UI error
+    return []
+
+def _tools_connection_error(bound_logger, e: Exception) -> list:
+    error_message = f"Connection Error: Could not connect to the MCP API server at {API_BASE_URL} to get tools. Is it running?"
+    bound_logger.error(f"{error_message} ({e})")
+    st.error(error_message) # Keep UI error
+    return []
+
+def _tools_timeout_error(bound_logger) -> list:
+    error_message = f"Timeout connecting to MCP API server to get tools."
+    bound_logger.error(error_message)
+    st.error(error_message) # Keep UI error
+    return []
+
+def _tools_unexpected_error(bound_logger, e: Exception) -> list:
+    error_message = f"Unexpected error during get_tools API call: {e}"
+    bound_logger.exception(error_message)
+    st.error(error_message) # Keep UI error
+    return []
+
+def get_available_tools(
+    selected_nifi_server_id: str | None, # Added parameter
+    user_request_id: str | None = None,
+    action_id: str | None = None,
+    phase: str | None = None # Add phase parameter
+) -> list[dict]:
+    """Fetches tool definitions from the REST API, optionally filtered by phase. Cached until the server's tool catalog changes."""
+    url = _tools_url(phase)
+    # Bind context IDs for logging within this function call
+    bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, nifi_server_id=selected_nifi_server_id)
+    cached_tools = _current_cached_tools(url)
+    if cached_tools is not None:
+        bound_logger.debug(f"Using {len(cached_tools)} cached tool definitions for {url}")
+        return cached_tools
+
+    try:
+        headers = _prepare_tools_request(url, selected_nifi_server_id, user_request_id, action_id, bound_logger)
+        response = get_mcp_session().get(url, headers=headers, timeout=_timeout(config.get_mcp_api_client_config(), 'tools_timeout'))
+        return _tools_result(url, response, bound_logger)
     except requests.exceptions.ConnectionError as e:
-        error_message = f"Connection Error: Could not connect to the MCP API server at {API_BASE_URL} to get tools. Is it running?"
-        # Replace logging with logger
-        bound_logger.error(f"{error_message} ({e})")
-        # logging.error(f"{error_message} ({e})") # Use logging
-        st.error(error_message) # Keep UI error
-        return []
-        
+        return _tools_connection_error(bound_logger, e)
     except requests.exceptions.Timeout:
-        error_message = f"Timeout connecting to MCP API server to get tools."
-        # Replace logging with logger
-        bound_logger.error(error_message)
-        # logging.error(error_message) # Use logging
-        st.error(error_message) # Keep UI error
-        return []
-        
+        return _tools_timeout_error(bound_logger)
     except Exception as e:
-        error_message = f"Unexpected error during get_tools API call: {e}"
-        # Replace logging.exception with logger.exception
-        bound_logger.exception(error_message)
-        # logging.exception(error_message) # Use logging.exception
-        st.error(error_message) # Keep UI error
-        return []
+        return _tools_unexpected_error(bound_logger, e)
+
+async def get_available_tools_async(
+    selected_nifi_server_id: str | None,
+    user_request_id: str | None = None,
+    action_id: str | None = None,
+    phase: str | None = None
+) -> list[dict]:
+    """Async variant of `get_available_tools`, over the running event loop's pooled client."""
+    url = _tools_url(phase)
+    bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, nifi_server_id=selected_nifi_server_id)
+    cached_tools = _current_cached_tools(url)
+    if cached_tools is not None:
+        bound_logger.debug(f"Using {len(cached_tools)} cached tool definitions for {url}")
+        return cached_tools
+    connect_timeout, read_timeout = _timeout(config.get_mcp_api_client_config(), 'tools_timeout')
+
+    try:
+        headers = _prepare_tools_request(url, selected_nifi_server_id, user_request_id, action_id, bound_logger)
+        response = await get_mcp_async_client().get(url, headers=headers, timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+        return _tools_result(url, response, bound_logger)
+    except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+        return _tools_connection_error(bound_logger, e)
+    except httpx.TimeoutException:
+        return _tools_timeout_error(bound_logger)
+    except Exception as e:
+        return _tools_unexpected_error(bound_logger, e)
 
-# Ensure streamlit UI code calls these synchronous functions directly.
+# Ensure streamlit UI code calls these synchronous functions directly; async workflow nodes use the *_async variants.
 
 # Remove old/unused functions and state
 # def stop_mcp_server(): ... (no longer needed, session handles process)
@@ -0,0 +1,214 @@
+"""
+Prunes a conversation to a token budget before it is sent to the LLM.
+
+The conversation is indexed once into turn groups: a user message together with the
+assistant replies and tool results that follow it. An assistant message's tool calls and
+their tool results always end up in the same group, so dropping whole groups keeps the
+history valid for the provider APIs. Groups are dropped oldest first, using per-group
+token weights from a TokenLedger, until the total fits the limit. The most recent turns
+are always kept: two, or only the last one while the history is more than twice the limit.
+
+Indexing, selection and rebuilding are each a single pass over the messages, so pruning
+is linear in the history length. Used by the Streamlit execution loop and by the async
+workflow nodes.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger as default_logger
+
+TURNS_TO_PRESERVE = 2
+TURNS_TO_PRESERVE_WHEN_SEVERE = 1  # while the history is more than twice the limit
+
+
+@dataclass
+class TurnGroup:
+    """Messages [start, end) that can only be dropped together, and their token weight."""
+    start: int
+    end: int
+    tokens: int = 0
+
+
+def index_turn_groups(messages: List[Dict[str, Any]], start: int = 0) -> List[TurnGroup]:
+    """
+    Groups messages[start:] into turns, oldest first.
+
+    Messages before the first user message, and messages after an unexpected role until
+    the next user message, belong to no group and are never dropped. A tool result whose
+    call was made in an earlier group merges the groups in between, so a call and its
+    result are never separated.
+    """
+    groups: List[TurnGroup] = []
+    call_groups: Dict[str, int] = {}  # tool_call_id -> index of the group that made the call
+    open_group = False
+
+    for index in range(start, len(messages)):
+        message = messages[index]
+        role = message.get("role")
+        if role == "user":
+            groups.append(TurnGroup(index, index + 1))
+            open_group = True
+        elif role in ("assistant", "tool") and open_group:
+            groups[-1].end = index + 1
+            if role == "assistant":
+                for tool_call in message.get("tool_calls") or []:
+                    call_id = tool_call.get("id")
+                    if call_id:
+                        call_groups[call_id] = len(groups) - 1
+            else:
+                owner = call_groups.get(message.get("tool_call_id"), len(groups) - 1)
+                if owner < len(groups) - 1:
+                    groups[owner].end = index + 1
+                    del groups[owner + 1:]
+        else:
+            # Orphaned assistant/tool messages or other roles are kept as they are
+            open_group = False
+    return groups
+
+
+def select_groups_to_drop(groups: List[TurnGroup], total_tokens: int, max_tokens: int) -> Tuple[int, int]:
+    """
+    How many of the oldest groups to drop, and the token total that leaves.
+
+    Stops as soon as the total fits, or when only the turns that must be preserved remain.
+    """
+    remaining = total_tokens
+    dropped = 0
+    for position, group in enumerate(groups):
+        if remaining <= max_tokens:
+            break
+        preserve = TURNS_TO_PRESERVE_WHEN_SEVERE if remaining > max_tokens * 2 else TURNS_TO_PRESERVE
+        if position >= len(groups) - preserve:
+            break
+        remaining -= group.tokens
+        dropped += 1
+    return dropped, remaining
+
+
+def prune_messages(
+    messages: List[Dict[str, Any]],
+    max_tokens: int,
+    provider: str,
+    model_name: str,
+    tools: Optional[List[Any]],
+    token_counter: "TokenCounter",
+    logger=None
+) -> List[Dict[str, Any]]:
+    """
+    Returns the messages with the oldest complete turns removed so that they, together
+    with the tool definitions, fit within `max_tokens`. A leading system message is always
+    kept. The original list is returned when nothing can or needs to be removed, or when
+    the result would not be a valid conversation.
+    """
+    log = logger or default_logger
+    if len(messages) <= 2:  # System + 1 user message minimum
+        return messages
+
+    try:
+        ledger = token_counter.ledger(messages, provider, model_name, tools)
+    except Exception as e:
+        log.error(f"Error calculating tokens during smart pruning: {e}")
+        return messages
+    if ledger.total <= max_tokens:
+        return messages
+
+    head = 1 if messages[0].get("role") == "system" else 0
+    groups = index_turn_groups(messages, head)
+    for group in groups:
+        group.tokens = ledger.tokens(group.start, group.end)
+    dropped, remaining = select_groups_to_drop(groups, ledger.total, max_tokens)
+    if not dropped:
+        log.info(f"Smart pruning found no removable turns: {ledger.total} tokens, limit {max_tokens}")
+        return messages
+
+    pruned: List[Dict[str, Any]] = []
+    position = 0
+    for group in groups[:dropped]:
+        pruned.extend(messages[position:group.start])
+        position = group.end
+    pruned.extend(messages[position:])
+
+    if not validate_message_structure(pruned, log):
+        log.error("Message structure validation failed after pruning, returning original messages")
+        return messages
+
+    log.info(f"Smart pruning complete: {len(messages)} → {len(pruned)} messages, "
+             f"{ledger.total} → {remaining} tokens ({dropped} turns removed)")
+    return pruned
+
+
+def validate_message_structure(messages: List[Dict], logger) -> bool:
+    """
+    Validate that the message structure is valid for OpenAI API.
+
+    Rules:
+    1. Every 'tool' message must be preceded by an 'assistant' message with 'tool_calls'
+    2. No orphaned tool messages
+    3. System message should be first (if present)
+    4. Assistant messages with tool_calls must have all corresponding tool responses
+
+    Args:
+        messages: List of messages to validate
+        logger: Logger instance
+
+    Returns:
+        True if structure is valid, False otherwise
+    """
+    if not messages:
+        return True
+
+    # Track tool calls that need responses
+    pending_tool_calls = set()
+
+    for i, message in enumerate(messages):
+        role = message.get("role")
+
+        if role == "system":
+            # System message should be first
+            if i != 0:
+                logger.warning(f"System message found at position {i}, should be at position 0")
+                return False
+
+        elif role == "assistant":
+            # Check if there are unresolved tool calls from previous assistant message
+            if pending_tool_calls:
+                logger.warning(f"Previous assistant message has unresolved tool calls: {pending_tool_calls}")
+                return False
+
+            # Clear pending tool calls and check for new ones
+            pending_tool_calls.clear()
+
+            # Check for new tool calls
+            tool_calls = message.get("tool_calls", [])
+            for tool_call in tool_calls:
+                tool_call_id = tool_call.get("id")
+                if tool_call_id:
+                    pending_tool_calls.add(tool_call_id)
+
+        elif role == "tool":
+            # Tool message must have a corresponding tool_call_id
+            tool_call_id = message.get("tool_call_id")
+            if not tool_call_id:
+                logger.warning(f"Tool message at position {i} missing tool_call_id")
+                return False
+
+            if tool_call_id not in pending_tool_calls:
+                logger.warning(f"Tool message at position {i} has orphaned tool_call_id: {tool_call_id}")
+                return False
+
+            # Remove this tool call from pending
+            pending_tool_calls.remove(tool_call_id)
+
+        elif role == "user":
+            # User messages should not appear while tool calls are pending
+            if pending_tool_calls:
+                logger.warning(f"User message while tool calls pending: {pending_tool_calls}")
+                return False
+
+    # Check if there are any unresolved tool calls at the end
+    if pending_tool_calls:
+        logger.warning(f"Unresolved tool calls at end: {pending_tool_calls}")
+        return False
+
+    return True
@@ -0,0 +1,118 @@
+"""
+Runs the tool calls the LLM requested in one turn, overlapping the ones that only read.
+
+Tools tagged with the "Review" phase on the server (`tool_phases` in
+nifi_mcp_server/api_tools) only read the flow. Consecutive read-only calls run
+concurrently, at most `mcp_api_client.tool_call_concurrency` at a time. Any other tool may
+change the flow, so it runs alone: after every earlier call has finished and before any
+later call starts, which keeps reads requested after a change consistent with it. Tools
+whose phases are unknown are treated as mutating.
+
+Results are returned in the order the calls were requested, so tool messages keep the
+model's `tool_call_id` order.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+READ_ONLY_PHASE = "review"
+
+
+def tool_call_name(tool_call: Dict[str, Any]) -> Optional[str]:
+    """The function name of an OpenAI-style tool call, if present."""
+    function = tool_call.get("function")
+    return function.get("name") if isinstance(function, dict) else None
+
+
+def read_only_tool_names(tool_definitions: Optional[Iterable[Dict[str, Any]]]) -> Set[str]:
+    """Names of the tools in a `/tools` response that are tagged with the Review phase."""
+    names = set()
+    for definition in tool_definitions or []:
+        name = definition.get("function", {}).get("name")
+        phases = definition.get("phases") or []
+        if name and any(str(phase).lower() == READ_ONLY_PHASE for phase in phases):
+            names.add(name)
+    return names
+
+
+def plan_batches(tool_calls: List[Dict[str, Any]], read_only: Set[str]) -> List[List[int]]:
+    """
+    Splits the calls into batches of indices that may run together: maximal runs of
+    consecutive read-only calls, and every other call on its own.
+    """
+    batches: List[List[int]] = []
+    previous_read_only = False
+    for index, tool_call in enumerate(tool_calls):
+        is_read_only = tool_call_name(tool_call) in read_only
+        if is_read_only and previous_read_only:
+            batches[-1].append(index)
+        else:
+            batches.append([index])
+        previous_read_only = is_read_only
+    return batches
+
+
+def get_tool_call_concurrency() -> int:
+    """How many read-only tool calls may run at once (`mcp_api_client.tool_call_concurrency`)."""
+    from config import settings as config
+    return max(1, int(config.get_mcp_api_client_config().get('tool_call_concurrency', 1)))
+
+
+async def run_tool_calls_async(
+    tool_calls: List[Dict[str, Any]],
+    execute: Callable[[int, Dict[str, Any]], Awaitable[Any]],
+    read_only: Set[str],
+    max_concurrency: Optional[int] = None
+) -> List[Any]:
+    """
+    Awaits `execute(index, tool_call)` for every call and returns the results in call order.
+
+    `execute` is expected to turn tool failures into results; an exception it raises is
+    propagated once the calls of its batch have finished.
+    """
+    limit = max_concurrency or get_tool_call_concurrency()
+    semaphore = asyncio.Semaphore(limit)
+    results: List[Any] = [None] * len(tool_calls)
+
+    async def run_one(index: int):
+        async with semaphore:
+            results[index] = await execute(index, tool_calls[index])
+
+    for batch in plan_batches(tool_calls, read_only):
+        outcomes = await asyncio.gather(*(run_one(index) for index in batch), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+    return results
+
+
+def run_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    execute: Callable[[int, Dict[str, Any]], Any],
+    read_only: Set[str],
+    max_concurrency: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    thread_initializer: Optional[Callable[[], None]] = None
+) -> List[Any]:
+    """
+    Thread-pool variant of `run_tool_calls_async` for blocking callers such as the
+    Streamlit execution loop.
+
+    `should_stop` is checked before each batch; calls that were not started because of it
+    have a result of None. Read-only batches run `execute` on worker threads, each set up
+    with `thread_initializer` (e.g. to attach the Streamlit script context).
+    """
+    limit = max_concurrency or get_tool_call_concurrency()
+    results: List[Any] = [None] * len(tool_calls)
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="tool-call", initializer=thread_initializer) as pool:
+        for batch in plan_batches(tool_calls, read_only):
+            if should_stop and should_stop():
+                break
+            if len(batch) == 1:
+                results[batch[0]] = execute(batch[0], tool_calls[batch[0]])
+                continue
+            futures = {index: pool.submit(execute, index, tool_calls[index]) for index in batch}
+            for index, future in futures.items():
+                results[index] = future.result()
+    return results
@@ -1,5 +1,5 @@
 import asyncio
-from typing import List, Dict, Optional, Any, Union, Literal, Tuple
+from typing import Awaitable, List, Dict, Optional, Any, Union, Literal, Tuple
 
 # Import necessary components from parent/utils
 from loguru import logger
@@ -21,7 +21,10 @@ from .utils import (
     smart_parameter_validation
 )
 from nifi_mcp_server.nifi_client import NiFiClient, NiFiAuthenticationError
+from nifi_mcp_server.type_catalog import type_catalog_registry
+from nifi_mcp_server.flow_snapshot import bounded_gather
 from mcp.server.fastmcp.exceptions import ToolError
+from config import settings as mcp_settings
 
 # Import modules that were previously imported dynamically
 from .review import list_nifi_objects, get_process_group_status
@@ -1377,6 +1380,183 @@ async def create_nifi_flow(
         results.append({"status": "error", "message": f"An unexpected error occurred during flow creation: {e}"})
         return results
 
+# --- Private helpers for create_complete_nifi_flow's dependency waves ---
+def _strip_property_name_quotes(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strips stray quotes that LLMs sometimes wrap around property names."""
+    if not properties or not isinstance(properties, dict):
+        return properties
+    return {k.strip('"\'') if isinstance(k, str) else k: v for k, v in properties.items()}
+
+
+async def _gather_flow_wave(aws: List[Awaitable], max_concurrency: int) -> List[Any]:
+    """
+    Runs one dependency wave, at most `max_concurrency` awaitables at a time.
+
+    Results come back in input order. Exceptions are returned rather than raised so the
+    caller can record every object the wave did create (for rollback) before failing.
+    """
+    return await bounded_gather(aws, return_exceptions=True, max_concurrency=max_concurrency)
+
+
+async def _create_flow_controller_service(job: Dict[str, Any], target_pg_id: str, logger) -> Dict[str, Any]:
+    logger.info(f"Creating controller service: {job['name']} ({job['service_type']})")
+    cs_result = await create_controller_services([{
+        "service_type": job["service_type"],
+        "name": job["name"],
+        "properties": job["properties"]
+    }], target_pg_id)
+    # Extract the single result from the list
+    cs_result = cs_result[0] if cs_result else {"status": "error", "message": "No result returned"}
+
+    cs_result["object_type"] = "controller_service"
+    cs_result["name"] = job["name"]
+    return cs_result
+
+
+async def _create_flow_processor(
+    job: Dict[str, Any],
+    service_map: Dict[str, str],
+    target_pg_id: str,
+    nifi_client: NiFiClient,
+    logger,
+    user_request_id: str,
+    action_id: str
+) -> Dict[str, Any]:
+    """
+    Validates and creates one processor of a complete flow.
+
+    Returns the creation result, or an error result carrying `validation_errors` when the
+    properties cannot be fixed up; the caller decides whether that aborts the flow.
+    """
+    name = job["name"]
+    processor_type = job["processor_type"]
+    position = job["position"]
+    properties = job["properties"]
+
+    # ✅ FIX 4: Enhanced Property Schema Validation BEFORE creation
+    validated_properties, schema_warnings, schema_errors = await _validate_processor_properties_upfront(
+        processor_type=processor_type,
+        properties=properties,
+        nifi_client=nifi_client,
+        user_request_id=user_request_id,
+        action_id=action_id
+    )
+
+    # Fail fast on schema errors
+    if schema_errors:
+        return {
+            "status": "error",
+            "message": f"Property schema validation failed for processor '{name}': {'; '.join(schema_errors)}",
+            "definition": job["definition"],
+            "object_type": "processor",
+            "schema_errors": schema_errors
+        }
+
+    # Phase 2B: Enhanced property validation - remove invalid properties
+    phase2b_properties, phase2b_warnings = await _validate_processor_properties_phase2b(
+        processor_type=processor_type,
+        properties=validated_properties,  # Use schema-validated properties
+        logger=logger
+    )
+
+    # Phase 1A & 1C: Enhanced service reference resolution and property validation
+    resolved_properties, warnings, errors = await _validate_and_fix_processor_properties(
+        processor_type=processor_type,
+        properties=phase2b_properties,  # Use phase2b-validated properties
+        service_map=service_map,
+        process_group_id=target_pg_id,
+        nifi_client=nifi_client,
+        logger=logger,
+        user_request_id=user_request_id,
+        action_id=action_id
+    )
+
+    # Combine warnings from all phases
+    all_warnings = schema_warnings + phase2b_warnings + warnings
+
+    # Track unresolved service references for test compatibility
+    unresolved_refs = []
+    for prop_key, prop_value in properties.items():
+        if isinstance(prop_value, str) and prop_value.startswith("@"):
+            service_name = prop_value[1:]  # Remove @ prefix
+            if service_name not in service_map:
+                # Check if it was resolved by process group lookup
+                resolved_value = resolved_properties.get(prop_key)
+                if resolved_value == prop_value:  # Unchanged, so unresolved
+                    unresolved_refs.append(prop_value)
+
+    # CRITICAL FIX: Check for critical errors that would prevent processor creation
+    if errors:
+        return {
+            "status": "error",
+            "message": f"Processor '{name}' has validation errors: {'; '.join(errors)}",
+            "definition": job["definition"],
+            "object_type": "processor",
+            "validation_errors": errors
+        }
+
+    logger.info(f"Creating processor: {name} ({processor_type})")
+    proc_result = await create_nifi_processors([
+        {
+            "processor_type": processor_type,
+            "name": name,
+            "position_x": position["x"],
+            "position_y": position["y"],
+            "properties": resolved_properties
+        }
+    ], process_group_id=target_pg_id)
+    # Extract the single result from the list
+    proc_result = proc_result[0] if proc_result else {"status": "error", "message": "No result returned"}
+
+    proc_result["object_type"] = "processor"
+    proc_result["name"] = name
+    if all_warnings:
+        proc_result["warnings"] = all_warnings
+    if unresolved_refs:
+        proc_result["unresolved_service_references"] = unresolved_refs
+    return proc_result
+
+
+async def _create_flow_connection(job: Dict[str, Any], logger) -> Dict[str, Any]:
+    logger.info(f"Creating connection: {job['source_name']} → {job['target_name']} ({job['relationships']})")
+    conn_result = await _create_nifi_connection_single(
+        source_id=job["source_id"],
+        target_id=job["target_id"],
+        relationships=job["relationships"]
+    )
+
+    conn_result["object_type"] = "connection"
+    conn_result["source_name"] = job["source_name"]
+    conn_result["target_name"] = job["target_name"]
+    return conn_result
+
+
+async def _apply_flow_auto_termination(update: Dict[str, Any], logger) -> Dict[str, Any]:
+    processor_id = update["processor_id"]
+    processor_name = update["processor_name"]
+    relationships_to_terminate = update["relationships_to_terminate"]
+
+    logger.info(f"Auto-terminating relationships for '{processor_name}': {relationships_to_terminate}")
+    rel_update_result = await update_nifi_processor_relationships(
+        processor_id=processor_id,
+        auto_terminated_relationships=relationships_to_terminate
+    )
+
+    if rel_update_result.get("status") not in ["success", "warning"]:
+        logger.warning(f"Failed to auto-terminate relationships for '{processor_name}': {rel_update_result.get('message')}")
+        return rel_update_result
+
+    logger.info(f"Successfully auto-terminated relationships for '{processor_name}'")
+    return {
+        "status": "success",
+        "message": f"Auto-terminated unused relationships for processor '{processor_name}': {relationships_to_terminate}",
+        "object_type": "processor_relationships",
+        "processor_name": processor_name,
+        "processor_id": processor_id,
+        "auto_terminated_relationships": relationships_to_terminate
+    }
+
+
 @mcp.tool()
 @tool_phases(["Build"])
 async def create_complete_nifi_flow(
@@ -1544,7 +1724,7 @@ async def create_complete_nifi_flow(
             local_logger.error("Type validation failed - returning suggestions")
             return type_error_response
 
-        # 2. Create Controller Services
+        # 2. Split definitions by object type
         controller_services = [obj for obj in nifi_objects if obj.get("type") == "controller_service"]
         processors = [obj for obj in nifi_objects if obj.get("type") == "processor"]
         
@@ -1553,8 +1733,6 @@ async def create_complete_nifi_flow(
         connections_from_param = connections or []
         all_connections = connections_from_objects + connections_from_param
         
-        local_logger.info(f"Creating {len(controller_services)} controller services...")
-        
         # ✅ FIX 2: Enhanced Duplicate Prevention with clear guidance
         existing_objects = {}
         if controller_services or processors or all_connections:
@@ -1623,279 +1801,223 @@ async def create_complete_nifi_flow(
                 }
             }
         
+        # Plan the build as dependency waves. Objects within a wave do not depend on each
+        # other and are created concurrently (capped by nifi.flow_build_max_concurrency):
+        #   services -> processors (may reference services) + service enabling
+        #            -> connections (need both endpoints) -> relationship auto-termination
+        max_concurrency = mcp_settings.get_nifi_flow_build_max_concurrency()
+
+        # 2a. Validate controller service definitions (local checks only)
+        service_slots = []  # Per definition: ("error", result) or ("create", job)
+        planned_service_names = set()
         for cs_def in controller_services:
             name = cs_def.get("name")
             service_type = cs_def.get("service_type") or cs_def.get("class")
-            properties = cs_def.get("properties", {})
-            
-            # --- STRIP QUOTES FROM PROPERTY NAMES ---
-            if properties and isinstance(properties, dict):
-                cleaned_properties = {}
-                for k, v in properties.items():
-                    if isinstance(k, str):
-                        cleaned_key = k.strip('"\'')
-                    else:
-                        cleaned_key = k
-                    cleaned_properties[cleaned_key] = v
-                properties = cleaned_properties
-            
+            properties = _strip_property_name_quotes(cs_def.get("properties", {}))
+
             if not all([name, service_type]):
-                error_result = {
+                service_slots.append(("error", {
                     "status": "error",
                     "message": "Controller service missing required fields (name, service_type)",
                     "definition": cs_def,
                     "object_type": "controller_service"
-                }
-                results.append(error_result)
-                stats["errors"] += 1
-                continue
-                
-            if name in service_map:
-                error_result = {
-                    "status": "error", 
+                }))
+            elif name in planned_service_names:
+                service_slots.append(("error", {
+                    "status": "error",
                     "message": f"Duplicate controller service name '{name}' found. Names must be unique.",
                     "definition": cs_def,
                     "object_type": "controller_service"
-                }
-                results.append(error_result)
+                }))
+            else:
+                planned_service_names.add(name)
+                service_slots.append(("create", {"name": name, "service_type": service_type, "properties": properties}))
+
+        # 2b. Wave 1: create controller services
+        service_jobs = [job for kind, job in service_slots if kind == "create"]
+        local_logger.info(f"Creating {len(service_jobs)} controller services (up to {max_concurrency} at a time)...")
+        service_outcomes = iter(await _gather_flow_wave(
+            [_create_flow_controller_service(job, target_pg_id, local_logger) for job in service_jobs],
+            max_concurrency
+        ))
+
+        service_failure = None
+        for kind, payload in service_slots:
+            if kind == "error":
+                results.append(payload)
                 stats["errors"] += 1
                 continue
-                
-            # Note: Duplicate checking now handled in pre-flight phase above
-            
-            local_logger.info(f"Creating controller service: {name} ({service_type})")
-            cs_result = await create_controller_services([{
-                "service_type": service_type,
-                "name": name,
-                "properties": properties
-            }], target_pg_id)
-            # Extract the single result from the list
-            cs_result = cs_result[0] if cs_result else {"status": "error", "message": "No result returned"}
-            
-            cs_result["object_type"] = "controller_service"
-            cs_result["name"] = name
+
+            cs_result = next(service_outcomes)
+            if isinstance(cs_result, BaseException):
+                service_failure = service_failure or cs_result
+                continue
             results.append(cs_result)
-            
+
             if cs_result.get("status") != "error":
                 created_id = cs_result.get("entity", {}).get("id")
                 if created_id:
-                    service_map[name] = created_id
+                    service_map[payload["name"]] = created_id
                     stats["controller_services_created"] += 1
-                    
+
                     # Track for rollback
                     created_objects.append({
                         "type": "controller_service",
                         "id": created_id,
-                        "name": name
+                        "name": payload["name"]
                     })
-                    
-                    local_logger.debug(f"Mapped service '{name}' to ID '{created_id}'")
+
+                    local_logger.debug(f"Mapped service '{payload['name']}' to ID '{created_id}'")
                 else:
                     cs_result["status"] = "error"
                     cs_result["message"] += " (Could not retrieve ID after creation)"
                     stats["errors"] += 1
             else:
                 stats["errors"] += 1
-                
+
                 # CRITICAL FIX: Immediate rollback on critical service failures
                 error_msg = cs_result.get("message", "")
                 is_critical_error = any(phrase in error_msg.lower() for phrase in [
                     "not known to this nifi",
-                    "invalid service type", 
+                    "invalid service type",
                     "service type not found",
                     "409",  # Conflict status code
                     "400"   # Bad request status code
                 ])
-                
-                if is_critical_error or stats["errors"] >= 2:  # Lower threshold for services
+
+                if (is_critical_error or stats["errors"] >= 2) and service_failure is None:  # Lower threshold for services
                     local_logger.error(f"Critical controller service failure detected: {error_msg}")
-                    raise ToolError(f"Critical controller service creation failure. Error: {cs_result.get('message')}")
-
-        # 3. Enable Controller Services
-        if service_map:
-            local_logger.info(f"Enabling {len(service_map)} controller services...")
-            enable_requests = []
-            for service_name, service_id in service_map.items():
-                enable_requests.append({
-                    "object_type": "controller_service",
-                    "object_id": service_id,
-                    "operation_type": "enable",
-                    "name": service_name
-                })
-            
-            # Use our batch operation tool
-            enable_results = await operate_nifi_objects(enable_requests)
-            
-            for enable_result in enable_results:
-                if enable_result.get("status") == "success":
-                    stats["controller_services_enabled"] += 1
-                elif enable_result.get("status") == "error":
-                    stats["errors"] += 1
-                    # Service enabling failure is not critical - continue
-                    local_logger.warning(f"Service enabling failed: {enable_result.get('message')}")
-                else:
-                    stats["warnings"] += 1
-                    
-                # Add to results with context
-                enable_result["operation"] = "enable_controller_service"
-                results.append(enable_result)
+                    service_failure = ToolError(f"Critical controller service creation failure. Error: {cs_result.get('message')}")
 
-        # 4. Create Processors (with @ServiceName resolution)
-        local_logger.info(f"Creating {len(processors)} processors...")
-        
+        # Every service of the wave is tracked above, so rollback covers the whole wave
+        if service_failure is not None:
+            raise service_failure
+
+        # 3a. Validate processor definitions (local checks only)
+        processor_slots = []  # Per definition: ("error", result) or ("create", job)
+        planned_processor_names = set()
         for proc_def in processors:
             name = proc_def.get("name")
             processor_type = proc_def.get("processor_type") or proc_def.get("class")
             position = proc_def.get("position", {})
-            properties = proc_def.get("properties", {}).copy()  # Copy to avoid mutating original
-            
-            # --- STRIP QUOTES FROM PROPERTY NAMES ---
-            if properties and isinstance(properties, dict):
-                cleaned_properties = {}
-                for k, v in properties.items():
-                    if isinstance(k, str):
-                        cleaned_key = k.strip('"\'')
-                    else:
-                        cleaned_key = k
-                    cleaned_properties[cleaned_key] = v
-                properties = cleaned_properties
-            
+            properties = _strip_property_name_quotes(proc_def.get("properties", {}).copy())  # Copy to avoid mutating original
+
             if not all([name, processor_type, position.get("x") is not None, position.get("y") is not None]):
-                error_result = {
+                processor_slots.append(("error", {
                     "status": "error",
                     "message": f"Processor missing required fields (name, processor_type, position.x, position.y)",
                     "definition": proc_def,
                     "object_type": "processor"
-                }
-                results.append(error_result)
-                stats["errors"] += 1
-                continue
-                
-            if name in id_map:
-                error_result = {
+                }))
+            elif name in planned_processor_names:
+                processor_slots.append(("error", {
                     "status": "error",
                     "message": f"Duplicate name '{name}' found. Names must be unique.",
                     "definition": proc_def,
                     "object_type": "processor"
-                }
-                results.append(error_result)
+                }))
+            else:
+                planned_processor_names.add(name)
+                processor_slots.append(("create", {
+                    "definition": proc_def,
+                    "name": name,
+                    "processor_type": processor_type,
+                    "position": position,
+                    "properties": properties
+                }))
+
+        # 3b. Wave 2: create processors (with @ServiceName resolution) while the services are enabled.
+        # Processors only need the service IDs, not enabled services, so both run together.
+        processor_jobs = [job for kind, job in processor_slots if kind == "create"]
+        enable_requests = [
+            {
+                "object_type": "controller_service",
+                "object_id": service_id,
+                "operation_type": "enable",
+                "name": service_name
+            }
+            for service_name, service_id in service_map.items()
+        ]
+        if enable_requests:
+            local_logger.info(f"Enabling {len(enable_requests)} controller services...")
+        local_logger.info(f"Creating {len(processor_jobs)} processors (up to {max_concurrency} at a time)...")
+
+        # Use our batch operation tool for enabling. Both run under one gather so neither outlives
+        # the other, and an enable failure is only raised once the processors are tracked below.
+        processor_outcomes, enable_results = await asyncio.gather(
+            _gather_flow_wave(
+                [
+                    _create_flow_processor(
+                        job, service_map, target_pg_id, nifi_client, local_logger, user_request_id, action_id
+                    )
+                    for job in processor_jobs
+                ],
+                max_concurrency
+            ),
+            operate_nifi_objects(enable_requests) if enable_requests else asyncio.sleep(0, result=[]),
+            return_exceptions=True
+        )
+        if isinstance(processor_outcomes, BaseException):
+            raise processor_outcomes
+
+        processor_failure = None
+        if isinstance(enable_results, BaseException):
+            local_logger.error(f"Enabling controller services failed: {enable_results}")
+            processor_failure = ToolError(f"Failed to enable controller services: {enable_results}")
+            enable_results = []
+
+        for enable_result in enable_results:
+            if enable_result.get("status") == "success":
+                stats["controller_services_enabled"] += 1
+            elif enable_result.get("status") == "error":
                 stats["errors"] += 1
-                continue
-                
-            # Note: Duplicate checking now handled in pre-flight phase above
+                # Service enabling failure is not critical - continue
+                local_logger.warning(f"Service enabling failed: {enable_result.get('message')}")
+            else:
+                stats["warnings"] += 1
 
-            # ✅ FIX 4: Enhanced Property Schema Validation BEFORE creation
-            validated_properties, schema_warnings, schema_errors = await _validate_processor_properties_upfront(
-                processor_type=processor_type,
-                properties=properties,
-                nifi_client=nifi_client,
-                user_request_id=user_request_id,
-                action_id=action_id
-            )
-            
-            # Fail fast on schema errors
-            if schema_errors:
-                error_result = {
-                    "status": "error",
-                    "message": f"Property schema validation failed for processor '{name}': {'; '.join(schema_errors)}",
-                    "definition": proc_def,
-                    "object_type": "processor",
-                    "schema_errors": schema_errors
-                }
-                results.append(error_result)
+            # Add to results with context
+            enable_result["operation"] = "enable_controller_service"
+            results.append(enable_result)
+
+        processor_outcomes = iter(processor_outcomes)
+        for kind, payload in processor_slots:
+            if kind == "error":
+                results.append(payload)
                 stats["errors"] += 1
                 continue
 
-            # Phase 2B: Enhanced property validation - remove invalid properties
-            phase2b_properties, phase2b_warnings = await _validate_processor_properties_phase2b(
-                processor_type=processor_type,
-                properties=validated_properties,  # Use schema-validated properties
-                logger=local_logger
-            )
+            proc_result = next(processor_outcomes)
+            if isinstance(proc_result, BaseException):
+                processor_failure = processor_failure or proc_result
+                continue
+            results.append(proc_result)
 
-            # Phase 1A & 1C: Enhanced service reference resolution and property validation
-            resolved_properties, warnings, errors = await _validate_and_fix_processor_properties(
-                processor_type=processor_type,
-                properties=phase2b_properties,  # Use phase2b-validated properties
-                service_map=service_map,
-                process_group_id=target_pg_id,
-                nifi_client=nifi_client,
-                logger=local_logger,
-                user_request_id=user_request_id,
-                action_id=action_id
-            )
-            
-            # Combine warnings from all phases
-            all_warnings = schema_warnings + phase2b_warnings + warnings
-            
-            # Track unresolved service references for test compatibility
-            unresolved_refs = []
-            for prop_key, prop_value in properties.items():
-                if isinstance(prop_value, str) and prop_value.startswith("@"):
-                    service_name = prop_value[1:]  # Remove @ prefix
-                    if service_name not in service_map:
-                        # Check if it was resolved by process group lookup
-                        resolved_value = resolved_properties.get(prop_key)
-                        if resolved_value == prop_value:  # Unchanged, so unresolved
-                            unresolved_refs.append(prop_value)
-            
-            # CRITICAL FIX: Check for critical errors that would prevent processor creation
-            if errors:
-                error_result = {
-                    "status": "error",
-                    "message": f"Processor '{name}' has validation errors: {'; '.join(errors)}",
-                    "definition": proc_def,
-                    "object_type": "processor",
-                    "validation_errors": errors
-                }
-                results.append(error_result)
+            validation_errors = proc_result.get("validation_errors")
+            if validation_errors:
                 stats["errors"] += 1
-                
+
                 # CRITICAL FIX: Immediate rollback on service reference failures
-                has_service_ref_error = any("service reference" in error.lower() for error in errors)
-                if has_service_ref_error or stats["errors"] >= 3:  # Lower threshold for processors
-                    local_logger.error(f"Critical processor validation failure detected: {errors}")
-                    raise ToolError(f"Critical processor validation failure. Error: {'; '.join(errors)}")
+                has_service_ref_error = any("service reference" in error.lower() for error in validation_errors)
+                if (has_service_ref_error or stats["errors"] >= 3) and processor_failure is None:  # Lower threshold for processors
+                    local_logger.error(f"Critical processor validation failure detected: {validation_errors}")
+                    processor_failure = ToolError(f"Critical processor validation failure. Error: {'; '.join(validation_errors)}")
                 continue
-            
-            local_logger.info(f"Creating processor: {name} ({processor_type})")
-            proc_result = await create_nifi_processors([
-                {
-                    "processor_type": processor_type,
-                    "name": name,
-                    "position_x": position["x"],
-                    "position_y": position["y"],
-                    "properties": resolved_properties
-                }
-            ], process_group_id=target_pg_id)
-            # Extract the single result from the list
-            proc_result = proc_result[0] if proc_result else {"status": "error", "message": "No result returned"}
-            
-            proc_result["object_type"] = "processor"
-            proc_result["name"] = name
-            if all_warnings:
-                proc_result["warnings"] = all_warnings
-            if errors:
-                proc_result["errors"] = errors
-            if unresolved_refs:
-                proc_result["unresolved_service_references"] = unresolved_refs
-                
-            results.append(proc_result)
-            
+
             if proc_result.get("status") != "error":
                 created_id = proc_result.get("entity", {}).get("id")
                 if created_id:
-                    id_map[name] = created_id
+                    id_map[payload["name"]] = created_id
                     stats["processors_created"] += 1
-                    
+
                     # Track for rollback
                     created_objects.append({
                         "type": "processor",
                         "id": created_id,
-                        "name": name
+                        "name": payload["name"]
                     })
-                    
-                    local_logger.debug(f"Mapped processor '{name}' to ID '{created_id}'")
+
+                    local_logger.debug(f"Mapped processor '{payload['name']}' to ID '{created_id}'")
                 else:
                     proc_result["status"] = "error"
                     proc_result["message"] += " (Could not retrieve ID after creation)"
@@ -1903,121 +2025,82 @@ async def create_complete_nifi_flow(
             else:
                 stats["errors"] += 1
                 # CRITICAL FIX: Lower threshold for processor failures
-                if stats["errors"] >= 3:  # Reduced from 5 to 3
-                    raise ToolError(f"Too many processor creation failures. Last error: {proc_result.get('message')}")
+                if stats["errors"] >= 3 and processor_failure is None:  # Reduced from 5 to 3
+                    processor_failure = ToolError(f"Too many processor creation failures. Last error: {proc_result.get('message')}")
 
-        # 4.5. PHASE 2B PREVIEW: Intelligent Relationship Auto-Termination
-        # Auto-terminate relationships that won't be used by connections to prevent validation errors
-        if len(id_map) > 0:  # Only if we have processors
-            local_logger.info("Analyzing relationships for intelligent auto-termination...")
-            relationship_updates = await _analyze_and_auto_terminate_relationships(
-                nifi_objects=nifi_objects,
-                id_map=id_map,
-                nifi_client=nifi_client,
-                logger=local_logger,
-                user_request_id=user_request_id,
-                action_id=action_id
-            )
-            
-            # Apply relationship updates
-            for update in relationship_updates:
-                processor_id = update["processor_id"]
-                processor_name = update["processor_name"]
-                relationships_to_terminate = update["relationships_to_terminate"]
-                
-                if relationships_to_terminate:
-                    local_logger.info(f"Auto-terminating relationships for '{processor_name}': {relationships_to_terminate}")
-                    
-                    rel_update_result = await update_nifi_processor_relationships(
-                        processor_id=processor_id,
-                        auto_terminated_relationships=relationships_to_terminate
-                    )
-                    
-                    if rel_update_result.get("status") in ["success", "warning"]:
-                        local_logger.info(f"Successfully auto-terminated relationships for '{processor_name}'")
-                        stats["warnings"] += 1  # Count as warning since it's automatic
-                        
-                        # Add to results for transparency
-                        results.append({
-                            "status": "success",
-                            "message": f"Auto-terminated unused relationships for processor '{processor_name}': {relationships_to_terminate}",
-                            "object_type": "processor_relationships",
-                            "processor_name": processor_name,
-                            "processor_id": processor_id,
-                            "auto_terminated_relationships": relationships_to_terminate
-                        })
-                    else:
-                        local_logger.warning(f"Failed to auto-terminate relationships for '{processor_name}': {rel_update_result.get('message')}")
-                        stats["warnings"] += 1
+        # Every processor of the wave is tracked above, so rollback covers the whole wave
+        if processor_failure is not None:
+            raise processor_failure
 
-        # 5. Create Connections
-        local_logger.info(f"Creating {len(all_connections)} connections...")
-        
+        # 4. Wave 3: create connections
+        connection_slots = []  # Per definition: ("error", result) or ("create", job)
         for conn_def in all_connections:
             source_name = conn_def.get("source")
             target_name = conn_def.get("target") or conn_def.get("dest") or conn_def.get("destination")
             relationships = conn_def.get("relationships")
-            
+
             if not all([source_name, target_name, relationships]):
-                error_result = {
+                connection_slots.append(("error", {
                     "status": "error",
                     "message": "Connection missing required fields (source, target, relationships)",
                     "definition": conn_def,
                     "object_type": "connection"
-                }
-                results.append(error_result)
-                stats["errors"] += 1
-                continue
-            
-            source_id = id_map.get(source_name)
-            target_id = id_map.get(target_name)
-            
-            if not source_id:
-                error_result = {
+                }))
+            elif not id_map.get(source_name):
+                connection_slots.append(("error", {
                     "status": "error",
                     "message": f"Source component '{source_name}' not found or failed to create",
                     "definition": conn_def,
                     "object_type": "connection"
-                }
-                results.append(error_result)
-                stats["errors"] += 1
-                continue
-                
-            if not target_id:
-                error_result = {
+                }))
+            elif not id_map.get(target_name):
+                connection_slots.append(("error", {
                     "status": "error",
                     "message": f"Target component '{target_name}' not found or failed to create",
                     "definition": conn_def,
                     "object_type": "connection"
-                }
-                results.append(error_result)
+                }))
+            else:
+                connection_slots.append(("create", {
+                    "source_name": source_name,
+                    "target_name": target_name,
+                    "source_id": id_map[source_name],
+                    "target_id": id_map[target_name],
+                    "relationships": relationships
+                }))
+
+        connection_jobs = [job for kind, job in connection_slots if kind == "create"]
+        local_logger.info(f"Creating {len(connection_jobs)} connections (up to {max_concurrency} at a time)...")
+        connection_outcomes = iter(await _gather_flow_wave(
+            [_create_flow_connection(job, local_logger) for job in connection_jobs],
+            max_concurrency
+        ))
+
+        connection_failure = None
+        for kind, payload in connection_slots:
+            if kind == "error":
+                results.append(payload)
                 stats["errors"] += 1
                 continue
 
-            local_logger.info(f"Creating connection: {source_name} → {target_name} ({relationships})")
-            conn_result = await _create_nifi_connection_single(
-                source_id=source_id,
-                target_id=target_id,
-                relationships=relationships
-            )
-            
-            conn_result["object_type"] = "connection"
-            conn_result["source_name"] = source_name
-            conn_result["target_name"] = target_name
+            conn_result = next(connection_outcomes)
+            if isinstance(conn_result, BaseException):
+                connection_failure = connection_failure or conn_result
+                continue
             results.append(conn_result)
-            
+
             if conn_result.get("status") == "success":
                 stats["connections_created"] += 1
-                
+
                 # Track for rollback
                 connection_id = conn_result.get("entity", {}).get("id")
                 if connection_id:
                     created_objects.append({
                         "type": "connection",
                         "id": connection_id,
-                        "name": f"{source_name}→{target_name}"
+                        "name": f"{payload['source_name']}→{payload['target_name']}"
                     })
-                    
+
             elif conn_result.get("status") == "error":
                 stats["errors"] += 1
                 # Connection failures are often due to missing components - continue
@@ -2025,6 +2108,35 @@ async def create_complete_nifi_flow(
             else:
                 stats["warnings"] += 1
 
+        if connection_failure is not None:
+            raise connection_failure
+
+        # 5. Wave 4: Intelligent Relationship Auto-Termination
+        # Auto-terminate relationships that won't be used by connections to prevent validation errors
+        if len(id_map) > 0:  # Only if we have processors
+            local_logger.info("Analyzing relationships for intelligent auto-termination...")
+            relationship_updates = await _analyze_and_auto_terminate_relationships(
+                nifi_objects=nifi_objects,
+                id_map=id_map,
+                nifi_client=nifi_client,
+                logger=local_logger,
+                user_request_id=user_request_id,
+                action_id=action_id
+            )
+            relationship_updates = [update for update in relationship_updates if update["relationships_to_terminate"]]
+
+            update_outcomes = await _gather_flow_wave(
+                [_apply_flow_auto_termination(update, local_logger) for update in relationship_updates],
+                max_concurrency
+            )
+            for update_result in update_outcomes:
+                if isinstance(update_result, BaseException):
+                    raise update_result
+                stats["warnings"] += 1  # Count as warning since it's automatic
+                if update_result.get("status") == "success":
+                    # Add to results for transparency
+                    results.append(update_result)
+
         # 6. Flow Validation
         local_logger.info("Performing complete flow validation...")
         validation_result = await _validate_complete_flow(target_pg_id, nifi_client, local_logger, user_request_id, action_id)
@@ -3426,6 +3538,8 @@ async def _validate_processor_type_exists(processor_type: str, nifi_client: 'NiF
     """
     Validate that a processor type exists in the NiFi instance.
     
+    Uses the cached per-server type catalog, so repeated checks make no extra HTTP calls.
+    
     Args:
         processor_type: The processor type to validate
         nifi_client: NiFi client instance
@@ -3436,15 +3550,8 @@ async def _validate_processor_type_exists(processor_type: str, nifi_client: 'NiF
         True if processor type exists, False otherwise
     """
     try:
-        # Call NiFi client directly instead of using helper function that requires MCP context
-        all_types = await nifi_client.get_processor_types()
-        
-        # Check if the exact type exists
-        for proc_type in all_types:
-            if proc_type.get("type") == processor_type:
-                return True
-        
-        return False
+        catalog = await type_catalog_registry.get_processor_catalog(nifi_client)
+        return catalog.has_type(processor_type)
     except Exception:
         return False
 
@@ -3453,6 +3560,8 @@ async def _validate_controller_service_type_exists(service_type: str, nifi_clien
     """
     Validate that a controller service type exists in the NiFi instance.
     
+    Uses the cached per-server type catalog, so repeated checks make no extra HTTP calls.
+    
     Args:
         service_type: The service type to validate
         nifi_client: NiFi client instance
@@ -3463,23 +3572,28 @@ async def _validate_controller_service_type_exists(service_type: str, nifi_clien
         True if service type exists, False otherwise
     """
     try:
-        # Call NiFi client directly instead of using helper function that requires MCP context
-        all_types = await nifi_client.get_controller_service_types(user_request_id=user_request_id, action_id=action_id)
-        
-        # Check if the exact type exists
-        for service_type_info in all_types:
-            if service_type_info.get("type") == service_type:
-                return True
-        
-        return False
+        catalog = await type_catalog_registry.get_controller_service_catalog(
+            nifi_client, user_request_id=user_request_id, action_id=action_id
+        )
+        return catalog.has_type(service_type)
     except Exception:
         return False
 
 
+def _format_type_suggestion(type_info: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": type_info.get("type"),
+        "description": type_info.get("description", ""),
+        "tags": type_info.get("tags", [])
+    }
+
+
 async def _get_processor_type_suggestions(processor_name: str, nifi_client: 'NiFiClient', max_suggestions: int = 5) -> List[Dict[str, Any]]:
     """
     Get processor type suggestions based on processor name.
     
+    Substring matches come first; near misses (e.g. typos) are ranked by trigram similarity.
+    
     Args:
         processor_name: The processor name to find suggestions for
         nifi_client: NiFi client instance
@@ -3489,39 +3603,8 @@ async def _get_processor_type_suggestions(processor_name: str, nifi_client: 'NiF
         List of processor type suggestions with type and description
     """
     try:
-        # Call NiFi client directly to get all processor types
-        all_types = await nifi_client.get_processor_types()
-        
-        # Search for matches based on simple name
-        matches = []
-        search_name_lower = processor_name.lower()
-        
-        for proc_type in all_types:
-            # Extract relevant fields for matching
-            title = proc_type.get("title", "").lower()
-            type_str = proc_type.get("type", "").lower()
-            description = proc_type.get("description", "").lower()
-            tags = [tag.lower() for tag in proc_type.get("tags", [])]
-            
-            # Check if the search term matches
-            name_match_found = (
-                search_name_lower in title or
-                search_name_lower in type_str or
-                search_name_lower in description or
-                any(search_name_lower in tag for tag in tags)
-            )
-            
-            if name_match_found:
-                matches.append({
-                    "type": proc_type.get("type"),
-                    "description": proc_type.get("description", ""),
-                    "tags": proc_type.get("tags", [])
-                })
-                
-                if len(matches) >= max_suggestions:
-                    break
-        
-        return matches
+        catalog = await type_catalog_registry.get_processor_catalog(nifi_client)
+        return [_format_type_suggestion(proc_type) for proc_type in catalog.suggest(processor_name, limit=max_suggestions)]
     except Exception:
         return []
 
@@ -3530,6 +3613,8 @@ async def _get_controller_service_type_suggestions(service_name: str, nifi_clien
     """
     Get controller service type suggestions based on service name.
     
+    Substring matches come first; near misses (e.g. typos) are ranked by trigram similarity.
+    
     Args:
         service_name: The service name to find suggestions for
         nifi_client: NiFi client instance
@@ -3541,39 +3626,10 @@ async def _get_controller_service_type_suggestions(service_name: str, nifi_clien
         List of service type suggestions with type and description
     """
     try:
-        # Call NiFi client directly to get all service types
-        all_types = await nifi_client.get_controller_service_types(user_request_id=user_request_id, action_id=action_id)
-        
-        # Search for matches based on simple name
-        matches = []
-        search_name_lower = service_name.lower()
-        
-        for service_type in all_types:
-            # Extract relevant fields for matching
-            title = service_type.get("title", "").lower()
-            type_str = service_type.get("type", "").lower()
-            description = service_type.get("description", "").lower()
-            tags = [tag.lower() for tag in service_type.get("tags", [])]
-            
-            # Check if the search term matches
-            name_match_found = (
-                search_name_lower in title or
-                search_name_lower in type_str or
-                search_name_lower in description or
-                any(search_name_lower in tag for tag in tags)
-            )
-            
-            if name_match_found:
-                matches.append({
-                    "type": service_type.get("type"),
-                    "description": service_type.get("description", ""),
-                    "tags": service_type.get("tags", [])
-                })
-                
-                if len(matches) >= max_suggestions:
-                    break
-        
-        return matches
+        catalog = await type_catalog_registry.get_controller_service_catalog(
+            nifi_client, user_request_id=user_request_id, action_id=action_id
+        )
+        return [_format_type_suggestion(service_type) for service_type in catalog.suggest(service_name, limit=max_suggestions)]
     except Exception:
         return []
 
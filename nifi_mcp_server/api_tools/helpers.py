@@ -16,6 +16,7 @@ from .utils import (
     # No other utils needed for this specific tool
 )
 from nifi_mcp_server.nifi_client import NiFiClient, NiFiAuthenticationError
+from nifi_mcp_server.type_catalog import type_catalog_registry
 from mcp.server.fastmcp.exceptions import ToolError
 from config import settings as mcp_settings
 
@@ -88,7 +89,8 @@ def _format_controller_service_type_summary(service_type_data: Dict) -> Dict:
 @tool_phases(["Review","Build", "Modify"])
 async def lookup_nifi_processor_types(
     processor_names: List[str],
-    bundle_artifact_filter: str | None = None
+    bundle_artifact_filter: str | None = None,
+    refresh_type_catalog: bool = False
 ) -> List[Dict]:
     """
     Looks up available NiFi processor types by display names, returning key details including the full class name.
@@ -99,6 +101,8 @@ async def lookup_nifi_processor_types(
     Args:
         processor_names: List of processor display names (e.g., ['GenerateFlowFile', 'LogAttribute']). Case-insensitive.
         bundle_artifact_filter: Optional. Filters by bundle artifact (e.g., 'nifi-standard-nar'). Case-insensitive.
+        refresh_type_catalog: Optional. Re-fetch the server's processor types instead of using the cached catalog
+            (e.g. after installing new NARs). Defaults to False.
         
     Example:
     ```python
@@ -134,13 +138,12 @@ async def lookup_nifi_processor_types(
     
     local_logger.info(f"Looking up processor type details for {len(processor_names)} processor names")
     try:
-        nifi_req = {"operation": "get_processor_types"}
+        nifi_req = {"operation": "get_processor_types", "cached_catalog": not refresh_type_catalog}
         local_logger.bind(interface="nifi", direction="request", data=nifi_req).debug("Calling NiFi API")
-        all_types = await nifi_client.get_processor_types()
-        nifi_resp = {"processor_type_count": len(all_types)}
+        catalog = await type_catalog_registry.get_processor_catalog(nifi_client, refresh=refresh_type_catalog)
+        nifi_resp = {"processor_type_count": len(catalog)}
         local_logger.bind(interface="nifi", direction="response", data=nifi_resp).debug("Received from NiFi API")
 
-        filter_artifact_lower = bundle_artifact_filter.lower() if bundle_artifact_filter else None
         results = []
         
         # Process each processor name in the request
@@ -149,33 +152,11 @@ async def lookup_nifi_processor_types(
             if not processor_name:
                 continue
                 
-            matches = []
-            search_name_lower = processor_name.lower()
-
-            for proc_type in all_types:
-                # Extract relevant fields, ensuring they are strings and lowercased
-                title = proc_type.get("title", "").lower()
-                type_str = proc_type.get("type", "").lower()
-                description = proc_type.get("description", "").lower()
-                tags = [tag.lower() for tag in proc_type.get("tags", [])] # Lowercase all tags
-
-                # Check if the search term is present in any relevant field
-                name_match_found = (
-                    search_name_lower in title or
-                    search_name_lower in type_str or
-                    search_name_lower in description or
-                    any(search_name_lower in tag for tag in tags)
-                )
-
-                if name_match_found:
-                    # Apply bundle artifact filter if specified
-                    if filter_artifact_lower:
-                        bundle = proc_type.get("bundle", {})
-                        artifact = bundle.get("artifact", "").lower()
-                        if artifact == filter_artifact_lower: # Check lowercase artifact
-                            matches.append(_format_processor_type_summary(proc_type))
-                    else:
-                        matches.append(_format_processor_type_summary(proc_type))
+            # Indexed case-insensitive match on title, type, description and tags
+            matches = [
+                _format_processor_type_summary(proc_type)
+                for proc_type in catalog.search(processor_name, bundle_artifact=bundle_artifact_filter)
+            ]
 
             # Add result for this processor name
             result = {
@@ -204,7 +185,8 @@ async def lookup_nifi_processor_types(
 @tool_phases(["Build", "Modify"])
 async def get_controller_service_types(
     service_name: str | None = None,
-    bundle_artifact_filter: str | None = None
+    bundle_artifact_filter: str | None = None,
+    refresh_type_catalog: bool = False
 ) -> Union[List[Dict], Dict]:
     """
     Retrieves available NiFi controller service types, optionally filtered by name or bundle.
@@ -215,6 +197,8 @@ async def get_controller_service_types(
     Args:
         service_name: Optional. Filter by service display name (e.g., 'DBCPConnectionPool'). Case-insensitive.
         bundle_artifact_filter: Optional. Filter by bundle artifact (e.g., 'nifi-dbcp-service-nar'). Case-insensitive.
+        refresh_type_catalog: Optional. Re-fetch the server's controller service types instead of using the
+            cached catalog. Defaults to False.
 
     Returns:
         - If service_name provided and one match: A dictionary with service type details.
@@ -251,58 +235,26 @@ async def get_controller_service_types(
         local_logger.info("Retrieving all available controller service types")
         
     try:
-        nifi_req = {"operation": "get_controller_service_types"}
+        nifi_req = {"operation": "get_controller_service_types", "cached_catalog": not refresh_type_catalog}
         local_logger.bind(interface="nifi", direction="request", data=nifi_req).debug("Calling NiFi API")
-        all_types = await nifi_client.get_controller_service_types(user_request_id=user_request_id, action_id=action_id)
-        nifi_resp = {"controller_service_type_count": len(all_types)}
+        catalog = await type_catalog_registry.get_controller_service_catalog(
+            nifi_client, refresh=refresh_type_catalog, user_request_id=user_request_id, action_id=action_id
+        )
+        nifi_resp = {"controller_service_type_count": len(catalog)}
         local_logger.bind(interface="nifi", direction="response", data=nifi_resp).debug("Received from NiFi API")
 
         if not service_name:
             # Return all types, optionally filtered by bundle
-            results = []
-            filter_artifact_lower = bundle_artifact_filter.lower() if bundle_artifact_filter else None
-            
-            for service_type in all_types:
-                if filter_artifact_lower:
-                    bundle = service_type.get("bundle", {})
-                    artifact = bundle.get("artifact", "").lower()
-                    if artifact == filter_artifact_lower:
-                        results.append(_format_controller_service_type_summary(service_type))
-                else:
-                    results.append(_format_controller_service_type_summary(service_type))
-                    
+            service_types = catalog.by_artifact(bundle_artifact_filter) if bundle_artifact_filter else catalog.raw_types
+            results = [_format_controller_service_type_summary(service_type) for service_type in service_types]
             local_logger.info(f"Returning {len(results)} controller service type(s)")
             return results
 
-        # Search for specific service name
-        matches = []
-        search_name_lower = service_name.lower()
-        filter_artifact_lower = bundle_artifact_filter.lower() if bundle_artifact_filter else None
-
-        for service_type in all_types:
-            # Extract relevant fields, ensuring they are strings and lowercased
-            title = service_type.get("title", "").lower()
-            type_str = service_type.get("type", "").lower()
-            description = service_type.get("description", "").lower()
-            tags = [tag.lower() for tag in service_type.get("tags", [])] # Lowercase all tags
-
-            # Check if the search term is present in any relevant field
-            name_match_found = (
-                search_name_lower in title or
-                search_name_lower in type_str or
-                search_name_lower in description or
-                any(search_name_lower in tag for tag in tags)
-            )
-
-            if name_match_found:
-                # Apply bundle artifact filter if specified
-                if filter_artifact_lower:
-                    bundle = service_type.get("bundle", {})
-                    artifact = bundle.get("artifact", "").lower()
-                    if artifact == filter_artifact_lower: # Check lowercase artifact
-                        matches.append(_format_controller_service_type_summary(service_type))
-                else:
-                    matches.append(_format_controller_service_type_summary(service_type))
+        # Indexed case-insensitive match on title, type, description and tags
+        matches = [
+            _format_controller_service_type_summary(service_type)
+            for service_type in catalog.search(service_name, bundle_artifact=bundle_artifact_filter)
+        ]
 
         local_logger.info(f"Found {len(matches)} match(es) for '{service_name}'")
         
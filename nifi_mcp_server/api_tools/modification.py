@@ -1,4 +1,5 @@
 import asyncio
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any, Union, Literal
 
 # Import necessary components from parent/utils
@@ -20,6 +21,8 @@ from .utils import (
 )
 from .review import get_nifi_object_details, list_nifi_objects  # Import both functions at the top
 from nifi_mcp_server.nifi_client import NiFiClient, NiFiAuthenticationError
+from nifi_mcp_server.async_request_poller import PollSchedule
+from nifi_mcp_server.flow_snapshot import bounded_gather, fetch_group_node
 from mcp.server.fastmcp.exceptions import ToolError
 
 
@@ -1149,9 +1152,11 @@ async def delete_nifi_objects(
 ) -> List[Dict]:
     """
     Deletes multiple NiFi objects (processors, connections, ports, process groups, or controller services) in batch.
-    Attempts Auto-Stop for running processors if enabled.
+    Objects are deleted in dependency order (connections, then processors and ports, then controller
+    services, then process groups), and the deletions within each step run concurrently.
+    Attempts Auto-Stop for running processors and ports if enabled (one stop call per parent group).
     Attempts Auto-Delete for processors with connections if enabled.
-    Attempts Auto-Purge for connections with queued data if enabled.
+    Attempts Auto-Purge for connections with queued data if enabled (all queues purged together).
     Attempts Auto-Disable for enabled controller services.
 
     Args:
@@ -1205,47 +1210,53 @@ async def delete_nifi_objects(
             raise ToolError(f"Deletion request {i} has invalid object_type '{req['object_type']}'. Must be one of: processor, connection, port, process_group, controller_service.")
 
     local_logger.info(f"Executing delete_nifi_objects for {len(objects)} objects")
-    
-    results = []
-    
-    for i, deletion_request in enumerate(objects):
+
+    max_concurrency = mcp_settings.get_nifi_operation_max_concurrency()
+    plan = await _plan_batch_deletion(objects, nifi_client, local_logger, max_concurrency)
+    results: List[Optional[Dict]] = [None] * len(objects)
+    for i, error_result in plan.errors.items():
+        results[i] = _with_deletion_metadata(error_result, objects[i], i)
+
+    async def _run_single(i: int, deletion_request: Dict[str, Any]):
         object_type = deletion_request["object_type"]
         object_id = deletion_request["object_id"]
         object_name = deletion_request.get("name", object_id)
-        
+
         request_logger = local_logger.bind(object_id=object_id, object_type=object_type, request_index=i)
         request_logger.info(f"Processing deletion request {i+1}/{len(objects)} for {object_type} '{object_name}' ({object_id})")
-        
+
         try:
-            # Call the original deletion logic for a single object
             result = await _delete_single_nifi_object(
                 object_type=object_type,
                 object_id=object_id,
                 object_name=object_name,
                 nifi_client=nifi_client,
-                logger=request_logger
+                logger=request_logger,
+                current_entity=plan.entities.get(i)
             )
-            
-            # Add metadata to the result
-            result["object_type"] = object_type
-            result["object_id"] = object_id
-            result["object_name"] = object_name
-            result["request_index"] = i
-            
-            results.append(result)
-            
         except Exception as e:
-            error_result = {
+            request_logger.error(f"Unexpected error in deletion request {i}: {e}", exc_info=True)
+            result = {
                 "status": "error",
-                "message": f"Unexpected error deleting {object_type} '{object_name}' ({object_id}): {e}",
-                "object_type": object_type,
-                "object_id": object_id,
-                "object_name": object_name,
-                "request_index": i
+                "message": f"Unexpected error deleting {object_type} '{object_name}' ({object_id}): {e}"
             }
-            results.append(error_result)
-            request_logger.error(f"Unexpected error in deletion request {i}: {e}", exc_info=True)
-    
+        results[i] = _with_deletion_metadata(result, deletion_request, i)
+
+    # Each tier only depends on the tiers before it, so the deletions within a tier run concurrently
+    for tier in _DELETION_TIER_ORDER:
+        members = [(i, req) for i, req in enumerate(objects) if req["object_type"] in tier and results[i] is None]
+        auto_deletions = plan.auto_delete_connections if "connection" in tier else {}
+        if not members and not auto_deletions:
+            continue
+        local_logger.info(f"Deleting {len(members) + len(auto_deletions)} {'/'.join(tier)} objects (up to {max_concurrency} at a time)")
+        if auto_deletions:
+            await _delete_auto_connections(plan, nifi_client, local_logger, max_concurrency)
+            for i, error_result in plan.errors.items():
+                if results[i] is None:
+                    results[i] = _with_deletion_metadata(error_result, objects[i], i)
+            members = [(i, req) for i, req in members if results[i] is None]
+        await bounded_gather([_run_single(i, req) for i, req in members], max_concurrency=max_concurrency)
+
     # Summary logging
     successful_deletions = [r for r in results if r.get("status") == "success"]
     failed_deletions = [r for r in results if r.get("status") == "error"]
@@ -1256,23 +1267,301 @@ async def delete_nifi_objects(
     return results
 
 
+# Batched deletions run one tier per dependency level, in this order: connections before their
+# endpoints, components before the controller services they reference, and groups last.
+_DELETION_TIER_ORDER = [("connection",), ("processor", "port"), ("controller_service",), ("process_group",)]
+
+# Seconds that stops and disables issued for a deletion may take to settle
+_STATE_SETTLE_TIMEOUT_SECONDS = 15
+
+
+@dataclass
+class _DeletionPlan:
+    """Batch-level preparation shared by every request of one delete_nifi_objects call."""
+    # Request index -> entity fetched (and refreshed after stopping) for the deletion
+    entities: Dict[int, Dict] = field(default_factory=dict)
+    # Request index -> final result for requests that cannot proceed
+    errors: Dict[int, Dict] = field(default_factory=dict)
+    # Connections attached to requested processors, deleted first by Auto-Delete: ID -> entity
+    auto_delete_connections: Dict[str, Dict] = field(default_factory=dict)
+    # Auto-deleted connection ID -> indexes of the processor requests that need it gone
+    connection_owners: Dict[str, List[int]] = field(default_factory=dict)
+
+
+def _with_deletion_metadata(result: Dict, deletion_request: Dict[str, Any], request_index: int) -> Dict:
+    result["object_type"] = deletion_request["object_type"]
+    result["object_id"] = deletion_request["object_id"]
+    result["object_name"] = deletion_request.get("name", deletion_request["object_id"])
+    result["request_index"] = request_index
+    return result
+
+
+def _request_feature_headers() -> Dict[str, str]:
+    """Request headers (lower-cased) that can override the Auto-* feature flags."""
+    from config.logging_setup import request_context
+    context_data = request_context.get()
+    request_headers = context_data.get('headers', {}) if context_data else {}
+    return {k.lower(): v for k, v in request_headers.items()} if request_headers else {}
+
+
+def _queued_count(connection_entity: Dict) -> int:
+    snapshot = connection_entity.get("status", {}).get("aggregateSnapshot", {})
+    try:
+        return int(snapshot.get("flowFilesQueued", snapshot.get("queuedCount", "0")))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _is_stopped(entity: Dict) -> bool:
+    active_threads = entity.get("status", {}).get("aggregateSnapshot", {}).get("activeThreadCount") or 0
+    return entity.get("component", {}).get("state") != "RUNNING" and active_threads == 0
+
+
+async def _wait_for_state(description: str, fetch, is_settled, logger, timeout_seconds: float = _STATE_SETTLE_TIMEOUT_SECONDS):
+    """
+    Polls `fetch()` until `is_settled(result)` or the timeout, with the same backoff as NiFi's
+    asynchronous requests. Returns (settled, last result).
+    """
+    schedule = PollSchedule.from_settings()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    delay = None
+    while True:
+        result = await fetch()
+        if is_settled(result):
+            return True, result
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            logger.warning(f"{description} did not settle within {timeout_seconds} seconds")
+            return False, result
+        delay = schedule.next_delay(delay, 0.0, None)
+        logger.info(f"Waiting {min(delay, remaining):.2f}s for {description}")
+        await asyncio.sleep(min(delay, remaining))
+
+
+async def _plan_batch_deletion(
+    objects: List[Dict[str, Any]],
+    nifi_client: NiFiClient,
+    logger,
+    max_concurrency: int
+) -> _DeletionPlan:
+    """
+    Fetches the requested connections, processors and ports and does the batch-level preparation:
+    - Auto-Delete: finds the connections attached to requested processors.
+    - Auto-Stop: stops what must not run (requested processors and ports, and the sources of
+      connections being deleted) with one scheduling call per parent group, then polls until stopped.
+    - Auto-Purge: empties every queue being deleted with one concurrent batch purge.
+    """
+    plan = _DeletionPlan()
+    headers = _request_feature_headers()
+    auto_stop = mcp_settings.get_feature_auto_stop_enabled(headers=headers)
+    auto_delete = mcp_settings.get_feature_auto_delete_enabled(headers=headers)
+    auto_purge = mcp_settings.get_feature_auto_purge_enabled(headers=headers)
+    logger.info(f"[Delete Plan] Features enabled - Auto-Stop: {auto_stop}, Auto-Delete: {auto_delete}, Auto-Purge: {auto_purge}")
+
+    def _fail(i: int, message: str):
+        req = objects[i]
+        logger.warning(f"[Delete Plan] {req['object_type']} {req['object_id']}: {message}")
+        plan.errors[i] = {"status": "error", "message": message}
+
+    # 1. Fresh details for the requests the plan prepares. Services and groups are read in their
+    # own tier instead, since the earlier tiers change their state.
+    async def _fetch(i: int, req: Dict[str, Any]):
+        try:
+            plan.entities[i] = await get_nifi_object_details(object_type=req["object_type"], object_id=req["object_id"], bypass_cache=True)
+        except Exception as e:
+            _fail(i, f"Failed to delete {req['object_type']} {req['object_id']}: {e}")
+
+    await bounded_gather(
+        [_fetch(i, req) for i, req in enumerate(objects) if req["object_type"] in ("connection", "processor", "port")],
+        max_concurrency=max_concurrency
+    )
+
+    # 2. One /flow snapshot per parent group of the requested connections, processors and ports
+    by_group: Dict[str, List[int]] = {}
+    for i, entity in plan.entities.items():
+        parent_id = entity.get("component", {}).get("parentGroupId")
+        if parent_id:
+            by_group.setdefault(parent_id, []).append(i)
+    group_nodes: Dict[str, Any] = {}
+
+    async def _fetch_group(pg_id: str):
+        try:
+            group_nodes[pg_id] = await fetch_group_node(nifi_client, pg_id, local_logger=logger, use_cache=False)
+        except Exception as e:
+            logger.warning(f"[Delete Plan] Could not read process group {pg_id}: {e}")
+
+    await bounded_gather([_fetch_group(pg_id) for pg_id in by_group], max_concurrency=max_concurrency)
+
+    requested_connections = {objects[i]["object_id"] for i in plan.entities if objects[i]["object_type"] == "connection"}
+    # Group ID -> {component ID: revision} to stop with one call
+    to_stop: Dict[str, Dict[str, Dict]] = {}
+
+    for pg_id, indexes in by_group.items():
+        node = group_nodes.get(pg_id)
+        runnables = {e.get("id"): e for e in (node.processors + node.input_ports + node.output_ports)} if node else {}
+
+        def _stop(component_id: str):
+            entity = runnables.get(component_id)
+            if entity is not None and not _is_stopped(entity):
+                to_stop.setdefault(pg_id, {})[component_id] = entity.get("revision", {})
+
+        for i in indexes:
+            req = objects[i]
+            object_id = req["object_id"]
+            component = plan.entities[i].get("component", {})
+            name = component.get("name", req.get("name", object_id))
+
+            if req["object_type"] in ("processor", "port") and not _is_stopped(plan.entities[i]):
+                if not auto_stop:
+                    _fail(i, f"Failed to delete {req['object_type']} {object_id}: Cannot delete running {req['object_type']} {object_id} when Auto-Stop is disabled")
+                    continue
+                _stop(object_id)
+
+            if req["object_type"] == "processor" and node is not None:
+                attached = [
+                    c for c in node.connections
+                    if object_id in (c.get("component", {}).get("source", {}).get("id"), c.get("component", {}).get("destination", {}).get("id"))
+                    and c.get("id") not in requested_connections
+                ]
+                if attached and not auto_delete:
+                    _fail(i, f"Processor {name} has {len(attached)} connections. Auto-Delete is disabled. Please delete connections first or enable Auto-Delete.")
+                    continue
+                for connection in attached:
+                    logger.info(f"[Auto-Delete] Connection {connection.get('id')} will be deleted before processor {name} ({object_id})")
+                    plan.auto_delete_connections[connection["id"]] = connection
+                    plan.connection_owners.setdefault(connection["id"], []).append(i)
+                    _stop(connection.get("component", {}).get("source", {}).get("id"))
+
+            if req["object_type"] == "connection" and auto_stop:
+                _stop(component.get("source", {}).get("id"))
+
+    # 3. Auto-Stop: one scheduling call per parent group, then poll until everything has stopped
+    async def _stop_group(pg_id: str, components: Dict[str, Dict]):
+        nifi_req = {"operation": "update_process_group_state", "process_group_id": pg_id, "state": "STOPPED", "components": list(components)}
+        logger.bind(interface="nifi", direction="request", data=nifi_req).debug("Calling NiFi API (group scheduling)")
+
+        def _fail_stopping(e: Exception):
+            for i in by_group[pg_id]:
+                if objects[i]["object_id"] in components and i not in plan.errors:
+                    _fail(i, f"Failed to delete {objects[i]['object_type']} {objects[i]['object_id']}: Failed to auto-stop {objects[i]['object_type']}: {e}")
+
+        try:
+            await nifi_client.update_process_group_state(pg_id, "STOPPED", components=components)
+            logger.bind(interface="nifi", direction="response", data={"status": "success"}).debug("Received from NiFi API (group scheduling)")
+        except Exception as e:
+            logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received error from NiFi API (group scheduling)")
+            _fail_stopping(e)
+            return
+        logger.info(f"[Auto-Stop] Stopping {len(components)} components in process group {pg_id} with one call")
+
+        def _all_stopped(node) -> bool:
+            states = {e.get("id"): e for e in (node.processors + node.input_ports + node.output_ports)}
+            return all(component_id not in states or _is_stopped(states[component_id]) for component_id in components)
+
+        try:
+            settled, node = await _wait_for_state(
+                f"{len(components)} components in process group {pg_id} to stop",
+                lambda: fetch_group_node(nifi_client, pg_id, local_logger=logger, use_cache=False),
+                _all_stopped,
+                logger
+            )
+        except Exception as e:
+            logger.warning(f"[Auto-Stop] Could not confirm that components in process group {pg_id} stopped: {e}")
+            _fail_stopping(e)
+            return
+        if not settled:
+            logger.warning("[Auto-Stop] Some components may not be fully stopped yet. Proceeding with caution.")
+        # Requested components continue with their stopped state and revision
+        refreshed = {e.get("id"): e for e in (node.processors + node.input_ports + node.output_ports)}
+        for i in by_group[pg_id]:
+            if i not in plan.errors and objects[i]["object_id"] in refreshed:
+                plan.entities[i] = {**plan.entities[i], **refreshed[objects[i]["object_id"]]}
+
+    await bounded_gather([_stop_group(pg_id, components) for pg_id, components in to_stop.items()], max_concurrency=max_concurrency)
+
+    # 4. Auto-Purge: every queue being deleted, in one concurrent batch
+    to_purge: Dict[str, List[int]] = {}
+    for i, entity in plan.entities.items():
+        if objects[i]["object_type"] != "connection" or i in plan.errors or _queued_count(entity) <= 0:
+            continue
+        if not auto_purge:
+            _fail(i, f"Cannot delete connection {objects[i]['object_id']} with {_queued_count(entity)} queued items when Auto-Purge is disabled")
+            continue
+        to_purge[objects[i]["object_id"]] = [i]
+    if auto_purge:
+        for connection_id, connection in plan.auto_delete_connections.items():
+            if _queued_count(connection) > 0:
+                to_purge[connection_id] = plan.connection_owners[connection_id]
+
+    if to_purge:
+        logger.info(f"[Auto-Purge] Purging {len(to_purge)} connection queues")
+        purge = await nifi_client.purge_connections_flowfiles(
+            list(to_purge), timeout_seconds=30, max_concurrency=mcp_settings.get_nifi_purge_max_concurrency()
+        )
+        for result in purge["results"]:
+            if result["success"]:
+                continue
+            connection_id = result["connection_id"]
+            for i in to_purge[connection_id]:
+                if i not in plan.errors:
+                    if objects[i]["object_type"] == "connection":
+                        _fail(i, f"Failed to delete connection {connection_id}: Failed to auto-purge connection queue: {result.get('error')}")
+                    else:
+                        _fail(i, f"Auto-Delete encountered 1 errors: {connection_id}: Failed to purge queue: {result.get('error')}")
+
+    # Connections only needed by processors that cannot be deleted stay in place
+    for connection_id, owners in list(plan.connection_owners.items()):
+        if all(i in plan.errors for i in owners):
+            plan.auto_delete_connections.pop(connection_id, None)
+            plan.connection_owners.pop(connection_id)
+
+    return plan
+
+
+async def _delete_auto_connections(plan: _DeletionPlan, nifi_client: NiFiClient, logger, max_concurrency: int):
+    """Deletes the connections Auto-Delete found; a failure fails every processor request that needed it gone."""
+    failures: Dict[int, List[str]] = {}
+
+    async def _delete(connection_id: str):
+        try:
+            deleted = await nifi_client.delete_connection(connection_id)
+            error = None if deleted else "NiFi API returned false"
+        except Exception as e:
+            error = str(e)
+        if error is None:
+            logger.info(f"[Auto-Delete] Successfully deleted connection {connection_id}")
+            return
+        logger.warning(f"[Auto-Delete] Could not delete connection {connection_id}: {error}")
+        for i in plan.connection_owners.get(connection_id, []):
+            failures.setdefault(i, []).append(f"{connection_id}: {error}")
+
+    await bounded_gather([_delete(connection_id) for connection_id in plan.auto_delete_connections], max_concurrency=max_concurrency)
+    for i, errors in failures.items():
+        if i not in plan.errors:
+            plan.errors[i] = {"status": "error", "message": f"Auto-Delete encountered {len(errors)} errors: {', '.join(errors)}"}
+
+
 async def _delete_single_nifi_object(
     object_type: str,
     object_id: str,
     object_name: str,
     nifi_client: NiFiClient,
-    logger
+    logger,
+    current_entity: Optional[Dict] = None
 ) -> Dict:
     """
     Internal function to delete a single NiFi object.
-    Contains the core deletion logic extracted from the original delete_nifi_object function.
+    Auto-Stop of processors and ports, Auto-Delete and Auto-Purge are batch-level steps done by
+    _plan_batch_deletion beforehand; this disables services and stops process groups itself.
     """
     logger.info(f"Executing deletion for {object_type} '{object_name}' ({object_id})")
 
     try:
-        # 1. Get current details using get_nifi_object_details
-        logger.info(f"Fetching details for {object_type} {object_id}")
-        current_entity = await get_nifi_object_details(object_type=object_type, object_id=object_id)
+        # 1. Get current details unless the batch plan already has them
+        if not current_entity:
+            logger.info(f"Fetching details for {object_type} {object_id}")
+            current_entity = await get_nifi_object_details(object_type=object_type, object_id=object_id, bypass_cache=True)
         if not current_entity:
             raise ToolError(f"Could not retrieve details for {object_type} {object_id}")
 
@@ -1296,344 +1585,56 @@ async def _delete_single_nifi_object(
         state = component.get("state")
         name = component.get("name", object_name)
 
-        # --- AUTO-DELETE PRE-EMPTIVE LOGIC ---
-        if original_object_type == "processor":
-            # Get headers from request context
-            from config.logging_setup import request_context
-            context_data = request_context.get()
-            request_headers = context_data.get('headers', {}) if context_data else {}
-            
-            # Convert header keys to lowercase for case-insensitive comparison
-            if request_headers:
-                request_headers = {k.lower(): v for k, v in request_headers.items()}
-            
-            is_auto_delete_feature_enabled = mcp_settings.get_feature_auto_delete_enabled(headers=request_headers)
-            logger.info(f"[Auto-Delete] Feature flag check - headers: {request_headers}")
-            logger.info(f"[Auto-Delete] Feature enabled: {is_auto_delete_feature_enabled}")
-            
-            # Auto-Stop should have already run by this point and verified processor stopped
-            # Now check for connections
-            processor_details = await nifi_client.get_processor_details(object_id)
-            processor_component = processor_details.get("component", {})
-            processor_name = processor_component.get("name", "unknown")
-            parent_pg_id = processor_component.get("parentGroupId")
-            
-            if not parent_pg_id:
-                logger.error(f"[Auto-Delete] Could not determine parent process group for processor {processor_name} ({object_id})")
-                return {"status": "error", "message": f"Failed to determine parent process group for processor {processor_name}"}
-            
-            # Check if the processor is part of any connections
-            logger.info(f"[Auto-Delete] Checking for connections to processor {processor_name} ({object_id}) in process group {parent_pg_id}")
-            try:
-                connections_list = await nifi_client.list_connections(parent_pg_id)
-                
-                connections = []
-                connection_ids = []
-                for connection_data in connections_list:
-                    # The connection details are in the first item of the list
-                    if not isinstance(connection_data, dict):
-                        continue
-                    component = connection_data.get('component', {})
-                    source = component.get('source', {})
-                    destination = component.get('destination', {})
-                    if (source.get('id') == object_id or destination.get('id') == object_id):
-                        connections.append(connection_data)
-                        connection_id = connection_data.get('id')
-                        if not connection_id:
-                            # Try to get from component if not at root level
-                            connection_id = component.get('id')
-                        if connection_id:
-                            connection_ids.append(connection_id)
-                            logger.info(f"[Auto-Delete] Found connection: {connection_id} with source={source.get('id')} and destination={destination.get('id')}")
-                
-                if connections:
-                    logger.info(f"[Auto-Delete] Found {len(connections)} connections for processor {processor_name}")
-                    
-                    if not is_auto_delete_feature_enabled:
-                        # Auto-Delete is disabled, we should fail the deletion
-                        logger.warning(f"[Auto-Delete] Feature disabled. Cannot delete processor with connections.")
-                        return {"status": "error", "message": f"Processor {processor_name} has {len(connections)} connections. Auto-Delete is disabled. Please delete connections first or enable Auto-Delete."}
-                    
-                    # Auto-Delete is enabled, delete the connections first
-                    logger.info(f"[Auto-Delete] Feature enabled. Automatically deleting {len(connections)} connections.")
-                    
-                    # Use the batch delete method to delete all connections at once
-                    if connection_ids:
-                        logger.info(f"[Auto-Delete] Attempting batch deletion of {len(connection_ids)} connections: {connection_ids}")
-                        try:
-                            # Make sure we have a valid client
-                            if not nifi_client._client:
-                                await nifi_client._get_client()
-                            
-                            # First, check if any source processors are running and stop them
-                            processors_to_stop = set()
-                            for connection_data in connections:
-                                component = connection_data.get('component', {})
-                                source = component.get('source', {})
-                                source_id = source.get('id')
-                                source_type = source.get('type', '').upper()
-                                
-                                # Only stop processors, not other component types
-                                if source_id and source_type == 'PROCESSOR' and source_id != object_id:
-                                    # Check if the processor is running
-                                    try:
-                                        proc_details = await nifi_client.get_processor_details(source_id)
-                                        proc_state = proc_details.get('component', {}).get('state', '')
-                                        if proc_state == 'RUNNING':
-                                            processors_to_stop.add(source_id)
-                                            logger.info(f"[Auto-Delete] Found running source processor {source_id} that needs to be stopped")
-                                    except Exception as e:
-                                        logger.warning(f"[Auto-Delete] Could not check processor {source_id} state: {e}")
-                            
-                            # Stop any running processors
-                            for proc_id in processors_to_stop:
-                                try:
-                                    logger.info(f"[Auto-Delete] Stopping processor {proc_id} to allow connection deletion")
-                                    await nifi_client.stop_processor(proc_id)
-                                    # Wait a moment for the processor to fully stop
-                                    await asyncio.sleep(1)
-                                except Exception as e:
-                                    logger.warning(f"[Auto-Delete] Failed to stop processor {proc_id}: {e}")
-
-                            # Verify processors are fully stopped before proceeding with connection deletion
-                            if processors_to_stop:
-                                logger.info(f"[Auto-Delete] Verifying {len(processors_to_stop)} processors are fully stopped")
-                                max_wait_seconds = 5
-                                for attempt in range(max_wait_seconds):
-                                    all_stopped = True
-                                    for proc_id in processors_to_stop:
-                                        try:
-                                            proc_details = await nifi_client.get_processor_details(proc_id)
-                                            proc_state = proc_details.get('component', {}).get('state')
-                                            if proc_state != 'STOPPED':
-                                                logger.info(f"[Auto-Delete] Processor {proc_id} still in state {proc_state} on attempt {attempt+1}")
-                                                all_stopped = False
-                                                break
-                                        except Exception as e:
-                                            logger.warning(f"[Auto-Delete] Error checking processor state: {e}")
-                                            all_stopped = False
-                                            break
-                                    
-                                    if all_stopped:
-                                        logger.info(f"[Auto-Delete] All source processors verified as stopped")
-                                        break
-                                    
-                                    if attempt < max_wait_seconds - 1:  # Don't sleep on last iteration
-                                        logger.info(f"[Auto-Delete] Waiting for processors to stop (attempt {attempt+1}/{max_wait_seconds})")
-                                        await asyncio.sleep(1)
-                                
-                                if not all_stopped:
-                                    logger.warning(f"[Auto-Delete] Some processors may not be fully stopped yet. Proceeding with caution.")
-                            
-                            # Now try to delete the connections
-                            auto_delete_errors = []  # Initialize the errors collection
-                            batch_results = await nifi_client.delete_connections_batch(connection_ids)
-                            
-                            # Debug output
-                            for conn_id, result in batch_results.items():
-                                if result.get("success"):
-                                    logger.info(f"[Auto-Delete] Successfully deleted connection {conn_id}")
-                                else:
-                                    error_msg = result.get('message', 'Unknown error')
-                                    # Check if this is an expected error (processor still running)
-                                    if "running" in error_msg.lower() or "active" in error_msg.lower():
-                                        logger.warning(f"[Auto-Delete] Could not delete connection {conn_id}: {error_msg}")
-                                    else:
-                                        logger.error(f"[Auto-Delete] Failed to delete connection {conn_id}: {error_msg}")
-                                    auto_delete_errors.append(f"{conn_id}: {error_msg}")
-                                    if result.get("error"):
-                                        # Log the actual error at debug level to reduce console noise
-                                        logger.debug(f"[Auto-Delete] Error details: {str(result.get('error'))}")
-                        except Exception as conn_delete_error:
-                            error_msg = f"Error in batch deletion: {conn_delete_error}"
-                            logger.error(f"[Auto-Delete] {error_msg}")
-                            auto_delete_errors.append(error_msg)
-                        
-                        # Check for any failures
-                        failures = []
-                        for conn_id, result in batch_results.items():
-                            if not result.get("success"):
-                                failures.append(f"{conn_id}: {result.get('message')}")
-                                
-                        if failures:
-                            error_message = f"Auto-Delete encountered {len(failures)} errors: {', '.join(failures)}"
-                            # Log as warning if we're proceeding with processor deletion anyway
-                            logger.warning(f"[Auto-Delete] {error_message}")
-                            return {"status": "error", "message": error_message}
-                        
-                        logger.info(f"[Auto-Delete] Successfully deleted {len(connection_ids)} connections in batch.")
-                else:
-                    logger.info(f"[Auto-Delete] No connections found for processor {processor_name}")
-            except Exception as e:
-                logger.error(f"[Auto-Delete] Error checking for connections: {str(e)}")
-                return {"status": "error", "message": f"Error checking for connections: {str(e)}"}
-
-        # --- AUTO-PURGE PRE-EMPTIVE LOGIC ---
-        if object_type == "connection":
-            # Get headers from request context
-            from config.logging_setup import request_context
-            context_data = request_context.get()
-            request_headers = context_data.get('headers', {}) if context_data else {}
-            
-            # Convert header keys to lowercase for case-insensitive comparison
-            if request_headers:
-                request_headers = {k.lower(): v for k, v in request_headers.items()}
-            
-            is_auto_purge_feature_enabled = mcp_settings.get_feature_auto_purge_enabled(headers=request_headers)
-            logger.info(f"[Auto-Purge] Feature flag check - headers: {request_headers}")
-            logger.info(f"[Auto-Purge] Feature enabled: {is_auto_purge_feature_enabled}")
-
-            # Check if connection has queued data
-            connection_status = current_entity.get("status", {}).get("aggregateSnapshot", {})
-            queued_count = int(connection_status.get("queuedCount", "0"))
-            
-            if queued_count > 0:
-                if is_auto_purge_feature_enabled:
-                    # Attempt to purge the queue
-                    logger.info(f"[Auto-Purge] Connection has {queued_count} queued items. Attempting to purge.")
-                    try:
-                        # Create a drop request
-                        drop_request = await nifi_client.create_drop_request(object_id)
-                        drop_request_id = drop_request.get("id") # Get ID directly from the drop request object
-                        if not drop_request_id:
-                            raise ToolError("Failed to create drop request - no ID returned")
-                        
-                        # Wait for the drop request to complete
-                        await nifi_client.handle_drop_request(object_id, timeout_seconds=30)
-                        logger.info(f"[Auto-Purge] Successfully purged queue for connection {object_id}")
-                    except Exception as e:
-                        logger.error(f"[Auto-Purge] Failed to purge connection queue: {e}", exc_info=True)
-                        raise ToolError(f"Failed to auto-purge connection queue: {e}")
-                else:
-                    error_msg = f"Cannot delete connection {object_id} with {queued_count} queued items when Auto-Purge is disabled"
-                    logger.warning(error_msg)
-                    return {"status": "error", "message": error_msg}
-
         # --- AUTO-DISABLE PRE-EMPTIVE LOGIC ---
         if original_object_type == "controller_service" and state == "ENABLED":
             logger.info(f"Controller service '{name}' is ENABLED. Auto-disabling for deletion.")
             try:
                 nifi_request_data = {"operation": "disable_controller_service", "controller_service_id": object_id}
                 logger.bind(interface="nifi", direction="request", data=nifi_request_data).debug("Calling NiFi API")
-                await nifi_client.disable_controller_service(object_id)
+                await nifi_client.disable_controller_service(object_id, revision=current_revision_dict)
                 logger.bind(interface="nifi", direction="response", data={"status": "success"}).debug("Received from NiFi API")
-                
-                # Wait for controller service to fully disable
-                max_wait_seconds = 15
-                for attempt in range(max_wait_seconds):
-                    updated_details = await nifi_client.get_controller_service_details(object_id)
-                    current_state = updated_details.get("component", {}).get("state")
-                    if current_state == "DISABLED":
-                        logger.info(f"[Auto-Disable] Confirmed controller service {object_id} is disabled")
-                        # Update our references with the latest details
-                        current_entity = updated_details
-                        component = current_entity.get("component", {})
-                        current_revision_dict = current_entity.get("revision")
-                        current_version = current_revision_dict.get("version") if current_revision_dict else None
-                        state = current_state
-                        name = component.get("name", object_name)
-                        break
-                    
-                    if attempt == max_wait_seconds - 1:
-                        raise ToolError(f"Controller service {object_id} did not disable after {max_wait_seconds} seconds")
-                    
-                    logger.info(f"[Auto-Disable] Waiting for controller service to disable (attempt {attempt + 1}/{max_wait_seconds})")
-                    await asyncio.sleep(1)
+
+                disabled, updated_details = await _wait_for_state(
+                    f"controller service {object_id} to disable",
+                    lambda: nifi_client.get_controller_service_details(object_id),
+                    lambda details: details.get("component", {}).get("state") == "DISABLED",
+                    logger
+                )
+                if not disabled:
+                    raise ToolError(f"Controller service {object_id} did not disable after {_STATE_SETTLE_TIMEOUT_SECONDS} seconds")
+                logger.info(f"[Auto-Disable] Confirmed controller service {object_id} is disabled")
+                current_version = updated_details.get("revision", {}).get("version", current_version)
+                state = updated_details.get("component", {}).get("state")
 
             except Exception as e:
                 logger.error(f"[Auto-Disable] Failed to disable controller service: {e}", exc_info=True)
                 logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received error from NiFi API")
                 raise ToolError(f"Failed to auto-disable controller service for deletion: {e}")
 
-        # --- AUTO-STOP PRE-EMPTIVE LOGIC --- 
-        if original_object_type == "processor" and state == "RUNNING":
-            logger.info(f"Processor '{name}' is RUNNING. Checking Auto-Stop feature.")
-            
-            # Get headers from request context
-            from config.logging_setup import request_context
-            context_data = request_context.get()
-            request_headers = context_data.get('headers', {}) if context_data else {}
-            
-            # Convert header keys to lowercase for case-insensitive comparison
-            if request_headers:
-                request_headers = {k.lower(): v for k, v in request_headers.items()}
-            
-            is_auto_stop_feature_enabled = mcp_settings.get_feature_auto_stop_enabled(headers=request_headers)
-            logger.info(f"[Auto-Stop] Feature flag check - headers: {request_headers}")
-            logger.info(f"[Auto-Stop] Feature enabled: {is_auto_stop_feature_enabled}")
-
-            if is_auto_stop_feature_enabled:
-                # Stop the component first
-                logger.info(f"[Auto-Stop] Stopping {original_object_type} {object_id}")
-                try:
-                    async def verify_stopped(obj_type: str, obj_id: str, max_wait_seconds: int = 15) -> bool:
-                        """Verify that a component (processor or process group) has stopped."""
-                        for attempt in range(max_wait_seconds):
-                            if obj_type == "processor":
-                                details = await nifi_client.get_processor_details(obj_id)
-                                current_state = details.get("component", {}).get("state")
-                                if current_state == "STOPPED":
-                                    logger.info(f"[Auto-Stop] Confirmed processor {obj_id} is stopped")
-                                    return True, details  # Return both status and details
-                            elif obj_type == "process_group":
-                                # For PGs, we need to check all processors within
-                                processors = await list_nifi_objects(
-                                    object_type="processors",
-                                    process_group_id=obj_id,
-                                    search_scope="all"
-                                )
-                                all_stopped = True
-                                for proc in processors:
-                                    if isinstance(proc, dict):
-                                        state = proc.get("component", {}).get("state")
-                                        if state == "RUNNING":
-                                            all_stopped = False
-                                            break
-                                if all_stopped:
-                                    logger.info(f"[Auto-Stop] Confirmed all processors in PG {obj_id} are stopped")
-                                    return True, None  # No specific details for PG
-                            
-                            if attempt == max_wait_seconds - 1:
-                                logger.warning(f"[Auto-Stop] Maximum wait time reached without confirming stopped state for {obj_type} {obj_id}")
-                                return False, None
-                            
-                            logger.info(f"[Auto-Stop] Waiting for {obj_type} to stop (attempt {attempt + 1}/{max_wait_seconds})")
-                            await asyncio.sleep(1)
-                        return False, None
-
-                    if original_object_type == "processor":
-                        nifi_request_data = {"operation": "stop_processor", "processor_id": object_id}
-                        logger.bind(interface="nifi", direction="request", data=nifi_request_data).debug("Calling NiFi API")
-                        await nifi_client.stop_processor(object_id)
-                        logger.bind(interface="nifi", direction="response", data={"status": "success"}).debug("Received from NiFi API")
-                        
-                        is_stopped, updated_details = await verify_stopped("processor", object_id)
-                        if not is_stopped:
-                            raise ToolError(f"Processor {object_id} did not stop after 15 seconds")
-                        # Update our state and component info with the latest details
-                        if updated_details:
-                            state = updated_details.get("component", {}).get("state")
-                            component = updated_details.get("component", {})
-                            name = component.get("name", object_name)
-                            current_revision_dict = updated_details.get("revision")
-                            current_version = current_revision_dict.get("version") if current_revision_dict else None
-                            
-                    elif original_object_type == "process_group":
-                        nifi_request_data = {"operation": "stop_process_group", "process_group_id": object_id}
-                        logger.bind(interface="nifi", direction="request", data=nifi_request_data).debug("Calling NiFi API")
-                        await nifi_client.stop_process_group(object_id)
-                        logger.bind(interface="nifi", direction="response", data={"status": "success"}).debug("Received from NiFi API")
-                        
-                        is_stopped, _ = await verify_stopped("process_group", object_id)
-                        if not is_stopped:
-                            raise ToolError(f"Process Group {object_id} did not fully stop after 15 seconds")
-
-                except Exception as e:
-                    logger.error(f"[Auto-Stop] Failed to stop {original_object_type}: {e}", exc_info=True)
-                    logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received error from NiFi API")
-                    raise ToolError(f"Failed to auto-stop {original_object_type}: {e}")
-            else:
+        # --- AUTO-STOP PRE-EMPTIVE LOGIC (process groups) ---
+        if original_object_type == "process_group" and (current_entity.get("runningCount") or 0) > 0:
+            if not mcp_settings.get_feature_auto_stop_enabled(headers=_request_feature_headers()):
                 raise ToolError(f"Cannot delete running {original_object_type} {object_id} when Auto-Stop is disabled")
+            logger.info(f"[Auto-Stop] Stopping process group {object_id} ({current_entity.get('runningCount')} running components)")
+            try:
+                nifi_request_data = {"operation": "stop_process_group", "process_group_id": object_id}
+                logger.bind(interface="nifi", direction="request", data=nifi_request_data).debug("Calling NiFi API")
+                await nifi_client.stop_process_group(object_id)
+                logger.bind(interface="nifi", direction="response", data={"status": "success"}).debug("Received from NiFi API")
+
+                stopped, updated_details = await _wait_for_state(
+                    f"process group {object_id} to stop",
+                    lambda: nifi_client.get_process_group_details(object_id),
+                    lambda details: (details.get("runningCount") or 0) == 0,
+                    logger
+                )
+                if not stopped:
+                    raise ToolError(f"Process Group {object_id} did not fully stop after {_STATE_SETTLE_TIMEOUT_SECONDS} seconds")
+                current_version = updated_details.get("revision", {}).get("version", current_version)
+            except Exception as e:
+                logger.error(f"[Auto-Stop] Failed to stop {original_object_type}: {e}", exc_info=True)
+                logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received error from NiFi API")
+                raise ToolError(f"Failed to auto-stop {original_object_type}: {e}")
 
         # Final check on state before attempting deletion
         if object_type != "connection" and state == "RUNNING":
@@ -1647,7 +1648,8 @@ async def _delete_single_nifi_object(
              logger.warning(error_msg)
              return {"status": "error", "message": error_msg} 
 
-        # 2. Attempt deletion using the obtained version
+        # 2. Attempt deletion at the last known revision (auto-deleted connections and purges
+        # since the fetch are already accounted for by the client's revision tracking)
         delete_op = f"delete_{object_type}" # Use potentially refined object_type for ports
         nifi_delete_req = {"operation": delete_op, "id": object_id, "version": current_version}
         logger.bind(interface="nifi", direction="request", data=nifi_delete_req).debug("Calling NiFi API (delete)")
@@ -1655,11 +1657,13 @@ async def _delete_single_nifi_object(
         deleted = False
         try:
             if object_type == "processor":
-                deleted = await nifi_client.delete_processor(object_id, current_version)
+                deleted = await nifi_client.delete_processor(object_id)
             elif object_type == "connection":
-                deleted = await nifi_client.delete_connection(object_id, current_version)
-            elif object_type in ["input_port", "output_port"]:
-                deleted = await nifi_client.delete_port(object_id, current_version)
+                deleted = await nifi_client.delete_connection(object_id)
+            elif object_type == "input_port":
+                deleted = await nifi_client.delete_input_port(object_id)
+            elif object_type == "output_port":
+                deleted = await nifi_client.delete_output_port(object_id)
             elif object_type == "process_group":
                 deleted = await nifi_client.delete_process_group(object_id, current_version)
             elif object_type == "controller_service":
@@ -1,5 +1,5 @@
 import asyncio
-from typing import List, Dict, Optional, Any, Union, Literal
+from typing import List, Dict, Optional, Any, Union, Literal, Tuple
 import httpx
 import json
 
@@ -22,6 +22,8 @@ from .utils import (
 )
 from nifi_mcp_server.nifi_client import NiFiClient, NiFiAuthenticationError
 from mcp.server.fastmcp.exceptions import ToolError
+from config import settings as mcp_settings
+from nifi_mcp_server.flow_snapshot import bounded_gather, fetch_group_node
 
 # Import status checking function from review module
 from .review import get_process_group_status
@@ -32,7 +34,8 @@ from .review import get_process_group_status
 async def operate_nifi_object(
     object_type: Literal["processor", "port", "process_group", "controller_service"],
     object_id: str,
-    operation_type: Literal["start", "stop", "enable", "disable"]
+    operation_type: Literal["start", "stop", "enable", "disable"],
+    entity: Optional[Dict] = None
 ) -> Dict:
     """
     Internal function to operate on a single NiFi object.
@@ -47,6 +50,8 @@ async def operate_nifi_object(
             - 'start'/'stop': For processors, ports, and process groups
             - 'enable'/'disable': For controller services
             - For 'process_group', start/stop applies to all eligible components within
+        entity: The controller service entity, when the caller has already read it; the
+            enable pre-check and the state change reuse it instead of fetching it again.
 
     Returns:
         A dictionary indicating the status (success, warning, error) and potentially the updated entity.
@@ -132,7 +137,9 @@ async def operate_nifi_object(
 
             nifi_update_req = {"operation": operation_name_for_log, "processor_id": object_id, "state": target_state}
             local_logger.bind(interface="nifi", direction="request", data=nifi_update_req).debug("Calling NiFi API")
-            updated_entity = await nifi_client.update_processor_state(object_id, target_state)
+            # Reuse the revision from the start pre-check instead of fetching the processor again
+            precheck_revision = proc_details.get("revision") if operation_type == "start" else None
+            updated_entity = await nifi_client.update_processor_state(object_id, target_state, revision=precheck_revision)
 
             # --- Format and return processor result ---
             filtered_entity = filter_created_processor_data(updated_entity) # Re-use processor filter
@@ -295,9 +302,13 @@ async def operate_nifi_object(
             if operation_type == "enable":
                 local_logger.info(f"Performing pre-checks...")
                 try:
-                    nifi_get_req = {"operation": "get_controller_service_details", "controller_service_id": object_id}
-                    local_logger.bind(interface="nifi", direction="request", data=nifi_get_req).debug("Calling NiFi API (pre-check)")
-                    cs_details = await nifi_client.get_controller_service_details(object_id)
+                    # An entity that looked invalid is read again: a service it references may
+                    # have been enabled since
+                    cs_details = entity if (entity or {}).get("component", {}).get("validationStatus") == "VALID" else None
+                    if cs_details is None:
+                        nifi_get_req = {"operation": "get_controller_service_details", "controller_service_id": object_id}
+                        local_logger.bind(interface="nifi", direction="request", data=nifi_get_req).debug("Calling NiFi API (pre-check)")
+                        cs_details = await nifi_client.get_controller_service_details(object_id)
                     component_precheck = cs_details.get("component", {})
                     precheck_resp = {
                         "id": object_id,
@@ -335,9 +346,10 @@ async def operate_nifi_object(
             local_logger.bind(interface="nifi", direction="request", data=nifi_update_req).debug("Calling NiFi API")
             
             if operation_type == "enable":
-                updated_entity = await nifi_client.enable_controller_service(object_id)
+                # Reuse the revision from the enable pre-check
+                updated_entity = await nifi_client.enable_controller_service(object_id, revision=cs_details.get("revision"))
             else:  # disable
-                updated_entity = await nifi_client.disable_controller_service(object_id)
+                updated_entity = await nifi_client.disable_controller_service(object_id, revision=(entity or {}).get("revision"))
 
             # --- Format and return controller service result ---
             from .utils import filter_controller_service_data
@@ -400,11 +412,13 @@ async def _operate_single_nifi_object(
     operation_type: str,
     object_name: str,
     nifi_client: NiFiClient,
-    logger
+    logger,
+    entity: Optional[Dict] = None
 ) -> Dict:
     """
     Internal function to operate on a single NiFi object.
     Contains the core operation logic extracted from the original operate_nifi_object function.
+    `entity` is the object's entity if the batch has already read it.
     """
     logger.info(f"Executing {operation_type} operation on {object_type} '{object_name}' ({object_id})")
 
@@ -419,7 +433,8 @@ async def _operate_single_nifi_object(
             result = await operate_nifi_object(
                 object_type=object_type,
                 object_id=object_id,
-                operation_type=operation_type
+                operation_type=operation_type,
+                entity=entity
             )
             return result
         finally:
@@ -435,11 +450,163 @@ async def _operate_single_nifi_object(
         }
 
 
+# Batched operations run one phase per operation type, in this order
+_OPERATION_PHASE_ORDER = ["stop", "disable", "enable", "start"]
+
+OperationMember = Tuple[int, Dict[str, Any]]  # (request index, operation request)
+
+
+def _split_into_segments(operations: List[Dict[str, Any]]) -> List[List[OperationMember]]:
+    """
+    Splits a batch wherever an object is operated on again, so that operations on the same
+    object keep the caller's order. Each segment is run in phase order, one after another.
+    """
+    segments: List[List[OperationMember]] = []
+    seen = set()
+    for i, req in enumerate(operations):
+        if not segments or req["object_id"] in seen:
+            segments.append([])
+            seen = set()
+        segments[-1].append((i, req))
+        seen.add(req["object_id"])
+    return segments
+
+
+async def _service_dependency_layers(
+    members: List[OperationMember],
+    nifi_client: NiFiClient,
+    logger,
+    max_concurrency: int
+) -> Tuple[List[List[OperationMember]], Dict[str, Dict]]:
+    """
+    Orders controller service operations so each service comes after the services of the
+    batch it references (through a property value holding the other service's ID).
+
+    Returns layers whose services can be enabled together (disables run them in reverse),
+    and the service entities read to order them, by ID, for the operations to reuse.
+    Services whose details cannot be read, and reference cycles, end up in the last layer.
+    """
+    if len(members) < 2:
+        return [members], {}
+    service_ids = {req["object_id"] for _, req in members}
+    entities = await bounded_gather(
+        [nifi_client.get_controller_service_details(req["object_id"]) for _, req in members],
+        return_exceptions=True,
+        max_concurrency=max_concurrency
+    )
+    references: Dict[str, set] = {}
+    read_entities: Dict[str, Dict] = {}
+    for (_, req), entity in zip(members, entities):
+        if isinstance(entity, BaseException):
+            logger.warning(f"Could not read controller service {req['object_id']} to order the batch: {entity}")
+            properties = {}
+        else:
+            read_entities[req["object_id"]] = entity
+            properties = entity.get("component", {}).get("properties") or {}
+        references[req["object_id"]] = {
+            value for value in properties.values() if value in service_ids and value != req["object_id"]
+        }
+
+    layers: List[List[OperationMember]] = []
+    placed = set()
+    remaining = list(members)
+    while remaining:
+        layer = [member for member in remaining if references[member[1]["object_id"]] <= placed] or remaining
+        layers.append(layer)
+        placed.update(req["object_id"] for _, req in layer)
+        remaining = [member for member in remaining if member not in layer]
+    return layers, read_entities
+
+
+def _with_operation_metadata(result: Dict, operation_request: Dict[str, Any], request_index: int) -> Dict:
+    result["object_type"] = operation_request["object_type"]
+    result["object_id"] = operation_request["object_id"]
+    result["operation_type"] = operation_request["operation_type"]
+    result["object_name"] = operation_request.get("name", operation_request["object_id"])
+    result["request_index"] = request_index
+    return result
+
+
+async def _schedule_group_processors(
+    pg_id: str,
+    operation_type: str,
+    members: List[Tuple[int, Dict[str, Any]]],
+    nifi_client: NiFiClient,
+    logger
+) -> Optional[Dict[str, Dict]]:
+    """
+    Starts or stops every processor of a process group with one scheduling call.
+
+    Returns results keyed by processor ID, or None when the requests do not cover all of
+    the group's processors (the caller then operates on them one by one). Revisions and
+    start pre-checks come from a single /flow snapshot of the group, and the call names the
+    processors explicitly so ports and child groups keep their state.
+    """
+    target_state = "RUNNING" if operation_type == "start" else "STOPPED"
+    requested_ids = {req["object_id"] for _, req in members}
+    group_logger = logger.bind(process_group_id=pg_id, operation_type=operation_type)
+
+    try:
+        node = await fetch_group_node(nifi_client, pg_id, local_logger=group_logger, use_cache=False)
+    except Exception as e:
+        group_logger.warning(f"Could not read process group {pg_id} for group scheduling, operating per processor: {e}")
+        return None
+    group_processors = {p.get("id"): p for p in node.processors}
+    if set(group_processors) != requested_ids:
+        return None
+
+    results: Dict[str, Dict] = {}
+    components = {}
+    for proc_id, entity in group_processors.items():
+        component = entity.get("component", {})
+        name = component.get("name", proc_id)
+        if operation_type == "start":
+            validation_status = component.get("validationStatus")
+            if validation_status != "VALID":
+                validation_errors = component.get("validationErrors", [])
+                error_list_str = ", ".join(validation_errors) if validation_errors else "No specific errors listed."
+                results[proc_id] = {"status": "error", "message": f"Processor '{name}' cannot be started. Validation status: {validation_status}. Errors: [{error_list_str}]", "entity": None}
+                continue
+            if component.get("state") == "DISABLED":
+                results[proc_id] = {"status": "error", "message": f"Processor '{name}' cannot be started because it is DISABLED. Enable it first.", "entity": None}
+                continue
+        components[proc_id] = entity.get("revision", {})
+
+    if components:
+        nifi_update_req = {"operation": "update_process_group_state", "process_group_id": pg_id, "state": target_state, "components": list(components)}
+        group_logger.bind(interface="nifi", direction="request", data=nifi_update_req).debug("Calling NiFi API (group scheduling)")
+        try:
+            await nifi_client.update_process_group_state(pg_id, target_state, components=components)
+            refreshed = await fetch_group_node(nifi_client, pg_id, local_logger=group_logger, use_cache=False)
+        except (ValueError, NiFiAuthenticationError, ConnectionError) as e:
+            group_logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received error from NiFi API (group scheduling)")
+            for proc_id in components:
+                results[proc_id] = {"status": "error", "message": f"Failed to {operation_type} processor {proc_id} via process group {pg_id}: {e}", "entity": None}
+            return results
+
+        refreshed_processors = {p.get("id"): p for p in refreshed.processors}
+        for proc_id in components:
+            entity = refreshed_processors.get(proc_id, group_processors[proc_id])
+            filtered_entity = filter_created_processor_data(entity)
+            name = entity.get("component", {}).get("name", proc_id)
+            current_state = entity.get("component", {}).get("state")
+            if current_state == target_state:
+                action = "started" if operation_type == "start" else "stopped"
+                results[proc_id] = {"status": "success", "message": f"Processor '{name}' {action} successfully.", "entity": filtered_entity}
+            else:
+                action = "start" if operation_type == "start" else "stop"
+                results[proc_id] = {"status": "warning", "message": f"Processor '{name}' is {current_state} after {action} request. Check NiFi UI.", "entity": filtered_entity}
+        group_logger.info(f"Scheduled {len(components)} processors in process group {pg_id} to {target_state} with one call")
+
+    return results
+
+
 @smart_parameter_validation
 @mcp.tool()
 @tool_phases(["Operate"])
 async def operate_nifi_objects(
-    operations: List[Dict[str, Any]]
+    operations: List[Dict[str, Any]],
+    collapse_group_operations: bool = True
 ) -> List[Dict]:
     """
     Performs start, stop, enable, or disable operations on multiple NiFi objects in batch.
@@ -454,6 +621,18 @@ async def operate_nifi_objects(
             - object_id: The UUID of the object to operate on  
             - operation_type: The operation to perform ('start', 'stop', 'enable', or 'disable')
             - name (optional): A descriptive name for the object (used in logging/results)
+            - process_group_id (optional): Parent group of a processor, enables group scheduling
+        collapse_group_operations: When every processor of a group is started (or stopped),
+            schedule them with one process group call instead of one call per processor. The
+            group comes from the process_group_id hint, or from the processor's last known
+            parent group. Ports and child groups are left untouched.
+
+    Operations run in dependency order - stops, then controller service disables, then
+    enables, then starts - and the operations within each step run concurrently.
+    Controller services that reference other services of the batch are enabled after them
+    and disabled before them. When the same object appears more than once, the batch is
+    split at that point and the parts run one after another, so the object's operations
+    happen in the order given (e.g. enable then disable leaves it disabled).
     
     Example:
     ```python
@@ -523,18 +702,19 @@ async def operate_nifi_objects(
             raise ToolError(f"Operation request {i}: Invalid operation '{operation_type}' for {object_type}. Use 'start' or 'stop'.")
 
     local_logger.info(f"Executing operate_nifi_objects for {len(operations)} objects")
-    
-    results = []
-    
-    for i, operation_request in enumerate(operations):
+
+    max_concurrency = mcp_settings.get_nifi_operation_max_concurrency()
+    results: List[Optional[Dict]] = [None] * len(operations)
+
+    async def _run_single(i: int, operation_request: Dict[str, Any], entity: Optional[Dict] = None):
         object_type = operation_request["object_type"]
         object_id = operation_request["object_id"]
         operation_type = operation_request["operation_type"]
         object_name = operation_request.get("name", object_id)
-        
+
         request_logger = local_logger.bind(object_id=object_id, object_type=object_type, operation_type=operation_type, request_index=i)
         request_logger.info(f"Processing operation request {i+1}/{len(operations)} for {object_type} '{object_name}' ({object_id}): {operation_type}")
-        
+
         try:
             # Call the helper function that wraps the original operate_nifi_object logic
             result = await _operate_single_nifi_object(
@@ -543,32 +723,83 @@ async def operate_nifi_objects(
                 operation_type=operation_type,
                 object_name=object_name,
                 nifi_client=nifi_client,
-                logger=request_logger
+                logger=request_logger,
+                entity=entity
             )
-            
-            # Add metadata to the result
-            result["object_type"] = object_type
-            result["object_id"] = object_id
-            result["operation_type"] = operation_type
-            result["object_name"] = object_name
-            result["request_index"] = i
-            
-            results.append(result)
-            
         except Exception as e:
-            error_result = {
+            request_logger.error(f"Unexpected error in operation request {i}: {e}", exc_info=True)
+            result = {
                 "status": "error",
                 "message": f"Unexpected error during {operation_type} operation on {object_type} '{object_name}' ({object_id}): {e}",
-                "entity": None,
-                "object_type": object_type,
-                "object_id": object_id,
-                "operation_type": operation_type,
-                "object_name": object_name,
-                "request_index": i
+                "entity": None
             }
-            results.append(error_result)
-            request_logger.error(f"Unexpected error in operation request {i}: {e}", exc_info=True)
-    
+        results[i] = _with_operation_metadata(result, operation_request, i)
+
+    async def _run_group(pg_id: str, operation_type: str, members: List[OperationMember],
+                         fallback: List[OperationMember]):
+        group_results = await _schedule_group_processors(pg_id, operation_type, members, nifi_client, local_logger)
+        if group_results is None:
+            # Not the whole group: the phase operates on these processors one by one
+            fallback.extend(members)
+            return
+        for i, req in members:
+            results[i] = _with_operation_metadata(group_results[req["object_id"]], req, i)
+
+    async def _run_phase(phase_operation: str, phase: List[OperationMember]):
+        group_members: Dict[str, List[OperationMember]] = {}
+        services = []
+        singles = []
+        for i, req in phase:
+            pg_id = None
+            if collapse_group_operations and req["object_type"] == "processor":
+                pg_id = req.get("process_group_id") or nifi_client.revisions.parent_group_id(req["object_id"])
+            if pg_id:
+                group_members.setdefault(pg_id, []).append((i, req))
+            elif req["object_type"] == "controller_service":
+                services.append((i, req))
+            else:
+                singles.append((i, req))
+        for pg_id, members in list(group_members.items()):
+            if len(members) < 2:
+                singles.extend(group_members.pop(pg_id))
+
+        service_layers = []
+        service_entities: Dict[str, Dict] = {}
+        if services:
+            service_layers, service_entities = await _service_dependency_layers(services, nifi_client, local_logger, max_concurrency)
+            if phase_operation == "disable":
+                service_layers.reverse()
+        # Independent operations run alongside the first service layer
+        first_layer = service_layers.pop(0) if service_layers else []
+
+        local_logger.info(
+            f"Running {len(phase)} '{phase_operation}' operations "
+            f"({len(group_members)} group scheduling candidates, up to {max_concurrency} at a time)"
+        )
+        fallback: List[OperationMember] = []
+        await bounded_gather(
+            [_run_group(pg_id, phase_operation, members, fallback) for pg_id, members in group_members.items()]
+            + [_run_single(i, req) for i, req in singles]
+            + [_run_single(i, req, service_entities.get(req["object_id"])) for i, req in first_layer],
+            max_concurrency=max_concurrency
+        )
+        if fallback:
+            await bounded_gather([_run_single(i, req) for i, req in fallback], max_concurrency=max_concurrency)
+        for layer in service_layers:
+            await bounded_gather(
+                [_run_single(i, req, service_entities.get(req["object_id"])) for i, req in layer],
+                max_concurrency=max_concurrency
+            )
+
+    # Stops run first (so services can be disabled), services are enabled before anything
+    # starts, and the operations within each phase are independent and run concurrently.
+    # Repeated operations on one object start a new segment, keeping the caller's order.
+    for segment in _split_into_segments(operations):
+        for phase_operation in _OPERATION_PHASE_ORDER:
+            phase = [(i, req) for i, req in segment if req["operation_type"] == phase_operation]
+            if phase:
+                await _run_phase(phase_operation, phase)
+
     # Summary logging
     successful_operations = [r for r in results if r.get("status") == "success"]
     failed_operations = [r for r in results if r.get("status") == "error"]
@@ -825,9 +1056,13 @@ def format_drop_request_summary(result: Dict[str, Any]) -> Dict[str, Any]:
             return int(count_str.split('/')[0].strip())
         except (ValueError, AttributeError, IndexError):
             return 0
-            
-    total_dropped = sum(parse_dropped_count(str(r.get("dropped_count", "0"))) 
-                       for r in results if r.get("success", False))
+
+    succeeded = [r for r in results if r.get("success", False)]
+    total_dropped = sum(
+        r["dropped_flowfiles"] if "dropped_flowfiles" in r else parse_dropped_count(str(r.get("dropped_count", "0")))
+        for r in succeeded
+    )
+    total_dropped_bytes = sum(r.get("dropped_bytes", 0) for r in succeeded)
     
     return {
         "success": success,
@@ -836,45 +1071,55 @@ def format_drop_request_summary(result: Dict[str, Any]) -> Dict[str, Any]:
         "successful_drops": successful_drops,
         "failed_drops": failed_drops,
         "total_dropped": total_dropped,
+        "total_dropped_bytes": total_dropped_bytes,
         "results": results
     }
 
 @mcp.tool()
 @tool_phases(["Operate"])
 async def purge_flowfiles(
-    target_id: str,
+    target_id: Union[str, List[str]],
     target_type: Literal["connection", "process_group"],
     timeout_seconds: Optional[int] = 30
 ) -> Dict[str, Any]:
-    """Purges all FlowFiles from a connection or all connections in a process group.
+    """Purges all FlowFiles from one or more connections, or from all connections in a process group.
     
     This tool will wait for the purge operation to complete or until the timeout is reached.
-    For process groups, it will attempt to purge all connections and report any failures.
+    Several connections (a list of IDs, or every connection of a process group) are purged
+    concurrently, and the timeout covers the whole batch. Any failures are reported per connection.
     
     Args:
-        target_id: The ID of the connection or process group to purge
-        target_type: Either "connection" for a single connection or "process_group" for all connections in a PG
-        timeout_seconds: Maximum time in seconds to wait for each purge operation (default: 30)
+        target_id: The ID of the connection or process group to purge, or a list of connection IDs
+        target_type: Either "connection" for connection ID(s) or "process_group" for all connections in a PG
+        timeout_seconds: Maximum time in seconds to wait for the purge to finish (default: 30)
         
     Returns:
         Dict containing:
             - success: Whether all purge operations succeeded
             - message: Summary message
-            - summary: Detailed summary of operations
-            - results: List of individual purge results
+            - total_connections, successful_drops, failed_drops: Connection counts
+            - total_dropped, total_dropped_bytes: FlowFiles and bytes dropped overall
+            - results: List of individual purge results, with dropped_flowfiles and dropped_bytes each
     """
     nifi_client = current_nifi_client.get()
     local_logger = current_request_logger.get()
+    max_concurrency = mcp_settings.get_nifi_purge_max_concurrency()
     
     if target_type == "connection":
+        if isinstance(target_id, list):
+            local_logger.info(f"Purging {len(target_id)} connections (max {max_concurrency} concurrent)")
+            results = await nifi_client.purge_connections_flowfiles(target_id, timeout_seconds, max_concurrency)
+            return format_drop_request_summary(results)
         # Single connection purge
         result = await _handle_drop_request(nifi_client, target_id, timeout_seconds, local_logger)
         formatted_result = format_drop_request_summary(result)
         return formatted_result
     
     else:  # process_group
+        if isinstance(target_id, list):
+            raise ToolError("target_type 'process_group' takes a single process group ID.")
         # Use the client's process group purge method
-        results = await nifi_client.purge_process_group_flowfiles(target_id, timeout_seconds)
+        results = await nifi_client.purge_process_group_flowfiles(target_id, timeout_seconds, max_concurrency)
         return format_drop_request_summary(results)
 
 
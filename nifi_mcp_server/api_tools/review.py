@@ -1,6 +1,8 @@
 import asyncio
 import time
-from typing import List, Dict, Optional, Any, Union, Literal, Set
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Dict, Optional, Any, Union, Literal, Set, Tuple
 from datetime import datetime # Added import
 
 # Import necessary components from parent/utils
@@ -10,6 +12,7 @@ from ..core import mcp
 # Removed nifi_api_client import
 from .utils import (
     tool_phases,
+    streams_tool,
     # ensure_authenticated, # Removed - authentication handled by factory
     _format_processor_summary,
     _format_connection_summary,
@@ -29,6 +32,22 @@ from nifi_mcp_server.flow_documenter_improved import (
     extract_important_properties
 )
 
+from nifi_mcp_server.flow_snapshot import (
+    FlowSnapshot,
+    ProcessGroupNode,
+    bounded_gather,
+    decode_continuation_token,
+    fetch_flow_snapshot,
+    fetch_group_node,
+    iter_flow_groups,
+    start_traversal
+)
+from nifi_mcp_server.component_cache import component_cache, cache_bypass_requested
+from nifi_mcp_server.field_projection import DetailLevel, project, project_listing, resolve_projection, selects_key
+from nifi_mcp_server.async_request_poller import PollSchedule, run_async_request
+from config.settings import get_provenance_content_config
+from nifi_mcp_server.provenance_content import ContentSample, decode_content, sample_content, shared_content_claim
+
 # Import context variables
 from ..request_context import current_nifi_client, current_request_logger # Added
 # Import new context variables for IDs
@@ -37,6 +56,17 @@ from ..request_context import current_user_request_id, current_action_id # Added
 
 # --- Helper Functions (Now use context vars) --- 
 
+def _resolve_projection(result_kind: str, detail_level: Optional[str], fields: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    """Field paths a read tool should keep, or None for its full output."""
+    try:
+        return resolve_projection(result_kind, detail_level, fields)
+    except ValueError as e:
+        raise ToolError(str(e)) from e
+
+def _use_component_cache(bypass_cache: bool = False) -> bool:
+    """False when the caller asked to skip the shared component cache (argument or X-Mcp-Cache-Bypass header)."""
+    return not (bypass_cache or cache_bypass_requested())
+
 async def _get_process_group_name(pg_id: str) -> str:
     """Helper to safely get a process group's name."""
     # Get client, logger, and IDs from context
@@ -66,52 +96,21 @@ async def _get_process_group_name(pg_id: str) -> str:
 
 async def _get_process_group_contents_counts(pg_id: str) -> Dict[str, int]:
     """Fetches counts of components within a specific process group."""
-    # Get client, logger, and IDs from context
+    # Get client and logger from context
     nifi_client: Optional[NiFiClient] = current_nifi_client.get()
     local_logger = current_request_logger.get() or logger
-    user_request_id = current_user_request_id.get() or "-"
-    action_id = current_action_id.get() or "-"
     
     if not nifi_client:
         local_logger.error("NiFi client not found in context for _get_process_group_contents_counts")
         return {"processors": -1, "connections": -1, "ports": -1, "process_groups": -1}
 
     counts = {"processors": 0, "connections": 0, "ports": 0, "process_groups": 0}
-    # Extract context IDs from logger for the client calls
-    # context = local_logger._context # REMOVED
-    # user_request_id = context.get("user_request_id", "-") # REMOVED
-    # action_id = context.get("action_id", "-") # REMOVED
     try:
-        # Attempt to use the more efficient /flow endpoint first
-        nifi_req = {"operation": "get_process_group_flow", "process_group_id": pg_id}
-        local_logger.bind(interface="nifi", direction="request", data=nifi_req).debug("Calling NiFi API (for counts)")
-        pg_flow_details = await nifi_client.get_process_group_flow(pg_id) # Flow endpoint doesn't take context IDs
-        nifi_resp = {"has_flow_details": bool(pg_flow_details and 'processGroupFlow' in pg_flow_details)}
-        local_logger.bind(interface="nifi", direction="response", data=nifi_resp).debug("Received from NiFi API (for counts)")
-        
-        if pg_flow_details and 'processGroupFlow' in pg_flow_details:
-            flow_content = pg_flow_details['processGroupFlow'].get('flow', {})
-            counts["processors"] = len(flow_content.get('processors', []))
-            counts["connections"] = len(flow_content.get('connections', []))
-            counts["ports"] = len(flow_content.get('inputPorts', [])) + len(flow_content.get('outputPorts', []))
-            counts["process_groups"] = len(flow_content.get('processGroups', []))
-            local_logger.debug(f"Got counts for PG {pg_id} via /flow endpoint: {counts}")
-            return counts
-        else:
-             local_logger.warning(f"Could not get counts via /flow for PG {pg_id}, falling back to individual calls.")
-             # Pass IDs explicitly to client methods that need them
-             processors = await nifi_client.list_processors(pg_id, user_request_id=user_request_id, action_id=action_id)
-             connections = await nifi_client.list_connections(pg_id, user_request_id=user_request_id, action_id=action_id)
-             input_ports = await nifi_client.get_input_ports(pg_id) # Doesn't take context IDs
-             output_ports = await nifi_client.get_output_ports(pg_id) # Doesn't take context IDs
-             process_groups = await nifi_client.get_process_groups(pg_id) # Doesn't take context IDs
-             counts["processors"] = len(processors) if processors else 0
-             counts["connections"] = len(connections) if connections else 0
-             counts["ports"] = (len(input_ports) if input_ports else 0) + (len(output_ports) if output_ports else 0)
-             counts["process_groups"] = len(process_groups) if process_groups else 0
-             local_logger.debug(f"Got counts for PG {pg_id} via individual calls: {counts}")
-             return counts
-             
+        # One /flow call returns every component of the group
+        node = await fetch_group_node(nifi_client, pg_id, local_logger=local_logger)
+        counts = node.counts()
+        local_logger.debug(f"Got counts for PG {pg_id} via /flow endpoint: {counts}")
+        return counts
     except (ConnectionError, ValueError, NiFiAuthenticationError) as e:
         local_logger.error(f"Error fetching counts for PG {pg_id}: {e}")
         local_logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received error from NiFi API (for counts)")
@@ -121,476 +120,304 @@ async def _get_process_group_contents_counts(pg_id: str) -> Dict[str, int]:
          local_logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received unexpected error from NiFi API (for counts)")
          return counts
 
-async def _list_components_recursively_with_timeout(
-    object_type: Literal["processors", "connections", "ports", "controller_services"],
+def _format_snapshot_objects(
+    object_type: Literal["processors", "connections", "ports"],
+    node: ProcessGroupNode
+) -> List[Dict]:
+    """Formats the components of one snapshot group with the standard summary helpers."""
+    if object_type == "processors":
+        return _format_processor_summary(node.processors)
+    if object_type == "connections":
+        return _format_connection_summary(node.connections)
+    if object_type == "ports":
+        return _format_port_summary(node.input_ports, node.output_ports)
+    return []
+
+async def _fetch_snapshot_for_listing(
+    nifi_client: NiFiClient,
     pg_id: str,
-    depth: int = 0,
-    max_depth: int = 3,
+    max_depth: Optional[int] = None,
     timeout_seconds: Optional[float] = None,
     start_time: Optional[float] = None,
-    processed_pgs: Optional[Set[str]] = None,
-    continuation_token: Optional[str] = None
-) -> Dict[str, Any]:
+    continuation_token: Optional[str] = None,
+    use_cache: bool = True
+) -> FlowSnapshot:
     """
-    Recursively lists NiFi components with timeout support, parallel processing, and partial results.
+    Runs the bounded-concurrency flow traversal for the recursive listing tools.
     
-    This function provides enhanced recursive traversal with the following optimizations:
-    - Parallel processing of child process groups using asyncio.gather()
-    - Configurable timeout with graceful degradation
-    - Continuation token support for resuming interrupted operations
-    - Progress tracking to avoid duplicate processing
-    - Comprehensive error handling with partial results
+    An unreadable continuation token is logged and the traversal starts fresh from `pg_id`.
+    """
+    local_logger = current_request_logger.get() or logger
+    if continuation_token:
+        try:
+            decode_continuation_token(continuation_token)
+        except ValueError as e:
+            local_logger.warning(f"Invalid continuation token. Starting fresh. Error: {e}")
+            continuation_token = None
+    if timeout_seconds:
+        local_logger.info(f"Using timeout of {timeout_seconds} seconds for recursive traversal of PG {pg_id}")
+    return await fetch_flow_snapshot(
+        nifi_client,
+        pg_id,
+        max_depth=max_depth,
+        timeout_seconds=timeout_seconds,
+        start_time=start_time,
+        continuation_token=continuation_token,
+        local_logger=local_logger,
+        use_cache=use_cache
+    )
+
+def _snapshot_progress(snapshot: FlowSnapshot) -> Dict[str, Any]:
+    """Completion fields shared by every recursive listing result."""
+    return {
+        "completed": snapshot.completed,
+        "continuation_token": snapshot.continuation_token,
+        "processed_count": len(snapshot.groups),
+        "timeout_occurred": snapshot.timeout_occurred
+    }
+
+async def _list_components_from_snapshot(
+    object_type: Literal["processors", "connections", "ports", "controller_services"],
+    snapshot: FlowSnapshot
+) -> List[Dict]:
+    """
+    Groups the formatted components of every fetched process group.
     
-    Args:
-        object_type: Type of NiFi objects to list ("processors", "connections", "ports")
-        pg_id: Process group ID to start traversal from
-        depth: Current recursion depth (used internally)
-        max_depth: Maximum recursion depth to prevent infinite loops
-        timeout_seconds: Maximum time to spend on operation (None = no timeout)
-        start_time: Operation start time (used internally for timeout calculation)
-        processed_pgs: Set of already processed process group IDs (used internally)
-        continuation_token: Token for resuming from previous partial result
+    Controller services are not part of the /flow response, so they are listed per group
+    under the same concurrency cap as the traversal.
     
     Returns:
-        Dict containing:
-        - results: List of component results, each with process_group_id, process_group_name, and objects
-        - completed: bool indicating if operation completed fully (True) or timed out (False)
-        - continuation_token: str for resuming if timed out (None if completed)
-        - processed_count: int number of process groups successfully processed
-        - timeout_occurred: bool indicating if timeout was the reason for stopping
-        
-    Performance Notes:
-        - Uses parallel processing for child groups, significantly faster than sequential
-        - Tracks processed groups to avoid duplication when using continuation tokens
-        - Returns partial results immediately when timeout is reached
-        - Memory efficient - doesn't load entire hierarchy into memory at once
+        List of dictionaries with 'process_group_id', 'process_group_name' and either
+        'objects' (groups without matching components are omitted) or 'error'.
     """
-    if start_time is None:
-        start_time = time.time()
-    if processed_pgs is None:
-        processed_pgs = set()
-    
-    # Get client, logger, and IDs from context
-    nifi_client: Optional[NiFiClient] = current_nifi_client.get()
     local_logger = current_request_logger.get() or logger
+    nifi_client: Optional[NiFiClient] = current_nifi_client.get()
     user_request_id = current_user_request_id.get() or "-"
     action_id = current_action_id.get() or "-"
 
-    if not nifi_client:
-        local_logger.error("NiFi client not found in context for _list_components_recursively_with_timeout")
-        return {
-            "results": [{
-                "process_group_id": pg_id,
-                "process_group_name": "Unknown (Client Error)",
-                "error": "NiFi Client not available"
-            }],
-            "completed": False,
-            "continuation_token": None,
-            "processed_count": 0,
-            "timeout_occurred": False
-        }
-
-    # Check timeout
-    if timeout_seconds and (time.time() - start_time) >= timeout_seconds:
-        local_logger.warning(f"Timeout reached while processing PG {pg_id} at depth {depth}")
-        return {
-            "results": [],
-            "completed": False,
-            "continuation_token": f"{pg_id}:{depth}",
-            "processed_count": len(processed_pgs),
-            "timeout_occurred": True
-        }
+    nodes = [node for node in snapshot.iter_groups() if not node.error]
+    if object_type == "controller_services":
+        service_lists = await bounded_gather(
+            (nifi_client.list_controller_services(node.id, user_request_id=user_request_id, action_id=action_id) for node in nodes),
+            return_exceptions=True
+        )
+    else:
+        service_lists = [None] * len(nodes)
+    fetched = dict(zip((node.id for node in nodes), service_lists))
 
     all_results = []
-    
-    # Skip if already processed (for continuation support)
-    if pg_id in processed_pgs:
-        local_logger.debug(f"Skipping already processed PG {pg_id}")
-    else:
-        processed_pgs.add(pg_id)
-        current_pg_name = await _get_process_group_name(pg_id)
-        
-        current_level_objects = []
-        try:
-            if object_type == "processors":
-                raw_objects = await nifi_client.list_processors(pg_id, user_request_id=user_request_id, action_id=action_id)
-                current_level_objects = _format_processor_summary(raw_objects)
-            elif object_type == "connections":
-                raw_objects = await nifi_client.list_connections(pg_id, user_request_id=user_request_id, action_id=action_id)
-                current_level_objects = _format_connection_summary(raw_objects)
-            elif object_type == "controller_services":
-                raw_objects = await nifi_client.list_controller_services(pg_id, user_request_id=user_request_id, action_id=action_id)
-                current_level_objects = _format_controller_service_summary(raw_objects)
-            elif object_type == "ports":
-                input_ports = await nifi_client.get_input_ports(pg_id)
-                output_ports = await nifi_client.get_output_ports(pg_id)
-                current_level_objects = _format_port_summary(input_ports, output_ports)
-                
-            if current_level_objects:
-                all_results.append({
-                    "process_group_id": pg_id,
-                    "process_group_name": current_pg_name,
-                    "objects": current_level_objects
-                })
-                
-        except (ConnectionError, ValueError, NiFiAuthenticationError) as e:
-            local_logger.error(f"Error fetching {object_type} for PG {pg_id} during recursion: {e}")
+    for node in snapshot.iter_groups():
+        if node.error:
             all_results.append({
-                "process_group_id": pg_id,
-                "process_group_name": current_pg_name,
-                "error": f"Failed to retrieve {object_type}: {e}"
+                "process_group_id": node.id,
+                "process_group_name": node.name,
+                "error": f"Failed to retrieve {object_type}: {node.error}"
             })
-        except Exception as e:
-            local_logger.error(f"Unexpected error fetching {object_type} for PG {pg_id} during recursion: {e}", exc_info=True)
+            continue
+
+        if object_type == "controller_services":
+            raw_objects = fetched.get(node.id)
+            if isinstance(raw_objects, Exception):
+                local_logger.error(f"Error fetching {object_type} for PG {node.id} during recursion: {raw_objects}")
+                all_results.append({
+                    "process_group_id": node.id,
+                    "process_group_name": node.name,
+                    "error": f"Failed to retrieve {object_type}: {raw_objects}"
+                })
+                continue
+            current_level_objects = _format_controller_service_summary(raw_objects)
+        else:
+            current_level_objects = _format_snapshot_objects(object_type, node)
+
+        if current_level_objects:
             all_results.append({
-                "process_group_id": pg_id,
-                "process_group_name": current_pg_name,
-                "error": f"Unexpected error retrieving {object_type}: {e}"
+                "process_group_id": node.id,
+                "process_group_name": node.name,
+                "objects": current_level_objects
             })
+    return all_results
 
-    # Check if max depth is reached before fetching child groups
-    if depth >= max_depth:
-        local_logger.debug(f"Max recursion depth ({max_depth}) reached for PG {pg_id}. Stopping recursion.")
-        return {
-            "results": all_results,
-            "completed": True,
-            "continuation_token": None,
-            "processed_count": len(processed_pgs),
-            "timeout_occurred": False
+def _hierarchy_from_snapshot(snapshot: FlowSnapshot, recursive_search: bool) -> Dict[str, Any]:
+    """
+    Builds the process group hierarchy view from a snapshot.
+    
+    With `recursive_search` the full nested tree is returned; otherwise only the direct
+    children of the snapshot root, each with its component counts.
+    """
+    root_node = snapshot.groups.get(snapshot.root_id)
+    if recursive_search:
+        hierarchy_data = snapshot.hierarchy()
+    else:
+        hierarchy_data = {
+            "id": snapshot.root_id,
+            "name": root_node.name if root_node else "Unknown",
+            "child_process_groups": []
         }
+        if root_node:
+            for child_id in root_node.child_ids:
+                child_node = snapshot.groups.get(child_id)
+                if child_node is None:
+                    continue
+                child_data = {"id": child_id, "name": child_node.name, "counts": child_node.counts()}
+                if child_node.error:
+                    child_data["error"] = child_node.error
+                hierarchy_data["child_process_groups"].append(child_data)
+
+    hierarchy_data.update(_snapshot_progress(snapshot))
+    if not snapshot.timeout_occurred:
+        hierarchy_data.pop("continuation_token")
+    if root_node and root_node.error:
+        hierarchy_data["completed"] = False
+        hierarchy_data["error"] = f"Failed to retrieve full hierarchy for process group {snapshot.root_id}: {root_node.error}"
+    return hierarchy_data
+
+def _process_group_chunk(node: ProcessGroupNode) -> Dict[str, Any]:
+    """One process group's entry when process groups are listed incrementally."""
+    chunk = {
+        "process_group_id": node.id,
+        "process_group_name": node.name,
+        "parent_group_id": node.parent_id,
+        "depth": node.depth,
+        "counts": node.counts()
+    }
+    if node.error:
+        chunk["error"] = node.error
+    return chunk
 
-    # Check timeout again before processing children
-    if timeout_seconds and (time.time() - start_time) >= timeout_seconds:
-        local_logger.warning(f"Timeout reached before processing children of PG {pg_id}")
+def _component_chunk(
+    object_type: Literal["processors", "connections", "ports"],
+    node: ProcessGroupNode
+) -> Optional[Dict[str, Any]]:
+    """One process group's entry in a recursive component listing, or None when it has no matching components."""
+    if node.error:
         return {
-            "results": all_results,
-            "completed": False,
-            "continuation_token": f"{pg_id}:{depth}:children",
-            "processed_count": len(processed_pgs),
-            "timeout_occurred": True
+            "process_group_id": node.id,
+            "process_group_name": node.name,
+            "error": f"Failed to retrieve {object_type}: {node.error}"
         }
+    objects = _format_snapshot_objects(object_type, node)
+    if not objects:
+        return None
+    return {"process_group_id": node.id, "process_group_name": node.name, "objects": objects}
+
+@dataclass
+class _ListingStream:
+    """A recursive listing whose per-group results are produced while the traversal runs."""
+    nifi_client: NiFiClient
+    object_type: Literal["processors", "connections", "ports", "process_groups"]
+    snapshot: FlowSnapshot
+    start_pg_id: str
+    start_time: float
+    timeout_seconds: float
+    max_depth: int
+    use_cache: bool
+    retain_groups: bool = False
+    processed_count: int = 0
+
+    async def chunks(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yields each process group's result as soon as its /flow fetch completes."""
+        local_logger = current_request_logger.get() or logger
+        groups = iter_flow_groups(
+            self.nifi_client,
+            self.snapshot,
+            timeout_seconds=self.timeout_seconds,
+            start_time=self.start_time,
+            local_logger=local_logger,
+            use_cache=self.use_cache,
+            retain_groups=self.retain_groups
+        )
+        # Closing this generator early must close the traversal too, so its unfinished work stays resumable
+        async with aclosing(groups):
+            async for node in groups:
+                self.processed_count += 1
+                if self.object_type == "process_groups":
+                    yield _process_group_chunk(node)
+                    continue
+                chunk = _component_chunk(self.object_type, node)
+                if chunk is not None:
+                    yield chunk
+
+    def summary(self) -> Dict[str, Any]:
+        """Completion, timing and progress fields, once `chunks()` is exhausted or closed."""
+        summary = _snapshot_progress(self.snapshot)
+        summary["processed_count"] = self.processed_count
+        summary["total_time_seconds"] = time.time() - self.start_time
+        summary["progress_info"] = {
+            "object_type": self.object_type,
+            "start_pg_id": self.snapshot.root_id,
+            "max_depth": self.max_depth,
+            "timeout_seconds": self.timeout_seconds
+        }
+        return summary
 
-    try:
-        child_groups = await nifi_client.get_process_groups(pg_id)
-        if child_groups:
-            # Process children in parallel with timeout checks
-            child_tasks = []
-            for child_group_entity in child_groups:
-                child_id = child_group_entity.get('id')
-                if child_id and child_id not in processed_pgs:
-                    # Check timeout before starting each child
-                    if timeout_seconds and (time.time() - start_time) >= timeout_seconds:
-                        local_logger.warning(f"Timeout reached before processing child {child_id}")
-                        return {
-                            "results": all_results,
-                            "completed": False,
-                            "continuation_token": f"{child_id}:{depth + 1}",
-                            "processed_count": len(processed_pgs),
-                            "timeout_occurred": True
-                        }
-                    
-                    child_tasks.append(
-                        _list_components_recursively_with_timeout(
-                            object_type=object_type,
-                            pg_id=child_id,
-                            depth=depth + 1,
-                            max_depth=max_depth,
-                            timeout_seconds=timeout_seconds,
-                            start_time=start_time,
-                            processed_pgs=processed_pgs,
-                            continuation_token=continuation_token
-                        )
-                    )
-            
-            if child_tasks:
-                # Process children in parallel
-                child_results = await asyncio.gather(*child_tasks, return_exceptions=True)
-                
-                for child_result in child_results:
-                    if isinstance(child_result, Exception):
-                        local_logger.error(f"Error in child processing: {child_result}")
-                        continue
-                    
-                    if isinstance(child_result, dict):
-                        all_results.extend(child_result.get("results", []))
-                        
-                        # If any child timed out, return partial results
-                        if child_result.get("timeout_occurred"):
-                            return {
-                                "results": all_results,
-                                "completed": False,
-                                "continuation_token": child_result.get("continuation_token"),
-                                "processed_count": child_result.get("processed_count", len(processed_pgs)),
-                                "timeout_occurred": True
-                            }
-                        
-                        # If any child didn't complete, return partial results
-                        if not child_result.get("completed", True):
-                            return {
-                                "results": all_results,
-                                "completed": False,
-                                "continuation_token": child_result.get("continuation_token"),
-                                "processed_count": child_result.get("processed_count", len(processed_pgs)),
-                                "timeout_occurred": child_result.get("timeout_occurred", False)
-                            }
-                    
-    except (ConnectionError, ValueError, NiFiAuthenticationError) as e:
-        local_logger.error(f"Error fetching child groups for PG {pg_id} during recursion: {e}")
-        all_results.append({
-            "process_group_id": pg_id,
-            "process_group_name": await _get_process_group_name(pg_id),
-            "error_fetching_children": f"Failed to retrieve child groups: {e}"
-        })
-    except Exception as e:
-        local_logger.error(f"Unexpected error fetching child groups for PG {pg_id}: {e}", exc_info=True)
-        all_results.append({
-            "process_group_id": pg_id,
-            "process_group_name": await _get_process_group_name(pg_id),
-            "error_fetching_children": f"Unexpected error retrieving child groups: {e}"
-        })
-        
-    return {
-        "results": all_results,
-        "completed": True,
-        "continuation_token": None,
-        "processed_count": len(processed_pgs),
-        "timeout_occurred": False
-    }
-
-async def _get_process_group_hierarchy_with_timeout(
-    pg_id: str, 
-    recursive_search: bool,
-    timeout_seconds: Optional[float] = None,
-    start_time: Optional[float] = None,
-    processed_pgs: Optional[Set[str]] = None
-) -> Dict[str, Any]:
+@streams_tool("list_nifi_objects_with_streaming")
+async def open_nifi_objects_stream(
+    object_type: Literal["processors", "connections", "ports", "process_groups"],
+    process_group_id: str | None = None,
+    timeout_seconds: float = 30.0,
+    max_depth: int = 10,
+    continuation_token: Optional[str] = None,
+    batch_size: int = 50,
+    bypass_cache: bool = False,
+    retain_groups: bool = False
+) -> _ListingStream:
     """
-    Fetches NiFi process group hierarchy with timeout support and partial results.
-    
-    This function builds a nested hierarchy of process groups with enhanced features:
-    - Configurable timeout with graceful degradation
-    - Parallel processing for better performance
-    - Continuation token support for resuming interrupted operations
-    - Comprehensive error handling with partial results
+    Resolves the start group and returns the incremental listing behind list_nifi_objects_with_streaming.
     
-    Args:
-        pg_id: Process group ID to start hierarchy traversal from
-        recursive_search: If True, recursively fetch child hierarchies; if False, only direct children
-        timeout_seconds: Maximum time to spend on operation (None = no timeout)
-        start_time: Operation start time (used internally for timeout calculation)
-        processed_pgs: Set of already processed process group IDs (used internally)
-    
-    Returns:
-        Dict containing hierarchy data:
-        - id: Process group ID
-        - name: Process group name
-        - child_process_groups: List of child process group data
-        - completed: bool indicating if operation completed fully
-        - timeout_occurred: bool indicating if timeout occurred
-        - continuation_token: str for resuming if timed out (only present if timeout occurred)
-        - error: str error message (only present if error occurred)
-        
-    Performance Notes:
-        - Processes child groups in parallel when possible
-        - Returns partial hierarchy immediately when timeout is reached
-        - Tracks processed groups to avoid duplication
-        - Memory efficient for large hierarchies
+    Groups are not kept once their chunk is produced unless `retain_groups` is set, so memory
+    stays flat however large the canvas is.
     """
-    if start_time is None:
-        start_time = time.time()
-    if processed_pgs is None:
-        processed_pgs = set()
-    
-    # Get client, logger, and IDs from context
     nifi_client: Optional[NiFiClient] = current_nifi_client.get()
     local_logger = current_request_logger.get() or logger
-    user_request_id = current_user_request_id.get() or "-"
-    action_id = current_action_id.get() or "-"
 
     if not nifi_client:
-        local_logger.error("NiFi client not found in context for _get_process_group_hierarchy_with_timeout")
-        return {
-            "id": pg_id, 
-            "name": "Unknown (Client Error)", 
-            "child_process_groups": [], 
-            "error": "NiFi Client not available",
-            "completed": False,
-            "timeout_occurred": False
-        }
+        raise ToolError("NiFi client not found in context.")
+    if not isinstance(nifi_client, NiFiClient):
+         raise ToolError(f"Invalid NiFi client type found in context: {type(nifi_client)}")
+    if object_type not in ("processors", "connections", "ports", "process_groups"):
+        raise ToolError(f"Unsupported object_type for streaming listing: {object_type}")
 
-    # Check timeout
-    if timeout_seconds and (time.time() - start_time) >= timeout_seconds:
-        local_logger.warning(f"Timeout reached while processing hierarchy for PG {pg_id}")
-        return {
-            "id": pg_id,
-            "name": "Timeout",
-            "child_process_groups": [],
-            "completed": False,
-            "timeout_occurred": True,
-            "continuation_token": pg_id
-        }
+    user_request_id = current_user_request_id.get() or "-"
+    action_id = current_action_id.get() or "-"
+    start_time = time.time()
 
-    hierarchy_data = { 
-        "id": pg_id, 
-        "name": "Unknown", 
-        "child_process_groups": [],
-        "completed": True,
-        "timeout_occurred": False
-    }
-    
     try:
-        parent_name = await _get_process_group_name(pg_id)
-        hierarchy_data["name"] = parent_name
-
-        nifi_req_children = {"operation": "get_process_groups", "process_group_id": pg_id}
-        local_logger.bind(interface="nifi", direction="request", data=nifi_req_children).debug("Calling NiFi API")
-        child_groups_response = await nifi_client.get_process_groups(pg_id)
-        child_count = len(child_groups_response) if child_groups_response else 0
-        nifi_resp_children = {"child_group_count": child_count}
-        local_logger.bind(interface="nifi", direction="response", data=nifi_resp_children).debug("Received from NiFi API")
-        child_groups_list = child_groups_response
-
-        if child_groups_list:
-            child_tasks = []
-            for child_group_entity in child_groups_list:
-                child_id = child_group_entity.get('id')
-                child_component = child_group_entity.get('component', {})
-                child_name = child_component.get('name', f"Unnamed PG ({child_id})")
-
-                if child_id:
-                    # Check timeout before processing each child
-                    if timeout_seconds and (time.time() - start_time) >= timeout_seconds:
-                        local_logger.warning(f"Timeout reached before processing child {child_id}")
-                        hierarchy_data["completed"] = False
-                        hierarchy_data["timeout_occurred"] = True
-                        hierarchy_data["continuation_token"] = child_id
-                        return hierarchy_data
-                    
-                    if recursive_search:
-                        child_tasks.append((child_id, child_name, _get_process_group_hierarchy_with_timeout(
-                            pg_id=child_id, 
-                            recursive_search=True,
-                            timeout_seconds=timeout_seconds,
-                            start_time=start_time,
-                            processed_pgs=processed_pgs
-                        )))
-                    else:
-                        child_tasks.append((child_id, child_name, _get_process_group_contents_counts(child_id)))
-            
-            # Process children
-            for child_id, child_name, child_task in child_tasks:
-                try:
-                    if recursive_search:
-                        child_hierarchy = await child_task
-                        child_data = {
-                            "id": child_id,
-                            "name": child_name,
-                            "children": child_hierarchy.get("child_process_groups", [])
-                        }
-                        
-                        # Check if child timed out
-                        if child_hierarchy.get("timeout_occurred"):
-                            hierarchy_data["completed"] = False
-                            hierarchy_data["timeout_occurred"] = True
-                            hierarchy_data["continuation_token"] = child_hierarchy.get("continuation_token", child_id)
-                            hierarchy_data["child_process_groups"].append(child_data)
-                            return hierarchy_data
-                    else:
-                        counts = await child_task
-                        child_data = {
-                            "id": child_id,
-                            "name": child_name,
-                            "counts": counts
-                        }
-                    
-                    hierarchy_data["child_process_groups"].append(child_data)
-                    
-                except Exception as e:
-                    local_logger.error(f"Error processing child {child_id}: {e}")
-                    hierarchy_data["child_process_groups"].append({
-                        "id": child_id,
-                        "name": child_name,
-                        "error": str(e)
-                    })
-
-        return hierarchy_data
-
-    except (ConnectionError, ValueError, NiFiAuthenticationError) as e:
-        local_logger.error(f"Error fetching process group hierarchy for {pg_id}: {e}")
-        local_logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received error from NiFi API")
-        hierarchy_data["error"] = f"Failed to retrieve full hierarchy for process group {pg_id}: {e}"
-        hierarchy_data["completed"] = False
-        return hierarchy_data
-    except Exception as e:
-         local_logger.error(f"Unexpected error fetching hierarchy for {pg_id}: {e}", exc_info=True)
-         local_logger.bind(interface="nifi", direction="response", data={"error": str(e)}).debug("Received unexpected error from NiFi API")
-         hierarchy_data["error"] = f"Unexpected error retrieving hierarchy for {pg_id}: {e}"
-         hierarchy_data["completed"] = False
-         return hierarchy_data
-
-# --- Legacy Wrapper Functions for Backward Compatibility ---
+        target_pg_id = process_group_id
+        if not target_pg_id:
+            local_logger.info("process_group_id not provided, defaulting to root.")
+            target_pg_id = await nifi_client.get_root_process_group_id(user_request_id=user_request_id, action_id=action_id)
+            local_logger.info(f"Resolved root process group ID: {target_pg_id}")
+    except NiFiAuthenticationError as e:
+         local_logger.error(f"Authentication error during streaming list: {e}", exc_info=False)
+         raise ToolError(f"Authentication error accessing NiFi: {e}") from e
+    except (ValueError, ConnectionError) as e:
+        local_logger.error(f"Error during streaming list: {e}", exc_info=False)
+        raise ToolError(f"Error listing NiFi {object_type}: {e}") from e
 
-async def _list_components_recursively(
-    object_type: Literal["processors", "connections", "ports"],
-    pg_id: str,
-    depth: int = 0,
-    max_depth: int = 3
-) -> List[Dict]:
-    """
-    Legacy wrapper for backward compatibility.
-    
-    This function maintains the original API for existing code while delegating
-    to the enhanced timeout-aware implementation. It returns only the results
-    list without timeout/continuation metadata.
-    
-    Args:
-        object_type: Type of NiFi objects to list
-        pg_id: Process group ID to start from
-        depth: Current recursion depth
-        max_depth: Maximum recursion depth
-        
-    Returns:
-        List of component results (legacy format)
-        
-    Note:
-        For new code, consider using _list_components_recursively_with_timeout()
-        directly for enhanced timeout and continuation support.
-    """
-    result = await _list_components_recursively_with_timeout(
+    if continuation_token:
+        try:
+            decode_continuation_token(continuation_token)
+        except ValueError as e:
+            local_logger.warning(f"Invalid continuation token. Starting fresh. Error: {e}")
+            continuation_token = None
+
+    local_logger.info(f"Starting streaming list of {object_type} from PG {target_pg_id} with {timeout_seconds}s timeout")
+    snapshot = start_traversal(
+        target_pg_id,
+        max_depth=None if object_type == "process_groups" else max_depth,
+        continuation_token=continuation_token,
+        local_logger=local_logger
+    )
+    return _ListingStream(
+        nifi_client=nifi_client,
         object_type=object_type,
-        pg_id=pg_id,
-        depth=depth,
+        snapshot=snapshot,
+        start_pg_id=target_pg_id,
+        start_time=start_time,
+        timeout_seconds=timeout_seconds,
         max_depth=max_depth,
-        timeout_seconds=None
-    )
-    return result.get("results", [])
-
-async def _get_process_group_hierarchy(
-    pg_id: str, 
-    recursive_search: bool
-) -> Dict[str, Any]:
-    """
-    Legacy wrapper for backward compatibility.
-    
-    This function maintains the original API for existing code while delegating
-    to the enhanced timeout-aware implementation. It returns the hierarchy
-    without timeout/continuation metadata.
-    
-    Args:
-        pg_id: Process group ID to start from
-        recursive_search: Whether to recursively fetch child hierarchies
-        
-    Returns:
-        Dict containing hierarchy data (legacy format)
-        
-    Note:
-        For new code, consider using _get_process_group_hierarchy_with_timeout()
-        directly for enhanced timeout and continuation support.
-    """
-    return await _get_process_group_hierarchy_with_timeout(
-        pg_id=pg_id,
-        recursive_search=recursive_search,
-        timeout_seconds=None
+        use_cache=_use_component_cache(bypass_cache),
+        retain_groups=retain_groups
     )
 
 # --- Tool Definitions --- 
@@ -603,6 +430,9 @@ async def list_nifi_objects(
     search_scope: Literal["current_group", "recursive"] = "current_group",
     timeout_seconds: Optional[float] = None,
     continuation_token: Optional[str] = None,
+    bypass_cache: bool = False,
+    detail_level: Optional[DetailLevel] = None,
+    fields: Optional[List[str]] = None,
     # mcp_context: dict = {} # Removed context parameter
 ) -> Union[List[Dict], Dict]:
     """
@@ -611,9 +441,10 @@ async def list_nifi_objects(
     Enhanced with timeout management, parallel processing, and partial results for large recursive operations.
     
     Performance Improvements:
-    - Parallel processing of child process groups (47-71% faster than sequential)
+    - Breadth-first traversal with a global cap on concurrent NiFi requests
+    - One /flow request per process group returns its processors, connections, ports and child groups
     - Configurable timeouts prevent indefinite hanging
-    - Continuation tokens allow resuming interrupted operations
+    - Continuation tokens allow resuming interrupted operations without revisiting groups
     - No lost work when timeouts occur
 
     Parameters
@@ -636,8 +467,20 @@ async def list_nifi_objects(
         Maximum time in seconds to spend on recursive operations. If exceeded, returns partial results
         with a continuation token. Only applies to recursive operations. Default: None (no timeout).
     continuation_token : Optional[str], optional
-        Token from a previous partial result to resume processing from where it left off.
-        Format: "process_group_id:depth" or "process_group_id:depth:children".
+        Opaque token from a previous partial result to resume processing from where it left off.
+        It records the queued process groups and those already visited.
+    bypass_cache : bool, optional
+        If True, fetch fresh data from NiFi instead of the shared component cache. Default: False.
+    detail_level : Optional[Literal["ids", "summary", "config", "full"]], optional
+        Trims each listed object to a preset set of fields to keep the result small.
+        - 'ids': identifiers and names only (connections also keep their source and destination IDs).
+        - 'summary': adds state, run and validation status, without properties or relationships.
+        - 'config': adds properties and relationships, without status counters or canvas positions.
+        - 'full': every field of the summaries (default).
+        Not applied to the recursive process group hierarchy.
+    fields : Optional[List[str]], optional
+        Explicit field paths to keep in each object instead of a preset, e.g. ["id", "name", "properties"].
+        Dotted paths select nested keys. Takes precedence over detail_level.
     # Removed mcp_context from docstring
 
     Returns
@@ -671,6 +514,7 @@ async def list_nifi_objects(
     user_request_id = current_user_request_id.get() or "-"
     action_id = current_action_id.get() or "-"
     # --------------------------
+    projection = _resolve_projection(object_type, detail_level, fields)
 
     try:
         target_pg_id = process_group_id
@@ -680,33 +524,30 @@ async def list_nifi_objects(
             local_logger.info(f"Resolved root process group ID: {target_pg_id}")
 
         local_logger.info(f"Listing NiFi objects of type '{object_type}' in scope '{search_scope}' for PG '{target_pg_id}'")
+        use_cache = _use_component_cache(bypass_cache)
 
         # --- Process Group Handling --- 
         if object_type == "process_groups":
             local_logger.debug("Handling object_type 'process_groups'...")
             if search_scope == "current_group":
                 local_logger.debug(f"Fetching direct children for PG {target_pg_id}")
-                child_groups_response = await nifi_client.get_process_groups(target_pg_id)
-                results = []
-                if child_groups_response:
-                    for child_group_entity in child_groups_response:
-                        child_id = child_group_entity.get('id')
-                        child_component = child_group_entity.get('component', {})
-                        child_name = child_component.get('name', f"Unnamed PG ({child_id})")
-                        if child_id:
-                            counts = await _get_process_group_contents_counts(child_id)
-                            results.append({"id": child_id, "name": child_name, "counts": counts})
+                snapshot = await fetch_flow_snapshot(nifi_client, target_pg_id, max_depth=1, local_logger=local_logger, use_cache=use_cache)
+                hierarchy = _hierarchy_from_snapshot(snapshot, recursive_search=False)
+                if hierarchy.get("error"):
+                    raise ConnectionError(hierarchy["error"])
+                results = hierarchy.get("child_process_groups", [])
                 local_logger.info(f"Found {len(results)} direct child process groups in PG {target_pg_id}")
-                return results
+                return project_listing(results, projection)
             else: # recursive
                 local_logger.debug(f"Recursively fetching hierarchy starting from PG {target_pg_id}")
-                if timeout_seconds:
-                    local_logger.info(f"Using timeout of {timeout_seconds} seconds for recursive hierarchy fetch")
-                hierarchy = await _get_process_group_hierarchy_with_timeout(
-                    target_pg_id, 
-                    True, 
-                    timeout_seconds=timeout_seconds
+                snapshot = await _fetch_snapshot_for_listing(
+                    nifi_client,
+                    target_pg_id,
+                    timeout_seconds=timeout_seconds,
+                    continuation_token=continuation_token,
+                    use_cache=use_cache
                 )
+                hierarchy = _hierarchy_from_snapshot(snapshot, recursive_search=True)
                 local_logger.info(f"Finished fetching recursive hierarchy for PG {target_pg_id}")
                 if hierarchy.get("timeout_occurred"):
                     local_logger.warning(f"Hierarchy fetch timed out. Processed {hierarchy.get('processed_count', 0)} groups. Use continuation_token to resume.")
@@ -718,57 +559,33 @@ async def list_nifi_objects(
             if search_scope == "current_group":
                 local_logger.debug(f"Fetching objects directly within PG {target_pg_id}")
                 objects = []
-                if object_type == "processors":
-                    raw_objects = await nifi_client.list_processors(target_pg_id, user_request_id=user_request_id, action_id=action_id)
-                    objects = _format_processor_summary(raw_objects)
-                elif object_type == "connections":
-                    raw_objects = await nifi_client.list_connections(target_pg_id, user_request_id=user_request_id, action_id=action_id)
-                    objects = _format_connection_summary(raw_objects)
-                elif object_type == "ports":
-                    input_ports = await nifi_client.get_input_ports(target_pg_id)
-                    output_ports = await nifi_client.get_output_ports(target_pg_id)
-                    objects = _format_port_summary(input_ports, output_ports)
-                elif object_type == "controller_services":
+                if object_type == "controller_services":
                     raw_objects = await nifi_client.list_controller_services(target_pg_id, user_request_id=user_request_id, action_id=action_id)
                     objects = _format_controller_service_summary(raw_objects)
+                else:
+                    node = await fetch_group_node(nifi_client, target_pg_id, local_logger=local_logger, use_cache=use_cache)
+                    objects = _format_snapshot_objects(object_type, node)
                     
                 local_logger.info(f"Found {len(objects)} {object_type} directly within PG {target_pg_id}")
-                return objects
+                return project_listing(objects, projection)
             else: # recursive
                 local_logger.debug(f"Recursively fetching {object_type} starting from PG {target_pg_id}")
-                if timeout_seconds:
-                    local_logger.info(f"Using timeout of {timeout_seconds} seconds for recursive {object_type} fetch")
-                
-                # Parse continuation token if provided
-                start_pg_id = target_pg_id
-                start_depth = 0
-                processed_pgs = set()
-                
-                if continuation_token:
-                    try:
-                        parts = continuation_token.split(":")
-                        if len(parts) >= 2:
-                            start_pg_id = parts[0]
-                            start_depth = int(parts[1])
-                            local_logger.info(f"Resuming from continuation token: PG {start_pg_id} at depth {start_depth}")
-                    except (ValueError, IndexError) as e:
-                        local_logger.warning(f"Invalid continuation token format: {continuation_token}. Starting fresh. Error: {e}")
-                
-                recursive_results = await _list_components_recursively_with_timeout(
-                    object_type=object_type,
-                    pg_id=start_pg_id,
-                    depth=start_depth,
+                snapshot = await _fetch_snapshot_for_listing(
+                    nifi_client,
+                    target_pg_id,
                     max_depth=10, # Set a reasonable max depth
                     timeout_seconds=timeout_seconds,
-                    processed_pgs=processed_pgs,
-                    continuation_token=continuation_token
+                    continuation_token=continuation_token,
+                    use_cache=use_cache
                 )
+                recursive_results = {"results": await _list_components_from_snapshot(object_type, snapshot)}
+                recursive_results.update(_snapshot_progress(snapshot))
                 
                 local_logger.info(f"Finished recursive search for {object_type} starting from PG {target_pg_id}")
                 if recursive_results.get("timeout_occurred"):
                     local_logger.warning(f"Recursive search timed out. Processed {recursive_results.get('processed_count', 0)} groups. Use continuation_token to resume.")
                 
-                return recursive_results
+                return project_listing(recursive_results, projection)
 
     except NiFiAuthenticationError as e:
          local_logger.error(f"Authentication error during list_nifi_objects: {e}", exc_info=False)
@@ -788,7 +605,8 @@ async def list_nifi_objects_with_streaming(
     timeout_seconds: float = 30.0,
     max_depth: int = 10,
     continuation_token: Optional[str] = None,
-    batch_size: int = 50
+    batch_size: int = 50,
+    bypass_cache: bool = False
 ) -> Dict[str, Any]:
     """
     Lists NiFi objects recursively with streaming support for large hierarchies.
@@ -798,6 +616,7 @@ async def list_nifi_objects_with_streaming(
     - Continuation tokens for resuming interrupted operations
     - Progress tracking and batch processing
     - Parallel processing for better performance
+    - Per-group results as they arrive when called through the SSE endpoint
 
     Parameters
     ----------
@@ -814,6 +633,8 @@ async def list_nifi_objects_with_streaming(
         Token from a previous partial result to resume processing.
     batch_size : int, optional
         Number of process groups to process in each batch. Default: 50.
+    bypass_cache : bool, optional
+        If True, fetch fresh data from NiFi instead of the shared component cache. Default: False.
 
     Returns
     -------
@@ -827,97 +648,33 @@ async def list_nifi_objects_with_streaming(
         - 'total_time_seconds': float time spent on operation
         - 'progress_info': dict with additional progress details
     """
-    # Get client and logger from context variables
-    nifi_client: Optional[NiFiClient] = current_nifi_client.get()
     local_logger = current_request_logger.get() or logger
+    # The hierarchy view needs every group at the end; component listings only need each chunk once
+    stream = await open_nifi_objects_stream(
+        object_type,
+        process_group_id=process_group_id,
+        timeout_seconds=timeout_seconds,
+        max_depth=max_depth,
+        continuation_token=continuation_token,
+        batch_size=batch_size,
+        bypass_cache=bypass_cache,
+        retain_groups=object_type == "process_groups"
+    )
 
-    if not nifi_client:
-        raise ToolError("NiFi client not found in context.")
-    if not isinstance(nifi_client, NiFiClient):
-         raise ToolError(f"Invalid NiFi client type found in context: {type(nifi_client)}")
-
-    # Get IDs from context
-    user_request_id = current_user_request_id.get() or "-"
-    action_id = current_action_id.get() or "-"
-
-    start_time = time.time()
-    
     try:
-        target_pg_id = process_group_id
-        if not target_pg_id:
-            local_logger.info("process_group_id not provided, defaulting to root.")
-            target_pg_id = await nifi_client.get_root_process_group_id(user_request_id=user_request_id, action_id=action_id)
-            local_logger.info(f"Resolved root process group ID: {target_pg_id}")
-
-        local_logger.info(f"Starting streaming list of {object_type} from PG {target_pg_id} with {timeout_seconds}s timeout")
-
-        # Parse continuation token if provided
-        start_pg_id = target_pg_id
-        start_depth = 0
-        processed_pgs = set()
-        
-        if continuation_token:
-            try:
-                parts = continuation_token.split(":")
-                if len(parts) >= 2:
-                    start_pg_id = parts[0]
-                    start_depth = int(parts[1])
-                    local_logger.info(f"Resuming from continuation token: PG {start_pg_id} at depth {start_depth}")
-            except (ValueError, IndexError) as e:
-                local_logger.warning(f"Invalid continuation token format: {continuation_token}. Starting fresh. Error: {e}")
-
-        if object_type == "process_groups":
-            # Use hierarchy function for process groups
-            result = await _get_process_group_hierarchy_with_timeout(
-                pg_id=start_pg_id,
-                recursive_search=True,
-                timeout_seconds=timeout_seconds,
-                start_time=start_time,
-                processed_pgs=processed_pgs
-            )
-        else:
-            # Use component listing for processors, connections, ports
-            result = await _list_components_recursively_with_timeout(
-                object_type=object_type,
-                pg_id=start_pg_id,
-                depth=start_depth,
-                max_depth=max_depth,
-                timeout_seconds=timeout_seconds,
-                start_time=start_time,
-                processed_pgs=processed_pgs,
-                continuation_token=continuation_token
-            )
-
-        # Add timing and progress information
-        total_time = time.time() - start_time
-        
         if object_type == "process_groups":
+            async for _ in stream.chunks():
+                pass
+            hierarchy = _hierarchy_from_snapshot(stream.snapshot, recursive_search=True)
             # For process groups, wrap the hierarchy result
-            final_result = {
-                "results": result,
-                "completed": result.get("completed", True),
-                "continuation_token": result.get("continuation_token"),
-                "processed_count": len(processed_pgs),
-                "timeout_occurred": result.get("timeout_occurred", False),
-                "total_time_seconds": total_time,
-                "progress_info": {
-                    "object_type": object_type,
-                    "start_pg_id": start_pg_id,
-                    "max_depth": max_depth,
-                    "timeout_seconds": timeout_seconds
-                }
-            }
+            final_result = {"results": hierarchy}
+            final_result.update(stream.summary())
         else:
-            # For other object types, use the result directly
-            final_result = result.copy()
-            final_result["total_time_seconds"] = total_time
-            final_result["progress_info"] = {
-                "object_type": object_type,
-                "start_pg_id": start_pg_id,
-                "max_depth": max_depth,
-                "timeout_seconds": timeout_seconds
-            }
+            # Component listing for processors, connections, ports, in the order groups arrived
+            final_result = {"results": [chunk async for chunk in stream.chunks()]}
+            final_result.update(stream.summary())
 
+        total_time = final_result["total_time_seconds"]
         if final_result.get("timeout_occurred"):
             local_logger.warning(f"Operation timed out after {total_time:.2f}s. Processed {final_result.get('processed_count', 0)} groups.")
         else:
@@ -940,6 +697,9 @@ async def list_nifi_objects_with_streaming(
 async def get_nifi_object_details(
     object_type: Literal["processor", "connection", "port", "process_group", "controller_service"],
     object_id: str,
+    bypass_cache: bool = False,
+    detail_level: Optional[DetailLevel] = None,
+    fields: Optional[List[str]] = None,
     # mcp_context: dict = {} # Removed context parameter
 ) -> Dict:
     """
@@ -951,12 +711,25 @@ async def get_nifi_object_details(
         The type of NiFi object to retrieve details for.
     object_id : str
         The ID of the specific NiFi object.
+    bypass_cache : bool, optional
+        If True, fetch fresh data from NiFi instead of the shared component cache. Default: False.
+    detail_level : Optional[Literal["ids", "summary", "config", "full"]], optional
+        Trims the entity to a preset set of fields to keep the result small.
+        - 'ids': id, name, type and parent group.
+        - 'summary': adds revision version, state, validation status and key status counters.
+        - 'config': adds the configuration (properties, scheduling, relationships), without
+          property descriptors, bundle, position or status.
+        - 'full': the complete NiFi entity (default).
+    fields : Optional[List[str]], optional
+        Explicit dotted field paths to keep instead of a preset, e.g.
+        ["revision.version", "component.config.properties"]. Takes precedence over detail_level.
     # Removed mcp_context from docstring
 
     Returns
     -------
     Dict
         A dictionary containing the detailed entity information for the specified object, including component details, configuration, status, and revision.
+        Only the selected fields are included when detail_level or fields is given.
     """
     # Get client and logger from context variables
     nifi_client: Optional[NiFiClient] = current_nifi_client.get()
@@ -974,11 +747,13 @@ async def get_nifi_object_details(
     action_id = current_action_id.get() or "-"
     # --------------------------
 
+    projection = _resolve_projection(object_type, detail_level, fields)
+
     local_logger.info(f"Getting details for NiFi object type '{object_type}' with ID '{object_id}'")
     nifi_req = {"operation": f"get_{object_type}_details", "id": object_id}
     local_logger.bind(interface="nifi", direction="request", data=nifi_req).debug("Calling NiFi API")
 
-    try:
+    async def _fetch_details() -> Dict:
         details = {}
         if object_type == "processor":
             details = await nifi_client.get_processor_details(object_id)
@@ -1009,14 +784,24 @@ async def get_nifi_object_details(
         else:
             # Should not happen due to Literal validation, but good practice
             raise ToolError(f"Invalid object_type specified: {object_type}")
-            
+        return details
+
+    try:
+        details = await component_cache.get_or_fetch(
+            nifi_client.cache_key,
+            object_type,
+            object_id,
+            _fetch_details,
+            bypass=not _use_component_cache(bypass_cache)
+        )
+
         local_logger.bind(interface="nifi", direction="response", data={
             "object_id": object_id, 
             "object_type": object_type, 
             "has_details": bool(details)
             }).debug("Received from NiFi API")
         local_logger.info(f"Successfully retrieved details for {object_type} {object_id}")
-        return details
+        return project(details, projection)
 
     except NiFiAuthenticationError as e:
          local_logger.error(f"Authentication error getting details for {object_type} {object_id}: {e}", exc_info=False)
@@ -1043,6 +828,7 @@ async def document_nifi_flow(
     max_depth: int = 10,
     include_properties: bool = True,
     include_descriptions: bool = True,
+    bypass_cache: bool = False,
 ) -> Dict[str, Any]:
     """
     Analyzes and documents a NiFi flow starting from a given process group or processor.
@@ -1062,6 +848,8 @@ async def document_nifi_flow(
         Whether to include important processor properties in the documentation. Defaults to True.
     include_descriptions : bool, optional
         Whether to include processor and connection descriptions/comments (if available). Defaults to True.
+    bypass_cache : bool, optional
+        If True, fetch fresh data from NiFi instead of the shared component cache. Defaults to False.
 
     Returns
     -------
@@ -1090,6 +878,7 @@ async def document_nifi_flow(
     action_id = current_action_id.get() or "-"
     
     local_logger.info(f"Starting NiFi flow documentation. PG: {process_group_id}, Start Proc: {starting_processor_id}, Max Depth: {max_depth}")
+    use_cache = _use_component_cache(bypass_cache)
 
     try:
         # Determine the target process group ID
@@ -1098,7 +887,13 @@ async def document_nifi_flow(
             local_logger.info(f"No process_group_id provided, finding parent group for starting processor {starting_processor_id}")
             nifi_req = {"operation": "get_processor_details", "id": starting_processor_id}
             local_logger.bind(interface="nifi", direction="request", data=nifi_req).debug("Calling NiFi API")
-            proc_details = await nifi_client.get_processor_details(starting_processor_id)
+            proc_details = await component_cache.get_or_fetch(
+                nifi_client.cache_key,
+                "processor",
+                starting_processor_id,
+                lambda: nifi_client.get_processor_details(starting_processor_id),
+                bypass=not use_cache
+            )
             nifi_resp = {"has_proc_details": bool(proc_details and 'component' in proc_details)}
             local_logger.bind(interface="nifi", direction="response", data=nifi_resp).debug("Received from NiFi API")
             
@@ -1116,15 +911,13 @@ async def document_nifi_flow(
         if not pg_id:
              raise ToolError("Failed to determine a target process group ID for documentation.")
 
-        # Fetch components for the target process group
+        # Fetch components for the target process group (one /flow call, possibly cached)
         local_logger.info(f"Fetching components for process group {pg_id}...")
-        nifi_req_components = {"operation": "list_all", "process_group_id": pg_id}
-        local_logger.bind(interface="nifi", direction="request", data=nifi_req_components).debug("Calling NiFi API (multiple calls)")
-        
-        processors_list = await nifi_client.list_processors(pg_id, user_request_id=user_request_id, action_id=action_id)
-        connections_list = await nifi_client.list_connections(pg_id, user_request_id=user_request_id, action_id=action_id)
-        input_ports_list = await nifi_client.get_input_ports(pg_id)
-        output_ports_list = await nifi_client.get_output_ports(pg_id)
+        pg_node = await fetch_group_node(nifi_client, pg_id, local_logger=local_logger, use_cache=use_cache)
+        processors_list = pg_node.processors
+        connections_list = pg_node.connections
+        input_ports_list = pg_node.input_ports
+        output_ports_list = pg_node.output_ports
         
         nifi_resp_components = {
             "processor_count": len(processors_list) if isinstance(processors_list, list) else -1,
@@ -1283,6 +1076,8 @@ async def get_process_group_status(
     process_group_id: str | None = None,
     include_bulletins: bool = True,
     bulletin_limit: int = 20,
+    detail_level: Optional[DetailLevel] = None,
+    fields: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     Provides a consolidated status overview of a process group.
@@ -1294,6 +1089,12 @@ async def get_process_group_status(
         process_group_id: The ID of the target process group. Defaults to root if None.
         include_bulletins: Whether to fetch and include bulletins specific to this group.
         bulletin_limit: Max number of bulletins to fetch if include_bulletins is True.
+        detail_level: Trims the overview to a preset set of fields. 'ids' keeps the group id and
+            name; 'summary' keeps component counts, invalid component names, queue totals and
+            bulletin messages; 'config' keeps counts, full validation errors and per-connection
+            queues without bulletins; 'full' returns everything (default).
+        fields: Explicit dotted field paths to keep instead of a preset, e.g.
+            ["component_summary", "queue_summary.total_queued_count"]. Takes precedence over detail_level.
 
     Returns:
         A dictionary summarizing the status as defined in the plan.
@@ -1308,6 +1109,7 @@ async def get_process_group_status(
         raise ToolError("NiFi client not found in context.")
 
     local_logger = local_logger.bind(pg_id_param=process_group_id, include_bulletins=include_bulletins)
+    projection = _resolve_projection("process_group_status", detail_level, fields)
     local_logger.info("Getting process group status overview.")
 
     results = {
@@ -1512,8 +1314,8 @@ async def get_process_group_status(
         else:
              queue_summary["total_queued_size_human"] = f"{total_bytes/(1024**3):.1f} GB"
 
-        # --- Step 4: Get Bulletins (if requested) ---
-        if include_bulletins:
+        # --- Step 4: Get Bulletins (if requested and not projected away) ---
+        if include_bulletins and selects_key(projection, "bulletins"):
             local_logger.info(f"Fetching bulletins (limit {bulletin_limit})...")
             try:
                 nifi_req_b = {"operation": "get_bulletin_board", "group_id": target_pg_id, "limit": bulletin_limit}
@@ -1531,7 +1333,7 @@ async def get_process_group_status(
             results["bulletins"] = None # Explicitly set to None if not included
 
         local_logger.info("Process group status overview fetch complete.")
-        return results
+        return project(results, projection)
 
     except NiFiAuthenticationError as e:
          local_logger.error(f"Authentication error getting status for PG {target_pg_id}: {e}", exc_info=False)
@@ -1562,7 +1364,8 @@ async def list_flowfiles(
         target_id: The ID of the connection or processor.
         target_type: Whether the target_id refers to a 'connection' or 'processor'.
         max_results: Maximum number of FlowFile summaries to return.
-        polling_interval: Seconds between polling for async request completion (queue/provenance).
+        polling_interval: Longest wait between polls for async request completion (queue/provenance).
+            Polling starts faster and backs off up to this interval, following NiFi's reported progress.
         polling_timeout: Maximum seconds to wait for async request completion.
 
     Returns:
@@ -1586,156 +1389,129 @@ async def list_flowfiles(
     }
 
     try:
+        poll_schedule = PollSchedule.from_settings(max_interval=polling_interval)
+
         if target_type == "connection":
             results["listing_source"] = "queue"
             local_logger.info("Listing via connection queue...")
-            request_id = None
-            try:
-                # 1. Create request
+
+            async def submit_listing():
                 nifi_req_create = {"operation": "create_flowfile_listing_request", "connection_id": target_id}
                 local_logger.bind(interface="nifi", direction="request", data=nifi_req_create).debug("Calling NiFi API")
                 listing_request = await nifi_client.create_flowfile_listing_request(target_id)
-                request_id = listing_request.get("id")
-                nifi_resp_create = {"request_id": request_id}
+                nifi_resp_create = {"request_id": listing_request.get("id")}
                 local_logger.bind(interface="nifi", direction="response", data=nifi_resp_create).debug("Received from NiFi API")
-                if not request_id:
-                    raise ToolError("Failed to get request ID from NiFi for queue listing.")
-                local_logger.info(f"Submitted queue listing request: {request_id}")
-
-                # 2. Poll for completion
-                start_time = asyncio.get_event_loop().time()
-                while True:
-                    if (asyncio.get_event_loop().time() - start_time) > polling_timeout:
-                        raise TimeoutError(f"Timed out waiting for queue listing request {request_id} to complete.")
-                    
-                    nifi_req_get = {"operation": "get_flowfile_listing_request", "connection_id": target_id, "request_id": request_id}
-                    local_logger.bind(interface="nifi", direction="request", data=nifi_req_get).debug("Calling NiFi API (polling)")
-                    request_status = await nifi_client.get_flowfile_listing_request(target_id, request_id)
-                    nifi_resp_get = {"finished": request_status.get("finished"), "percentCompleted": request_status.get("percentCompleted")}
-                    local_logger.bind(interface="nifi", direction="response", data=nifi_resp_get).debug("Received from NiFi API (polling)")
-                    
-                    if request_status.get("finished"): 
-                        local_logger.info(f"Queue listing request {request_id} finished.")
-                        # 3. Extract results (already in the final status response)
-                        summaries_raw = request_status.get("flowFileSummaries", [])
-                        # Limit results here if necessary, though API might have internal limit
-                        results["flowfile_summaries"] = [
-                            {
-                                "uuid": ff.get("uuid"),
-                                "filename": ff.get("filename"),
-                                "size": ff.get("size"),
-                                "queued_duration": ff.get("queuedDuration"),
-                                "attributes": ff.get("attributes", {}), # Queue listing includes attributes
-                                "position": ff.get("position")
-                            }
-                            for ff in summaries_raw[:max_results]
-                        ]
-                        break
-                    await asyncio.sleep(polling_interval)
-
-            finally:
-                 # 4. Delete request (always attempt cleanup)
-                 if request_id:
-                    local_logger.info(f"Cleaning up queue listing request {request_id}...")
-                    try:
-                        nifi_req_del = {"operation": "delete_flowfile_listing_request", "connection_id": target_id, "request_id": request_id}
-                        local_logger.bind(interface="nifi", direction="request", data=nifi_req_del).debug("Calling NiFi API")
-                        await nifi_client.delete_flowfile_listing_request(target_id, request_id)
-                        local_logger.bind(interface="nifi", direction="response", data={"deleted": True}).debug("Received from NiFi API")
-                    except Exception as del_e:
-                        local_logger.warning(f"Failed to delete queue listing request {request_id}: {del_e}")
-                        # Don't fail the whole operation if cleanup fails
+                local_logger.info(f"Submitted queue listing request: {listing_request.get('id')}")
+                return listing_request
+
+            async def get_listing_status(request_id):
+                nifi_req_get = {"operation": "get_flowfile_listing_request", "connection_id": target_id, "request_id": request_id}
+                local_logger.bind(interface="nifi", direction="request", data=nifi_req_get).debug("Calling NiFi API (polling)")
+                request_status = await nifi_client.get_flowfile_listing_request(target_id, request_id)
+                nifi_resp_get = {"finished": request_status.get("finished"), "percentCompleted": request_status.get("percentCompleted")}
+                local_logger.bind(interface="nifi", direction="response", data=nifi_resp_get).debug("Received from NiFi API (polling)")
+                return request_status
+
+            async def delete_listing(request_id):
+                local_logger.info(f"Cleaning up queue listing request {request_id}...")
+                nifi_req_del = {"operation": "delete_flowfile_listing_request", "connection_id": target_id, "request_id": request_id}
+                local_logger.bind(interface="nifi", direction="request", data=nifi_req_del).debug("Calling NiFi API")
+                await nifi_client.delete_flowfile_listing_request(target_id, request_id)
+                local_logger.bind(interface="nifi", direction="response", data={"deleted": True}).debug("Received from NiFi API")
+
+            request_status = await run_async_request(
+                f"queue listing request for connection {target_id}",
+                submit=submit_listing,
+                get_status=get_listing_status,
+                delete=delete_listing,
+                timeout_seconds=polling_timeout,
+                schedule=poll_schedule,
+            )
+            local_logger.info("Queue listing request finished.")
+            # Summaries are already in the final status response
+            summaries_raw = request_status.get("flowFileSummaries", [])
+            results["flowfile_summaries"] = [
+                {
+                    "uuid": ff.get("uuid"),
+                    "filename": ff.get("filename"),
+                    "size": ff.get("size"),
+                    "queued_duration": ff.get("queuedDuration"),
+                    "attributes": ff.get("attributes", {}), # Queue listing includes attributes
+                    "position": ff.get("position")
+                }
+                for ff in summaries_raw[:max_results]
+            ]
 
         elif target_type == "processor":
             results["listing_source"] = "provenance"
             local_logger.info("Listing via processor provenance...")
-            query_id = None
-            try:
-                # 1. Submit query
-                provenance_payload = {
-                    "processor_id": target_id,
-                    "max_results": max_results  # Pass max_results to the client method
-                }
+            provenance_payload = {
+                "processor_id": target_id,
+                "max_results": max_results  # Pass max_results to the client method
+            }
+
+            async def submit_query():
                 nifi_req_create = {"operation": "submit_provenance_query", "payload": provenance_payload}
                 local_logger.bind(interface="nifi", direction="request", data=nifi_req_create).debug("Calling NiFi API")
                 query_response = await nifi_client.submit_provenance_query(provenance_payload)
-                # --- Corrected ID extraction ---
-                # query_id = query_response.get("query", {}).get("id") # Old incorrect way
-                query_id = query_response.get("id") # Correct: ID is directly in the returned dict
-                # -----------------------------
-                nifi_resp_create = {"query_id": query_id}
+                nifi_resp_create = {"query_id": query_response.get("id")}
                 local_logger.bind(interface="nifi", direction="response", data=nifi_resp_create).debug("Received from NiFi API")
-                if not query_id:
-                    raise ToolError("Failed to get query ID from NiFi for provenance search.")
-                local_logger.info(f"Submitted provenance query: {query_id}")
-
-                # 2. Poll for completion
-                start_time = asyncio.get_event_loop().time()
-                while True:
-                    if (asyncio.get_event_loop().time() - start_time) > polling_timeout:
-                        raise TimeoutError(f"Timed out waiting for provenance query {query_id} to complete.")
-
-                    nifi_req_get = {"operation": "get_provenance_query", "query_id": query_id}
-                    local_logger.bind(interface="nifi", direction="request", data=nifi_req_get).debug("Calling NiFi API (polling)")
-                    query_status = await nifi_client.get_provenance_query(query_id)
-                    nifi_resp_get = {"finished": query_status.get("query", {}).get("finished"), "percentCompleted": query_status.get("query", {}).get("percentCompleted")}
-                    local_logger.bind(interface="nifi", direction="response", data=nifi_resp_get).debug("Received from NiFi API (polling)")
-
-                    # --- Corrected Finished Check ---
-                    # if query_status.get("query", {}).get("finished"): # Old incorrect check
-                    if query_status.get("finished"): # Correct check directly on the status dict
-                    # ------------------------------
-                        local_logger.info(f"Provenance query {query_id} finished.")
-                        
-                        # Check if events are already in the query status response
-                        events = query_status.get("provenanceEvents", [])
-                        
-                        if not events:
-                            # If not in status, try to get results from separate endpoint
-                            try:
-                                events = await nifi_client.get_provenance_results(query_id)
-                            except Exception as e:
-                                local_logger.warning(f"Could not get provenance results from /results endpoint: {e}")
-                                # Try to extract from the query response itself
-                                events = query_status.get("results", {}).get("provenanceEvents", [])
-                        
-                        # --- Added Logging for Raw Events --- 
-                        local_logger.debug(f"Retrieved {len(events)} raw provenance events from client.")
-                        # if events:
-                        #      local_logger.trace(f"First raw event details: {events[0]}") # Log first event details
-                        # ------------------------------------
-
-                        # Format events into summaries
-                        # Note: Provenance events might show multiple stages for the same FlowFile.
-                        # We will return one entry per event for simplicity, ordered by event time (default). 
-                        results["flowfile_summaries"] = [
-                            {
-                                "uuid": event.get("flowFileUuid"),
-                                "filename": event.get("previousAttributes", {}).get("filename") or event.get("updatedAttributes", {}).get("filename"), # Try both
-                                # "size": event.get("fileSize"), # Use bytes value instead
-                                "size_bytes": event.get("fileSizeBytes"), # Corrected field
-                                "event_id": event.get("eventId"),
-                                "event_type": event.get("eventType"),
-                                "event_time": event.get("eventTime"),
-                                "component_name": event.get("componentName"),
-                                "attributes": event.get("updatedAttributes", {}), # Use updated attributes for the event
-                            }
-                            for event in events # Use the retrieved list
-                        ]
-                        break
-                    await asyncio.sleep(polling_interval)
-
-            finally:
-                # 4. Delete query
-                if query_id:
-                    local_logger.info(f"Cleaning up provenance query {query_id}...")
+                local_logger.info(f"Submitted provenance query: {query_response.get('id')}")
+                return query_response
+
+            async def get_query_status(query_id):
+                nifi_req_get = {"operation": "get_provenance_query", "query_id": query_id}
+                local_logger.bind(interface="nifi", direction="request", data=nifi_req_get).debug("Calling NiFi API (polling)")
+                query_status = await nifi_client.get_provenance_query(query_id)
+                nifi_resp_get = {"finished": query_status.get("finished"), "percentCompleted": query_status.get("percentCompleted")}
+                local_logger.bind(interface="nifi", direction="response", data=nifi_resp_get).debug("Received from NiFi API (polling)")
+                return query_status
+
+            async def collect_events(query_id, query_status):
+                local_logger.info(f"Provenance query {query_id} finished.")
+                # Events may already be in the query status response
+                events = query_status.get("provenanceEvents", [])
+                if not events:
                     try:
-                        nifi_req_del = {"operation": "delete_provenance_query", "query_id": query_id}
-                        local_logger.bind(interface="nifi", direction="request", data=nifi_req_del).debug("Calling NiFi API")
-                        await nifi_client.delete_provenance_query(query_id)
-                        local_logger.bind(interface="nifi", direction="response", data={"deleted": True}).debug("Received from NiFi API")
-                    except Exception as del_e:
-                        local_logger.warning(f"Failed to delete provenance query {query_id}: {del_e}")
+                        events = await nifi_client.get_provenance_results(query_id)
+                    except Exception as e:
+                        local_logger.warning(f"Could not get provenance results from /results endpoint: {e}")
+                        events = query_status.get("results", {}).get("provenanceEvents", [])
+                return events
+
+            async def delete_query(query_id):
+                local_logger.info(f"Cleaning up provenance query {query_id}...")
+                nifi_req_del = {"operation": "delete_provenance_query", "query_id": query_id}
+                local_logger.bind(interface="nifi", direction="request", data=nifi_req_del).debug("Calling NiFi API")
+                await nifi_client.delete_provenance_query(query_id)
+                local_logger.bind(interface="nifi", direction="response", data={"deleted": True}).debug("Received from NiFi API")
+
+            events = await run_async_request(
+                f"provenance query for processor {target_id}",
+                submit=submit_query,
+                get_status=get_query_status,
+                delete=delete_query,
+                timeout_seconds=polling_timeout,
+                on_finished=collect_events,
+                schedule=poll_schedule,
+            )
+            local_logger.debug(f"Retrieved {len(events)} raw provenance events from client.")
+
+            # Provenance events might show multiple stages for the same FlowFile.
+            # We return one entry per event, ordered by event time (default).
+            results["flowfile_summaries"] = [
+                {
+                    "uuid": event.get("flowFileUuid"),
+                    "filename": event.get("previousAttributes", {}).get("filename") or event.get("updatedAttributes", {}).get("filename"), # Try both
+                    "size_bytes": event.get("fileSizeBytes"),
+                    "event_id": event.get("eventId"),
+                    "event_type": event.get("eventType"),
+                    "event_time": event.get("eventTime"),
+                    "component_name": event.get("componentName"),
+                    "attributes": event.get("updatedAttributes", {}), # Use updated attributes for the event
+                }
+                for event in events
+            ]
 
         else:
             raise ToolError(f"Invalid target_type: {target_type}. Must be 'connection' or 'processor'.")
@@ -1758,18 +1534,23 @@ async def list_flowfiles(
 @tool_phases(["Review", "Operate"])
 async def get_flowfile_event_details(
     event_id: int,
-    max_content_bytes: int = 4096  # Reasonable default to avoid overwhelming LLM
+    max_content_bytes: int = 4096,  # Reasonable default to avoid overwhelming LLM
+    large_content_preview: Literal["none", "head", "tail", "head_and_tail"] = "none"
 ) -> Dict[str, Any]:
     """
     Retrieves detailed attributes and content for a specific FlowFile provenance event.
 
     Fetches the event details and intelligently retrieves content based on size limits.
     If input and output content are identical, only returns one copy to avoid duplication.
+    Content is streamed, so large FlowFiles are never loaded whole.
 
     Args:
         event_id: The specific numeric ID of the provenance event.
         max_content_bytes: Max bytes of content to return. If content is larger, 
                           returns size info instead of actual content.
+        large_content_preview: For content larger than max_content_bytes, return a preview of up to
+                          max_content_bytes from its start ("head"), its end ("tail"), or half of
+                          each ("head_and_tail") in content_preview. Default "none" returns sizes only.
 
     Returns:
         A dictionary containing the event and content details.
@@ -1798,11 +1579,13 @@ async def get_flowfile_event_details(
         "input_content_size_bytes": 0,
         "output_content_size_bytes": 0,
         "content_identical": False,
+        "content_comparison": None,  # "content_claim", "sha256" or "size" when input and output were compared
         # Content data (only if reasonably sized)
         "content_included": False,
         "content_too_large": False,
         "content": None,  # Will contain actual content if included
-        "content_type": None  # "input", "output", or "both" if different
+        "content_type": None,  # "input", "output", or "both" if different
+        "content_preview": None  # Head and/or tail of content too large to include
     }
 
     try:
@@ -1844,8 +1627,9 @@ async def get_flowfile_event_details(
             results["message"] = f"Event details retrieved. No content available for event {event_id}."
             results["content_included"] = False
             return results
-        
-        elif max_size > max_content_bytes:
+
+        content_too_large = max_size > max_content_bytes
+        if content_too_large and large_content_preview == "none":
             # Content too large to include
             results["status"] = "success"
             results["message"] = f"Event details retrieved. Content available but too large ({max_size} bytes > {max_content_bytes} limit)."
@@ -1853,88 +1637,98 @@ async def get_flowfile_event_details(
             results["content_included"] = False
             return results
 
-        # Step 3: Retrieve content (both input and output to check for duplication)
-        input_content = None
-        output_content = None
-        
-        if input_size > 0:
-            try:
-                local_logger.info(f"Retrieving input content ({input_size} bytes)")
-                content_resp = await nifi_client.get_provenance_event_content(event_id, "input")
-                input_content = await content_resp.aread()
-                await content_resp.aclose()
-            except Exception as e:
-                local_logger.warning(f"Could not retrieve input content: {e}")
+        # Step 3: Decide what to read. Shared content claims (or different sizes) settle identity without
+        # reading; otherwise both sides are hashed while streaming, up to the configured size.
+        content_config = get_provenance_content_config()
+        shared_claim = shared_content_claim(event_details)
+        if shared_claim and input_size == output_size:
+            results["content_identical"] = True
+            results["content_comparison"] = "content_claim"
+        elif input_size > 0 and output_size > 0 and input_size != output_size:
+            results["content_comparison"] = "size"
+        hash_sides = (
+            results["content_comparison"] is None
+            and input_size > 0 and output_size > 0
+            and max_size <= int(content_config["compare_max_bytes"])
+        )
+
+        if not content_too_large:
+            head_bytes, tail_bytes = max_content_bytes, 0
+        elif large_content_preview == "head":
+            head_bytes, tail_bytes = max_content_bytes, 0
+        elif large_content_preview == "tail":
+            head_bytes, tail_bytes = 0, max_content_bytes
+        else:
+            head_bytes, tail_bytes = max_content_bytes - max_content_bytes // 2, max_content_bytes // 2
 
-        if output_size > 0:
+        sides = [side for side, size in (("input", input_size), ("output", output_size)) if size > 0]
+        if results["content_identical"]:
+            sides = sides[:1]
+
+        async def _sample(direction: str):
             try:
-                local_logger.info(f"Retrieving output content ({output_size} bytes)")
-                content_resp = await nifi_client.get_provenance_event_content(event_id, "output")
-                output_content = await content_resp.aread()
-                await content_resp.aclose()
+                local_logger.info(f"Streaming {direction} content (head {head_bytes}, tail {tail_bytes} bytes, hashed: {hash_sides})")
+                return await sample_content(
+                    nifi_client.iter_provenance_event_content(event_id, direction, int(content_config["chunk_size_bytes"])),
+                    head_bytes=head_bytes,
+                    tail_bytes=tail_bytes,
+                    hash_content=hash_sides,
+                    max_bytes=None if (hash_sides or tail_bytes) else head_bytes
+                )
             except Exception as e:
-                local_logger.warning(f"Could not retrieve output content: {e}")
+                local_logger.warning(f"Could not retrieve {direction} content: {e}")
+                return None
+
+        samples = dict(zip(sides, await asyncio.gather(*(_sample(side) for side in sides))))
+        samples = {side: sample for side, sample in samples.items() if sample is not None}
 
         # Step 4: Check for identical content and prepare response
-        if input_content is not None and output_content is not None:
-            if input_content == output_content:
-                # Content is identical, only return one copy
-                results["content_identical"] = True
+        if hash_sides and len(samples) == 2 and samples["input"].sha256 and samples["output"].sha256:
+            results["content_comparison"] = "sha256"
+            results["content_identical"] = samples["input"].sha256 == samples["output"].sha256
+            if results["content_identical"]:
+                samples.pop("output")
+        local_logger.info(f"Input and output content identical: {results['content_identical']} (compared by {results['content_comparison']})")
+
+        def _render(side: str, sample: ContentSample):
+            size = input_size if side == "input" else output_size
+            if not content_too_large:
+                return decode_content(sample.head, truncated=sample.bytes_read > len(sample.head))
+            preview = {}
+            if head_bytes:
+                preview["head"] = decode_content(sample.head, truncated=True)
+            if tail_bytes:
+                preview["tail"] = decode_content(sample.tail, truncated=True)
+            preview["omitted_bytes"] = max(size - len(sample.head) - len(sample.tail), 0)
+            return preview
+
+        rendered = {side: _render(side, sample) for side, sample in samples.items()}
+        if rendered:
+            if results["content_identical"]:
                 results["content_type"] = "both"
-                try:
-                    results["content"] = input_content.decode('utf-8')
-                except UnicodeDecodeError:
-                    import base64
-                    results["content"] = base64.b64encode(input_content).decode('ascii')
-                local_logger.info(f"Input and output content are identical ({len(input_content)} bytes)")
-            else:
-                # Content is different, return both
-                results["content_identical"] = False
+                value = next(iter(rendered.values()))
+            elif len(rendered) == 2:
                 results["content_type"] = "both"
-                try:
-                    input_str = input_content.decode('utf-8')
-                    output_str = output_content.decode('utf-8')
-                    results["content"] = {
-                        "input": input_str,
-                        "output": output_str
-                    }
-                except UnicodeDecodeError:
-                    import base64
-                    results["content"] = {
-                        "input": base64.b64encode(input_content).decode('ascii'),
-                        "output": base64.b64encode(output_content).decode('ascii')
-                    }
-                local_logger.info(f"Input and output content are different (input: {len(input_content)}, output: {len(output_content)} bytes)")
-        
-        elif input_content is not None:
-            # Only input content available
-            results["content_identical"] = False
-            results["content_type"] = "input"
-            try:
-                results["content"] = input_content.decode('utf-8')
-            except UnicodeDecodeError:
-                import base64
-                results["content"] = base64.b64encode(input_content).decode('ascii')
-            local_logger.info(f"Only input content available ({len(input_content)} bytes)")
-            
-        elif output_content is not None:
-            # Only output content available
-            results["content_identical"] = False
-            results["content_type"] = "output"
-            try:
-                results["content"] = output_content.decode('utf-8')
-            except UnicodeDecodeError:
-                import base64
-                results["content"] = base64.b64encode(output_content).decode('ascii')
-            local_logger.info(f"Only output content available ({len(output_content)} bytes)")
+                value = rendered
+            else:
+                results["content_type"] = next(iter(rendered))
+                value = next(iter(rendered.values()))
+            if content_too_large:
+                results["content_preview"] = value
+            else:
+                results["content"] = value
 
         # Final status
+        results["status"] = "success"
         if results["content"] is not None:
             results["content_included"] = True
-            results["status"] = "success"
             results["message"] = f"Successfully retrieved event details and content for event {event_id}."
+        elif results["content_preview"] is not None:
+            results["content_too_large"] = True
+            results["message"] = (f"Event details retrieved. Content too large ({max_size} bytes > {max_content_bytes} limit); "
+                                  f"returning a {large_content_preview} preview.")
         else:
-            results["status"] = "success"
+            results["content_too_large"] = content_too_large
             results["message"] = f"Successfully retrieved event details for event {event_id}. Content was not accessible."
 
         return results
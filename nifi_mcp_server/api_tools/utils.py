@@ -26,6 +26,21 @@ def tool_phases(phases: List[str]):
     return decorator
 # -----------------------------
 
+# --- Streaming Tool Registry ---
+# Maps a tool name to an async function taking the tool's arguments and returning a stream
+# with `chunks()` (an async iterator of JSON-serializable partial results) and `summary()`.
+# SSE endpoints use it to forward each chunk as it arrives instead of awaiting the tool.
+_streaming_tool_registry = {}
+
+def streams_tool(tool_name: str):
+    """Decorator registering the function that opens an incremental stream for `tool_name`."""
+    def decorator(func):
+        _streaming_tool_registry[tool_name] = func
+        _logger.trace(f"Registered streaming variant {func.__name__} for tool {tool_name}")
+        return func
+    return decorator
+# -----------------------------
+
 # Removed ensure_authenticated function
 # --- Helper Function for Authentication --- 
 # 
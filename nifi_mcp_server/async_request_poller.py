@@ -0,0 +1,138 @@
+"""
+Lifecycle of NiFi's asynchronous requests: queue drops, queue listings and provenance queries.
+
+NiFi answers each of these with a request ID. The caller polls the request until it reports
+`finished`, and must then DELETE it, because NiFi keeps the request and its results in memory
+until it is deleted or expires.
+
+`run_async_request` runs that whole lifecycle:
+- The first status poll comes quickly. Later polls back off exponentially.
+- While NiFi reports a partial `percentCompleted`, the wait instead follows the projected
+  remaining time (elapsed * remaining% / completed%), within the same bounds.
+- No wait goes past the deadline. Reaching it raises TimeoutError.
+- The request is deleted however polling ends: success, error, timeout or cancellation.
+  The DELETE is shielded, so a second cancellation cannot abandon it half-way.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+from config.settings import get_async_request_polling_config
+
+
+@dataclass
+class PollSchedule:
+    initial_interval: float = 0.1
+    max_interval: float = 2.0
+    backoff_factor: float = 2.0
+
+    @classmethod
+    def from_settings(cls, max_interval: Optional[float] = None) -> "PollSchedule":
+        """The configured schedule, optionally with a tighter cap on the interval."""
+        config = get_async_request_polling_config()
+        schedule = cls(
+            initial_interval=float(config["initial_interval_seconds"]),
+            max_interval=float(config["max_interval_seconds"]),
+            backoff_factor=float(config["backoff_factor"]),
+        )
+        if max_interval is not None:
+            schedule.max_interval = max(float(max_interval), 0.0)
+            schedule.initial_interval = min(schedule.initial_interval, schedule.max_interval)
+        return schedule
+
+    def next_delay(self, previous_delay: Optional[float], elapsed: float, percent_completed: Any) -> float:
+        """Seconds to wait before the next status poll."""
+        if previous_delay is None:
+            delay = self.initial_interval
+        else:
+            delay = previous_delay * self.backoff_factor
+        try:
+            percent = float(percent_completed)
+        except (TypeError, ValueError):
+            percent = 0.0
+        if 0.0 < percent < 100.0:
+            # Projected time to completion from the progress made so far
+            delay = elapsed * (100.0 - percent) / percent
+        return min(max(delay, self.initial_interval), self.max_interval)
+
+
+async def run_async_request(
+    description: str,
+    submit: Callable[[], Awaitable[Dict[str, Any]]],
+    get_status: Callable[[str], Awaitable[Dict[str, Any]]],
+    delete: Callable[[str], Awaitable[Any]],
+    timeout_seconds: float,
+    on_finished: Optional[Callable[[str, Dict[str, Any]], Awaitable[Any]]] = None,
+    schedule: Optional[PollSchedule] = None,
+) -> Any:
+    """
+    Submits an asynchronous NiFi request, polls it until finished and always deletes it.
+
+    Args:
+        description: Names the request in log and timeout messages, e.g. "drop request for connection X".
+        submit: Creates the request. Returns a dict with the request `id`.
+        get_status: Fetches the request's status dict (`finished`, `percentCompleted`, ...) by ID.
+        delete: Deletes the request by ID.
+        timeout_seconds: Deadline for the request to finish, measured from submission.
+        on_finished: Optional follow-up, called with the ID and final status before the delete
+            (e.g. to fetch provenance results). Its result is returned instead of the status.
+        schedule: Poll timing. Defaults to the `nifi.async_request_polling` settings.
+
+    Raises:
+        TimeoutError: The request did not finish before the deadline.
+        ValueError: `submit` returned no request ID.
+    """
+    schedule = schedule or PollSchedule.from_settings()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + timeout_seconds
+
+    submitted = await submit()
+    request_id = (submitted or {}).get("id")
+    if not request_id:
+        raise ValueError(f"NiFi returned no ID for the {description}")
+
+    try:
+        polls = 0
+        delay = None
+        while True:
+            status = await get_status(request_id)
+            polls += 1
+            if status.get("finished"):
+                logger.debug(f"{description} {request_id} finished after {polls} polls in {loop.time() - started:.2f}s")
+                if on_finished is not None:
+                    return await on_finished(request_id, status)
+                return status
+
+            now = loop.time()
+            remaining = deadline - now
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Timed out after {timeout_seconds}s waiting for {description} {request_id} "
+                    f"({status.get('percentCompleted', 0)}% complete)"
+                )
+            delay = schedule.next_delay(delay, now - started, status.get("percentCompleted"))
+            await asyncio.sleep(min(delay, remaining))
+    finally:
+        await _delete_shielded(description, request_id, delete)
+
+
+async def _delete_shielded(description: str, request_id: str, delete: Callable[[str], Awaitable[Any]]):
+    """Deletes the request even if the surrounding task is cancelled meanwhile."""
+    cleanup = asyncio.ensure_future(delete(request_id))
+    try:
+        await asyncio.shield(cleanup)
+    except asyncio.CancelledError:
+        # The delete keeps running on its own; just report failures when it settles
+        cleanup.add_done_callback(lambda task: _log_cleanup_failure(description, request_id, task))
+        raise
+    except Exception as e:
+        logger.warning(f"Failed to delete {description} {request_id}: {e}")
+
+
+def _log_cleanup_failure(description: str, request_id: str, task: "asyncio.Future"):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Failed to delete {description} {request_id}: {task.exception()}")
@@ -0,0 +1,135 @@
+"""
+Process-wide registry of authenticated NiFi clients, keyed by NiFi server ID.
+
+Every tool request used to build a new NiFiClient and POST to /access/token before
+doing any real work. The registry keeps one authenticated, connection-pooled client
+per configured server alive for the lifetime of the process, refreshes its token
+shortly before the JWT expires, and closes everything on application shutdown.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import (
+    get_nifi_server_config,
+    get_nifi_http_client_config,
+    get_nifi_token_refresh_margin_seconds,
+)
+from nifi_mcp_server.nifi_client import NiFiClient, NiFiAuthenticationError
+
+
+@dataclass
+class _RegistryEntry:
+    """A cached client together with the event loop it was created on."""
+    client: NiFiClient
+    loop: asyncio.AbstractEventLoop
+
+
+class NiFiClientRegistry:
+    """Caches one authenticated NiFiClient per server ID and keeps its token fresh."""
+
+    def __init__(self, refresh_margin_seconds: Optional[float] = None):
+        self._entries: Dict[str, _RegistryEntry] = {}
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._refresh_margin_seconds = refresh_margin_seconds
+
+    @property
+    def refresh_margin_seconds(self) -> float:
+        if self._refresh_margin_seconds is not None:
+            return self._refresh_margin_seconds
+        return get_nifi_token_refresh_margin_seconds()
+
+    def _lock_for(self, server_id: str, loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+        # asyncio locks belong to one event loop, so keep one per (server, loop)
+        key = (server_id, id(loop))
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def _build_client(self, server_id: str, bound_logger=logger) -> NiFiClient:
+        server_conf = get_nifi_server_config(server_id)
+        if not server_conf:
+            bound_logger.error(f"Configuration for NiFi server ID '{server_id}' not found.")
+            raise ValueError(f"NiFi server configuration not found for ID: {server_id}")
+
+        client = NiFiClient(
+            base_url=server_conf.get('url'),
+            username=server_conf.get('username'),
+            password=server_conf.get('password'),
+            tls_verify=server_conf.get('tls_verify', True),
+            server_id=server_id,
+            **get_nifi_http_client_config(server_id)
+        )
+        bound_logger.debug(f"Instantiated NiFiClient for {server_conf.get('url')}")
+        return client
+
+    async def get_client(self, server_id: str, bound_logger=logger) -> NiFiClient:
+        """Returns the cached authenticated client for `server_id`, creating or refreshing it as needed."""
+        loop = asyncio.get_running_loop()
+        entry = self._entries.get(server_id)
+        if entry and entry.loop is loop and not entry.client.token_expires_within(self.refresh_margin_seconds):
+            bound_logger.debug(f"Reusing cached NiFi client for server ID: {server_id}")
+            return entry.client
+
+        async with self._lock_for(server_id, loop):
+            entry = self._entries.get(server_id)
+            if entry and entry.loop is not loop:
+                # httpx connections cannot be shared across event loops (e.g. asyncio.run in a worker thread)
+                bound_logger.info(f"Discarding NiFi client for {server_id} created on a different event loop.")
+                self._entries.pop(server_id, None)
+                entry = None
+
+            if entry is None:
+                client = self._build_client(server_id, bound_logger)
+                try:
+                    if not client.is_authenticated:
+                        bound_logger.info(f"Authenticating NiFi client for {client.base_url}")
+                        await client.authenticate()
+                        bound_logger.info(f"Authentication successful for {client.base_url}")
+                except NiFiAuthenticationError as e:
+                    bound_logger.error(f"Authentication failed for NiFi server {server_id} ({client.base_url}): {e}")
+                    await client.close()
+                    raise
+                except Exception as e:
+                    bound_logger.error(f"Unexpected error getting/authenticating NiFi client for {server_id}: {e}", exc_info=True)
+                    await client.close()
+                    raise
+                self._entries[server_id] = _RegistryEntry(client=client, loop=loop)
+                return client
+
+            client = entry.client
+            if client.token_expires_within(self.refresh_margin_seconds):
+                bound_logger.info(f"NiFi token for {server_id} expires within {self.refresh_margin_seconds}s; refreshing.")
+                try:
+                    await client.authenticate()
+                except NiFiAuthenticationError:
+                    self._entries.pop(server_id, None)
+                    await client.close()
+                    raise
+            return client
+
+    async def invalidate(self, server_id: str):
+        """Closes and forgets the cached client for `server_id` (e.g. after a configuration change)."""
+        entry = self._entries.pop(server_id, None)
+        if entry:
+            await entry.client.close()
+
+    async def close_all(self):
+        """Closes every cached client. Called from the FastAPI lifespan on shutdown."""
+        entries = list(self._entries.items())
+        self._entries.clear()
+        for server_id, entry in entries:
+            try:
+                await entry.client.close()
+                logger.info(f"Closed cached NiFi client for server ID: {server_id}")
+            except Exception as e:
+                logger.warning(f"Error closing cached NiFi client for server ID {server_id}: {e}")
+
+
+# Shared registry for the whole process
+nifi_client_registry = NiFiClientRegistry()
@@ -0,0 +1,174 @@
+"""
+Process-wide cache of NiFi component entities shared across tool calls.
+
+Agents tend to read the same processors, groups and flows several times within one
+conversation. Entries are keyed by (server key, component type, component id), carry the
+entity's `revision.version`, expire after a TTL and are evicted least-recently-used once
+the cache is full.
+
+Every mutating request a NiFiClient sends (POST/PUT/DELETE) invalidates the cached
+entries for that server, so any tool in creation.py, modification.py or operation.py
+clears stale reads as soon as it changes the flow. Reads that were already in flight when
+an invalidation happened are not stored. Callers can bypass the cache with the
+`X-Mcp-Cache-Bypass: true` header or a tool's `bypass_cache` argument.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import get_component_cache_config
+
+CACHE_BYPASS_HEADER = "x-mcp-cache-bypass"
+
+CacheKey = Tuple[str, str, str]
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    version: Optional[int]
+    expires_at: float
+
+
+def revision_version(entity: Any) -> Optional[int]:
+    """Returns `revision.version` of a NiFi entity, or None if it has none."""
+    if isinstance(entity, dict):
+        version = entity.get("revision", {}).get("version")
+        if isinstance(version, int):
+            return version
+    return None
+
+
+def cache_bypass_requested(headers: Optional[Dict[str, str]] = None) -> bool:
+    """Checks the request headers (or the current request context) for a cache bypass."""
+    if headers is None:
+        from config.logging_setup import request_context
+        context_data = request_context.get()
+        headers = context_data.get("headers", {}) if context_data else {}
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    return str(headers.get(CACHE_BYPASS_HEADER, "")).lower() == "true"
+
+
+class ComponentCache:
+    """TTL + LRU cache of NiFi entities with per-server invalidation."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None, enabled: Optional[bool] = None):
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def _config_value(self, explicit, key):
+        return explicit if explicit is not None else get_component_cache_config()[key]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._config_value(self._enabled, "enabled"))
+
+    @property
+    def ttl_seconds(self) -> float:
+        return float(self._config_value(self._ttl_seconds, "ttl_seconds"))
+
+    @property
+    def max_entries(self) -> int:
+        return int(self._config_value(self._max_entries, "max_entries"))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, server_key: str) -> int:
+        """Counter bumped by every invalidation of `server_key`."""
+        return self._generations.get(server_key, 0)
+
+    def get(self, server_key: str, component_type: str, component_id: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        key = (server_key, component_type, component_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(
+        self,
+        server_key: str,
+        component_type: str,
+        component_id: str,
+        value: Any,
+        version: Optional[int] = None,
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        Stores `value` unless it is known to be stale.
+
+        A value is rejected when the server was invalidated after `generation` was read,
+        or when the cached entry already holds a newer revision. Returns True if stored.
+        """
+        if not self.enabled:
+            return False
+        if generation is not None and generation != self.generation(server_key):
+            return False
+        key = (server_key, component_type, component_id)
+        if version is None:
+            version = revision_version(value)
+        existing = self._entries.get(key)
+        if existing and existing.version is not None and version is not None and version < existing.version:
+            return False
+        self._entries[key] = _CacheEntry(value=value, version=version, expires_at=time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    async def get_or_fetch(
+        self,
+        server_key: str,
+        component_type: str,
+        component_id: str,
+        fetch: Callable[[], Awaitable[Any]],
+        bypass: bool = False
+    ) -> Any:
+        """Returns the cached value or awaits `fetch()` and caches its result."""
+        if not bypass:
+            cached = self.get(server_key, component_type, component_id)
+            if cached is not None:
+                logger.trace(f"Component cache hit for {component_type} {component_id}")
+                return cached
+        generation = self.generation(server_key)
+        value = await fetch()
+        self.put(server_key, component_type, component_id, value, generation=generation)
+        return value
+
+    def invalidate(self, server_key: str, component_type: Optional[str] = None, component_id: Optional[str] = None):
+        """Drops one entry, one component type, or (by default) everything for `server_key`."""
+        self._generations[server_key] = self.generation(server_key) + 1
+        for key in [k for k in self._entries if k[0] == server_key]:
+            if component_type is not None and key[1] != component_type:
+                continue
+            if component_id is not None and key[2] != component_id:
+                continue
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+        self._generations.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared cache for the whole process
+component_cache = ComponentCache()
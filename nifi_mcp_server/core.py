@@ -3,6 +3,7 @@ from loguru import logger
 
 from mcp.server import FastMCP
 from nifi_mcp_server.nifi_client import NiFiClient, NiFiAuthenticationError
+from nifi_mcp_server.client_registry import nifi_client_registry
 
 # --- Import Config Settings --- #
 from config.settings import get_nifi_server_config, get_nifi_servers # Added
@@ -20,47 +21,22 @@ mcp = FastMCP(
 )
 logger.info("MCP instance initialized in core.")
 
-# REMOVED single shared NiFiClient instantiation
-# nifi_api_client = None 
-
 # --- NiFi Client Factory --- #
-# Simple cache for authenticated clients within a request scope? (Could use contextvars or pass around)
-# For now, create per request/call.
+# Authenticated clients are cached per server ID by the process-wide registry, so
+# tool calls reuse one pooled connection and token instead of logging in every time.
 
 async def get_nifi_client(server_id: str, bound_logger = logger) -> NiFiClient:
-    """Gets or creates an authenticated NiFi client for the specified server ID."""
+    """Gets the cached authenticated NiFi client for the specified server ID, creating it if needed.
+
+    The returned client is shared across requests: callers must not close it. Use
+    `close_nifi_clients()` on application shutdown instead.
+    """
     bound_logger.info(f"Requesting NiFi client for server ID: {server_id}")
-    server_conf = get_nifi_server_config(server_id)
-    if not server_conf:
-        bound_logger.error(f"Configuration for NiFi server ID '{server_id}' not found.")
-        raise ValueError(f"NiFi server configuration not found for ID: {server_id}")
-
-    client = NiFiClient(
-        base_url=server_conf.get('url'),
-        username=server_conf.get('username'),
-        password=server_conf.get('password'),
-        tls_verify=server_conf.get('tls_verify', True)
-    )
-    bound_logger.debug(f"Instantiated NiFiClient for {server_conf.get('url')}")
+    return await nifi_client_registry.get_client(server_id, bound_logger=bound_logger)
 
-    try:
-        # Ensure client is authenticated
-        if not client.is_authenticated:
-            bound_logger.info(f"Authenticating NiFi client for {server_conf.get('url')}")
-            await client.authenticate()
-            bound_logger.info(f"Authentication successful for {server_conf.get('url')}")
-        else:
-            bound_logger.debug(f"NiFi client for {server_conf.get('url')} is already authenticated (cached?)")
-        return client
-    except NiFiAuthenticationError as e:
-        bound_logger.error(f"Authentication failed for NiFi server {server_id} ({server_conf.get('url')}): {e}")
-        # Close the client if auth fails to release resources
-        await client.close()
-        raise # Re-raise the authentication error
-    except Exception as e:
-        bound_logger.error(f"Unexpected error getting/authenticating NiFi client for {server_id}: {e}", exc_info=True)
-        await client.close()
-        raise # Re-raise other exceptions
+async def close_nifi_clients():
+    """Closes all cached NiFi clients. Call from the application shutdown hook."""
+    await nifi_client_registry.close_all()
 
 
 # Ensure at least one NiFi server is configured on startup (Optional check)
@@ -189,9 +165,13 @@ def handle_nifi_errors(original_func: Callable[..., Coroutine[Any, Any, Any]]):
                         local_logger.info(f"[Auto-Stop] Target for stop is the process group itself: {target_pg_to_stop_id}")
                     elif object_type_for_remediation in ["processor", "input_port", "output_port"]:
                         local_logger.info(f"[Auto-Stop] Attempting to find parent PG for {object_type_for_remediation} {object_id_for_remediation}")
-                        details = await _get_component_details_direct(nifi_client, object_id_for_remediation, object_type_for_remediation, local_logger)
-                        if details and details.get("component", {}).get("parentGroupId"):
-                            target_pg_to_stop_id = details["component"]["parentGroupId"]
+                        # The client usually saw the component already; only fetch it when it did not
+                        target_pg_to_stop_id = nifi_client.revisions.parent_group_id(object_id_for_remediation)
+                        if not target_pg_to_stop_id:
+                            details = await _get_component_details_direct(nifi_client, object_id_for_remediation, object_type_for_remediation, local_logger)
+                            if details and details.get("component", {}).get("parentGroupId"):
+                                target_pg_to_stop_id = details["component"]["parentGroupId"]
+                        if target_pg_to_stop_id:
                             local_logger.info(f"[Auto-Stop] Identified parent PG ID: {target_pg_to_stop_id} for component {object_id_for_remediation}")
                         else:
                             local_logger.warning(f"[Auto-Stop] Could not get parentGroupId for {object_type_for_remediation} {object_id_for_remediation} to stop parent PG.")
@@ -259,6 +239,8 @@ async def _handle_drop_request(nifi_client: NiFiClient, connection_id: str, time
                 "connection_id": connection_id,
                 "success": result["success"],
                 "dropped_count": result.get("dropped_count") if result["success"] else None,
+                "dropped_flowfiles": result.get("dropped_flowfiles", 0),
+                "dropped_bytes": result.get("dropped_bytes", 0),
                 "error": result.get("error") if not result["success"] else None
             }]
         }
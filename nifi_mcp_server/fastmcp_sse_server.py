@@ -10,14 +10,12 @@ import signal
 from typing import List, Dict, Optional, Any, Union, Literal
 import json
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Body, Request, Query, Header
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import sys
 from loguru import logger 
-from docstring_parser import parse 
 from contextlib import asynccontextmanager
-from textwrap import dedent
 
 # --- Setup Logging --- 
 try:
@@ -31,7 +29,7 @@ except ImportError as e:
 from nifi_mcp_server.nifi_client import NiFiAuthenticationError
 
 # Import core components AFTER logging is setup, but BEFORE tools
-from .core import mcp, get_nifi_client
+from .core import mcp, get_nifi_client, close_nifi_clients
 
 # Import the context var from logging_setup
 from config.logging_setup import request_context
@@ -53,7 +51,8 @@ from .api_tools.utils import (
     filter_connection_data,
     filter_port_data,
     filter_process_group_data,
-    _tool_phase_registry
+    _tool_phase_registry,
+    _streaming_tool_registry
 )
 
 # --- Import Tool Modules AFTER mcp is defined to allow registration ---
@@ -62,6 +61,8 @@ from .api_tools import creation
 from .api_tools import modification
 from .api_tools import operation
 from .api_tools import helpers
+from .tool_catalog import TOOL_CATALOG_VERSION_HEADER, current_tool_catalog_version, etag_matches, get_tool_catalog
+from .metrics import METRICS_CONTENT_TYPE, render_metrics, track_tool_call
 
 # --- Import Config Settings --- #
 from config.settings import get_nifi_servers
@@ -90,6 +91,12 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to configure LLM clients: {e}", exc_info=True)
         logger.warning("Workflows may not be able to call LLMs")
     
+    # Format every tool definition once; GET /tools serves the result
+    try:
+        get_tool_catalog()
+    except Exception as e:
+        logger.error(f"Failed to build the tool catalog: {e}", exc_info=True)
+    
     if not get_nifi_servers():
         logger.warning("*******************************************************")
         logger.warning("*** No NiFi servers configured in config.yaml!      ***")
@@ -102,6 +109,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown logic
     logger.info("FastAPI server shutting down...")
+    await close_nifi_clients()
     logger.info("Cleanup finished.")
 
 app = FastAPI(
@@ -147,7 +155,10 @@ async def get_tools(
     request: Request, 
     phase: str | None = Query(None)
 ):
-    """Retrieve the list of available MCP tools, optionally filtered by phase."""
+    """Retrieve the list of available MCP tools, optionally filtered by phase.
+
+    Served from the precomputed tool catalog with an ETag; a matching If-None-Match gets a 304.
+    """
     user_request_id = request.state.user_request_id
     action_id = request.state.action_id
     bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, requested_phase=phase)
@@ -155,132 +166,23 @@ async def get_tools(
     bound_logger.debug(f"/tools endpoint received phase parameter: {phase!r}")
     
     try:
-        bound_logger.debug(f"Fetching tools, requested phase: '{phase}'")
-        formatted_tools = []
-        tool_manager = getattr(mcp, '_tool_manager', None)
-        if tool_manager:
-            tools_info = tool_manager.list_tools()
-            
-            for tool_info in tools_info: 
-                tool_name = getattr(tool_info, 'name', 'unknown')
-                tool_phases_list = _tool_phase_registry.get(tool_name, [])
-                if not tool_phases_list:
-                     bound_logger.warning(f"Could not find phase tags in registry for tool '{tool_name}'. Assuming it belongs to all phases for safety.")
-
-                requested_phase_lower = phase.lower() if phase else None
-                tool_phases_lower = [p.lower() for p in tool_phases_list]
-                
-                if requested_phase_lower and requested_phase_lower != "all" and requested_phase_lower not in tool_phases_lower:
-                    bound_logger.trace(f"Skipping tool '{tool_name}' due to phase mismatch (requested: {phase}, tool phases: {tool_phases_list})")
-                    continue
-
-                raw_docstring = getattr(tool_info, 'description', '')
-                parsed_docstring = parse(raw_docstring)
-                returns_description = ""
-                if parsed_docstring.returns and parsed_docstring.returns.description:
-                    returns_description = f"\n\n**Returns:**\n{parsed_docstring.returns.description}"
-
-                base_description_parts = []
-                if parsed_docstring.short_description:
-                    base_description_parts.append(parsed_docstring.short_description)
-                
-                if parsed_docstring.long_description:
-                    base_description_parts.append("\n\n" + parsed_docstring.long_description)
-
-                if base_description_parts:
-                    base_description = "".join(base_description_parts)
-                    bound_logger.trace(f"Using parsed short/long description for tool '{tool_name}'")
-                else:
-                    base_description = raw_docstring.split('\n\n')[0]
-                    bound_logger.trace(f"Falling back to basic description for tool '{tool_name}' (parsing empty?)")
-
-                # Extract Example section
-                example_section = ""
-                example_markers = ["Example:\n", "Examples:\n"]
-                normalized_docstring = "\n" + raw_docstring
-
-                marker_found = None
-                marker_start_index = -1
-                for marker in example_markers:
-                    found_index = normalized_docstring.find(marker)
-                    if found_index != -1:
-                        marker_found = marker
-                        marker_start_index = found_index
-                        break
-                
-                if marker_found:
-                    content_start_index = marker_start_index + len(marker_found)
-                    potential_example_content = normalized_docstring[content_start_index:]
-
-                    next_section_markers = ["Args:\n", "Returns:\n", "Raises:\n", "Attributes:\n", "Yields:\n"]
-                    end_index = len(potential_example_content)
-
-                    for next_marker in next_section_markers:
-                         found_index = potential_example_content.find(next_marker)
-                         if found_index != -1:
-                            end_index = min(end_index, found_index)
-
-                    raw_example_content = potential_example_content[:end_index]
-                    dedented_content = dedent(raw_example_content)
-                    example_content = dedented_content.strip()
-                    
-                    if example_content:
-                         example_section = f"\n\n**{marker_found.strip()}**\n{example_content}\n\n"
-                         bound_logger.trace(f"Extracted Example section for tool '{tool_name}'")
-
-                tool_description = f"{base_description}{example_section}{returns_description}"
-
-                param_descriptions = {p.arg_name: p.description for p in parsed_docstring.params}
-                raw_params_schema = getattr(tool_info, 'parameters', {})
-                parameters_schema = {"type": "object", "properties": {}}
-                raw_properties = raw_params_schema.get('properties', {})
-                cleaned_properties = {}
-                if isinstance(raw_properties, dict):
-                    for prop_name, prop_schema in raw_properties.items():
-                        if isinstance(prop_schema, dict):
-                            cleaned_schema = prop_schema.copy()
-                            cleaned_schema.pop('anyOf', None)
-                            cleaned_schema.pop('title', None)
-                            cleaned_schema.pop('default', None)
-                            cleaned_schema['description'] = param_descriptions.get(prop_name, '')
-                            cleaned_properties[prop_name] = cleaned_schema
-                        else:
-                            logger.warning(f"Property '{prop_name}' in tool '{tool_name}' has non-dict schema: {prop_schema}. Skipping property.")
-                parameters_schema["properties"] = cleaned_properties
-                required_list = raw_params_schema.get('required', [])
-                if required_list and cleaned_properties:
-                     parameters_schema["required"] = required_list
-                elif "required" in parameters_schema:
-                     del parameters_schema["required"]
-                if not parameters_schema["properties"]:
-                     del parameters_schema["properties"]
-                     if "required" in parameters_schema: del parameters_schema["required"]
-                if 'required' in raw_params_schema:
-                    parameters_schema["required"] = list(raw_params_schema['required'])
-                if 'properties' in parameters_schema:
-                    for prop_name, prop_data in parameters_schema['properties'].items():
-                        if isinstance(prop_data, dict) and 'enum' in prop_data:
-                            prop_data['enum'] = [str(val) for val in prop_data['enum']]
-                
-                formatted_tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool_name,
-                        "description": tool_description,
-                        "parameters": parameters_schema
-                    },
-                    "phases": tool_phases_list
-                })
-            bound_logger.info(f"Returning {len(formatted_tools)} tool definitions (Phase: {phase or 'All'}).")
-            return formatted_tools
-        else:
-            bound_logger.warning("Could not find ToolManager (_tool_manager) on MCP instance.")
-            return []
+        phase_tools = get_tool_catalog().for_phase(phase)
     except Exception as e:
         bound_logger.error(f"Error retrieving tool definitions: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error retrieving tools.")
 
+    if etag_matches(request.headers.get("If-None-Match"), phase_tools.etag):
+        bound_logger.debug(f"Tool definitions unchanged (Phase: {phase or 'All'}, ETag: {phase_tools.etag}).")
+        return Response(status_code=304, headers={"ETag": phase_tools.etag})
+    bound_logger.info(f"Returning {len(phase_tools.tools)} tool definitions (Phase: {phase or 'All'}).")
+    return Response(content=phase_tools.body, media_type="application/json", headers={"ETag": phase_tools.etag})
+
 # Define a Pydantic model for the request body with context support
+@app.get("/metrics", tags=["Monitoring"])
+async def get_metrics():
+    """NiFi API, tool and workflow step metrics in the Prometheus text format."""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 from pydantic import BaseModel
 
 class ContextModel(BaseModel):
@@ -315,6 +217,10 @@ async def add_context_to_logger(request: Request, call_next):
     
     try:
         response = await call_next(request)
+        # Lets clients tell whether their cached tool list is still current
+        catalog_version = current_tool_catalog_version()
+        if catalog_version:
+            response.headers[TOOL_CATALOG_VERSION_HEADER] = catalog_version
     finally:
         request_context.reset(loguru_context_token)
         current_user_request_id.reset(user_id_token)
@@ -360,7 +266,8 @@ async def execute_tool(
 
         bound_logger.info(f"Executing tool '{tool_name}'...")
         
-        tool_result_mcp_format = await mcp.call_tool(tool_name, tool_input)
+        with track_tool_call(tool_name, nifi_server_id):
+            tool_result_mcp_format = await mcp.call_tool(tool_name, tool_input)
                 
         bound_logger.info(f"Tool '{tool_name}' execution successful.")
         bound_logger.debug(f"Raw MCP Tool result: {tool_result_mcp_format}") 
@@ -438,9 +345,6 @@ async def execute_tool(
         if logger_token:
             current_request_logger.reset(logger_token)
             bound_logger.trace("Reset request logger context variable.")
-        if nifi_client:
-            bound_logger.debug(f"Closing NiFi client connection for server ID: {nifi_server_id}")
-            await nifi_client.close()
 
 # --- SSE Endpoints --- #
 
@@ -495,8 +399,28 @@ async def execute_tool_sse(
 
             bound_logger.info(f"Executing tool '{tool_name}'...")
             yield f"data: {json.dumps({'type': 'progress', 'message': f'Executing tool: {tool_name}'})}\n\n"
-            
-            tool_result_mcp_format = await mcp.call_tool(tool_name, tool_input)
+
+            if tool_name in _streaming_tool_registry:
+                # Forward each partial result as its own event instead of buffering the whole result
+                try:
+                    stream = await _streaming_tool_registry[tool_name](**tool_input)
+                except TypeError as e:
+                    raise ValueError(f"Invalid arguments for tool '{tool_name}': {e}") from e
+                chunks = stream.chunks()
+                chunk_count = 0
+                with track_tool_call(tool_name, nifi_server_id):
+                    try:
+                        async for chunk in chunks:
+                            chunk_count += 1
+                            yield f"data: {json.dumps({'type': 'progress', 'message': f'Partial result {chunk_count}', 'chunk': chunk})}\n\n"
+                    finally:
+                        await chunks.aclose()
+                bound_logger.info(f"Tool '{tool_name}' streamed {chunk_count} partial results.")
+                yield f"data: {json.dumps({'type': 'complete', 'result': stream.summary()})}\n\n"
+                return
+
+            with track_tool_call(tool_name, nifi_server_id):
+                tool_result_mcp_format = await mcp.call_tool(tool_name, tool_input)
                 
             bound_logger.info(f"Tool '{tool_name}' execution successful.")
             bound_logger.debug(f"Raw MCP Tool result: {tool_result_mcp_format}") 
@@ -572,9 +496,6 @@ async def execute_tool_sse(
             if logger_token:
                 current_request_logger.reset(logger_token)
                 bound_logger.trace("Reset request logger context variable.")
-            if nifi_client:
-                bound_logger.debug(f"Closing NiFi client connection for server ID: {nifi_server_id}")
-                await nifi_client.close()
 
     return StreamingResponse(
         generate_sse(),
@@ -735,9 +656,6 @@ async def execute_workflow(
         if logger_token:
             current_request_logger.reset(logger_token)
             bound_logger.trace("Reset request logger context variable.")
-        if nifi_client:
-            bound_logger.debug(f"Closing NiFi client connection for server ID: {nifi_server_id}")
-            await nifi_client.close()
 
 @app.get("/workflows/validate/{workflow_name}", response_model=Dict[str, Any], tags=["Workflows"])
 async def validate_workflow(
@@ -860,9 +778,6 @@ async def execute_workflow_sse(
             if logger_token:
                 current_request_logger.reset(logger_token)
                 bound_logger.trace("Reset request logger context variable.")
-            if nifi_client:
-                bound_logger.debug(f"Closing NiFi client connection for server ID: {nifi_server_id}")
-                await nifi_client.close()
 
     return StreamingResponse(
         generate_workflow_sse(),
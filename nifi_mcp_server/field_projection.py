@@ -0,0 +1,260 @@
+"""
+Field projection for the read tools' results.
+
+NiFi entities carry far more than an agent usually needs: revisions, status snapshots,
+bundle coordinates, canvas positions and full property descriptors. The read tools accept
+a `detail_level` preset (`ids`, `summary`, `config`, `full`) or an explicit list of dotted
+field paths (e.g. `component.config.properties`), and prune their result down to those
+fields before it is serialized.
+
+A path selects a key at each step; when a step reaches a list, the rest of the path applies
+to every item. A path that ends on a dict or list keeps it whole, and a path naming a key
+the result does not have is ignored. Projection builds new containers on the way down and
+never mutates its input, so results shared with the component cache stay intact.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
+
+DetailLevel = Literal["ids", "summary", "config", "full"]
+
+DETAIL_LEVELS: Tuple[str, ...] = ("ids", "summary", "config", "full")
+
+# A projection trie: key -> sub-trie, where None keeps the key's whole value
+_Trie = Dict[str, Optional["_Trie"]]
+
+_ENTITY_IDS = ("id", "component.name", "component.type", "component.parentGroupId")
+_ENTITY_STATE = ("revision.version", "component.state", "component.validationStatus", "component.validationErrors")
+
+# Presets per result shape. The keys are the get_nifi_object_details object types (raw NiFi
+# entities), the list_nifi_objects object types (summaries from api_tools.utils) and
+# "process_group_status". `full` is never listed: it means no projection.
+DETAIL_PRESETS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "processor": {
+        "ids": _ENTITY_IDS,
+        "summary": _ENTITY_IDS + _ENTITY_STATE + (
+            "status.runStatus",
+            "status.aggregateSnapshot.activeThreadCount",
+            "status.aggregateSnapshot.flowFilesIn",
+            "status.aggregateSnapshot.flowFilesOut",
+        ),
+        "config": _ENTITY_IDS + _ENTITY_STATE + (
+            "component.relationships",
+            "component.config.properties",
+            "component.config.schedulingStrategy",
+            "component.config.schedulingPeriod",
+            "component.config.concurrentlySchedulableTaskCount",
+            "component.config.autoTerminatedRelationships",
+            "component.config.penaltyDuration",
+            "component.config.yieldDuration",
+            "component.config.runDurationMillis",
+            "component.config.comments",
+        ),
+    },
+    "connection": {
+        "ids": ("id", "component.name", "component.parentGroupId", "component.source.id", "component.destination.id"),
+        "summary": (
+            "id", "revision.version", "component.name", "component.parentGroupId",
+            "component.source.id", "component.source.name",
+            "component.destination.id", "component.destination.name",
+            "component.selectedRelationships",
+            "status.aggregateSnapshot.flowFilesQueued",
+            "status.aggregateSnapshot.bytesQueued",
+        ),
+        "config": (
+            "id", "revision.version", "component.name", "component.parentGroupId",
+            "component.source.id", "component.source.name",
+            "component.destination.id", "component.destination.name",
+            "component.selectedRelationships",
+            "component.availableRelationships",
+            "component.backPressureObjectThreshold",
+            "component.backPressureDataSizeThreshold",
+            "component.flowFileExpiration",
+            "component.prioritizers",
+            "component.loadBalanceStrategy",
+        ),
+    },
+    "port": {
+        "ids": _ENTITY_IDS,
+        "summary": _ENTITY_IDS + _ENTITY_STATE + ("status.runStatus",),
+        "config": _ENTITY_IDS + _ENTITY_STATE + (
+            "component.comments",
+            "component.concurrentlySchedulableTaskCount",
+            "component.allowRemoteAccess",
+        ),
+    },
+    "process_group": {
+        "ids": ("id", "component.name", "component.parentGroupId"),
+        "summary": (
+            "id", "revision.version", "component.name", "component.parentGroupId",
+            "runningCount", "stoppedCount", "invalidCount", "disabledCount",
+            "inputPortCount", "outputPortCount",
+            "status.aggregateSnapshot.flowFilesQueued",
+            "status.aggregateSnapshot.bytesQueued",
+        ),
+        "config": (
+            "id", "revision.version", "component.name", "component.parentGroupId",
+            "component.comments",
+            "component.parameterContext",
+            "component.flowfileConcurrency",
+            "component.flowfileOutboundPolicy",
+        ),
+    },
+    "controller_service": {
+        "ids": _ENTITY_IDS,
+        "summary": _ENTITY_IDS + _ENTITY_STATE,
+        "config": _ENTITY_IDS + _ENTITY_STATE + (
+            "component.properties",
+            "component.controllerServiceApis",
+            "component.comments",
+        ),
+    },
+    "processors": {
+        "ids": ("id", "name", "type"),
+        "summary": ("id", "name", "type", "state", "runStatus", "validationStatus", "validationErrors"),
+        "config": ("id", "name", "type", "state", "validationStatus", "validationErrors", "relationships", "properties"),
+    },
+    "connections": {
+        "ids": ("id", "name", "sourceId", "destinationId"),
+        "summary": (
+            "id", "name", "sourceId", "sourceName", "sourceType",
+            "destinationId", "destinationName", "destinationType", "selectedRelationships",
+        ),
+        "config": (
+            "id", "name", "sourceId", "sourceName", "sourceGroupId",
+            "destinationId", "destinationName", "destinationGroupId",
+            "selectedRelationships", "availableRelationships",
+        ),
+    },
+    "ports": {
+        "ids": ("id", "name", "type"),
+        "summary": ("id", "name", "type", "state", "validation_errors", "active_thread_count", "queued_count", "queued_size"),
+        "config": ("id", "name", "type", "state", "validation_errors", "comments", "concurrent_tasks"),
+    },
+    "controller_services": {
+        "ids": ("id", "name", "type"),
+        "summary": ("id", "name", "type", "state", "validationStatus", "validationErrors"),
+        "config": (
+            "id", "name", "type", "state", "version", "validationStatus", "validationErrors",
+            "properties", "controllerServiceApis", "comments",
+        ),
+    },
+    "process_groups": {
+        "ids": ("id", "name", "error"),
+        "summary": ("id", "name", "counts", "error"),
+        "config": ("id", "name", "counts", "error"),
+    },
+    "process_group_status": {
+        "ids": ("process_group_id", "process_group_name"),
+        "summary": (
+            "process_group_id", "process_group_name", "component_summary",
+            "invalid_components.id", "invalid_components.name", "invalid_components.type",
+            "queue_summary.total_queued_count", "queue_summary.total_queued_size_human",
+            "bulletins.timestamp", "bulletins.sourceId", "bulletins.error",
+            "bulletins.bulletin.level", "bulletins.bulletin.sourceName", "bulletins.bulletin.message",
+        ),
+        # What needs fixing: full validation errors and per-connection queues, no bulletins
+        "config": (
+            "process_group_id", "process_group_name", "component_summary",
+            "invalid_components", "queue_summary",
+        ),
+    },
+}
+
+
+def normalize_fields(fields: Optional[Union[str, Iterable[str]]]) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the field paths as a tuple, or None when no explicit fields were given.
+
+    Accepts a list of paths or a single comma-separated string; blank entries are skipped.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    paths = tuple(path.strip() for path in fields if path and path.strip())
+    return paths or None
+
+
+def resolve_projection(
+    result_kind: str,
+    detail_level: Optional[str] = None,
+    fields: Optional[Union[str, Iterable[str]]] = None
+) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the field paths to keep for a result of `result_kind`, or None to keep everything.
+
+    Explicit `fields` take precedence over `detail_level`; `full`, or neither, means no
+    projection.
+
+    Raises:
+        ValueError: If `detail_level` is not one of DETAIL_LEVELS.
+    """
+    paths = normalize_fields(fields)
+    if paths is not None:
+        return paths
+    if detail_level is None or detail_level == "full":
+        return None
+    if detail_level not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown detail_level '{detail_level}'. Expected one of: {', '.join(DETAIL_LEVELS)}")
+    return DETAIL_PRESETS[result_kind][detail_level]
+
+
+@lru_cache(maxsize=256)
+def _compile(paths: Tuple[str, ...]) -> _Trie:
+    """Merges dotted paths into a trie; a shorter path wins over the longer ones it prefixes."""
+    trie: _Trie = {}
+    for path in paths:
+        node = trie
+        keys = path.split(".")
+        for position, key in enumerate(keys):
+            if position == len(keys) - 1:
+                node[key] = None
+            elif key in node:
+                if node[key] is None:
+                    break  # An ancestor is already kept whole
+                node = node[key]
+            else:
+                node[key] = {}
+                node = node[key]
+    return trie
+
+
+def _apply(value: Any, trie: Optional[_Trie]) -> Any:
+    if trie is None:
+        return value
+    if isinstance(value, dict):
+        return {key: _apply(value[key], sub) for key, sub in trie.items() if key in value}
+    if isinstance(value, list):
+        return [_apply(item, trie) for item in value]
+    return value
+
+
+def project(data: Any, paths: Optional[Iterable[str]]) -> Any:
+    """Returns `data` pruned to the given dotted field paths; None keeps everything."""
+    if paths is None:
+        return data
+    return _apply(data, _compile(tuple(paths)))
+
+
+def selects_key(paths: Optional[Iterable[str]], key: str) -> bool:
+    """Whether a projection keeps any part of the top-level `key`, so tools can skip fetching it."""
+    return paths is None or key in _compile(tuple(paths))
+
+
+def project_listing(result: Union[List[Dict], Dict], paths: Optional[Iterable[str]]) -> Union[List[Dict], Dict]:
+    """
+    Projects each object of a list_nifi_objects result.
+
+    Current-group listings are lists of summaries. Recursive listings keep their progress
+    fields and per-group wrappers, and only the `objects` of each group are projected.
+    """
+    if paths is None:
+        return result
+    if isinstance(result, list):
+        return project(result, paths)
+    projected = dict(result)
+    projected["results"] = [
+        {**group, "objects": project(group.get("objects", []), paths)} for group in result.get("results", [])
+    ]
+    return projected
@@ -1,6 +1,9 @@
+from collections import defaultdict
 from typing import Dict, List, Any, Optional, Set
 from loguru import logger
 
+from nifi_mcp_server.flow_snapshot import bounded_gather
+
 def extract_important_properties(processor_entity: Dict[str, Any]) -> Dict[str, Any]:
     """Extract and analyze important properties from a processor entity."""
     component = processor_entity.get("component", {})
@@ -219,6 +222,23 @@ async def fetch_detailed_processor_info(processor_id: str, nifi_client, user_req
         logger.warning(f"Failed to fetch detailed processor info for {processor_id}: {e}")
         return None
 
+def processor_needs_details(processor_entity: Dict[str, Any], include_properties: bool = True) -> bool:
+    """
+    Returns True if a listed processor entity lacks fields the documenter uses.
+
+    List and /flow responses normally carry the full component (relationships and config),
+    so a per-processor GET is only needed when the component is missing (e.g. read
+    permission only on the summary) or was returned without those fields.
+    """
+    component = processor_entity.get("component")
+    if not component:
+        return True
+    if "relationships" not in component:
+        return True
+    if include_properties and "properties" not in component.get("config", {}):
+        return True
+    return False
+
 async def document_nifi_flow_simplified(
     processors: List[Dict[str, Any]],
     connections: List[Dict[str, Any]],
@@ -240,7 +260,7 @@ async def document_nifi_flow_simplified(
         output_ports: List of output port entities
         include_properties: Whether to include processor properties
         include_descriptions: Whether to include descriptions
-        nifi_client: NiFi client instance for fetching detailed processor info (optional)
+        nifi_client: NiFi client used to fetch details for processors whose listed entity is incomplete (optional)
         user_request_id: User request ID for logging
         action_id: Action ID for logging
         
@@ -303,6 +323,29 @@ async def document_nifi_flow_simplified(
         if port_id:
             all_components[port_id] = port
     
+    # Fetch full details only for processors whose listed entity is incomplete
+    detailed_processors: Dict[str, Dict[str, Any]] = {}
+    if nifi_client:
+        incomplete_ids = [
+            proc.get("id") for proc in processors
+            if proc.get("id") and processor_needs_details(proc, include_properties)
+        ]
+        if incomplete_ids:
+            logger.debug(f"Fetching detailed info for {len(incomplete_ids)} of {len(processors)} processors")
+            fetched = await bounded_gather(
+                fetch_detailed_processor_info(processor_id=proc_id, nifi_client=nifi_client, user_request_id=user_request_id, action_id=action_id)
+                for proc_id in incomplete_ids
+            )
+            detailed_processors = {proc_id: details for proc_id, details in zip(incomplete_ids, fetched) if details}
+
+    # Index connections by endpoint once instead of scanning them for every processor
+    outgoing_by_source: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    incoming_by_destination: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for conn in connections:
+        conn_comp = conn.get("component", {})
+        outgoing_by_source[conn_comp.get("source", {}).get("id")].append(conn)
+        incoming_by_destination[conn_comp.get("destination", {}).get("id")].append(conn)
+
     # Process processors with embedded connection info
     for proc in processors:
         proc_id = proc.get("id")
@@ -310,22 +353,11 @@ async def document_nifi_flow_simplified(
             continue
             
         component = proc.get("component", {})
-        config = component.get("config", {})
-        
-        # Try to fetch detailed processor info if client is available
-        detailed_processor = None
-        if nifi_client:
-            try:
-                detailed_processor = await fetch_detailed_processor_info(processor_id=proc_id, nifi_client=nifi_client, user_request_id=user_request_id, action_id=action_id)
-                if detailed_processor:
-                    # Use the detailed component and config
-                    component = detailed_processor.get("component", component)
-                    config = component.get("config", config)
-                    logger.debug(f"Using detailed processor info for {proc_id}")
-                else:
-                    logger.debug(f"Using basic processor info for {proc_id} (detailed fetch failed)")
-            except Exception as e:
-                logger.warning(f"Error fetching detailed processor info for {proc_id}: {e}")
+        detailed_processor = detailed_processors.get(proc_id)
+        if detailed_processor:
+            # Use the detailed component
+            component = detailed_processor.get("component", component)
+            logger.debug(f"Using detailed processor info for {proc_id}")
         
         # Extract basic processor info
         proc_info = {
@@ -362,25 +394,21 @@ async def document_nifi_flow_simplified(
                 auto_terminated.add(rel.get("name"))
         
         # Find outgoing connections for this processor
-        for conn in connections:
+        for conn in outgoing_by_source.get(proc_id, []):
             conn_comp = conn.get("component", {})
-            source = conn_comp.get("source", {})
             dest = conn_comp.get("destination", {})
+            dest_id = dest.get("id")
+            dest_entity = all_components.get(dest_id, {})
+            dest_component = dest_entity.get("component", {})
+            relationship = conn_comp.get("selectedRelationships", [""])[0]
             
-            # Check if this processor is the source
-            if source.get("id") == proc_id:
-                dest_id = dest.get("id")
-                dest_entity = all_components.get(dest_id, {})
-                dest_component = dest_entity.get("component", {})
-                relationship = conn_comp.get("selectedRelationships", [""])[0]
-                
-                proc_info["outgoing_connections"].append({
-                    "connection_id": conn.get("id"),
-                    "destination_name": dest_component.get("name", dest.get("name", "Unknown")),
-                    "destination_id": dest_id,
-                    "destination_type": dest.get("type", "UNKNOWN"),
-                    "relationship": relationship
-                })
+            proc_info["outgoing_connections"].append({
+                "connection_id": conn.get("id"),
+                "destination_name": dest_component.get("name", dest.get("name", "Unknown")),
+                "destination_id": dest_id,
+                "destination_type": dest.get("type", "UNKNOWN"),
+                "relationship": relationship
+            })
         
         # Add auto-terminated relationships as separate entries
         for relationship in auto_terminated:
@@ -389,25 +417,21 @@ async def document_nifi_flow_simplified(
             })
         
         # Find incoming connections for this processor
-        for conn in connections:
+        for conn in incoming_by_destination.get(proc_id, []):
             conn_comp = conn.get("component", {})
             source = conn_comp.get("source", {})
-            dest = conn_comp.get("destination", {})
+            source_id = source.get("id")
+            source_entity = all_components.get(source_id, {})
+            source_component = source_entity.get("component", {})
+            relationship = conn_comp.get("selectedRelationships", [""])[0]
             
-            # Check if this processor is the destination
-            if dest.get("id") == proc_id:
-                source_id = source.get("id")
-                source_entity = all_components.get(source_id, {})
-                source_component = source_entity.get("component", {})
-                relationship = conn_comp.get("selectedRelationships", [""])[0]
-                
-                proc_info["incoming_connections"].append({
-                    "connection_id": conn.get("id"),
-                    "source_name": source_component.get("name", source.get("name", "Unknown")),
-                    "source_id": source_id,
-                    "source_type": source.get("type", "UNKNOWN"),
-                    "relationship": relationship
-                })
+            proc_info["incoming_connections"].append({
+                "connection_id": conn.get("id"),
+                "source_name": source_component.get("name", source.get("name", "Unknown")),
+                "source_id": source_id,
+                "source_type": source.get("type", "UNKNOWN"),
+                "relationship": relationship
+            })
         
         result["components"]["processors"][proc_id] = proc_info
     
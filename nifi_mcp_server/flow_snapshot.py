@@ -0,0 +1,464 @@
+"""
+In-memory snapshot of a NiFi process group hierarchy.
+
+A single GET /flow/process-groups/{id} returns a group's processors, connections,
+input/output ports and direct child groups together. The snapshot engine walks the
+hierarchy with one such call per group and keeps the results as a small typed graph
+(group nodes, a component index and connection edges), so recursive listings, counts
+and the hierarchy view no longer need separate name/list/children requests per group.
+
+Traversal is a breadth-first work queue. Requests are bounded by a process-wide
+semaphore (`nifi.traversal_max_concurrency`) so wide canvases do not flood the NiFi
+web tier, a deadline cancels outstanding fetches, and an interrupted traversal returns
+a continuation token carrying the pending queue and the set of visited groups.
+`iter_flow_groups` yields each group as it arrives, for callers that stream results
+instead of waiting for the whole snapshot.
+"""
+
+import asyncio
+import base64
+import json
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from loguru import logger
+
+from config.settings import get_nifi_traversal_max_concurrency
+from nifi_mcp_server.component_cache import component_cache
+from nifi_mcp_server.nifi_client import NiFiClient, NiFiAuthenticationError
+
+CONTINUATION_TOKEN_VERSION = 1
+
+# Traversal semaphores are bound to an event loop, so keep one per loop
+_traversal_semaphores: Dict[int, Tuple[int, asyncio.Semaphore]] = {}
+
+
+def _traversal_semaphore() -> asyncio.Semaphore:
+    """Returns the process-wide traversal semaphore for the running event loop."""
+    loop_id = id(asyncio.get_running_loop())
+    limit = get_nifi_traversal_max_concurrency()
+    entry = _traversal_semaphores.get(loop_id)
+    if entry is None or entry[0] != limit:
+        entry = (limit, asyncio.Semaphore(limit))
+        _traversal_semaphores[loop_id] = entry
+    return entry[1]
+
+
+async def bounded_gather(
+    aws: Iterable[Awaitable],
+    return_exceptions: bool = False,
+    max_concurrency: Optional[int] = None
+) -> List[Any]:
+    """
+    Like asyncio.gather, but every awaitable runs under the shared traversal semaphore,
+    or under a private one of size `max_concurrency` when given.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency)) if max_concurrency else _traversal_semaphore()
+
+    async def _run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class PendingGroup(NamedTuple):
+    """A process group queued for fetching."""
+    id: str
+    parent_id: Optional[str]
+    depth: int
+    name: Optional[str] = None
+
+
+@dataclass
+class TraversalState:
+    """Resumable traversal state carried by a continuation token."""
+    root_id: str
+    pending: List[PendingGroup]
+    visited: Set[str]
+    max_depth: Optional[int] = None
+
+
+def encode_continuation_token(state: TraversalState) -> str:
+    """Serializes traversal state into an opaque, URL-safe token."""
+    payload = {
+        "v": CONTINUATION_TOKEN_VERSION,
+        "root": state.root_id,
+        "max_depth": state.max_depth,
+        "pending": [list(entry) for entry in state.pending],
+        "visited": sorted(state.visited),
+    }
+    raw = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_continuation_token(token: str, max_depth: Optional[int] = None) -> TraversalState:
+    """
+    Parses a continuation token produced by `encode_continuation_token`.
+
+    The older "process_group_id:depth" form is still accepted; it resumes from that one
+    group with no record of visited groups. Raises ValueError for malformed tokens.
+    """
+    if ":" in token:
+        pg_id, depth = token.split(":")[:2]
+        return TraversalState(root_id=pg_id, pending=[PendingGroup(pg_id, None, int(depth))], visited=set(), max_depth=max_depth)
+    try:
+        payload = json.loads(zlib.decompress(base64.urlsafe_b64decode(token.encode("ascii"))))
+    except Exception as e:
+        raise ValueError(f"Invalid continuation token: {e}") from e
+    if payload.get("v") != CONTINUATION_TOKEN_VERSION:
+        raise ValueError(f"Unsupported continuation token version: {payload.get('v')}")
+    return TraversalState(
+        root_id=payload["root"],
+        pending=[PendingGroup(*entry) for entry in payload.get("pending", [])],
+        visited=set(payload.get("visited", [])),
+        max_depth=payload.get("max_depth"),
+    )
+
+
+@dataclass
+class ProcessGroupNode:
+    """One process group and the entities returned for it by the /flow endpoint."""
+    id: str
+    name: str
+    parent_id: Optional[str] = None
+    depth: int = 0
+    processors: List[Dict] = field(default_factory=list)
+    connections: List[Dict] = field(default_factory=list)
+    input_ports: List[Dict] = field(default_factory=list)
+    output_ports: List[Dict] = field(default_factory=list)
+    child_groups: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def child_ids(self) -> List[str]:
+        return [child.get("id") for child in self.child_groups if child.get("id")]
+
+    def counts(self) -> Dict[str, int]:
+        """Component counts in the format returned by list_nifi_objects."""
+        return {
+            "processors": len(self.processors),
+            "connections": len(self.connections),
+            "ports": len(self.input_ports) + len(self.output_ports),
+            "process_groups": len(self.child_groups),
+        }
+
+
+@dataclass
+class ComponentRef:
+    """Index entry pointing from a component ID back to its group and raw entity."""
+    id: str
+    type: str
+    group_id: str
+    entity: Dict[str, Any]
+
+
+@dataclass
+class FlowSnapshot:
+    """Process group nodes fetched from one traversal, in breadth-first order."""
+    root_id: str
+    groups: Dict[str, ProcessGroupNode] = field(default_factory=dict)
+    components: Dict[str, ComponentRef] = field(default_factory=dict)
+    pending: List[PendingGroup] = field(default_factory=list)
+    visited: Set[str] = field(default_factory=set)
+    max_depth: Optional[int] = None
+    timeout_occurred: bool = False
+    resumed: bool = False
+
+    @property
+    def completed(self) -> bool:
+        return not self.pending
+
+    @property
+    def continuation_token(self) -> Optional[str]:
+        if not self.pending:
+            return None
+        return encode_continuation_token(TraversalState(
+            root_id=self.root_id, pending=self.pending, visited=self.visited, max_depth=self.max_depth
+        ))
+
+    def add_group(self, node: ProcessGroupNode):
+        self.groups[node.id] = node
+        for entity_list, component_type in (
+            (node.processors, "processor"),
+            (node.connections, "connection"),
+            (node.input_ports, "input_port"),
+            (node.output_ports, "output_port"),
+            (node.child_groups, "process_group"),
+        ):
+            for entity in entity_list:
+                entity_id = entity.get("id")
+                if entity_id:
+                    self.components[entity_id] = ComponentRef(entity_id, component_type, node.id, entity)
+
+    def iter_groups(self) -> Iterator[ProcessGroupNode]:
+        return iter(self.groups.values())
+
+    def get_component(self, component_id: str) -> Optional[ComponentRef]:
+        return self.components.get(component_id)
+
+    def connection_edges(self) -> List[Tuple[str, str, Dict]]:
+        """Returns (source_id, destination_id, connection_entity) for every connection in the snapshot."""
+        edges = []
+        for node in self.groups.values():
+            for conn in node.connections:
+                component = conn.get("component", {})
+                source_id = conn.get("sourceId") or component.get("source", {}).get("id")
+                dest_id = conn.get("destinationId") or component.get("destination", {}).get("id")
+                edges.append((source_id, dest_id, conn))
+        return edges
+
+    def hierarchy(self, pg_id: Optional[str] = None) -> Dict[str, Any]:
+        """Builds the nested hierarchy view used by list_nifi_objects for process groups."""
+        node = self.groups.get(pg_id or self.root_id)
+        if node is None:
+            # Resumed traversals start below the original root: return each resumed subtree
+            subtrees = []
+            for group in self.groups.values():
+                if group.parent_id not in self.groups:
+                    subtree = self._child_hierarchy({"id": group.id, "component": {"name": group.name}})
+                    subtree["parent_id"] = group.parent_id
+                    subtrees.append(subtree)
+            return {"id": pg_id or self.root_id, "name": "Unknown", "child_process_groups": subtrees}
+        hierarchy = {
+            "id": node.id,
+            "name": node.name,
+            "child_process_groups": [self._child_hierarchy(child) for child in node.child_groups],
+        }
+        if node.error:
+            hierarchy["error"] = node.error
+        return hierarchy
+
+    def _child_hierarchy(self, child_entity: Dict) -> Dict[str, Any]:
+        child_id = child_entity.get("id")
+        child_name = child_entity.get("component", {}).get("name", f"Unnamed PG ({child_id})")
+        node = self.groups.get(child_id)
+        child_data = {
+            "id": child_id,
+            "name": child_name,
+            "children": [self._child_hierarchy(grandchild) for grandchild in node.child_groups] if node else [],
+        }
+        if node and node.error:
+            child_data["error"] = node.error
+        elif node is None and any(entry.id == child_id for entry in self.pending):
+            child_data["pending"] = True
+        return child_data
+
+
+def build_group_node(flow_response: Dict, parent_id: Optional[str] = None, depth: int = 0) -> ProcessGroupNode:
+    """Converts a GET /flow/process-groups/{id} response into a ProcessGroupNode."""
+    pg_flow = (flow_response or {}).get("processGroupFlow")
+    if not pg_flow:
+        raise ValueError("Flow response did not contain 'processGroupFlow'.")
+
+    pg_id = pg_flow.get("id")
+    breadcrumb = pg_flow.get("breadcrumb", {}).get("breadcrumb", {})
+    flow = pg_flow.get("flow", {})
+    return ProcessGroupNode(
+        id=pg_id,
+        name=breadcrumb.get("name", f"Unnamed PG ({pg_id})"),
+        parent_id=parent_id if parent_id is not None else pg_flow.get("parentGroupId"),
+        depth=depth,
+        processors=flow.get("processors", []),
+        connections=flow.get("connections", []),
+        input_ports=flow.get("inputPorts", []),
+        output_ports=flow.get("outputPorts", []),
+        child_groups=flow.get("processGroups", []),
+    )
+
+
+async def fetch_group_node(
+    nifi_client: NiFiClient,
+    pg_id: str,
+    parent_id: Optional[str] = None,
+    depth: int = 0,
+    local_logger=logger,
+    use_cache: bool = True
+) -> ProcessGroupNode:
+    """Fetches a single process group with one /flow call, served from the component cache when possible."""
+    nifi_req = {"operation": "get_process_group_flow", "process_group_id": pg_id}
+    local_logger.bind(interface="nifi", direction="request", data=nifi_req).debug("Calling NiFi API")
+    flow_response = await component_cache.get_or_fetch(
+        nifi_client.cache_key,
+        "process_group_flow",
+        pg_id,
+        lambda: nifi_client.get_process_group_flow(pg_id),
+        bypass=not use_cache
+    )
+    node = build_group_node(flow_response, parent_id=parent_id, depth=depth)
+    local_logger.bind(interface="nifi", direction="response", data={"process_group_id": node.id, "counts": node.counts()}).debug("Received from NiFi API")
+    return node
+
+
+async def _fetch_limited(
+    nifi_client: NiFiClient,
+    semaphore: asyncio.Semaphore,
+    entry: PendingGroup,
+    local_logger,
+    use_cache: bool
+) -> ProcessGroupNode:
+    async with semaphore:
+        return await fetch_group_node(nifi_client, entry.id, entry.parent_id, entry.depth, local_logger, use_cache)
+
+
+def start_traversal(
+    root_pg_id: str,
+    max_depth: Optional[int] = None,
+    start_depth: int = 0,
+    continuation_token: Optional[str] = None,
+    local_logger=logger
+) -> FlowSnapshot:
+    """
+    Returns an empty snapshot whose `pending` queue holds the groups to fetch: `root_pg_id`,
+    or the queue and visited set carried by `continuation_token`.
+    """
+    if continuation_token:
+        state = decode_continuation_token(continuation_token, max_depth=max_depth)
+        local_logger.info(f"Resuming traversal of PG {state.root_id}: {len(state.pending)} pending, {len(state.visited)} already visited")
+        return FlowSnapshot(root_id=state.root_id, pending=list(state.pending), visited=state.visited, max_depth=state.max_depth, resumed=True)
+    return FlowSnapshot(root_id=root_pg_id, pending=[PendingGroup(root_pg_id, None, start_depth)], max_depth=max_depth)
+
+
+async def iter_flow_groups(
+    nifi_client: NiFiClient,
+    snapshot: FlowSnapshot,
+    timeout_seconds: Optional[float] = None,
+    start_time: Optional[float] = None,
+    local_logger=logger,
+    use_cache: bool = True,
+    retain_groups: bool = True
+) -> AsyncIterator[ProcessGroupNode]:
+    """
+    Walks the hierarchy from `snapshot.pending` breadth-first, one /flow call per group,
+    yielding each group as soon as its fetch completes (so not in breadth-first order).
+    Groups that fail to load are yielded with `error` set.
+
+    At most `nifi.traversal_max_concurrency` fetches are in flight across all traversals
+    in the process. Groups at `snapshot.max_depth` are fetched but their children are not.
+    When the deadline (`start_time + timeout_seconds`) passes, in-flight fetches are
+    cancelled and they and all queued groups are left in `snapshot.pending`, so
+    `snapshot.continuation_token` resumes exactly where the walk stopped. Closing the
+    generator early does the same without waiting for a deadline. With `retain_groups=False` the snapshot
+    only tracks visited IDs, so memory does not grow with the size of the groups.
+    With `use_cache=False` every group is fetched from NiFi even if it is cached.
+    """
+    if start_time is None:
+        start_time = time.time()
+    deadline = start_time + timeout_seconds if timeout_seconds else None
+
+    queue: Deque[PendingGroup] = deque(snapshot.pending)
+    snapshot.pending = []
+    semaphore = _traversal_semaphore()
+    worker_limit = get_nifi_traversal_max_concurrency()
+    in_flight: Dict[asyncio.Task, PendingGroup] = {}
+    discovery_order: Dict[str, int] = {}
+
+    try:
+        while queue or in_flight:
+            # Keep the scheduler topped up in FIFO (breadth-first) order
+            while queue and len(in_flight) < worker_limit:
+                entry = queue.popleft()
+                if entry.id in snapshot.visited:
+                    continue
+                snapshot.visited.add(entry.id)
+                discovery_order.setdefault(entry.id, len(discovery_order))
+                task = asyncio.create_task(_fetch_limited(nifi_client, semaphore, entry, local_logger, use_cache))
+                in_flight[task] = entry
+            if not in_flight:
+                break
+
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                done = set()
+            else:
+                done, _ = await asyncio.wait(in_flight, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                local_logger.warning(f"Traversal deadline reached with {len(in_flight)} fetches in flight and {len(queue)} queued")
+                unfinished = list(in_flight.values())
+                for task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+                in_flight.clear()
+                snapshot.visited.difference_update(entry.id for entry in unfinished)
+                snapshot.pending = unfinished + [entry for entry in queue if entry.id not in snapshot.visited]
+                snapshot.timeout_occurred = True
+                break
+
+            for task in done:
+                entry = in_flight.pop(task)
+                error = task.exception()
+                if error is not None:
+                    if isinstance(error, (ConnectionError, ValueError, NiFiAuthenticationError)):
+                        local_logger.error(f"Error fetching flow for PG {entry.id}: {error}")
+                    else:
+                        local_logger.error(f"Unexpected error fetching flow for PG {entry.id}: {error}", exc_info=error)
+                    node = ProcessGroupNode(
+                        id=entry.id,
+                        name=entry.name or f"Unknown PG ({entry.id})",
+                        parent_id=entry.parent_id,
+                        depth=entry.depth,
+                        error=str(error)
+                    )
+                else:
+                    node = task.result()
+                    if entry.id == snapshot.root_id and node.id != entry.id:
+                        # Aliases such as "root" resolve to the real ID in the response
+                        snapshot.visited.add(node.id)
+                        discovery_order[node.id] = discovery_order[entry.id]
+                        snapshot.root_id = node.id
+                    if snapshot.max_depth is None or entry.depth < snapshot.max_depth:
+                        for child in node.child_groups:
+                            child_id = child.get("id")
+                            if child_id and child_id not in snapshot.visited:
+                                queue.append(PendingGroup(child_id, node.id, entry.depth + 1, child.get("component", {}).get("name")))
+
+                if retain_groups:
+                    snapshot.add_group(node)
+                yield node
+    finally:
+        # Never leak fetches if the caller is cancelled or stops iterating, and keep what
+        # was left undone resumable
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            # Wait for the cancellations to land and retrieve any exceptions already raised
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        if not snapshot.timeout_occurred and (in_flight or queue):
+            unfinished = list(in_flight.values())
+            snapshot.visited.difference_update(entry.id for entry in unfinished)
+            snapshot.pending = unfinished + [entry for entry in queue if entry.id not in snapshot.visited]
+
+    if retain_groups:
+        # Fetches complete out of order; present groups in the order they were queued (breadth-first)
+        snapshot.groups = dict(sorted(snapshot.groups.items(), key=lambda item: discovery_order.get(item[0], len(discovery_order))))
+
+
+async def fetch_flow_snapshot(
+    nifi_client: NiFiClient,
+    root_pg_id: str,
+    max_depth: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+    start_time: Optional[float] = None,
+    start_depth: int = 0,
+    skip_ids: Optional[Set[str]] = None,
+    continuation_token: Optional[str] = None,
+    local_logger=logger,
+    use_cache: bool = True
+) -> FlowSnapshot:
+    """
+    Walks the hierarchy below `root_pg_id` with `iter_flow_groups` and returns every group,
+    in breadth-first order. IDs in `skip_ids` are treated as visited, and the set is
+    updated with the groups this call visited.
+    """
+    snapshot = start_traversal(root_pg_id, max_depth, start_depth, continuation_token, local_logger)
+    if skip_ids:
+        snapshot.visited.update(skip_ids)
+    async for _ in iter_flow_groups(nifi_client, snapshot, timeout_seconds, start_time, local_logger, use_cache):
+        pass
+
+    if skip_ids is not None:
+        skip_ids.update(snapshot.visited)
+    return snapshot
@@ -36,7 +36,7 @@ mcp_server = FastMCP(
 
 # Helper function to get NiFi client
 async def _get_nifi_client_for_tool(server_id: str = "nifi-local-example"):
-    """Get a NiFi client for tool execution."""
+    """Get the shared, cached NiFi client for tool execution (do not close it)."""
     try:
         client = await get_nifi_client(server_id)
         return client
@@ -54,11 +54,8 @@ async def list_process_groups(
 ):
     """List all process groups in the specified process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.list_process_groups(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.list_process_groups(client, process_group_id)
+    return result
 
 @mcp_server.tool
 async def create_process_group(
@@ -70,13 +67,10 @@ async def create_process_group(
 ):
     """Create a new process group in NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await creation.create_process_group(
-            client, name, parent_group_id, position_x, position_y
-        )
-        return result
-    finally:
-        await client.close()
+    result = await creation.create_process_group(
+        client, name, parent_group_id, position_x, position_y
+    )
+    return result
 
 @mcp_server.tool
 async def delete_process_group(
@@ -85,11 +79,8 @@ async def delete_process_group(
 ):
     """Delete a process group from NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await modification.delete_nifi_object(client, "process_group", process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await modification.delete_nifi_object(client, "process_group", process_group_id)
+    return result
 
 @mcp_server.tool
 async def update_process_group_state(
@@ -99,11 +90,8 @@ async def update_process_group_state(
 ):
     """Update the state of a process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await modification.update_process_group_state(client, process_group_id, state)
-        return result
-    finally:
-        await client.close()
+    result = await modification.update_process_group_state(client, process_group_id, state)
+    return result
 
 # Processor Tools
 @mcp_server.tool
@@ -113,11 +101,8 @@ async def list_processors(
 ):
     """List all processors in the specified process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.list_processors(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.list_processors(client, process_group_id)
+    return result
 
 @mcp_server.tool
 async def create_processor(
@@ -130,13 +115,10 @@ async def create_processor(
 ):
     """Create a new processor in NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await creation.create_processor(
-            client, processor_type, name, parent_group_id, position_x, position_y
-        )
-        return result
-    finally:
-        await client.close()
+    result = await creation.create_processor(
+        client, processor_type, name, parent_group_id, position_x, position_y
+    )
+    return result
 
 @mcp_server.tool
 async def update_processor(
@@ -146,11 +128,8 @@ async def update_processor(
 ):
     """Update processor properties."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await modification.update_processor(client, processor_id, properties)
-        return result
-    finally:
-        await client.close()
+    result = await modification.update_processor(client, processor_id, properties)
+    return result
 
 @mcp_server.tool
 async def delete_processor(
@@ -159,11 +138,8 @@ async def delete_processor(
 ):
     """Delete a processor from NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await modification.delete_nifi_object(client, "processor", processor_id)
-        return result
-    finally:
-        await client.close()
+    result = await modification.delete_nifi_object(client, "processor", processor_id)
+    return result
 
 # Connection Tools
 @mcp_server.tool
@@ -173,11 +149,8 @@ async def list_connections(
 ):
     """List all connections in the specified process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.list_connections(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.list_connections(client, process_group_id)
+    return result
 
 @mcp_server.tool
 async def create_connection(
@@ -191,13 +164,10 @@ async def create_connection(
 ):
     """Create a new connection between components."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await creation.create_connection(
-            client, source_id, target_id, source_type, target_type, name, parent_group_id
-        )
-        return result
-    finally:
-        await client.close()
+    result = await creation.create_connection(
+        client, source_id, target_id, source_type, target_type, name, parent_group_id
+    )
+    return result
 
 @mcp_server.tool
 async def delete_connection(
@@ -206,11 +176,8 @@ async def delete_connection(
 ):
     """Delete a connection from NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await modification.delete_nifi_object(client, "connection", connection_id)
-        return result
-    finally:
-        await client.close()
+    result = await modification.delete_nifi_object(client, "connection", connection_id)
+    return result
 
 # Port Tools
 @mcp_server.tool
@@ -220,11 +187,8 @@ async def list_input_ports(
 ):
     """List all input ports in the specified process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.list_input_ports(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.list_input_ports(client, process_group_id)
+    return result
 
 @mcp_server.tool
 async def list_output_ports(
@@ -233,11 +197,8 @@ async def list_output_ports(
 ):
     """List all output ports in the specified process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.list_output_ports(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.list_output_ports(client, process_group_id)
+    return result
 
 @mcp_server.tool
 async def create_input_port(
@@ -249,13 +210,10 @@ async def create_input_port(
 ):
     """Create a new input port in NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await creation.create_input_port(
-            client, name, parent_group_id, position_x, position_y
-        )
-        return result
-    finally:
-        await client.close()
+    result = await creation.create_input_port(
+        client, name, parent_group_id, position_x, position_y
+    )
+    return result
 
 @mcp_server.tool
 async def create_output_port(
@@ -267,13 +225,10 @@ async def create_output_port(
 ):
     """Create a new output port in NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await creation.create_output_port(
-            client, name, parent_group_id, position_x, position_y
-        )
-        return result
-    finally:
-        await client.close()
+    result = await creation.create_output_port(
+        client, name, parent_group_id, position_x, position_y
+    )
+    return result
 
 # Flow Management Tools
 @mcp_server.tool
@@ -283,11 +238,8 @@ async def get_flow_summary(
 ):
     """Get a summary of the flow in the specified process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await helpers.get_flow_summary(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await helpers.get_flow_summary(client, process_group_id)
+    return result
 
 @mcp_server.tool
 async def document_flow(
@@ -296,11 +248,8 @@ async def document_flow(
 ):
     """Generate documentation for a NiFi flow."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await review.document_flow(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await review.document_flow(client, process_group_id)
+    return result
 
 # Configuration Tools
 @mcp_server.tool
@@ -333,11 +282,8 @@ async def list_flowfiles(
 ):
     """List FlowFiles in a connection."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.list_flowfiles(client, connection_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.list_flowfiles(client, connection_id)
+    return result
 
 @mcp_server.tool
 async def purge_connection(
@@ -346,11 +292,8 @@ async def purge_connection(
 ):
     """Purge all FlowFiles from a connection."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.purge_connection(client, connection_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.purge_connection(client, connection_id)
+    return result
 
 # Controller Service Tools
 @mcp_server.tool
@@ -360,11 +303,8 @@ async def list_controller_services(
 ):
     """List controller services in the specified process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.list_controller_services(client, process_group_id)
-        return result
-    finally:
-        await client.close()
+    result = await operation.list_controller_services(client, process_group_id)
+    return result
 
 @mcp_server.tool
 async def create_controller_service(
@@ -375,13 +315,10 @@ async def create_controller_service(
 ):
     """Create a new controller service in NiFi."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await creation.create_controller_service(
-            client, service_type, name, parent_group_id
-        )
-        return result
-    finally:
-        await client.close()
+    result = await creation.create_controller_service(
+        client, service_type, name, parent_group_id
+    )
+    return result
 
 # Additional Operation Tools
 @mcp_server.tool
@@ -391,11 +328,8 @@ async def operate_nifi_objects(
 ):
     """Performs start, stop, enable, or disable operations on multiple NiFi objects in batch."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.operate_nifi_objects(operations)
-        return result
-    finally:
-        await client.close()
+    result = await operation.operate_nifi_objects(operations)
+    return result
 
 @mcp_server.tool
 async def invoke_nifi_http_endpoint(
@@ -409,13 +343,10 @@ async def invoke_nifi_http_endpoint(
 ):
     """Sends an HTTP request to a specified URL, typically to test a NiFi flow endpoint."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.invoke_nifi_http_endpoint(
-            url, process_group_id, method, payload, headers, timeout_seconds
-        )
-        return result
-    finally:
-        await client.close()
+    result = await operation.invoke_nifi_http_endpoint(
+        url, process_group_id, method, payload, headers, timeout_seconds
+    )
+    return result
 
 @mcp_server.tool
 async def purge_flowfiles(
@@ -426,11 +357,8 @@ async def purge_flowfiles(
 ):
     """Purges all FlowFiles from a connection or all connections in a process group."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.purge_flowfiles(target_id, target_type, timeout_seconds)
-        return result
-    finally:
-        await client.close()
+    result = await operation.purge_flowfiles(target_id, target_type, timeout_seconds)
+    return result
 
 @mcp_server.tool
 async def analyze_nifi_processor_errors(
@@ -440,11 +368,8 @@ async def analyze_nifi_processor_errors(
 ):
     """Analyze processor errors and provide debugging suggestions for faster resolution."""
     client = await _get_nifi_client_for_tool(nifi_server_id)
-    try:
-        result = await operation.analyze_nifi_processor_errors(processor_id, include_suggestions)
-        return result
-    finally:
-        await client.close()
+    result = await operation.analyze_nifi_processor_errors(processor_id, include_suggestions)
+    return result
 
 if __name__ == "__main__":
     import argparse
@@ -0,0 +1,268 @@
+"""
+Process-wide latency and size metrics, exposed in the Prometheus text format at `/metrics`.
+
+Three layers are instrumented:
+
+- every HTTP call a NiFiClient sends, labelled by server, method, endpoint template
+  (component IDs replaced by `{id}`) and status,
+- every tool execution through the FastAPI apps, labelled by server and tool,
+- every workflow step, labelled by workflow and step.
+
+The registry is deliberately small (counters and cumulative histograms only) so the
+server does not need a metrics client library; the output can be scraped by Prometheus
+or read by hand.
+"""
+
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# UUIDs (NiFi component IDs) and numeric IDs (provenance events) in URL paths
+_ID_SEGMENT = re.compile(r"^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)$")
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = lock
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Rendered sample lines of every label set."""
+
+    @abstractmethod
+    def clear(self):
+        """Drops every recorded sample."""
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+    kind = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}" for key, value in items]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in registration order."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str]) -> Counter:
+        return self._register(Counter(name, documentation, label_names, self._lock))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str],
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, self._lock, buckets=buckets))
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Drops every recorded sample, keeping the metric definitions."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+NIFI_REQUESTS = registry.counter(
+    "nifi_api_requests_total", "NiFi REST API calls.", ("server", "method", "endpoint", "status"))
+NIFI_REQUEST_SECONDS = registry.histogram(
+    "nifi_api_request_duration_seconds", "Latency of NiFi REST API calls.", ("server", "method", "endpoint"))
+NIFI_REQUEST_BYTES = registry.histogram(
+    "nifi_api_request_size_bytes", "Request body size of NiFi REST API calls.", ("server", "method", "endpoint"),
+    buckets=SIZE_BUCKETS)
+NIFI_RESPONSE_BYTES = registry.histogram(
+    "nifi_api_response_size_bytes", "Response body size of NiFi REST API calls.", ("server", "method", "endpoint"),
+    buckets=SIZE_BUCKETS)
+TOOL_CALLS = registry.counter(
+    "mcp_tool_calls_total", "MCP tool executions.", ("server", "tool", "outcome"))
+TOOL_CALL_SECONDS = registry.histogram(
+    "mcp_tool_call_duration_seconds", "Latency of MCP tool executions.", ("server", "tool"))
+WORKFLOW_STEPS = registry.counter(
+    "workflow_steps_total", "Workflow step executions.", ("workflow", "step", "outcome"))
+WORKFLOW_STEP_SECONDS = registry.histogram(
+    "workflow_step_duration_seconds", "Latency of workflow steps.", ("workflow", "step"))
+
+
+def endpoint_template(path: str, base_path: str = "") -> str:
+    """The request path relative to `base_path`, with component and event IDs replaced by `{id}`."""
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return "/".join(segments) or "/"
+
+
+def _body_size(message) -> Optional[int]:
+    """Size of an already-read body, or the Content-Length header of a streamed one."""
+    try:
+        return len(message.content)
+    except (httpx.RequestNotRead, httpx.ResponseNotRead):
+        length = message.headers.get("content-length")
+        return int(length) if length and length.isdigit() else None
+
+
+def record_nifi_request(server: str, request: httpx.Request, response: Optional[httpx.Response],
+                        duration_seconds: float, base_path: str = ""):
+    """Records one NiFi HTTP call. `response` is None when the call failed without one."""
+    labels = {"server": server, "method": request.method, "endpoint": endpoint_template(request.url.path, base_path)}
+    status = str(response.status_code) if response is not None else "error"
+    NIFI_REQUESTS.inc(status=status, **labels)
+    NIFI_REQUEST_SECONDS.observe(duration_seconds, **labels)
+    request_size = _body_size(request)
+    if request_size:
+        NIFI_REQUEST_BYTES.observe(request_size, **labels)
+    if response is not None:
+        response_size = _body_size(response)
+        if response_size is not None:
+            NIFI_RESPONSE_BYTES.observe(response_size, **labels)
+
+
+@contextmanager
+def track_tool_call(tool_name: str, server_id: Optional[str]) -> Iterator[None]:
+    """Times the enclosed tool execution; any exception counts as an `error` outcome."""
+    labels = {"server": server_id or "-", "tool": tool_name}
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        TOOL_CALLS.inc(outcome=outcome, **labels)
+        TOOL_CALL_SECONDS.observe(time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def track_workflow_step(workflow_name: str, step_name: str) -> Iterator[None]:
+    """Times the enclosed workflow step; any exception counts as an `error` outcome."""
+    labels = {"workflow": workflow_name or "unknown", "step": step_name or "unknown"}
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        WORKFLOW_STEPS.inc(outcome=outcome, **labels)
+        WORKFLOW_STEP_SECONDS.observe(time.perf_counter() - start, **labels)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return registry.render()
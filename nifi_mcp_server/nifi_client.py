@@ -3,13 +3,18 @@ import logging
 from loguru import logger
 import httpx
 import uuid
-from typing import Optional, Dict, Any, Union, List, Literal, Tuple
+from typing import AsyncIterator, Optional, Dict, Any, Union, List, Literal, Tuple
 from mcp.server.fastmcp.exceptions import ToolError
 import asyncio
 import time
 import base64
 import json
 
+from nifi_mcp_server.async_request_poller import run_async_request
+from nifi_mcp_server.component_cache import component_cache
+from nifi_mcp_server.metrics import record_nifi_request
+from nifi_mcp_server.revision_map import RevisionMap, is_entity_path, is_listing_path, is_stale_revision_conflict
+
 # Define exceptions locally instead of importing them
 class NiFiAuthenticationError(Exception):
     """Raised when there is an error authenticating with NiFi."""
@@ -26,10 +31,100 @@ class AuthParams:
         self.username = username
         self.password = password
 
+# Per-operation read timeouts (seconds) for calls that are known to be slow on large instances
+DEFAULT_OPERATION_TIMEOUTS: Dict[str, float] = {
+    "processor_types": 60.0,
+    "controller_service_types": 60.0,
+    "search": 60.0,
+    "provenance_content": 120.0,
+}
+
+# Drop requests in flight at once during a batch purge, unless the caller passes its own cap
+DEFAULT_PURGE_MAX_CONCURRENCY = 8
+
+# Requests that use POST/DELETE without changing the flow (token, provenance and queue listing queries)
+_READ_ONLY_REQUEST_MARKERS = ("/access/token", "/provenance", "/listing-requests")
+
+def _is_mutating_request(request: httpx.Request) -> bool:
+    if request.method not in ("POST", "PUT", "DELETE"):
+        return False
+    return not any(marker in request.url.path for marker in _READ_ONLY_REQUEST_MARKERS)
+
+def _decode_token_expiry(token: Optional[str]) -> Optional[float]:
+    """Returns the `exp` claim (epoch seconds) of a NiFi JWT access token, or None if unavailable."""
+    if not token or token.count(".") != 2:
+        return None
+    try:
+        payload_segment = token.split(".")[1]
+        payload_segment += "=" * (-len(payload_segment) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(payload_segment))
+        exp = payload.get("exp")
+        return float(exp) if exp is not None else None
+    except (ValueError, TypeError, json.JSONDecodeError):
+        return None
+
+class _ReauthenticatingAsyncClient(httpx.AsyncClient):
+    """httpx client that re-authenticates its owning NiFiClient once when a request gets a 401."""
+
+    def __init__(self, owner: "NiFiClient", **kwargs):
+        super().__init__(**kwargs)
+        self._owner = owner
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        try:
+            response = await self._send_with_reauth(request, **kwargs)
+        finally:
+            if _is_mutating_request(request):
+                # Invalidate after the request settles so reads racing the change are not cached
+                component_cache.invalidate(self._owner.cache_key)
+        if not kwargs.get("stream"):
+            self._owner._track_revisions(request, response)
+        return response
+
+    async def _timed_send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        """Sends one HTTP request and records its latency, status and payload sizes."""
+        base_path = self.base_url.path.rstrip("/")
+        start = time.perf_counter()
+        try:
+            response = await super().send(request, **kwargs)
+        except Exception:
+            record_nifi_request(self._owner.cache_key, request, None, time.perf_counter() - start, base_path)
+            raise
+        record_nifi_request(self._owner.cache_key, request, response, time.perf_counter() - start, base_path)
+        return response
+
+    async def _send_with_reauth(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        response = await self._timed_send(request, **kwargs)
+        if (response.status_code != 401
+                or not self._owner.username
+                or request.url.path.endswith("/access/token")):
+            return response
+
+        logger.warning(f"Received 401 for {request.method} {request.url.path}; re-authenticating once and retrying.")
+        await response.aclose()
+        await self._owner._reauthenticate(stale_header=request.headers.get("Authorization"))
+        if self._owner._token:
+            request.headers["Authorization"] = f"Bearer {self._owner._token}"
+        return await self._timed_send(request, **kwargs)
+
 class NiFiClient:
     """A simple asynchronous client for the NiFi REST API."""
 
-    def __init__(self, base_url: str, username: Optional[str] = None, password: Optional[str] = None, tls_verify: bool = True):
+    def __init__(
+        self,
+        base_url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        tls_verify: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        operation_timeouts: Optional[Dict[str, float]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        server_id: Optional[str] = None
+    ):
         """Initializes the NiFiClient.
 
         Args:
@@ -37,17 +132,41 @@ class NiFiClient:
             username: The username for NiFi authentication. Required if password is provided.
             password: The password for NiFi authentication. Required if username is provided.
             tls_verify: Whether to verify the server's TLS certificate. Defaults to True.
+            max_connections: Maximum number of concurrent connections in the pool.
+            max_keepalive_connections: Maximum number of idle connections kept alive in the pool.
+            keepalive_expiry: Seconds an idle pooled connection is kept before being closed.
+            timeout: Default read/write/pool timeout in seconds for API calls.
+            connect_timeout: Timeout in seconds for establishing a new connection.
+            operation_timeouts: Optional per-operation read timeout overrides in seconds, keyed by
+                operation name (e.g. "processor_types", "search", "provenance_content").
+            transport: Optional httpx transport, mainly for tests and local simulators.
+            server_id: ID of the configured NiFi server, used to key shared caches.
         """
         if not base_url:
             raise ValueError("base_url is required for NiFiClient")
         self.base_url = base_url
+        self.server_id = server_id
         self.username = username
         self.password = password
         self.tls_verify = tls_verify
-        self._client = None
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._operation_timeouts = dict(DEFAULT_OPERATION_TIMEOUTS)
+        if operation_timeouts:
+            self._operation_timeouts.update(operation_timeouts)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
         self._token = None
+        self._token_expires_at: Optional[float] = None
+        self._auth_lock = asyncio.Lock()
         # Generate a unique client ID for this instance, used for revisions
         self._client_id = str(uuid.uuid4())
+        # Last known component revisions, filled from responses and used optimistically on writes
+        self.revisions = RevisionMap()
         logger.info(f"NiFiClient initialized for {self.base_url} with client ID: {self._client_id}")
 
     @property
@@ -55,66 +174,191 @@ class NiFiClient:
         """Checks if the client currently holds an authentication token or is configured for HTTP-only mode."""
         return self._token is not None or (self.base_url.startswith("http://") and self._token is None)
 
-    async def _get_client(self):
-        """Returns an httpx client instance, configuring auth if token exists."""
-        # Always create a new client instance to ensure headers are fresh,
-        # especially after authentication. If performance becomes an issue,
-        # we could optimize, but this ensures correctness.
-        if self._client:
-             await self._client.aclose() # Ensure old connection is closed if recreating
-             self._client = None
+    @property
+    def cache_key(self) -> str:
+        """Key identifying this NiFi server in the shared component cache."""
+        return self.server_id or self.base_url
+
+    @property
+    def token_expires_at(self) -> Optional[float]:
+        """Epoch seconds at which the current access token expires, if it could be decoded."""
+        return self._token_expires_at
 
-        headers = {}
+    def token_expires_within(self, seconds: float) -> bool:
+        """Returns True if the current token is known to expire within the given number of seconds."""
+        if self._token is None or self._token_expires_at is None:
+            return False
+        return self._token_expires_at - time.time() <= seconds
+
+    async def _reauthenticate(self, stale_header: Optional[str] = None):
+        """Re-authenticates once, even when called concurrently by many failing requests.
+
+        If another caller already refreshed the token since `stale_header` was sent, the new
+        token is reused instead of logging in again.
+        """
+        async with self._auth_lock:
+            current_header = f"Bearer {self._token}" if self._token else None
+            if stale_header is not None and current_header is not None and current_header != stale_header:
+                logger.debug("Token was already refreshed by a concurrent request; reusing it.")
+                return
+            await self.authenticate()
+
+    def _operation_timeout(self, operation: str) -> httpx.Timeout:
+        """Returns the timeout to use for a named operation, falling back to the client default."""
+        read_timeout = self._operation_timeouts.get(operation)
+        if read_timeout is None:
+            return self._timeout
+        return httpx.Timeout(read_timeout, connect=self._timeout.connect)
+
+    def _track_revisions(self, request: httpx.Request, response: httpx.Response):
+        """Remembers revisions from component responses and forgets deleted components."""
+        path = request.url.path
+        if not response.is_success or not is_entity_path(path):
+            return
+        if request.method == "DELETE":
+            component_id = path.rstrip("/").rsplit("/", 1)[-1]
+            if "/process-groups/" in path:
+                self.revisions.forget_group(component_id)
+            else:
+                self.revisions.forget(component_id)
+            return
+        if request.method == "GET" and is_listing_path(path):
+            # Listing bodies can be large; the listing methods record their parsed payload instead
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        try:
+            self.revisions.remember_response(response.json())
+        except ValueError:
+            pass
+
+    async def _revision_for_write(self, component_id: str, fetch_entity) -> Tuple[Dict, bool]:
+        """
+        Returns (revision, optimistic): the remembered revision of a component, or the one
+        from a fresh fetch when the component is unknown.
+        """
+        revision = self.revisions.get(component_id)
+        if revision is not None:
+            return revision, True
+        logger.info(f"No known revision for {component_id}; fetching it before the update.")
+        entity = await fetch_entity()
+        return entity["revision"], False
+
+    async def _put_with_revision(
+        self,
+        endpoint: str,
+        build_payload,
+        component_id: str,
+        revision: Dict,
+        optimistic: bool,
+        fetch_entity
+    ) -> httpx.Response:
+        """
+        PUTs `build_payload(revision)`. If an optimistic revision was stale (409), refetches
+        the component and retries once. Raises httpx.HTTPStatusError like raise_for_status().
+        """
+        client = await self._get_client()
+        response = await client.put(endpoint, json=build_payload(revision))
+        if optimistic and is_stale_revision_conflict(response.status_code, response.text):
+            logger.info(f"Revision {revision.get('version')} of {component_id} is stale; refetching and retrying once.")
+            self.revisions.forget(component_id)
+            entity = await fetch_entity()
+            response = await client.put(endpoint, json=build_payload(entity["revision"]))
+        response.raise_for_status()
+        return response
+
+    async def _delete_with_revision(
+        self,
+        endpoint: str,
+        component_id: str,
+        version: Optional[int],
+        optimistic: bool,
+        fetch_entity
+    ) -> httpx.Response:
+        """
+        DELETEs `endpoint` at `version`. If an optimistic version was stale (409), refetches
+        the component and retries once. Raises httpx.HTTPStatusError like raise_for_status().
+        """
+        client = await self._get_client()
+        response = await client.delete(f"{endpoint}?version={version}&clientId={self._client_id}")
+        if optimistic and is_stale_revision_conflict(response.status_code, response.text):
+            logger.info(f"Revision {version} of {component_id} is stale; refetching and retrying the delete once.")
+            self.revisions.forget(component_id)
+            entity = await fetch_entity()
+            version = entity["revision"]["version"]
+            response = await client.delete(f"{endpoint}?version={version}&clientId={self._client_id}")
+        response.raise_for_status()
+        return response
+
+    def _apply_token(self):
+        """Swaps the bearer token on the pooled client in place, keeping its open connections."""
+        if self._client is None:
+            return
         if self._token:
-            headers["Authorization"] = f"Bearer {self._token}"
-            # NiFi often requires client ID for state changes, let's check if we need it here
-            # Might need to parse initial response or call another endpoint if needed.
-
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            verify=self.tls_verify,
-            headers=headers,
-            timeout=30.0 # Keep timeout
-        )
+            self._client.headers["Authorization"] = f"Bearer {self._token}"
+        else:
+            self._client.headers.pop("Authorization", None)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Returns the long-lived, connection-pooled httpx client, creating it on first use.
+
+        The same client is shared by every API method (and by concurrent calls issued via
+        asyncio.gather), so TCP/TLS connections are reused across calls. The Authorization
+        header is updated in place whenever the token changes.
+        """
+        if self._client is None or self._client.is_closed:
+            client_kwargs = {
+                "base_url": self.base_url,
+                "verify": self.tls_verify,
+                "limits": self._limits,
+                "timeout": self._timeout,
+            }
+            if self._transport is not None:
+                client_kwargs["transport"] = self._transport
+            self._client = _ReauthenticatingAsyncClient(self, **client_kwargs)
+            self._apply_token()
+            logger.debug(f"Created pooled HTTP client for {self.base_url} (limits: {self._limits})")
         return self._client
 
     async def authenticate(self):
         """Authenticates with NiFi and stores the token."""
-        # Use a temporary client for the auth request itself, as it doesn't need the token header
-        async with httpx.AsyncClient(base_url=self.base_url, verify=self.tls_verify) as auth_client:
-            endpoint = "/access/token"
-            try:
-                logger.info(f"Authenticating with NiFi at {self.base_url}{endpoint}")
-                response = await auth_client.post(
-                    endpoint,
-                    data={"username": self.username, "password": self.password},
-                    headers={"Content-Type": "application/x-www-form-urlencoded"} # Correct header for form data
-                )
-                response.raise_for_status()
-                self._token = response.text # Store the token
-                logger.info("Authentication successful.")
-
-                # Force recreation of the main client with the token on next call to _get_client
-                if self._client:
-                    await self._client.aclose()
-                self._client = None
+        # Reuse the pooled client for the auth request, but send it without any stale bearer token
+        client = await self._get_client()
+        endpoint = "/access/token"
+        try:
+            logger.info(f"Authenticating with NiFi at {self.base_url}{endpoint}")
+            request = client.build_request(
+                "POST",
+                endpoint,
+                data={"username": self.username, "password": self.password},
+                headers={"Content-Type": "application/x-www-form-urlencoded"} # Correct header for form data
+            )
+            request.headers.pop("Authorization", None)
+            response = await client.send(request)
+            response.raise_for_status()
+            self._token = response.text # Store the token
+            self._token_expires_at = _decode_token_expiry(self._token)
+            self._apply_token()
+            logger.info("Authentication successful.")
 
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 409 and "Access tokens are only issued over HTTPS" in e.response.text:
-                    logger.warning("NiFi requires HTTPS for authentication. Attempting to work around this...")
-                    # For HTTP-only NiFi instances, we'll try to work without authentication
-                    # This is a workaround for development environments
-                    logger.info("Proceeding without authentication token for HTTP-only NiFi instance")
-                    self._token = None  # No token, but we'll try to proceed
-                else:
-                    logger.error(f"Authentication failed: {e.response.status_code} - {e.response.text}")
-                    raise NiFiAuthenticationError(f"Authentication failed: {e.response.status_code}") from e
-            except httpx.RequestError as e:
-                logger.error(f"An error occurred during authentication: {e}")
-                raise NiFiAuthenticationError(f"An error occurred during authentication: {e}") from e
-            except Exception as e:
-                logger.error(f"An unexpected error occurred during authentication: {e}", exc_info=True)
-                raise NiFiAuthenticationError(f"An unexpected error occurred during authentication: {e}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 409 and "Access tokens are only issued over HTTPS" in e.response.text:
+                logger.warning("NiFi requires HTTPS for authentication. Attempting to work around this...")
+                # For HTTP-only NiFi instances, we'll try to work without authentication
+                # This is a workaround for development environments
+                logger.info("Proceeding without authentication token for HTTP-only NiFi instance")
+                self._token = None  # No token, but we'll try to proceed
+                self._token_expires_at = None
+                self._apply_token()
+            else:
+                logger.error(f"Authentication failed: {e.response.status_code} - {e.response.text}")
+                raise NiFiAuthenticationError(f"Authentication failed: {e.response.status_code}") from e
+        except httpx.RequestError as e:
+            logger.error(f"An error occurred during authentication: {e}")
+            raise NiFiAuthenticationError(f"An error occurred during authentication: {e}") from e
+        except Exception as e:
+            logger.error(f"An unexpected error occurred during authentication: {e}", exc_info=True)
+            raise NiFiAuthenticationError(f"An unexpected error occurred during authentication: {e}")
 
     async def close(self):
         """Closes the underlying httpx client."""
@@ -173,6 +417,7 @@ class NiFiClient:
             response = await client.get(endpoint)
             response.raise_for_status()
             data = response.json()
+            self.revisions.remember_response(data)
             # The response is typically a ProcessorsEntity which has a 'processors' key containing a list
             processors = data.get("processors", [])
             local_logger.info(f"Found {len(processors)} processors in group {process_group_id}.")
@@ -326,19 +571,24 @@ class NiFiClient:
             logger.error(f"An unexpected error occurred getting processor details for {processor_id}: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred getting processor details: {e}") from e
 
-    async def delete_processor(self, processor_id: str, version: int) -> bool:
-        """Deletes a processor given its ID and current revision version."""
+    async def delete_processor(self, processor_id: str, version: Optional[int] = None) -> bool:
+        """Deletes a processor given its ID and current revision version (the last known one if omitted)."""
         if not self.is_authenticated:
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        client = await self._get_client()
-        # The version must be passed as a query parameter, along with the client ID
-        endpoint = f"/processors/{processor_id}?version={version}&clientId={self._client_id}"
+        fetch_entity = lambda: self.get_processor_details(processor_id)
+        optimistic = False
+        if version is None:
+            revision, optimistic = await self._revision_for_write(processor_id, fetch_entity)
+            version = revision.get("version")
+
+        # The version is passed as a query parameter, along with the client ID
+        endpoint = f"/processors/{processor_id}"
 
         try:
             logger.info(f"Attempting to delete processor {processor_id} (version {version}) using {self.base_url}{endpoint}")
-            response = await client.delete(endpoint)
-            response.raise_for_status() # Raises HTTPStatusError for 4xx/5xx
+            # Raises HTTPStatusError for 4xx/5xx
+            response = await self._delete_with_revision(endpoint, processor_id, version, optimistic, fetch_entity)
 
             # Check if deletion was successful (usually returns 200 OK with the entity deleted)
             if response.status_code == 200:
@@ -423,6 +673,7 @@ class NiFiClient:
             )
             response.raise_for_status()
             data = response.json()
+            self.revisions.remember_response(data)
             
             # Extract the connections from the response
             connections = data.get("connections", [])
@@ -442,26 +693,24 @@ class NiFiClient:
         if not self.is_authenticated:
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        client = await self._get_client()
-        
-        # Get current version if not provided
+        fetch_entity = lambda: self.get_connection(connection_id)
+        optimistic = False
+        # Get current version if not provided (from the last known revision when possible)
         if version_number is None:
             try:
-                connection_details = await self.get_connection(connection_id)
-                version_number = connection_details.get("revision", {}).get("version")
+                revision, optimistic = await self._revision_for_write(connection_id, fetch_entity)
+                version_number = revision.get("version")
                 if version_number is None:
                     raise ValueError(f"Could not determine revision version for connection {connection_id}")
-                logger.info(f"Using fetched revision version {version_number} for connection {connection_id}")
             except Exception as e:
                 logger.error(f"Failed to fetch connection {connection_id} details to get version: {e}")
                 raise
 
-        endpoint = f"/connections/{connection_id}?version={version_number}&clientId={self._client_id}"
+        endpoint = f"/connections/{connection_id}"
 
         try:
             logger.info(f"Deleting connection {connection_id} (version {version_number}) from {self.base_url}{endpoint}")
-            response = await client.delete(endpoint)
-            response.raise_for_status()
+            response = await self._delete_with_revision(endpoint, connection_id, version_number, optimistic, fetch_entity)
 
             if response.status_code == 200:
                 logger.info(f"Successfully deleted connection {connection_id}.")
@@ -542,25 +791,20 @@ class NiFiClient:
         if update_type not in valid_update_types:
             raise ValueError(f"Invalid update_type '{update_type}'. Must be one of {valid_update_types}")
 
-        # 1. Get current processor entity to obtain the latest revision
-        logger.info(f"Fetching current details for processor {processor_id} before update.")
+        # 1. Use the last known revision, fetching the processor only if it is unknown
         try:
-            current_entity = await self.get_processor_details(processor_id)
-            current_revision = current_entity["revision"]
-            current_component = current_entity["component"]
+            current_revision, optimistic = await self._revision_for_write(
+                processor_id, lambda: self.get_processor_details(processor_id)
+            )
         except (ValueError, ConnectionError) as e:
             logger.error(f"Failed to fetch processor {processor_id} for update: {e}")
             raise
 
         # 2. Prepare the update payload
-        # Start with essential component details
+        # NiFi applies partial updates: omitted fields (name, position, other config) are left as they are
         update_component = {
-            "id": current_component["id"],
-            # Keep existing name, position etc. unless explicitly changed later
-            "name": current_component.get("name"),
-            "position": current_component.get("position"),
-            # Copy existing config first, then overwrite specific part
-            "config": current_component.get("config", {}).copy(),
+            "id": processor_id,
+            "config": {},
         }
 
         # Apply the specific update based on update_type
@@ -618,19 +862,22 @@ class NiFiClient:
             log_message_part = f"config.autoTerminatedRelationships: {update_data}"
 
         # Construct final payload
-        update_payload = {
-            "revision": current_revision,
-            "component": update_component
-        }
+        def build_payload(revision: Dict) -> Dict:
+            return {
+                "revision": revision,
+                "component": update_component
+            }
+        update_payload = build_payload(current_revision)
 
         # 3. Make the PUT request
-        client = await self._get_client()
         endpoint = f"/processors/{processor_id}"
         try:
             logger.debug(f"NiFiClient.update_processor_config: Sending PUT request to {endpoint} with payload: {update_payload}") # Added log
             logger.info(f"Updating processor {processor_id} (Version: {current_revision.get('version')}). Updating {log_message_part}")
-            response = await client.put(endpoint, json=update_payload)
-            response.raise_for_status()
+            response = await self._put_with_revision(
+                endpoint, build_payload, processor_id, current_revision, optimistic,
+                lambda: self.get_processor_details(processor_id)
+            )
             updated_entity = response.json()
             logger.info(f"Successfully updated processor {processor_id}. New revision: {updated_entity.get('revision', {}).get('version')}")
             return updated_entity
@@ -652,8 +899,13 @@ class NiFiClient:
             logger.error(f"An unexpected error occurred updating processor {processor_id}: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred updating processor: {e}") from e
 
-    async def update_processor_state(self, processor_id: str, state: str) -> dict:
-        """Starts or stops a specific processor."""
+    async def update_processor_state(self, processor_id: str, state: str, revision: Optional[Dict] = None) -> dict:
+        """
+        Starts or stops a specific processor.
+
+        Pass `revision` when the caller already holds the processor entity to skip
+        re-fetching it.
+        """
         if not self.is_authenticated:
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
@@ -661,31 +913,31 @@ class NiFiClient:
         if normalized_state not in ["RUNNING", "STOPPED"]:
             raise ValueError("Invalid state specified. Must be 'RUNNING' or 'STOPPED'.")
 
-        # 1. Get current processor entity to obtain the latest revision
+        # 1. Use the given or last known revision, fetching the processor only if it is unknown
         # We need the revision even just to change the state.
-        logger.info(f"Fetching current revision for processor {processor_id} before changing state to {normalized_state}.")
-        try:
-            # Use get_processor_details as it already handles fetching the entity
-            current_entity = await self.get_processor_details(processor_id)
-            current_revision = current_entity["revision"]
-        except (ValueError, ConnectionError) as e:
-            logger.error(f"Failed to fetch processor {processor_id} to update state: {e}")
-            raise
+        fetch_entity = lambda: self.get_processor_details(processor_id)
+        if revision is not None:
+            current_revision, optimistic = revision, True
+        else:
+            try:
+                current_revision, optimistic = await self._revision_for_write(processor_id, fetch_entity)
+            except (ValueError, ConnectionError) as e:
+                logger.error(f"Failed to fetch processor {processor_id} to update state: {e}")
+                raise
 
         # 2. Prepare the update payload for the run-status endpoint
-        update_payload = {
-            "revision": current_revision,
-            "state": normalized_state,
-            "disconnectedNodeAcknowledged": False # Usually required, defaults to false
-        }
+        def build_payload(revision: Dict) -> Dict:
+            return {
+                "revision": revision,
+                "state": normalized_state,
+                "disconnectedNodeAcknowledged": False # Usually required, defaults to false
+            }
 
         # 3. Make the PUT request to the run-status endpoint
-        client = await self._get_client()
         endpoint = f"/processors/{processor_id}/run-status"
         try:
             logger.info(f"Setting processor {processor_id} state to {normalized_state} (Version: {current_revision.get('version')}).")
-            response = await client.put(endpoint, json=update_payload)
-            response.raise_for_status()
+            response = await self._put_with_revision(endpoint, build_payload, processor_id, current_revision, optimistic, fetch_entity)
             updated_entity = response.json() # The response contains the processor entity with updated status
             logger.info(f"Successfully set processor {processor_id} state to {updated_entity.get('component',{}).get('state', 'UNKNOWN')}. New revision: {updated_entity.get('revision', {}).get('version')}")
             return updated_entity
@@ -837,6 +1089,7 @@ class NiFiClient:
             response = await client.get(endpoint)
             response.raise_for_status()
             data = response.json()
+            self.revisions.remember_response(data)
             # Response is InputPortsEntity with 'inputPorts' key
             ports = data.get("inputPorts", [])
             logger.info(f"Found {len(ports)} input ports in group {process_group_id}.")
@@ -863,6 +1116,7 @@ class NiFiClient:
             response = await client.get(endpoint)
             response.raise_for_status()
             data = response.json()
+            self.revisions.remember_response(data)
             # Response is OutputPortsEntity with 'outputPorts' key
             ports = data.get("outputPorts", [])
             logger.info(f"Found {len(ports)} output ports in group {process_group_id}.")
@@ -889,6 +1143,7 @@ class NiFiClient:
             response = await client.get(endpoint)
             response.raise_for_status()
             data = response.json()
+            self.revisions.remember_response(data)
             # Response is ProcessGroupsEntity with 'processGroups' key
             groups = data.get("processGroups", [])
             logger.info(f"Found {len(groups)} child process groups in group {process_group_id}.")
@@ -946,6 +1201,7 @@ class NiFiClient:
             response = await client.get(endpoint)
             response.raise_for_status()
             flow_details = response.json()
+            self.revisions.remember_response(flow_details)
             logger.info(f"Successfully fetched flow details for process group {process_group_id}")
             return flow_details
 
@@ -1021,18 +1277,23 @@ class NiFiClient:
             logger.error(f"An unexpected error occurred getting output port details for {port_id}: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred getting output port details: {e}") from e
 
-    async def delete_input_port(self, port_id: str, version: int) -> bool:
-        """Deletes an input port given its ID and current revision version."""
+    async def delete_input_port(self, port_id: str, version: Optional[int] = None) -> bool:
+        """Deletes an input port given its ID and current revision version (the last known one if omitted)."""
         if not self.is_authenticated:
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        client = await self._get_client()
-        endpoint = f"/input-ports/{port_id}?version={version}&clientId={self._client_id}"
+        fetch_entity = lambda: self.get_input_port_details(port_id)
+        optimistic = False
+        if version is None:
+            revision, optimistic = await self._revision_for_write(port_id, fetch_entity)
+            version = revision.get("version")
+
+        endpoint = f"/input-ports/{port_id}"
 
         try:
             logger.info(f"Attempting to delete input port {port_id} (version {version}) using {self.base_url}{endpoint}")
-            response = await client.delete(endpoint)
-            response.raise_for_status() # Raises HTTPStatusError for 4xx/5xx
+            # Raises HTTPStatusError for 4xx/5xx
+            response = await self._delete_with_revision(endpoint, port_id, version, optimistic, fetch_entity)
 
             if response.status_code == 200:
                  logger.info(f"Successfully deleted input port {port_id}.")
@@ -1058,18 +1319,22 @@ class NiFiClient:
             logger.error(f"An unexpected error occurred deleting input port {port_id}: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred deleting input port: {e}") from e
 
-    async def delete_output_port(self, port_id: str, version: int) -> bool:
-        """Deletes an output port given its ID and current revision version."""
+    async def delete_output_port(self, port_id: str, version: Optional[int] = None) -> bool:
+        """Deletes an output port given its ID and current revision version (the last known one if omitted)."""
         if not self.is_authenticated:
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        client = await self._get_client()
-        endpoint = f"/output-ports/{port_id}?version={version}&clientId={self._client_id}"
+        fetch_entity = lambda: self.get_output_port_details(port_id)
+        optimistic = False
+        if version is None:
+            revision, optimistic = await self._revision_for_write(port_id, fetch_entity)
+            version = revision.get("version")
+
+        endpoint = f"/output-ports/{port_id}"
 
         try:
             logger.info(f"Attempting to delete output port {port_id} (version {version}) using {self.base_url}{endpoint}")
-            response = await client.delete(endpoint)
-            response.raise_for_status()
+            response = await self._delete_with_revision(endpoint, port_id, version, optimistic, fetch_entity)
 
             if response.status_code == 200:
                  logger.info(f"Successfully deleted output port {port_id}.")
@@ -1095,19 +1360,23 @@ class NiFiClient:
             logger.error(f"An unexpected error occurred deleting output port {port_id}: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred deleting output port: {e}") from e
 
-    async def delete_process_group(self, pg_id: str, version: int) -> bool:
-        """Deletes a process group given its ID and current revision version. Fails if not empty."""
+    async def delete_process_group(self, pg_id: str, version: Optional[int] = None) -> bool:
+        """Deletes a process group given its ID and current revision version (the last known one if omitted). Fails if not empty."""
         if not self.is_authenticated:
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        client = await self._get_client()
+        fetch_entity = lambda: self.get_process_group_details(pg_id)
+        optimistic = False
+        if version is None:
+            revision, optimistic = await self._revision_for_write(pg_id, fetch_entity)
+            version = revision.get("version")
+
         # Recursive deletion isn't standard; this deletes only if empty
-        endpoint = f"/process-groups/{pg_id}?version={version}&clientId={self._client_id}"
+        endpoint = f"/process-groups/{pg_id}"
 
         try:
             logger.info(f"Attempting to delete process group {pg_id} (version {version}) using {self.base_url}{endpoint}")
-            response = await client.delete(endpoint)
-            response.raise_for_status()
+            response = await self._delete_with_revision(endpoint, pg_id, version, optimistic, fetch_entity)
 
             if response.status_code == 200:
                  logger.info(f"Successfully deleted process group {pg_id}.")
@@ -1143,29 +1412,27 @@ class NiFiClient:
         if normalized_state not in ["RUNNING", "STOPPED", "DISABLED"]:
             raise ValueError("Invalid state specified. Must be 'RUNNING' or 'STOPPED' or 'DISABLED'.")
 
-        # 1. Get current details for revision
-        logger.info(f"Fetching current revision for input port {port_id} before changing state to {normalized_state}.")
+        # 1. Use the last known revision, fetching the port only if it is unknown
+        fetch_entity = lambda: self.get_input_port_details(port_id)
         try:
-            current_entity = await self.get_input_port_details(port_id)
-            current_revision = current_entity["revision"]
+            current_revision, optimistic = await self._revision_for_write(port_id, fetch_entity)
         except (ValueError, ConnectionError) as e:
             logger.error(f"Failed to fetch input port {port_id} to update state: {e}")
             raise
 
         # 2. Prepare payload
-        update_payload = {
-            "revision": current_revision,
-            "state": normalized_state,
-            "disconnectedNodeAcknowledged": False
-        }
+        def build_payload(revision: Dict) -> Dict:
+            return {
+                "revision": revision,
+                "state": normalized_state,
+                "disconnectedNodeAcknowledged": False
+            }
 
         # 3. Make PUT request
-        client = await self._get_client()
         endpoint = f"/input-ports/{port_id}/run-status"
         try:
             logger.info(f"Setting input port {port_id} state to {normalized_state} (Version: {current_revision.get('version')}).")
-            response = await client.put(endpoint, json=update_payload)
-            response.raise_for_status()
+            response = await self._put_with_revision(endpoint, build_payload, port_id, current_revision, optimistic, fetch_entity)
             updated_entity = response.json()
             logger.info(f"Successfully set input port {port_id} state to {updated_entity.get('component',{}).get('state', 'UNKNOWN')}.")
             return updated_entity
@@ -1192,29 +1459,27 @@ class NiFiClient:
         if normalized_state not in ["RUNNING", "STOPPED", "DISABLED"]:
             raise ValueError("Invalid state specified. Must be 'RUNNING' or 'STOPPED' or 'DISABLED'.")
 
-        # 1. Get current details for revision
-        logger.info(f"Fetching current revision for output port {port_id} before changing state to {normalized_state}.")
+        # 1. Use the last known revision, fetching the port only if it is unknown
+        fetch_entity = lambda: self.get_output_port_details(port_id)
         try:
-            current_entity = await self.get_output_port_details(port_id)
-            current_revision = current_entity["revision"]
+            current_revision, optimistic = await self._revision_for_write(port_id, fetch_entity)
         except (ValueError, ConnectionError) as e:
             logger.error(f"Failed to fetch output port {port_id} to update state: {e}")
             raise
 
         # 2. Prepare payload
-        update_payload = {
-            "revision": current_revision,
-            "state": normalized_state,
-            "disconnectedNodeAcknowledged": False
-        }
+        def build_payload(revision: Dict) -> Dict:
+            return {
+                "revision": revision,
+                "state": normalized_state,
+                "disconnectedNodeAcknowledged": False
+            }
 
         # 3. Make PUT request
-        client = await self._get_client()
         endpoint = f"/output-ports/{port_id}/run-status"
         try:
             logger.info(f"Setting output port {port_id} state to {normalized_state} (Version: {current_revision.get('version')}).")
-            response = await client.put(endpoint, json=update_payload)
-            response.raise_for_status()
+            response = await self._put_with_revision(endpoint, build_payload, port_id, current_revision, optimistic, fetch_entity)
             updated_entity = response.json()
             logger.info(f"Successfully set output port {port_id} state to {updated_entity.get('component',{}).get('state', 'UNKNOWN')}.")
             return updated_entity
@@ -1343,7 +1608,7 @@ class NiFiClient:
 
         try:
             logger.info(f"Fetching available processor types from {self.base_url}{endpoint}")
-            response = await client.get(endpoint)
+            response = await client.get(endpoint, timeout=self._operation_timeout("processor_types"))
             response.raise_for_status()
             data = response.json()
             # The response is ProcessorTypesEntity, containing 'processorTypes' list
@@ -1372,7 +1637,7 @@ class NiFiClient:
 
         try:
             logger.info(f"Performing global flow search with query '{query}' using {self.base_url}{endpoint}")
-            response = await client.get(endpoint, params=params)
+            response = await client.get(endpoint, params=params, timeout=self._operation_timeout("search"))
             response.raise_for_status()
             search_results = response.json()
             logger.info(f"Successfully performed global flow search for query '{query}'.")
@@ -1391,8 +1656,13 @@ class NiFiClient:
             logger.error(f"An unexpected error occurred performing flow search for query '{query}': {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred performing flow search: {e}") from e
 
-    async def update_process_group_state(self, pg_id: str, state: str) -> dict:
-        """Starts or stops all eligible components within a specific process group."""
+    async def update_process_group_state(self, pg_id: str, state: str, components: Optional[Dict[str, Dict]] = None) -> dict:
+        """
+        Starts or stops all eligible components within a specific process group.
+
+        `components` (component ID -> revision) restricts the call to those components,
+        scheduling many of them in a single request.
+        """
         if not self.is_authenticated:
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
@@ -1409,12 +1679,23 @@ class NiFiClient:
             "state": normalized_state,
             "disconnectedNodeAcknowledged": False
         }
+        if components is not None:
+            update_payload["components"] = components
 
         try:
-            logger.info(f"Setting process group {pg_id} state to {normalized_state}")
+            logger.info(f"Setting process group {pg_id} state to {normalized_state}" + (f" for {len(components)} components" if components is not None else ""))
             response = await client.put(endpoint, json=update_payload)
             response.raise_for_status()
             updated_entity = response.json()
+            # Scheduling bumps the revision of every component it touched
+            if components is not None:
+                for component_id, revision in (updated_entity.get("components") or {}).items():
+                    self.revisions.remember({"id": component_id, "revision": revision})
+                for component_id in components:
+                    if component_id not in (updated_entity.get("components") or {}):
+                        self.revisions.forget(component_id)
+            else:
+                self.revisions.forget_group(pg_id)
             logger.info(f"Successfully set process group {pg_id} state to {normalized_state}")
             return updated_entity
 
@@ -1425,13 +1706,15 @@ class NiFiClient:
             logger.error(f"Error setting process group {pg_id} state to {normalized_state}: {e}")
             raise ConnectionError(f"Error setting process group state: {e}") from e
 
-    async def purge_process_group_flowfiles(self, process_group_id: str, timeout_seconds: int = 30) -> Dict[str, Any]:
+    async def purge_process_group_flowfiles(self, process_group_id: str, timeout_seconds: int = 30,
+                                            max_concurrency: int = DEFAULT_PURGE_MAX_CONCURRENCY) -> Dict[str, Any]:
         """
         Purges all flowfiles from all connections in a process group.
         
         Args:
             process_group_id: The ID of the process group containing connections to purge
-            timeout_seconds: Maximum time in seconds to wait for each purge operation
+            timeout_seconds: Maximum time in seconds to wait for the whole purge
+            max_concurrency: Maximum drop requests in flight at once
             
         Returns:
             Dict containing purge results with success status, message, and detailed results
@@ -1448,25 +1731,50 @@ class NiFiClient:
                 "message": f"No connections found in process group {process_group_id}",
                 "results": []
             }
-        
-        results = []
-        success = True
-        
-        # Process each connection using the new handle_drop_request method
-        for connection in connections:
-            connection_id = connection.get("id")
-            if not connection_id:
-                continue
-                
-            result = await self.handle_drop_request(connection_id, timeout_seconds)
-            results.append(result)
-            if not result["success"]:
-                success = False
-        
+
+        connection_ids = [connection["id"] for connection in connections if connection.get("id")]
+        purge = await self.purge_connections_flowfiles(connection_ids, timeout_seconds, max_concurrency)
+        purge["message"] = f"{purge['message']} in process group {process_group_id}"
+        return purge
+
+    async def purge_connections_flowfiles(self, connection_ids: List[str], timeout_seconds: int = 30,
+                                          max_concurrency: int = DEFAULT_PURGE_MAX_CONCURRENCY) -> Dict[str, Any]:
+        """
+        Purges several connections at once. Drop requests run concurrently, up to `max_concurrency`
+        at a time, and all of them share one deadline of `timeout_seconds`.
+
+        Returns:
+            Dict with overall success, a summary message, per-connection results (as returned by
+            handle_drop_request) and the total_dropped_count / total_dropped_bytes.
+        """
+        if not self.is_authenticated:
+            raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_seconds
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def purge_one(connection_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return {
+                        "success": False,
+                        "connection_id": connection_id,
+                        "error": f"Purge deadline of {timeout_seconds} seconds passed before the drop request was submitted"
+                    }
+                return await self.handle_drop_request(connection_id, remaining)
+
+        # dict.fromkeys drops duplicate IDs but keeps the order
+        results = await asyncio.gather(*(purge_one(connection_id) for connection_id in dict.fromkeys(connection_ids)))
+        succeeded = [r for r in results if r["success"]]
+
         return {
-            "success": success,
-            "message": f"Purged {sum(1 for r in results if r.get('success', False))} of {len(results)} connections in process group {process_group_id}",
-            "results": results
+            "success": len(succeeded) == len(results),
+            "message": f"Purged {len(succeeded)} of {len(results)} connections",
+            "total_dropped_count": sum(r.get("dropped_flowfiles", 0) for r in succeeded),
+            "total_dropped_bytes": sum(r.get("dropped_bytes", 0) for r in succeeded),
+            "results": list(results)
         }
 
     async def create_drop_request(self, connection_id: str) -> Dict[str, Any]:
@@ -1667,36 +1975,24 @@ class NiFiClient:
         return results
 
     async def handle_drop_request(self, connection_id: str, timeout_seconds: int = 30) -> Dict[str, Any]:
-        """Handles a drop request for a connection's flowfiles from creation through completion/polling."""
-        try:
-            # Create the drop request
-            drop_request_result = await self.create_drop_request(connection_id)
-            request_id = drop_request_result.get("id")
-            
-            if not request_id:
-                raise ValueError("No drop request ID found in response")
-            
-            # Poll until complete or timeout
-            start_time = time.time()
-            final_status = None
-            
-            while True:
-                if time.time() - start_time > timeout_seconds:
-                    raise TimeoutError(f"Drop request timed out after {timeout_seconds} seconds")
-
-                status = await self.get_drop_request(connection_id, request_id)
-                if status.get("finished"):
-                    final_status = status
-                    break
-                await asyncio.sleep(0.5)  # Short delay between checks
-
-            # Always try to cleanup the request
-            await self.delete_drop_request(connection_id, request_id)
+        """Handles a drop request for a connection's flowfiles from creation through completion/polling.
 
+        The request is always deleted afterwards, including on timeout or cancellation.
+        """
+        try:
+            final_status = await run_async_request(
+                f"drop request for connection {connection_id}",
+                submit=lambda: self.create_drop_request(connection_id),
+                get_status=lambda request_id: self.get_drop_request(connection_id, request_id),
+                delete=lambda request_id: self.delete_drop_request(connection_id, request_id),
+                timeout_seconds=timeout_seconds,
+            )
             return {
                 "success": True,
                 "connection_id": connection_id,
-                "dropped_count": final_status.get("dropped", "0 / 0 bytes")
+                "dropped_count": final_status.get("dropped", "0 / 0 bytes"),
+                "dropped_flowfiles": final_status.get("droppedCount", 0),
+                "dropped_bytes": final_status.get("droppedSize", 0)
             }
 
         except Exception as e:
@@ -2031,7 +2327,7 @@ class NiFiClient:
         endpoint = f"/provenance-events/{event_id}/content/{direction}"
         
         try:
-            response = await client.get(endpoint)
+            response = await client.get(endpoint, timeout=self._operation_timeout("provenance_content"))
             response.raise_for_status()
             
             # Return the response for streaming - caller should handle aclose()
@@ -2046,6 +2342,44 @@ class NiFiClient:
             logger.error(f"Error getting {direction} content for provenance event {event_id}: {e}")
             raise ConnectionError(f"Error getting provenance event content: {e}") from e
 
+    async def iter_provenance_event_content(
+        self,
+        event_id: int,
+        direction: Literal["input", "output"],
+        chunk_size: int = 65536
+    ) -> AsyncIterator[bytes]:
+        """Streams content for a specific provenance event in chunks of up to `chunk_size` bytes.
+
+        Only one chunk is held at a time. Stopping the iteration (closing the generator)
+        abandons the rest of the download.
+
+        Raises:
+            ValueError: The content is not available.
+            ConnectionError: NiFi could not be reached or returned an error.
+        """
+        if not self.is_authenticated:
+            raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
+
+        client = await self._get_client()
+        endpoint = f"/provenance-events/{event_id}/content/{direction}"
+
+        try:
+            async with client.stream("GET", endpoint, timeout=self._operation_timeout("provenance_content")) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Failed to stream {direction} content for provenance event {event_id}: {e.response.status_code} - {e.response.text}")
+            if e.response.status_code == 404:
+                raise ValueError(f"Content not available for provenance event {event_id} ({direction})") from e
+            raise ConnectionError(f"Failed to get provenance event content: {e.response.status_code}, {e.response.text}") from e
+        except httpx.RequestError as e:
+            logger.error(f"Error streaming {direction} content for provenance event {event_id}: {e}")
+            raise ConnectionError(f"Error getting provenance event content: {e}") from e
+
     # ==========================================
     # Controller Service Methods
     # ==========================================
@@ -2181,26 +2515,26 @@ class NiFiClient:
             local_logger.error("Authentication required before updating controller service properties.")
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        # First, get current controller service to get revision info
-        current_entity = await self.get_controller_service_details(controller_service_id, user_request_id, action_id)
+        # Use the last known revision, fetching the service only if it is unknown
+        fetch_entity = lambda: self.get_controller_service_details(controller_service_id, user_request_id, action_id)
+        revision, optimistic = await self._revision_for_write(controller_service_id, fetch_entity)
         
-        client = await self._get_client()
         endpoint = f"/controller-services/{controller_service_id}"
 
         # Construct the update payload
-        request_body = {
-            "revision": current_entity.get("revision", {}),
-            "disconnectedNodeAcknowledged": False,
-            "component": {
-                "id": controller_service_id,
-                "properties": properties
+        def build_request_body(current_revision: Dict) -> Dict:
+            return {
+                "revision": current_revision,
+                "disconnectedNodeAcknowledged": False,
+                "component": {
+                    "id": controller_service_id,
+                    "properties": properties
+                }
             }
-        }
 
         try:
             local_logger.info(f"Updating properties for controller service {controller_service_id}")
-            response = await client.put(endpoint, json=request_body)
-            response.raise_for_status()
+            response = await self._put_with_revision(endpoint, build_request_body, controller_service_id, revision, optimistic, fetch_entity)
             updated_entity = response.json()
             local_logger.info(f"Successfully updated properties for controller service {controller_service_id}")
             return updated_entity
@@ -2219,26 +2553,25 @@ class NiFiClient:
             local_logger.error(f"An unexpected error occurred updating controller service properties: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred updating controller service properties: {e}") from e
 
-    async def delete_controller_service(self, controller_service_id: str, version: int, user_request_id: str = "-", action_id: str = "-") -> bool:
-        """Deletes a controller service."""
+    async def delete_controller_service(self, controller_service_id: str, version: Optional[int] = None, user_request_id: str = "-", action_id: str = "-") -> bool:
+        """Deletes a controller service at the given revision version (the last known one if omitted)."""
         local_logger = logger.bind(user_request_id=user_request_id, action_id=action_id)
         
         if not self.is_authenticated:
             local_logger.error("Authentication required before deleting controller service.")
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        client = await self._get_client()
+        fetch_entity = lambda: self.get_controller_service_details(controller_service_id, user_request_id, action_id)
+        optimistic = False
+        if version is None:
+            revision, optimistic = await self._revision_for_write(controller_service_id, fetch_entity)
+            version = revision.get("version")
+
         endpoint = f"/controller-services/{controller_service_id}"
-        params = {
-            "version": version,
-            "clientId": self._client_id,
-            "disconnectedNodeAcknowledged": "false"
-        }
 
         try:
             local_logger.info(f"Deleting controller service {controller_service_id} with version {version}")
-            response = await client.delete(endpoint, params=params)
-            response.raise_for_status()
+            response = await self._delete_with_revision(endpoint, controller_service_id, version, optimistic, fetch_entity)
             local_logger.info(f"Successfully deleted controller service {controller_service_id}")
             return True
 
@@ -2257,31 +2590,34 @@ class NiFiClient:
             local_logger.error(f"An unexpected error occurred deleting controller service: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred deleting controller service: {e}") from e
 
-    async def enable_controller_service(self, controller_service_id: str, user_request_id: str = "-", action_id: str = "-") -> Dict:
-        """Enables a controller service."""
+    async def enable_controller_service(self, controller_service_id: str, user_request_id: str = "-", action_id: str = "-", revision: Optional[Dict] = None) -> Dict:
+        """Enables a controller service. Pass `revision` to skip re-fetching the service."""
         local_logger = logger.bind(user_request_id=user_request_id, action_id=action_id)
         
         if not self.is_authenticated:
             local_logger.error("Authentication required before enabling controller service.")
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        # First, get current controller service to get revision info
-        current_entity = await self.get_controller_service_details(controller_service_id, user_request_id, action_id)
+        # Use the given or last known revision, fetching the service only if it is unknown
+        fetch_entity = lambda: self.get_controller_service_details(controller_service_id, user_request_id, action_id)
+        if revision is not None:
+            optimistic = True
+        else:
+            revision, optimistic = await self._revision_for_write(controller_service_id, fetch_entity)
         
-        client = await self._get_client()
         endpoint = f"/controller-services/{controller_service_id}/run-status"
 
         # Construct the request body to enable the service
-        request_body = {
-            "revision": current_entity.get("revision", {}),
-            "disconnectedNodeAcknowledged": False,
-            "state": "ENABLED"
-        }
+        def build_request_body(current_revision: Dict) -> Dict:
+            return {
+                "revision": current_revision,
+                "disconnectedNodeAcknowledged": False,
+                "state": "ENABLED"
+            }
 
         try:
             local_logger.info(f"Enabling controller service {controller_service_id}")
-            response = await client.put(endpoint, json=request_body)
-            response.raise_for_status()
+            response = await self._put_with_revision(endpoint, build_request_body, controller_service_id, revision, optimistic, fetch_entity)
             updated_entity = response.json()
             local_logger.info(f"Successfully enabled controller service {controller_service_id}")
             return updated_entity
@@ -2300,31 +2636,34 @@ class NiFiClient:
             local_logger.error(f"An unexpected error occurred enabling controller service: {e}", exc_info=True)
             raise ConnectionError(f"An unexpected error occurred enabling controller service: {e}") from e
 
-    async def disable_controller_service(self, controller_service_id: str, user_request_id: str = "-", action_id: str = "-") -> Dict:
-        """Disables a controller service."""
+    async def disable_controller_service(self, controller_service_id: str, user_request_id: str = "-", action_id: str = "-", revision: Optional[Dict] = None) -> Dict:
+        """Disables a controller service. Pass `revision` to skip re-fetching the service."""
         local_logger = logger.bind(user_request_id=user_request_id, action_id=action_id)
         
         if not self.is_authenticated:
             local_logger.error("Authentication required before disabling controller service.")
             raise NiFiAuthenticationError("Client is not authenticated. Call authenticate() first.")
 
-        # First, get current controller service to get revision info
-        current_entity = await self.get_controller_service_details(controller_service_id, user_request_id, action_id)
+        # Use the given or last known revision, fetching the service only if it is unknown
+        fetch_entity = lambda: self.get_controller_service_details(controller_service_id, user_request_id, action_id)
+        if revision is not None:
+            optimistic = True
+        else:
+            revision, optimistic = await self._revision_for_write(controller_service_id, fetch_entity)
         
-        client = await self._get_client()
         endpoint = f"/controller-services/{controller_service_id}/run-status"
 
         # Construct the request body to disable the service
-        request_body = {
-            "revision": current_entity.get("revision", {}),
-            "disconnectedNodeAcknowledged": False,
-            "state": "DISABLED"
-        }
+        def build_request_body(current_revision: Dict) -> Dict:
+            return {
+                "revision": current_revision,
+                "disconnectedNodeAcknowledged": False,
+                "state": "DISABLED"
+            }
 
         try:
             local_logger.info(f"Disabling controller service {controller_service_id}")
-            response = await client.put(endpoint, json=request_body)
-            response.raise_for_status()
+            response = await self._put_with_revision(endpoint, build_request_body, controller_service_id, revision, optimistic, fetch_entity)
             updated_entity = response.json()
             local_logger.info(f"Successfully disabled controller service {controller_service_id}")
             return updated_entity
@@ -2356,7 +2695,7 @@ class NiFiClient:
 
         try:
             local_logger.info(f"Fetching available controller service types from {self.base_url}{endpoint}")
-            response = await client.get(endpoint)
+            response = await client.get(endpoint, timeout=self._operation_timeout("controller_service_types"))
             response.raise_for_status()
             data = response.json()
             # The response is ControllerServiceTypesEntity, containing 'controllerServiceTypes' list
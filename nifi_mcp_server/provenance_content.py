@@ -0,0 +1,120 @@
+"""
+Bounded-memory sampling of provenance event content.
+
+FlowFile content can run to hundreds of megabytes, so it is never read whole:
+- `sample_content` consumes a chunk stream once and keeps only a head and a tail of
+  fixed size, plus a running SHA-256 when the content is to be compared. It stops
+  downloading as soon as it has everything it needs.
+- `shared_content_claim` detects identical input and output from the event's content
+  claims, without reading any content at all.
+- `decode_content` renders sampled bytes for a tool response.
+"""
+
+import base64
+import hashlib
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+_CLAIM_FIELDS = ("ContentClaimContainer", "ContentClaimSection", "ContentClaimIdentifier",
+                 "ContentClaimOffset", "ContentClaimFileSizeBytes")
+
+
+@dataclass
+class ContentSample:
+    """What one pass over a content stream kept."""
+    head: bytes
+    tail: bytes
+    bytes_read: int
+    complete: bool  # The stream was read to its end
+    sha256: Optional[str] = None  # Only when hashing was requested and the stream was read to its end
+
+    @property
+    def truncated(self) -> bool:
+        return not self.complete or len(self.head) < self.bytes_read
+
+
+async def sample_content(
+    chunks: AsyncIterator[bytes],
+    head_bytes: int,
+    tail_bytes: int = 0,
+    hash_content: bool = False,
+    max_bytes: Optional[int] = None
+) -> ContentSample:
+    """
+    Reads a content stream once, keeping at most `head_bytes` + `tail_bytes` of it in memory.
+
+    The stream is abandoned as soon as the head is full, unless a tail or a hash is wanted.
+    `max_bytes` is a hard cap on how much is read at all. Content past it is never
+    downloaded, and the sample is then incomplete and unhashed.
+    """
+    head = bytearray()
+    tail = bytearray()
+    digest = hashlib.sha256() if hash_content else None
+    bytes_read = 0
+    complete = True
+    needs_full_pass = tail_bytes > 0 or hash_content
+
+    try:
+        async for chunk in chunks:
+            if max_bytes is not None and bytes_read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - bytes_read]
+                complete = False
+            bytes_read += len(chunk)
+            if len(head) < head_bytes:
+                head += chunk[:head_bytes - len(head)]
+            if tail_bytes > 0:
+                tail += chunk[-tail_bytes:]
+                del tail[:-tail_bytes]
+            if digest is not None:
+                digest.update(chunk)
+            if not complete:
+                break
+            if not needs_full_pass and len(head) >= head_bytes:
+                # Everything wanted is in hand; anything left in the stream would be discarded
+                complete = False
+                break
+    finally:
+        # Closing the generator releases the HTTP response without reading the rest
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    return ContentSample(
+        head=bytes(head),
+        tail=bytes(tail),
+        bytes_read=bytes_read,
+        complete=complete,
+        sha256=digest.hexdigest() if digest is not None and complete else None,
+    )
+
+
+def shared_content_claim(event: dict) -> Optional[bool]:
+    """
+    True when the event's input and output point at the same content claim, so the content is
+    identical without reading it. False when the claims differ. None when NiFi did not report them.
+    """
+    input_claim = tuple(event.get(f"input{name}") for name in _CLAIM_FIELDS)
+    output_claim = tuple(event.get(f"output{name}") for name in _CLAIM_FIELDS)
+    # The identifier is what locates the claim; without it the claims cannot be told apart
+    if input_claim[2] is None or output_claim[2] is None:
+        return None
+    return input_claim == output_claim
+
+
+def decode_content(data: bytes, truncated: bool = False) -> str:
+    """
+    UTF-8 text when the bytes are text, base64 otherwise. A cut-off multi-byte character at
+    the edge of a truncated sample is dropped rather than forcing base64.
+    """
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A character cut at either edge of a sample fails within its last or first 3 bytes
+        if truncated and (e.start >= len(data) - 3 or e.end <= 3):
+            for start in range(0, 4):
+                for end in range(len(data), len(data) - 4, -1):
+                    try:
+                        return data[start:end].decode("utf-8")
+                    except UnicodeDecodeError:
+                        continue
+        return base64.b64encode(data).decode("ascii")
@@ -0,0 +1,137 @@
+"""
+Last known revision of every NiFi component a NiFiClient has seen.
+
+NiFi's optimistic locking requires the current `revision` on every write, and the client
+used to GET the full entity before each PUT or DELETE just to read it. The map is filled
+from every component response the client receives (reads, creates, updates, listings), so
+writes can use the remembered revision directly. When that revision turns out to be stale
+the write gets a 409, and the client refetches and retries once.
+
+The map also remembers each component's parent group. That lets a process-group state
+change drop the revisions it invalidated, and lets Auto-Stop find a component's parent
+without another request.
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+# Component endpoints whose JSON responses carry a single entity with a revision
+_ENTITY_PATH = re.compile(
+    r"/(?:processors|input-ports|output-ports|controller-services|connections|process-groups|funnels|labels)"
+    r"/[^/]+(?:/run-status|/(?:processors|input-ports|output-ports|controller-services|connections|process-groups|funnels|labels))?$"
+)
+
+# Child collections of a process group; a GET returns a listing, a POST creates one entity
+_LISTING_PATH = re.compile(
+    r"/process-groups/[^/]+/(?:processors|input-ports|output-ports|controller-services|connections|process-groups|funnels|labels)$"
+)
+
+# Component lists in a /flow/process-groups/{id} response
+_FLOW_COMPONENT_KEYS = ("processors", "inputPorts", "outputPorts", "connections", "processGroups", "funnels", "labels")
+
+
+def is_entity_path(path: str) -> bool:
+    """True if responses from `path` are single component entities worth remembering."""
+    # /flow responses can be large; NiFiClient.get_process_group_flow records those itself
+    return "/flow/" not in path and _ENTITY_PATH.search(path) is not None
+
+
+def is_listing_path(path: str) -> bool:
+    """True if a GET of `path` lists a group's children; callers record those from their parsed payload."""
+    return _LISTING_PATH.search(path) is not None
+
+
+def is_stale_revision_conflict(status_code: int, body: str) -> bool:
+    """True for a 409 caused by an out-of-date revision (rather than, say, a running component)."""
+    return status_code == 409 and "revision" in (body or "").lower()
+
+
+@dataclass
+class KnownRevision:
+    revision: Dict[str, Any]
+    parent_group_id: Optional[str]
+
+
+class RevisionMap:
+    """Bounded map of component ID -> last known revision and parent group."""
+
+    def __init__(self, max_entries: int = 20000):
+        self._entries: "OrderedDict[str, KnownRevision]" = OrderedDict()
+        self._max_entries = max_entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def remember(self, entity: Any):
+        """Records the revision of a component entity. Older versions never replace newer ones."""
+        if not isinstance(entity, dict):
+            return
+        component_id = entity.get("id")
+        revision = entity.get("revision")
+        if not component_id or not isinstance(revision, dict) or revision.get("version") is None:
+            return
+        component = entity.get("component") or {}
+        parent_group_id = component.get("parentGroupId") or entity.get("parentGroupId")
+
+        existing = self._entries.get(component_id)
+        if existing is not None:
+            if revision["version"] < existing.revision.get("version", -1):
+                return
+            parent_group_id = parent_group_id or existing.parent_group_id
+        self._entries[component_id] = KnownRevision(revision=dict(revision), parent_group_id=parent_group_id)
+        self._entries.move_to_end(component_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def remember_many(self, entities: Iterable[Any]):
+        for entity in entities or []:
+            self.remember(entity)
+
+    def remember_response(self, data: Any):
+        """Records a single entity, or the entities of a component listing or a flow response."""
+        if not isinstance(data, dict):
+            return
+        if "revision" in data:
+            self.remember(data)
+            return
+        flow = data.get("processGroupFlow", {}).get("flow") if isinstance(data.get("processGroupFlow"), dict) else None
+        if isinstance(flow, dict):
+            for key in _FLOW_COMPONENT_KEYS:
+                self.remember_many(flow.get(key))
+            return
+        for value in data.values():
+            if isinstance(value, list):
+                self.remember_many(value)
+
+    def get(self, component_id: str) -> Optional[Dict[str, Any]]:
+        """Returns a copy of the last known revision, or None if the component is unknown."""
+        known = self._entries.get(component_id)
+        return dict(known.revision) if known else None
+
+    def parent_group_id(self, component_id: str) -> Optional[str]:
+        known = self._entries.get(component_id)
+        return known.parent_group_id if known else None
+
+    def forget(self, component_id: str):
+        self._entries.pop(component_id, None)
+
+    def forget_group(self, group_id: str):
+        """
+        Forgets every known component inside `group_id` (at any depth) and the group itself.
+        Group-level scheduling changes the revisions of everything it touches.
+        """
+        doomed = {group_id}
+        changed = True
+        while changed:
+            changed = False
+            for component_id, known in self._entries.items():
+                if component_id not in doomed and known.parent_group_id in doomed:
+                    doomed.add(component_id)
+                    changed = True
+        for component_id in doomed:
+            self._entries.pop(component_id, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -3,14 +3,12 @@ import signal
 from typing import List, Dict, Optional, Any, Union, Literal
 import json
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Body, Request, Query, Header
-from fastapi.responses import JSONResponse 
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import sys
 from loguru import logger 
-from docstring_parser import parse 
 from contextlib import asynccontextmanager # Added import
-from textwrap import dedent # <-- IMPORT ADDED
 
 # --- Setup Logging --- 
 try:
@@ -33,7 +31,7 @@ from nifi_mcp_server.nifi_client import NiFiAuthenticationError # Keep Error imp
 # REMOVED from mcp.server import FastMCP
 
 # Import core components AFTER logging is setup, but BEFORE tools
-from .core import mcp, get_nifi_client
+from .core import mcp, get_nifi_client, close_nifi_clients
 
 # Import the context var from logging_setup
 from config.logging_setup import request_context # Adjust import path if needed
@@ -69,6 +67,8 @@ from .api_tools import creation
 from .api_tools import modification
 from .api_tools import operation
 from .api_tools import helpers
+from .tool_catalog import TOOL_CATALOG_VERSION_HEADER, current_tool_catalog_version, etag_matches, get_tool_catalog
+from .metrics import METRICS_CONTENT_TYPE, render_metrics, track_tool_call
 # Add other tool module imports here as they are created
 # from .api_tools import helpers
 # ---------------------------------------------------------------------
@@ -102,6 +102,12 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to configure LLM clients: {e}", exc_info=True)
         logger.warning("Workflows may not be able to call LLMs")
     
+    # Format every tool definition once; GET /tools serves the result
+    try:
+        get_tool_catalog()
+    except Exception as e:
+        logger.error(f"Failed to build the tool catalog: {e}", exc_info=True)
+    
     if not get_nifi_servers():
         logger.warning("*******************************************************")
         logger.warning("*** No NiFi servers configured in config.yaml!      ***")
@@ -114,8 +120,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown logic (moved from shutdown_event and cleanup)
     logger.info("FastAPI server shutting down...")
-    # Call cleanup logic directly here if needed in the future
-    # await cleanup() 
+    await close_nifi_clients()
     logger.info("Cleanup finished.")
 
 app = FastAPI(
@@ -180,7 +185,10 @@ async def get_tools(
     request: Request, 
     phase: str | None = Query(None) # Add phase query parameter
 ):
-    """Retrieve the list of available MCP tools, optionally filtered by phase."""
+    """Retrieve the list of available MCP tools, optionally filtered by phase.
+
+    Served from the precomputed tool catalog with an ETag; a matching If-None-Match gets a 304.
+    """
     user_request_id = request.state.user_request_id
     action_id = request.state.action_id
     bound_logger = logger.bind(user_request_id=user_request_id, action_id=action_id, requested_phase=phase)
@@ -188,136 +196,22 @@ async def get_tools(
     bound_logger.debug(f"/tools endpoint received phase parameter: {phase!r}") # Log the raw value
     
     try:
-        bound_logger.debug(f"Fetching tools, requested phase: '{phase}'")
-        formatted_tools = []
-        tool_manager = getattr(mcp, '_tool_manager', None)
-        if tool_manager:
-            tools_info = tool_manager.list_tools()
-            
-            for tool_info in tools_info: 
-                tool_name = getattr(tool_info, 'name', 'unknown')
-                tool_phases_list = _tool_phase_registry.get(tool_name, [])
-                if not tool_phases_list:
-                     bound_logger.warning(f"Could not find phase tags in registry for tool '{tool_name}'. Assuming it belongs to all phases for safety.")
-
-                requested_phase_lower = phase.lower() if phase else None
-                tool_phases_lower = [p.lower() for p in tool_phases_list]
-                
-                if requested_phase_lower and requested_phase_lower != "all" and requested_phase_lower not in tool_phases_lower:
-                    bound_logger.trace(f"Skipping tool '{tool_name}' due to phase mismatch (requested: {phase}, tool phases: {tool_phases_list})")
-                    continue # Skip this tool if phase doesn't match
-
-                raw_docstring = getattr(tool_info, 'description', '')
-                parsed_docstring = parse(raw_docstring)
-                returns_description = ""
-                if parsed_docstring.returns and parsed_docstring.returns.description:
-                    returns_description = f"\n\n**Returns:**\n{parsed_docstring.returns.description}"
-
-                base_description_parts = []
-                if parsed_docstring.short_description:
-                    base_description_parts.append(parsed_docstring.short_description)
-                
-                if parsed_docstring.long_description:
-                    base_description_parts.append("\n\n" + parsed_docstring.long_description) # Add separation
-
-                if base_description_parts:
-                    base_description = "".join(base_description_parts)
-                    bound_logger.trace(f"Using parsed short/long description for tool '{tool_name}'")
-                else:
-                    base_description = raw_docstring.split('\n\n')[0] # Original fallback
-                    bound_logger.trace(f"Falling back to basic description for tool '{tool_name}' (parsing empty?)")
-
-                # --- BEGIN ADDITION: Extract Example section ---
-                example_section = ""
-                example_markers = ["Example:\n", "Examples:\n"] # Check for both singular and plural
-                normalized_docstring = "\n" + raw_docstring # Ensure leading newline for marker check at start
-
-                marker_found = None
-                marker_start_index = -1
-                for marker in example_markers:
-                    found_index = normalized_docstring.find(marker)
-                    if found_index != -1:
-                        marker_found = marker
-                        marker_start_index = found_index
-                        break
-                
-                if marker_found:
-                    # Start content search *after* the marker
-                    content_start_index = marker_start_index + len(marker_found)
-                    potential_example_content = normalized_docstring[content_start_index:]
-
-                    # Find the end of the example block by looking for the next common section marker
-                    next_section_markers = ["Args:\n", "Returns:\n", "Raises:\n", "Attributes:\n", "Yields:\n"] # Add others if needed
-                    end_index = len(potential_example_content) # Default to end of string
-
-                    for next_marker in next_section_markers:
-                         found_index = potential_example_content.find(next_marker)
-                         if found_index != -1:
-                            end_index = min(end_index, found_index)
-
-                    # Dedent the extracted block before stripping
-                    raw_example_content = potential_example_content[:end_index]
-                    dedented_content = dedent(raw_example_content)
-                    example_content = dedented_content.strip() # Strip after dedenting
-                    
-                    if example_content:
-                         # Re-add the marker itself (stripped) and format with bold markdown around it
-                         example_section = f"\n\n**{marker_found.strip()}**\n{example_content}\n\n"
-                         bound_logger.trace(f"Extracted Example section for tool '{tool_name}'")
-                # --- END ADDITION ---
-
-                tool_description = f"{base_description}{example_section}{returns_description}"
-
-                param_descriptions = {p.arg_name: p.description for p in parsed_docstring.params}
-                raw_params_schema = getattr(tool_info, 'parameters', {})
-                parameters_schema = {"type": "object", "properties": {}}
-                raw_properties = raw_params_schema.get('properties', {})
-                cleaned_properties = {}
-                if isinstance(raw_properties, dict):
-                    for prop_name, prop_schema in raw_properties.items():
-                        if isinstance(prop_schema, dict):
-                            cleaned_schema = prop_schema.copy()
-                            cleaned_schema.pop('anyOf', None)
-                            cleaned_schema.pop('title', None)
-                            cleaned_schema.pop('default', None)
-                            cleaned_schema['description'] = param_descriptions.get(prop_name, '')
-                            cleaned_properties[prop_name] = cleaned_schema
-                        else:
-                            logger.warning(f"Property '{prop_name}' in tool '{tool_name}' has non-dict schema: {prop_schema}. Skipping property.")
-                parameters_schema["properties"] = cleaned_properties
-                required_list = raw_params_schema.get('required', [])
-                if required_list and cleaned_properties:
-                     parameters_schema["required"] = required_list
-                elif "required" in parameters_schema:
-                     del parameters_schema["required"]
-                if not parameters_schema["properties"]:
-                     del parameters_schema["properties"]
-                     if "required" in parameters_schema: del parameters_schema["required"]
-                if 'required' in raw_params_schema:
-                    parameters_schema["required"] = list(raw_params_schema['required'])
-                if 'properties' in parameters_schema:
-                    for prop_name, prop_data in parameters_schema['properties'].items():
-                        if isinstance(prop_data, dict) and 'enum' in prop_data:
-                            prop_data['enum'] = [str(val) for val in prop_data['enum']]
-                
-                formatted_tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool_name,
-                        "description": tool_description,
-                        "parameters": parameters_schema
-                    },
-                    "phases": tool_phases_list # Include phases in the response
-                })
-            bound_logger.info(f"Returning {len(formatted_tools)} tool definitions (Phase: {phase or 'All'}).")
-            return formatted_tools
-        else:
-            bound_logger.warning("Could not find ToolManager (_tool_manager) on MCP instance.")
-            return []
+        phase_tools = get_tool_catalog().for_phase(phase)
     except Exception as e:
         bound_logger.error(f"Error retrieving tool definitions: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error retrieving tools.")
 
+    if etag_matches(request.headers.get("If-None-Match"), phase_tools.etag):
+        bound_logger.debug(f"Tool definitions unchanged (Phase: {phase or 'All'}, ETag: {phase_tools.etag}).")
+        return Response(status_code=304, headers={"ETag": phase_tools.etag})
+    bound_logger.info(f"Returning {len(phase_tools.tools)} tool definitions (Phase: {phase or 'All'}).")
+    return Response(content=phase_tools.body, media_type="application/json", headers={"ETag": phase_tools.etag})
+
+@app.get("/metrics", tags=["Monitoring"])
+async def get_metrics():
+    """NiFi API, tool and workflow step metrics in the Prometheus text format."""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 # Define a Pydantic model for the request body with context support
 from pydantic import BaseModel
 
@@ -361,6 +255,10 @@ async def add_context_to_logger(request: Request, call_next):
     
     try:
         response = await call_next(request)
+        # Lets clients tell whether their cached tool list is still current
+        catalog_version = current_tool_catalog_version()
+        if catalog_version:
+            response.headers[TOOL_CATALOG_VERSION_HEADER] = catalog_version
     finally:
         # --- Reset ContextVar --- 
         request_context.reset(loguru_context_token) # Reset Loguru context
@@ -422,7 +320,8 @@ async def execute_tool(
         
         # Call the tool using the correct method on the FastMCP instance
         # ContextVars provide client/logger implicitly via the context mechanism within call_tool
-        tool_result_mcp_format = await mcp.call_tool(tool_name, tool_input)
+        with track_tool_call(tool_name, nifi_server_id):
+            tool_result_mcp_format = await mcp.call_tool(tool_name, tool_input)
                 
         bound_logger.info(f"Tool '{tool_name}' execution successful.")
         bound_logger.debug(f"Raw MCP Tool result: {tool_result_mcp_format}") 
@@ -521,11 +420,7 @@ async def execute_tool(
             current_request_logger.reset(logger_token)
             bound_logger.trace("Reset request logger context variable.")
         # ------------------------ #
-        # --- Clean up NiFi Client --- #
-        if nifi_client:
-            bound_logger.debug(f"Closing NiFi client connection for server ID: {nifi_server_id}")
-            await nifi_client.close() # Ensure connection is closed after request
-        # -------------------------- #
+        # NiFi client is shared via the client registry and closed on shutdown, not per request
 
 # --- Workflow Endpoints --- #
 
@@ -687,11 +582,7 @@ async def execute_workflow(
             current_request_logger.reset(logger_token)
             bound_logger.trace("Reset request logger context variable.")
         # ------------------------ #
-        # --- Clean up NiFi Client --- #
-        if nifi_client:
-            bound_logger.debug(f"Closing NiFi client connection for server ID: {nifi_server_id}")
-            await nifi_client.close()
-        # -------------------------- #
+        # NiFi client is shared via the client registry and closed on shutdown, not per request
 
 @app.get("/workflows/validate/{workflow_name}", response_model=Dict[str, Any], tags=["Workflows"])
 async def validate_workflow(
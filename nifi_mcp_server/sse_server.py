@@ -10,7 +10,7 @@ import signal
 from typing import List, Dict, Optional, Any, Union, Literal
 import json
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Body, Request, Query, Header
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import sys
@@ -34,7 +34,7 @@ except ImportError as e:
 from nifi_mcp_server.nifi_client import NiFiAuthenticationError
 
 # Import core components
-from .core import mcp, get_nifi_client
+from .core import mcp, get_nifi_client, close_nifi_clients
 
 # Import the context var from logging_setup
 from config.logging_setup import request_context
@@ -62,6 +62,7 @@ from .api_tools import creation
 from .api_tools import modification
 from .api_tools import operation
 from .api_tools import helpers
+from .metrics import METRICS_CONTENT_TYPE, render_metrics, track_tool_call
 
 # Import Config Settings
 from config.settings import get_nifi_servers
@@ -100,6 +101,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown logic
     logger.info("FastAPI SSE server shutting down...")
+    await close_nifi_clients()
     logger.info("Cleanup finished.")
 
 # Create FastAPI app with SSE support
@@ -131,6 +133,11 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "server": "NiFi MCP SSE"}
 
+@app.get("/metrics", tags=["Monitoring"])
+async def get_metrics():
+    """NiFi API, tool and workflow step metrics in the Prometheus text format."""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 @app.get("/mcp/sse")
 async def mcp_sse_endpoint():
     """SSE endpoint for MCP communication."""
@@ -325,7 +332,8 @@ async def execute_tool(
             raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
         
         tool_func = mcp._tools[tool_name].func
-        result = await tool_func(**payload.arguments)
+        with track_tool_call(tool_name, nifi_server_id):
+            result = await tool_func(**payload.arguments)
         
         return result
         
@@ -335,10 +343,6 @@ async def execute_tool(
     except Exception as e:
         logger.error(f"Unexpected error in tool execution: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Clean up context
-        if nifi_client:
-            await nifi_client.close()
 
 # === Main Entry Point === #
 
@@ -0,0 +1,198 @@
+"""
+Precomputed catalog of the MCP tool definitions served by `GET /tools`.
+
+Formatting a definition parses the tool's docstring, extracts its example section and
+cleans up its parameter schema. Tools are registered at import time and do not change
+while the server runs, yet every request used to redo all of that. The catalog formats
+every tool once, keeps each phase's list serialized, and stamps it with an ETag derived
+from a hash of the whole catalog:
+
+- clients send the ETag back in `If-None-Match` and get a bodyless 304 while it holds,
+- every API response carries the catalog version in `X-Tool-Catalog-Version`, so clients
+  know when a cached list is stale without asking for it again.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from textwrap import dedent
+from typing import Any, Dict, List, Optional
+
+from docstring_parser import parse
+from loguru import logger
+
+TOOL_CATALOG_VERSION_HEADER = "X-Tool-Catalog-Version"
+
+_EXAMPLE_MARKERS = ["Example:\n", "Examples:\n"]  # Check for both singular and plural
+_NEXT_SECTION_MARKERS = ["Args:\n", "Returns:\n", "Raises:\n", "Attributes:\n", "Yields:\n"]
+
+
+def _example_section(raw_docstring: str) -> str:
+    """The docstring's Example(s) block, dedented and formatted as markdown, or ''."""
+    normalized_docstring = "\n" + raw_docstring  # Ensure leading newline for marker check at start
+    for marker in _EXAMPLE_MARKERS:
+        marker_start_index = normalized_docstring.find(marker)
+        if marker_start_index != -1:
+            break
+    else:
+        return ""
+
+    # Start content search *after* the marker, and end it at the next common section marker
+    potential_example_content = normalized_docstring[marker_start_index + len(marker):]
+    end_index = len(potential_example_content)
+    for next_marker in _NEXT_SECTION_MARKERS:
+        found_index = potential_example_content.find(next_marker)
+        if found_index != -1:
+            end_index = min(end_index, found_index)
+
+    example_content = dedent(potential_example_content[:end_index]).strip()
+    if not example_content:
+        return ""
+    return f"\n\n**{marker.strip()}**\n{example_content}\n\n"
+
+
+def format_tool_definition(tool_info: Any, phases: List[str]) -> Dict[str, Any]:
+    """Formats one registered MCP tool as an OpenAI-style function definition tagged with its phases."""
+    tool_name = getattr(tool_info, 'name', 'unknown')
+    raw_docstring = getattr(tool_info, 'description', '') or ''
+    parsed_docstring = parse(raw_docstring)
+
+    returns_description = ""
+    if parsed_docstring.returns and parsed_docstring.returns.description:
+        returns_description = f"\n\n**Returns:**\n{parsed_docstring.returns.description}"
+
+    base_description_parts = []
+    if parsed_docstring.short_description:
+        base_description_parts.append(parsed_docstring.short_description)
+    if parsed_docstring.long_description:
+        base_description_parts.append("\n\n" + parsed_docstring.long_description)  # Add separation
+    if base_description_parts:
+        base_description = "".join(base_description_parts)
+    else:
+        base_description = raw_docstring.split('\n\n')[0]  # Original fallback
+
+    tool_description = f"{base_description}{_example_section(raw_docstring)}{returns_description}"
+
+    param_descriptions = {p.arg_name: p.description for p in parsed_docstring.params}
+    raw_params_schema = getattr(tool_info, 'parameters', {}) or {}
+    parameters_schema: Dict[str, Any] = {"type": "object", "properties": {}}
+    raw_properties = raw_params_schema.get('properties', {})
+    cleaned_properties = {}
+    if isinstance(raw_properties, dict):
+        for prop_name, prop_schema in raw_properties.items():
+            if isinstance(prop_schema, dict):
+                cleaned_schema = prop_schema.copy()
+                cleaned_schema.pop('anyOf', None)
+                cleaned_schema.pop('title', None)
+                cleaned_schema.pop('default', None)
+                cleaned_schema['description'] = param_descriptions.get(prop_name, '')
+                cleaned_properties[prop_name] = cleaned_schema
+            else:
+                logger.warning(f"Property '{prop_name}' in tool '{tool_name}' has non-dict schema: {prop_schema}. Skipping property.")
+    if cleaned_properties:
+        parameters_schema["properties"] = cleaned_properties
+    else:
+        del parameters_schema["properties"]
+    if 'required' in raw_params_schema:
+        parameters_schema["required"] = list(raw_params_schema['required'])
+    for prop_data in parameters_schema.get('properties', {}).values():
+        if 'enum' in prop_data:
+            prop_data['enum'] = [str(val) for val in prop_data['enum']]
+
+    return {
+        "type": "function",
+        "function": {
+            "name": tool_name,
+            "description": tool_description,
+            "parameters": parameters_schema
+        },
+        "phases": phases  # Include phases in the response
+    }
+
+
+def _phase_key(phase: Optional[str]) -> str:
+    return phase.lower() if phase and phase.lower() != "all" else "all"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers `etag` (weak comparison, as for GET)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+@dataclass(frozen=True)
+class PhaseTools:
+    """One phase's tool list, serialized once, with the ETag it is served under."""
+    tools: List[Dict[str, Any]]
+    body: bytes
+    etag: str
+
+
+class ToolCatalog:
+    """Formatted tool definitions, filtered and serialized per phase ahead of time."""
+
+    def __init__(self, tools: List[Dict[str, Any]]):
+        self.tools = tools
+        canonical = json.dumps(tools, sort_keys=True, separators=(",", ":"))
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        phases = {"all"} | {phase.lower() for tool in tools for phase in tool["phases"]}
+        self._by_phase: Dict[str, PhaseTools] = {phase: self._build_phase(phase) for phase in phases}
+
+    def _build_phase(self, phase_key: str) -> PhaseTools:
+        # Tools without phase tags are only listed under "All"
+        tools = [
+            tool for tool in self.tools
+            if phase_key == "all" or phase_key in (p.lower() for p in tool["phases"])
+        ]
+        return PhaseTools(
+            tools=tools,
+            body=json.dumps(tools).encode("utf-8"),
+            etag=f'"{self.version}-{phase_key}"'
+        )
+
+    def for_phase(self, phase: Optional[str]) -> PhaseTools:
+        """The tools of `phase` (None or "All" for every tool). Phases no tool is tagged with are empty."""
+        phase_key = _phase_key(phase)
+        phase_tools = self._by_phase.get(phase_key)
+        if phase_tools is None:
+            # Not cached: arbitrary query values must not grow the catalog
+            phase_tools = self._build_phase(phase_key)
+        return phase_tools
+
+
+def build_tool_catalog(tool_manager: Any, phase_registry: Dict[str, List[str]]) -> ToolCatalog:
+    """Formats every tool registered with `tool_manager` (FastMCP's `_tool_manager`)."""
+    if tool_manager is None:
+        logger.warning("Could not find ToolManager (_tool_manager) on MCP instance.")
+        return ToolCatalog([])
+
+    tools = []
+    for tool_info in tool_manager.list_tools():
+        tool_name = getattr(tool_info, 'name', 'unknown')
+        phases = phase_registry.get(tool_name, [])
+        if not phases:
+            logger.warning(f"Could not find phase tags in registry for tool '{tool_name}'. It is only listed under phase 'All'.")
+        tools.append(format_tool_definition(tool_info, phases))
+    catalog = ToolCatalog(tools)
+    logger.info(f"Built tool catalog version {catalog.version} with {len(tools)} tool definitions.")
+    return catalog
+
+
+_catalog: Optional[ToolCatalog] = None
+
+
+def get_tool_catalog() -> ToolCatalog:
+    """The process-wide catalog, built on first use from the tools registered on the MCP instance."""
+    global _catalog
+    if _catalog is None:
+        from nifi_mcp_server.core import mcp
+        from nifi_mcp_server.api_tools.utils import _tool_phase_registry
+        _catalog = build_tool_catalog(getattr(mcp, '_tool_manager', None), _tool_phase_registry)
+    return _catalog
+
+
+def current_tool_catalog_version() -> Optional[str]:
+    """The catalog version, or None while it has not been built."""
+    return _catalog.version if _catalog is not None else None
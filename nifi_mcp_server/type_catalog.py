@@ -0,0 +1,256 @@
+"""
+Per-server catalog of NiFi processor and controller service types.
+
+`/flow/processor-types` and `/flow/controller-service-types` return thousands of entries
+that only change when NARs are installed, yet lookups, validators and suggestion helpers
+used to re-fetch and linearly scan them on every call. The catalog fetches each list once
+per server for the lifetime of the process (refreshable on demand) and precomputes:
+
+- an exact index on the fully qualified type name (O(1) validation),
+- lowercase simple-name, tag and bundle-artifact indexes,
+- a trigram index over title, type, description and tags used to narrow substring
+  searches and to rank suggestions for misspelled names.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional, Set, Tuple
+
+from loguru import logger
+
+from nifi_mcp_server.nifi_client import NiFiClient
+
+TypeKind = Literal["processor", "controller_service"]
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _query_trigrams(text: str) -> Set[str]:
+    """Trigrams that must occur in any string containing `text` (no padding)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass
+class TypeEntry:
+    """One NiFi type with its lowercase search fields precomputed."""
+    raw: Dict
+    type: str
+    simple_name: str
+    title_lower: str
+    type_lower: str
+    description_lower: str
+    tags_lower: List[str]
+    artifact_lower: str
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> "TypeEntry":
+        type_name = raw.get("type", "") or ""
+        return cls(
+            raw=raw,
+            type=type_name,
+            simple_name=type_name.rsplit(".", 1)[-1],
+            title_lower=(raw.get("title", "") or "").lower(),
+            type_lower=type_name.lower(),
+            description_lower=(raw.get("description", "") or "").lower(),
+            tags_lower=[tag.lower() for tag in raw.get("tags", []) or []],
+            artifact_lower=(raw.get("bundle", {}).get("artifact", "") or "").lower(),
+        )
+
+    def matches(self, query_lower: str) -> bool:
+        """Case-insensitive substring match on title, type, description or any tag."""
+        return (
+            query_lower in self.title_lower
+            or query_lower in self.type_lower
+            or query_lower in self.description_lower
+            or any(query_lower in tag for tag in self.tags_lower)
+        )
+
+
+@dataclass
+class TypeCatalog:
+    """Indexed, immutable view of one server's type list."""
+    kind: TypeKind
+    entries: List[TypeEntry]
+    fetched_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self._by_type: Dict[str, int] = {}
+        self._by_type_lower: Dict[str, List[int]] = {}
+        self._by_simple_name: Dict[str, List[int]] = {}
+        self._by_tag: Dict[str, List[int]] = {}
+        self._by_artifact: Dict[str, List[int]] = {}
+        self._trigram_index: Dict[str, Set[int]] = {}
+        self._name_trigrams: List[Set[str]] = []
+
+        for idx, entry in enumerate(self.entries):
+            self._by_type.setdefault(entry.type, idx)
+            self._by_type_lower.setdefault(entry.type_lower, []).append(idx)
+            self._by_simple_name.setdefault(entry.simple_name.lower(), []).append(idx)
+            self._by_artifact.setdefault(entry.artifact_lower, []).append(idx)
+            for tag in entry.tags_lower:
+                self._by_tag.setdefault(tag, []).append(idx)
+
+            searchable = [entry.title_lower, entry.type_lower, entry.description_lower] + entry.tags_lower
+            for text in searchable:
+                for gram in _query_trigrams(text):
+                    self._trigram_index.setdefault(gram, set()).add(idx)
+            self._name_trigrams.append(_trigrams(entry.simple_name.lower()) | _trigrams(entry.title_lower))
+
+    @classmethod
+    def from_types(cls, kind: TypeKind, types: List[Dict]) -> "TypeCatalog":
+        return cls(kind=kind, entries=[TypeEntry.from_raw(raw) for raw in types or []])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def raw_types(self) -> List[Dict]:
+        return [entry.raw for entry in self.entries]
+
+    def has_type(self, type_name: str) -> bool:
+        """True if `type_name` is an exact, fully qualified type known to the server."""
+        return type_name in self._by_type
+
+    def get(self, type_name: str) -> Optional[Dict]:
+        idx = self._by_type.get(type_name)
+        return self.entries[idx].raw if idx is not None else None
+
+    def by_simple_name(self, name: str) -> List[Dict]:
+        """Types whose class name (last segment) equals `name`, case-insensitively."""
+        return [self.entries[idx].raw for idx in self._by_simple_name.get(name.lower(), [])]
+
+    def by_tag(self, tag: str) -> List[Dict]:
+        return [self.entries[idx].raw for idx in self._by_tag.get(tag.lower(), [])]
+
+    def by_artifact(self, artifact: str) -> List[Dict]:
+        return [self.entries[idx].raw for idx in self._by_artifact.get(artifact.lower(), [])]
+
+    def _candidates(self, query_lower: str) -> List[int]:
+        if len(query_lower) < 3:
+            return list(range(len(self.entries)))
+        postings = [self._trigram_index.get(gram) for gram in _query_trigrams(query_lower)]
+        if any(p is None for p in postings):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def search(self, query: str, bundle_artifact: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Returns raw types whose title, type, description or tags contain `query`
+        (case-insensitive), in server order, optionally restricted to one bundle artifact.
+        """
+        query_lower = query.lower()
+        artifact_lower = bundle_artifact.lower() if bundle_artifact else None
+        results = []
+        for idx in self._candidates(query_lower):
+            entry = self.entries[idx]
+            if artifact_lower and entry.artifact_lower != artifact_lower:
+                continue
+            if entry.matches(query_lower):
+                results.append(entry.raw)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def suggest(self, name: str, limit: int = 5) -> List[Dict]:
+        """
+        Suggests types for a possibly misspelled name: substring matches first, then the
+        closest names by trigram similarity.
+        """
+        suggestions = self.search(name, limit=limit)
+        if len(suggestions) >= limit:
+            return suggestions
+
+        seen = {id(raw) for raw in suggestions}
+        query_grams = _trigrams(name.lower())
+        scores: Dict[int, int] = {}
+        for gram in query_grams:
+            for idx in self._trigram_index.get(gram, ()):
+                scores[idx] = scores.get(idx, 0) + 1
+
+        ranked: List[Tuple[float, int]] = []
+        for idx in scores:
+            if id(self.entries[idx].raw) in seen:
+                continue
+            name_grams = self._name_trigrams[idx]
+            overlap = len(query_grams & name_grams)
+            if overlap:
+                ranked.append((overlap / len(query_grams | name_grams), idx))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        suggestions.extend(self.entries[idx].raw for _, idx in ranked[:limit - len(suggestions)])
+        return suggestions
+
+
+class TypeCatalogRegistry:
+    """Caches one TypeCatalog per (server, kind) for the lifetime of the process."""
+
+    def __init__(self):
+        self._catalogs: Dict[Tuple[str, str], TypeCatalog] = {}
+        self._locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+
+    def _lock_for(self, key: Tuple[str, str]) -> asyncio.Lock:
+        # asyncio locks belong to one event loop, so keep one per (key, loop)
+        lock_key = key + (id(asyncio.get_running_loop()),)
+        lock = self._locks.get(lock_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[lock_key] = lock
+        return lock
+
+    async def get(
+        self,
+        nifi_client: NiFiClient,
+        kind: TypeKind,
+        refresh: bool = False,
+        user_request_id: str = "-",
+        action_id: str = "-"
+    ) -> TypeCatalog:
+        """Returns the catalog for the client's server, fetching it on first use or when `refresh` is set."""
+        key = (nifi_client.cache_key, kind)
+        catalog = self._catalogs.get(key)
+        if catalog is not None and not refresh:
+            return catalog
+
+        async with self._lock_for(key):
+            catalog = self._catalogs.get(key)
+            if catalog is not None and not refresh:
+                return catalog
+            if kind == "processor":
+                types = await nifi_client.get_processor_types()
+            else:
+                types = await nifi_client.get_controller_service_types(user_request_id=user_request_id, action_id=action_id)
+            catalog = TypeCatalog.from_types(kind, types)
+            self._catalogs[key] = catalog
+            logger.info(f"Loaded {len(catalog)} {kind} types for NiFi server {nifi_client.cache_key}")
+            return catalog
+
+    async def get_processor_catalog(self, nifi_client: NiFiClient, refresh: bool = False) -> TypeCatalog:
+        return await self.get(nifi_client, "processor", refresh=refresh)
+
+    async def get_controller_service_catalog(
+        self,
+        nifi_client: NiFiClient,
+        refresh: bool = False,
+        user_request_id: str = "-",
+        action_id: str = "-"
+    ) -> TypeCatalog:
+        return await self.get(nifi_client, "controller_service", refresh=refresh, user_request_id=user_request_id, action_id=action_id)
+
+    def invalidate(self, server_key: Optional[str] = None):
+        """Forgets cached catalogs for one server, or for all servers."""
+        for key in list(self._catalogs):
+            if server_key is None or key[0] == server_key:
+                del self._catalogs[key]
+
+
+# Shared catalog registry for the whole process
+type_catalog_registry = TypeCatalogRegistry()
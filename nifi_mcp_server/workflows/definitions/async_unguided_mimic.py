@@ -58,6 +58,8 @@ class AsyncInitializeExecutionNode(AsyncNiFiWorkflowNode):
             "messages": shared.get("messages", []),
             "selected_nifi_server_id": shared.get("selected_nifi_server_id"),
             "max_loop_iterations": shared.get("max_loop_iterations", 10),
+            "max_tokens_limit": shared.get("max_tokens_limit", 8000),
+            "auto_prune_history": shared.get("auto_prune_history", False),
             "workflow_id": "async_unguided_mimic",
             "step_id": "async_initialize_execution"
         }
@@ -92,6 +94,8 @@ class AsyncInitializeExecutionNode(AsyncNiFiWorkflowNode):
                 "messages": initial_messages.copy() if initial_messages else [],
                 "loop_count": 0,
                 "max_iterations": prep_res.get("max_loop_iterations", 10),
+                "max_tokens_limit": prep_res.get("max_tokens_limit", 8000),
+                "auto_prune_history": prep_res.get("auto_prune_history", False),
                 "tool_results": [],
                 "request_tokens_in": 0,
                 "request_tokens_out": 0,
@@ -158,7 +162,7 @@ class AsyncInitializeExecutionNode(AsyncNiFiWorkflowNode):
         self.bound_logger.info("Starting async LLM execution loop")
         
         # Prepare tools once
-        formatted_tools = self.prepare_tools(execution_state)
+        formatted_tools = await self.prepare_tools_async(execution_state)
         
         while not task_complete and not max_iterations_reached:
             execution_state["loop_count"] += 1
@@ -8,6 +8,7 @@ functionality with real-time event emission.
 import sys
 import os
 import uuid
+import json
 import asyncio
 import importlib.util
 from typing import Dict, Any, List, Optional
@@ -26,6 +27,7 @@ spec.loader.exec_module(pocketflow_init)
 AsyncNode = pocketflow_init.AsyncNode
 
 from loguru import logger
+from nifi_mcp_server.metrics import track_workflow_step
 from ..core.event_system import (
     get_event_emitter, 
     emit_llm_start, emit_llm_complete, 
@@ -35,7 +37,9 @@ from ..core.event_system import (
 )
 from nifi_chat_ui.llm.chat_manager import ChatManager
 from nifi_chat_ui.llm.mcp.client import MCPClient
-from nifi_chat_ui.mcp_handler import get_available_tools, execute_mcp_tool
+from nifi_chat_ui.mcp_handler import get_available_tools, get_available_tools_async, execute_mcp_tool_async
+from nifi_chat_ui.tool_scheduler import read_only_tool_names, run_tool_calls_async
+from nifi_chat_ui.message_pruner import prune_messages
 
 
 class AsyncNiFiWorkflowNode(AsyncNode):
@@ -56,6 +60,9 @@ class AsyncNiFiWorkflowNode(AsyncNode):
         # Initialize ChatManager for new modular architecture
         self._chat_manager = None
         self._mcp_client = None
+        
+        # Optional callback (plain or async) receiving the LLM response text as it streams in
+        self.on_llm_token = None
     
     def get_chat_manager(self) -> ChatManager:
         """Get or create the ChatManager instance."""
@@ -101,6 +108,11 @@ class AsyncNiFiWorkflowNode(AsyncNode):
             self._mcp_client = MCPClient()
         return self._mcp_client
     
+    async def _run_async(self, shared: Dict[str, Any]) -> str:
+        """Runs PocketFlow's prep/exec/post cycle for this step and records its latency."""
+        with track_workflow_step(shared.get("workflow_name", "unknown"), self.name):
+            return await super()._run_async(shared)
+    
     async def prep_async(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare the node execution context."""
         # Default prep - subclasses should override
@@ -122,6 +134,8 @@ class AsyncNiFiWorkflowNode(AsyncNode):
         workflow_id = execution_state.get("workflow_id", "unknown")
         step_id = execution_state.get("step_id", self.name)
         user_request_id = execution_state.get("user_request_id")
+        # Kept for execute_tool_calls_async, which classifies the calls of this turn
+        execution_state["tools"] = tools
         
         # Emit LLM start event
         await emit_llm_start(workflow_id, step_id, {
@@ -133,30 +147,27 @@ class AsyncNiFiWorkflowNode(AsyncNode):
         }, user_request_id)
         
         try:
-            # Call LLM (this is still synchronous, but we're in an async context)
+            # Call LLM
             provider = execution_state.get("provider", "openai")
             model_name = execution_state.get("model_name", "gpt-4o-mini")
             system_prompt = execution_state.get("system_prompt", "You are a helpful assistant.")
             
             # Extract non-system messages
             non_system_messages = [msg for msg in messages if msg.get("role") != "system"]
+            if execution_state.get("auto_prune_history"):
+                non_system_messages = self.prune_llm_context(non_system_messages, system_prompt, tools, execution_state)
             
-            # Define the sync function to call in executor
-            def call_sync_llm():
-                chat_manager = self.get_chat_manager()
-                return chat_manager.get_llm_response(
-                    messages=non_system_messages,
-                    system_prompt=system_prompt,
-                    provider=provider,
-                    model_name=model_name,
-                    user_request_id=user_request_id,
-                    action_id=action_id,
-                    tools=tools
-                )
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response_data = await loop.run_in_executor(None, call_sync_llm)
+            # Awaited on the provider's async client: no executor thread is held while the model responds
+            response_data = await self.get_chat_manager().get_llm_response_async(
+                messages=non_system_messages,
+                system_prompt=system_prompt,
+                provider=provider,
+                model_name=model_name,
+                user_request_id=user_request_id,
+                action_id=action_id,
+                tools=tools,
+                on_token=self.on_llm_token
+            )
             
             # Validate response data
             if response_data is None:
@@ -202,6 +213,20 @@ class AsyncNiFiWorkflowNode(AsyncNode):
             self.bound_logger.error(f"Async LLM call failed: {e}", exc_info=True)
             return {"error": str(e)}
     
+    def prune_llm_context(self, messages: List[Dict[str, Any]], system_prompt: str,
+                          tools: Optional[List[Dict[str, Any]]], execution_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Drops the oldest complete turns so the request fits the UI's `max_tokens_limit`."""
+        pruned = prune_messages(
+            [{"role": "system", "content": system_prompt}] + messages,
+            int(execution_state.get("max_tokens_limit") or 8000),
+            execution_state.get("provider", "openai"),
+            execution_state.get("model_name", "gpt-4o-mini"),
+            tools,
+            self.get_chat_manager().token_counter,
+            self.bound_logger
+        )
+        return pruned[1:]
+    
     async def execute_tool_calls_async(self, tool_calls: List[Dict[str, Any]], 
                                      execution_state: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute tool calls asynchronously with event emission."""
@@ -210,20 +235,23 @@ class AsyncNiFiWorkflowNode(AsyncNode):
         user_request_id = execution_state.get("user_request_id")
         nifi_server_id = execution_state.get("nifi_server_id")
         
-        tool_results = []
+        # Read-only tools (Review phase) run concurrently; tools that change the flow run alone.
+        # The tool list is the one the LLM was called with; it is only fetched when missing.
+        tools = execution_state.get("tools")
+        if tools is None:
+            tools = await self.prepare_tools_async(execution_state)
+        read_only = read_only_tool_names(tools)
         
-        for i, tool_call in enumerate(tool_calls):
+        async def execute_one(i: int, tool_call: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            tool_call_id = tool_call.get("id", str(uuid.uuid4()))
+            function_name = tool_call.get("function", {}).get("name")
             try:
-                tool_call_id = tool_call.get("id", str(uuid.uuid4()))
-                function_name = tool_call.get("function", {}).get("name")
-                function_args = tool_call.get("function", {}).get("arguments", "{}")
-                
                 if not function_name:
-                    continue
+                    return None
                 
                 # Parse arguments
+                function_args = tool_call.get("function", {}).get("arguments", "{}")
                 try:
-                    import json
                     args_dict = json.loads(function_args) if function_args != "{}" else {}
                 except json.JSONDecodeError:
                     args_dict = {}
@@ -237,27 +265,13 @@ class AsyncNiFiWorkflowNode(AsyncNode):
                     "arguments": args_dict
                 }, user_request_id)
                 
-                # Define the sync function to call in executor
-                def call_sync_tool():
-                    return execute_mcp_tool(
-                        tool_name=function_name,
-                        params=args_dict,
-                        selected_nifi_server_id=nifi_server_id,
-                        user_request_id=user_request_id
-                    )
-                
-                # Execute tool in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
-                tool_result = await loop.run_in_executor(None, call_sync_tool)
-                
-                # Create tool result message
-                result_message = {
-                    "role": "tool",
-                    "tool_call_id": tool_call_id,
-                    "name": function_name,
-                    "content": str(tool_result)
-                }
-                tool_results.append(result_message)
+                # Pooled async call: no thread hop, connections reused across tool calls
+                tool_result = await execute_mcp_tool_async(
+                    tool_name=function_name,
+                    params=args_dict,
+                    selected_nifi_server_id=nifi_server_id,
+                    user_request_id=user_request_id
+                )
                 
                 # Emit tool complete event
                 await emit_tool_complete(workflow_id, step_id, {
@@ -269,6 +283,14 @@ class AsyncNiFiWorkflowNode(AsyncNode):
                     "status": "success"
                 }, user_request_id)
                 
+                # Create tool result message
+                return {
+                    "role": "tool",
+                    "tool_call_id": tool_call_id,
+                    "name": function_name,
+                    "content": str(tool_result)
+                }
+                
             except Exception as e:
                 # Emit tool error event
                 await self.event_emitter.emit(EventTypes.TOOL_ERROR, {
@@ -281,15 +303,16 @@ class AsyncNiFiWorkflowNode(AsyncNode):
                 self.bound_logger.error(f"Tool execution failed: {function_name} - {e}")
                 
                 # Add error result
-                error_result = {
+                return {
                     "role": "tool",
                     "tool_call_id": tool_call_id,
                     "name": function_name,
                     "content": f"Error: {str(e)}"
                 }
-                tool_results.append(error_result)
         
-        return tool_results
+        # Results come back in the order the LLM requested the calls
+        tool_results = await run_tool_calls_async(tool_calls, execute_one, read_only)
+        return [result for result in tool_results if result is not None]
     
     async def add_message_to_context_async(self, message: Dict[str, Any], 
                                          execution_state: Dict[str, Any]):
@@ -312,6 +335,25 @@ class AsyncNiFiWorkflowNode(AsyncNode):
             "action_id": message.get("action_id")
         }, user_request_id)
     
+    async def prepare_tools_async(self, execution_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Prepare tools for LLM execution without blocking the event loop; kept in execution_state["tools"]."""
+        tools: List[Dict[str, Any]] = []
+        try:
+            nifi_server_id = execution_state.get("nifi_server_id")
+            if not nifi_server_id:
+                self.bound_logger.warning("No NiFi server ID provided, skipping tools")
+            else:
+                # Raw tools - ChatManager will handle formatting
+                tools = await get_available_tools_async(
+                    phase="All",  # Use "All" for unguided mode
+                    selected_nifi_server_id=nifi_server_id
+                ) or []
+                self.bound_logger.info(f"Prepared {len(tools)} raw tools (ChatManager will format them)")
+        except Exception as e:
+            self.bound_logger.error(f"Error preparing tools: {e}")
+        execution_state["tools"] = tools
+        return tools
+    
     def prepare_tools(self, execution_state: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
         """Prepare tools for LLM execution (sync method for compatibility)."""
         try:
@@ -12,6 +12,7 @@ from pocketflow import Node
 
 # Import existing patterns from the NiFi MCP codebase
 from config.logging_setup import request_context
+from nifi_mcp_server.metrics import track_workflow_step
 from ..core.context_manager import ContextManager
 from ..core.progress_tracker import ProgressTracker
 
@@ -90,6 +91,11 @@ class WorkflowNode(Node, ABC):
             )
         self._action_count += 1
         
+    def _run(self, shared: Dict[str, Any]) -> str:
+        """Runs PocketFlow's prep/exec/post cycle for this step and records its latency."""
+        with track_workflow_step(shared.get("workflow_name", "unknown"), self.name):
+            return super()._run(shared)
+
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """
         PocketFlow prep hook - prepare context for node execution.
@@ -0,0 +1,318 @@
+"""
+Tool-latency benchmarks against the NiFi simulator.
+
+Each benchmark calls one MCP tool through `mcp.call_tool`, exactly as the server does,
+with a NiFiClient wired to a freshly generated simulated canvas. For every tool and
+canvas size it records:
+
+- wall_seconds: median wall time over the timed repeats
+- nifi_requests: NiFi API requests the tool made
+- bytes_transferred: request plus response body bytes
+- peak_memory_bytes: peak traced Python allocations during the call, from a separate
+  tracemalloc run (it includes the simulator's response encoding, which scales the same way)
+
+Results are compared against tests/benchmarks/baseline.json, which stores the reference
+numbers and the allowed relative growth per metric. Run before deploying:
+
+    python -m tests.benchmarks.run_benchmarks                     # compare, exit 1 on regression
+    python -m tests.benchmarks.run_benchmarks --canvas large      # include the 10k-component canvas
+    python -m tests.benchmarks.run_benchmarks --update-baseline   # accept the current numbers
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from nifi_mcp_server.api_tools import creation, helpers, modification, operation, review  # noqa: F401 (registers the tools)
+from nifi_mcp_server.component_cache import component_cache
+from nifi_mcp_server.core import mcp
+from nifi_mcp_server.nifi_client import NiFiClient
+from nifi_mcp_server.request_context import current_nifi_client, current_request_logger
+from nifi_mcp_server.type_catalog import type_catalog_registry
+from tests.utils.nifi_simulator import SIMULATOR_BASE_URL, CanvasSpec, NiFiSimulator
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+CANVASES: Dict[str, CanvasSpec] = {
+    "small": CanvasSpec(depth=1, groups_per_group=2, processors_per_group=10),
+    "medium": CanvasSpec.sized(1_000, depth=2, groups_per_group=3),
+    "large": CanvasSpec.sized(10_000, depth=3, groups_per_group=4),
+}
+DEFAULT_CANVASES = ["small", "medium"]
+
+# Allowed relative growth over the baseline before a metric counts as a regression
+DEFAULT_THRESHOLDS = {
+    "wall_seconds": 0.5,
+    "nifi_requests": 0.05,
+    "bytes_transferred": 0.1,
+    "peak_memory_bytes": 0.25,
+}
+# Differences below these absolute amounts are noise, whatever the relative change
+NOISE_FLOORS = {
+    "wall_seconds": 0.01,
+    "nifi_requests": 1,
+    "bytes_transferred": 1024,
+    "peak_memory_bytes": 256 * 1024,
+}
+
+
+def _chain_flow(processor_count: int) -> List[Dict[str, Any]]:
+    """A create_complete_nifi_flow definition: one service and a chain of processors."""
+    objects: List[Dict[str, Any]] = [{
+        "type": "controller_service",
+        "service_type": "org.apache.nifi.json.JsonTreeReader",
+        "name": "BenchReader",
+        "properties": {},
+    }]
+    for index in range(processor_count):
+        objects.append({
+            "type": "processor",
+            "processor_type": "org.apache.nifi.processors.standard.UpdateAttribute",
+            "name": f"Bench{index}",
+            "position": {"x": 0, "y": index * 200},
+            "properties": {},
+        })
+    for index in range(processor_count - 1):
+        objects.append({"type": "connection", "source": f"Bench{index}", "target": f"Bench{index + 1}", "relationships": ["success"]})
+    return objects
+
+
+# Tool name -> builds the tool arguments for a simulator
+TOOL_CASES: Dict[str, Callable[[NiFiSimulator], Dict[str, Any]]] = {
+    "list_nifi_objects": lambda sim: {"object_type": "processors", "search_scope": "recursive"},
+    "document_nifi_flow": lambda sim: {},
+    "get_process_group_status": lambda sim: {},
+    "search_nifi_flow": lambda sim: {"query": "Group 1.0"},
+    "create_complete_nifi_flow": lambda sim: {"process_group_id": sim.root_id, "nifi_objects": _chain_flow(20)},
+}
+
+
+@dataclass
+class BenchmarkResult:
+    tool: str
+    canvas: str
+    components: int
+    wall_seconds: float
+    nifi_requests: int
+    bytes_transferred: int
+    peak_memory_bytes: int
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.tool}[{self.canvas}]"
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+    threshold: float
+
+    def __str__(self) -> str:
+        growth = (self.current / self.baseline - 1) if self.baseline else float("inf")
+        return (f"{self.key} {self.metric}: {self.current:g} vs baseline {self.baseline:g} "
+                f"(+{growth:.0%}, allowed +{self.threshold:.0%})")
+
+
+@dataclass
+class _Measurement:
+    wall_seconds: float
+    requests: int
+    bytes_transferred: int
+    peak_memory_bytes: int = 0
+    error: Optional[str] = None
+
+
+async def _run_once(tool: str, spec: CanvasSpec, latency_seconds: float, trace_memory: bool) -> _Measurement:
+    simulator = NiFiSimulator(spec, latency_seconds=latency_seconds)
+    client = NiFiClient(SIMULATOR_BASE_URL, "admin", "password", transport=simulator.transport())
+    # Every run starts cold: the caches are keyed by base URL, which all simulators share
+    component_cache.clear()
+    type_catalog_registry.invalidate()
+    await client.authenticate()
+    arguments = TOOL_CASES[tool](simulator)
+    simulator.reset_stats()
+
+    client_token = current_nifi_client.set(client)
+    logger_token = current_request_logger.set(logger)
+    error = None
+    peak = 0
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            await mcp.call_tool(tool, arguments)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        wall_seconds = time.perf_counter() - started
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        current_nifi_client.reset(client_token)
+        current_request_logger.reset(logger_token)
+        await client.close()
+
+    return _Measurement(
+        wall_seconds=wall_seconds,
+        requests=simulator.stats.requests,
+        bytes_transferred=simulator.stats.bytes_sent + simulator.stats.bytes_received,
+        peak_memory_bytes=peak,
+        error=error,
+    )
+
+
+async def run_benchmark(tool: str, canvas: str, repeat: int = 3, latency_seconds: float = 0.001,
+                        spec: Optional[CanvasSpec] = None) -> BenchmarkResult:
+    """Benchmarks one tool on one canvas: `repeat` timed runs plus one memory-traced run."""
+    spec = spec or CANVASES[canvas]
+    timed = [await _run_once(tool, spec, latency_seconds, trace_memory=False) for _ in range(max(repeat, 1))]
+    traced = await _run_once(tool, spec, latency_seconds, trace_memory=True)
+    error = next((m.error for m in timed + [traced] if m.error), None)
+    return BenchmarkResult(
+        tool=tool,
+        canvas=canvas,
+        components=spec.component_count,
+        wall_seconds=round(statistics.median(m.wall_seconds for m in timed), 4),
+        nifi_requests=max(m.requests for m in timed),
+        bytes_transferred=max(m.bytes_transferred for m in timed),
+        peak_memory_bytes=traced.peak_memory_bytes,
+        error=error,
+    )
+
+
+async def run_benchmarks(tools: Optional[List[str]] = None, canvases: Optional[List[str]] = None,
+                         repeat: int = 3, latency_seconds: float = 0.001) -> List[BenchmarkResult]:
+    results = []
+    for canvas in canvases or DEFAULT_CANVASES:
+        for tool in tools or list(TOOL_CASES):
+            results.append(await run_benchmark(tool, canvas, repeat=repeat, latency_seconds=latency_seconds))
+    return results
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    if not path.exists():
+        return {"thresholds": dict(DEFAULT_THRESHOLDS), "results": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[BenchmarkResult], latency_seconds: float, repeat: int,
+                  path: Path = BASELINE_PATH, thresholds: Optional[Dict[str, float]] = None):
+    """Writes the results as the new baseline, keeping entries for canvases that were not run."""
+    baseline = load_baseline(path)
+    baseline["thresholds"] = thresholds or baseline.get("thresholds") or dict(DEFAULT_THRESHOLDS)
+    baseline["settings"] = {"latency_seconds": latency_seconds, "repeat": repeat}
+    stored = baseline.setdefault("results", {})
+    for result in results:
+        if result.error is None:
+            entry = asdict(result)
+            entry.pop("error")
+            stored[result.key] = entry
+    baseline["results"] = dict(sorted(stored.items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict[str, Any]) -> List[Regression]:
+    """Returns every metric that grew past its threshold. Results without a baseline entry are skipped."""
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    regressions = []
+    for result in results:
+        reference = baseline.get("results", {}).get(result.key)
+        if not reference:
+            continue
+        for metric, threshold in thresholds.items():
+            base_value = reference.get(metric)
+            current = getattr(result, metric)
+            if base_value is None:
+                continue
+            if current - base_value <= NOISE_FLOORS.get(metric, 0):
+                continue
+            if current > base_value * (1 + threshold):
+                regressions.append(Regression(result.key, metric, base_value, current, threshold))
+    return regressions
+
+
+def _format_table(results: List[BenchmarkResult], baseline: Dict[str, Any]) -> str:
+    header = f"{'benchmark':<42} {'components':>10} {'wall ms':>10} {'requests':>9} {'KiB':>10} {'peak KiB':>10}  vs baseline"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        reference = baseline.get("results", {}).get(result.key)
+        if result.error:
+            note = f"ERROR {result.error}"
+        elif reference:
+            note = f"wall {result.wall_seconds / reference['wall_seconds']:.2f}x" if reference.get("wall_seconds") else "-"
+            note += f", requests {result.nifi_requests - reference['nifi_requests']:+d}"
+        else:
+            note = "no baseline"
+        lines.append(
+            f"{result.key:<42} {result.components:>10} {result.wall_seconds * 1000:>10.1f} {result.nifi_requests:>9} "
+            f"{result.bytes_transferred / 1024:>10.1f} {result.peak_memory_bytes / 1024:>10.1f}  {note}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MCP tools against the NiFi simulator.")
+    parser.add_argument("--tool", action="append", choices=list(TOOL_CASES), help="Tool to benchmark (repeatable; default all)")
+    parser.add_argument("--canvas", action="append", choices=list(CANVASES), help=f"Canvas size (repeatable; default {DEFAULT_CANVASES})")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark; the median is reported")
+    parser.add_argument("--latency", type=float, default=0.001, help="Simulated NiFi latency per request, in seconds")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    # Tool logging would dominate the timings
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = asyncio.run(run_benchmarks(args.tool, args.canvas, repeat=args.repeat, latency_seconds=args.latency))
+    baseline = load_baseline(args.baseline)
+    print(_format_table(results, baseline))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+    errors = [result for result in results if result.error]
+    if args.update_baseline:
+        save_baseline(results, args.latency, args.repeat, path=args.baseline)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 1 if errors else 0
+
+    settings = baseline.get("settings", {})
+    if settings and settings.get("latency_seconds") != args.latency:
+        print(f"\nWarning: baseline was recorded with --latency {settings.get('latency_seconds')}")
+    regressions = compare_to_baseline(results, baseline)
+    if regressions:
+        print("\nPerformance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+    if errors:
+        print("\nFailed benchmarks:")
+        for result in errors:
+            print(f"  {result.key}: {result.error}")
+    return 1 if regressions or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
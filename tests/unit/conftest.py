@@ -41,4 +41,41 @@ def nifi_test_server_id():
 @pytest.fixture
 def anyio_backend():
     """Configure anyio to only use asyncio backend for unit tests."""
-    return 'asyncio' 
\ No newline at end of file
+    return 'asyncio'
+
+
+@pytest.fixture(autouse=True)
+def clear_component_cache():
+    """Keep the process-wide component cache from leaking entries between tests."""
+    from nifi_mcp_server.component_cache import component_cache
+    component_cache.clear()
+    yield
+    component_cache.clear()
+
+
+@pytest.fixture
+async def simulated_nifi():
+    """
+    Connects NiFiClients to NiFi simulators.
+
+    `await simulated_nifi(simulator, set_context=True, **client_kwargs)` returns an
+    authenticated client and, unless `set_context` is False, installs it as the tools'
+    current NiFi client. Contexts are reset and clients closed after the test.
+    """
+    from nifi_mcp_server.nifi_client import NiFiClient
+    from nifi_mcp_server.request_context import current_nifi_client
+    from tests.utils.nifi_simulator import SIMULATOR_BASE_URL
+
+    connected = []
+
+    async def connect(simulator, set_context=True, **client_kwargs):
+        client = NiFiClient(SIMULATOR_BASE_URL, "admin", "password", transport=simulator.transport(), **client_kwargs)
+        await client.authenticate()
+        connected.append((client, current_nifi_client.set(client) if set_context else None))
+        return client
+
+    yield connect
+    for client, token in reversed(connected):
+        if token is not None:
+            current_nifi_client.reset(token)
+        await client.close()
@@ -0,0 +1,92 @@
+"""
+Unit tests for the shared poller of NiFi drop, listing and provenance requests.
+"""
+
+import asyncio
+
+import pytest
+
+from nifi_mcp_server.async_request_poller import PollSchedule, run_async_request
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+FAST = PollSchedule(initial_interval=0.001, max_interval=0.01, backoff_factor=2.0)
+
+
+@pytest.fixture
+async def queued_connection(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=0, processors_per_group=2, queued_flowfiles=3), async_request_polls=3)
+    client = await simulated_nifi(simulator, set_context=False)
+    return simulator, client, simulator.component_ids("connections")[0]
+
+
+def test_delay_backs_off_and_follows_reported_progress():
+    schedule = PollSchedule(initial_interval=0.1, max_interval=2.0, backoff_factor=2.0)
+
+    assert schedule.next_delay(None, 0.0, None) == 0.1
+    assert schedule.next_delay(0.4, 1.0, 0) == 0.8
+    assert schedule.next_delay(1.6, 5.0, None) == 2.0
+    # 1s for the first 80% -> about 0.25s to go
+    assert schedule.next_delay(1.6, 1.0, 80) == pytest.approx(0.25)
+    assert schedule.next_delay(None, 0.001, 99) == 0.1
+
+
+@pytest.mark.anyio
+async def test_request_is_polled_to_completion_and_deleted(queued_connection):
+    simulator, client, connection_id = queued_connection
+
+    status = await run_async_request(
+        "listing request",
+        submit=lambda: client.create_flowfile_listing_request(connection_id),
+        get_status=lambda request_id: client.get_flowfile_listing_request(connection_id, request_id),
+        delete=lambda request_id: client.delete_flowfile_listing_request(connection_id, request_id),
+        timeout_seconds=5,
+        schedule=FAST,
+    )
+
+    assert status["finished"]
+    assert len(status["flowFileSummaries"]) == 3
+    assert simulator.stats.by_route["GET /flowfile-queues/{connection_id}/listing-requests/{request_id}"] == 3
+    assert simulator.open_async_requests == 0
+
+
+@pytest.mark.anyio
+async def test_request_is_deleted_on_timeout(queued_connection):
+    simulator, client, connection_id = queued_connection
+
+    with pytest.raises(TimeoutError, match="drop request"):
+        await run_async_request(
+            "drop request",
+            submit=lambda: client.create_drop_request(connection_id),
+            get_status=lambda request_id: client.get_drop_request(connection_id, request_id),
+            delete=lambda request_id: client.delete_drop_request(connection_id, request_id),
+            timeout_seconds=0,
+            schedule=FAST,
+        )
+
+    assert simulator.open_async_requests == 0
+
+
+@pytest.mark.anyio
+async def test_request_is_deleted_on_cancellation(queued_connection):
+    simulator, client, connection_id = queued_connection
+    polled = asyncio.Event()
+
+    async def get_status(request_id):
+        polled.set()
+        return await client.get_drop_request(connection_id, request_id)
+
+    task = asyncio.create_task(run_async_request(
+        "drop request",
+        submit=lambda: client.create_drop_request(connection_id),
+        get_status=get_status,
+        delete=lambda request_id: client.delete_drop_request(connection_id, request_id),
+        timeout_seconds=30,
+        schedule=PollSchedule(initial_interval=10, max_interval=10),
+    ))
+    await polled.wait()
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert simulator.open_async_requests == 0
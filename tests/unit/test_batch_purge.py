@@ -0,0 +1,57 @@
+"""
+Unit tests for purging several connections concurrently under one deadline.
+"""
+
+import time
+
+import pytest
+
+from nifi_mcp_server.api_tools.operation import format_drop_request_summary
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+
+@pytest.fixture
+async def simulated_group(simulated_nifi):
+    simulator = NiFiSimulator(
+        CanvasSpec(depth=0, processors_per_group=11, queued_flowfiles=4),
+        latency_seconds=0.02,
+        async_request_polls=2,
+    )
+    return simulator, await simulated_nifi(simulator, set_context=False)
+
+
+@pytest.mark.anyio
+async def test_group_purge_runs_drop_requests_concurrently(simulated_group):
+    simulator, client = simulated_group
+    connection_ids = simulator.component_ids("connections")
+    simulator.reset_stats()
+
+    started = time.perf_counter()
+    purge = await client.purge_process_group_flowfiles(simulator.root_id, timeout_seconds=10, max_concurrency=10)
+    elapsed = time.perf_counter() - started
+
+    assert purge["success"]
+    assert len(purge["results"]) == len(connection_ids) == 10
+    assert purge["total_dropped_count"] == 40
+    assert purge["total_dropped_bytes"] == 40 * 1024
+    assert all(r["dropped_flowfiles"] == 4 for r in purge["results"])
+    assert simulator.open_async_requests == 0
+    # About 5 requests per connection at 20ms each: one after another this would take over a second
+    assert elapsed < 0.6
+
+    summary = format_drop_request_summary(purge)
+    assert summary["total_dropped"] == 40
+    assert summary["total_dropped_bytes"] == 40 * 1024
+
+
+@pytest.mark.anyio
+async def test_connections_waiting_past_the_shared_deadline_fail(simulated_group):
+    simulator, client = simulated_group
+    connection_ids = simulator.component_ids("connections")[:3]
+
+    purge = await client.purge_connections_flowfiles(connection_ids, timeout_seconds=0, max_concurrency=1)
+
+    assert not purge["success"]
+    assert purge["message"] == "Purged 0 of 3 connections"
+    assert all("deadline" in r["error"] for r in purge["results"])
+    assert simulator.open_async_requests == 0
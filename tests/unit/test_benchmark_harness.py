@@ -0,0 +1,47 @@
+"""
+Unit tests for the tool benchmark harness and its baseline comparison.
+"""
+
+import pytest
+
+from tests.benchmarks.run_benchmarks import BenchmarkResult, compare_to_baseline, run_benchmark
+from tests.utils.nifi_simulator import CanvasSpec
+
+
+def _result(**overrides):
+    values = dict(tool="search_nifi_flow", canvas="small", components=66, wall_seconds=0.1,
+                  nifi_requests=10, bytes_transferred=100_000, peak_memory_bytes=1_000_000)
+    values.update(overrides)
+    return BenchmarkResult(**values)
+
+
+@pytest.mark.anyio
+async def test_benchmark_records_tool_metrics():
+    result = await run_benchmark(
+        "search_nifi_flow", "tiny", repeat=1, latency_seconds=0, spec=CanvasSpec(depth=0, processors_per_group=3)
+    )
+
+    assert result.error is None
+    assert result.key == "search_nifi_flow[tiny]"
+    assert result.nifi_requests == 1
+    assert result.bytes_transferred > 0
+    assert result.peak_memory_bytes > 0
+
+
+def test_growth_past_threshold_is_a_regression():
+    baseline = {
+        "thresholds": {"nifi_requests": 0.05, "wall_seconds": 0.5},
+        "results": {"search_nifi_flow[small]": {"nifi_requests": 10, "wall_seconds": 0.1}},
+    }
+
+    regressions = compare_to_baseline([_result(nifi_requests=20, wall_seconds=0.14)], baseline)
+
+    assert [(r.key, r.metric) for r in regressions] == [("search_nifi_flow[small]", "nifi_requests")]
+
+
+def test_noise_and_unknown_benchmarks_are_not_regressions():
+    baseline = {"results": {"search_nifi_flow[small]": {"wall_seconds": 0.001, "nifi_requests": 10}}}
+
+    # 3x slower, but only by 2ms
+    assert compare_to_baseline([_result(wall_seconds=0.003)], baseline) == []
+    assert compare_to_baseline([_result(canvas="large", nifi_requests=500)], baseline) == []
@@ -0,0 +1,199 @@
+"""
+Unit tests for create_complete_nifi_flow's dependency-wave execution.
+"""
+
+import asyncio
+
+import pytest
+
+from nifi_mcp_server.api_tools import creation
+from nifi_mcp_server.request_context import current_nifi_client
+
+
+class FakeBuild:
+    """Replaces the per-object creation tools and records call order and concurrency."""
+
+    def __init__(self, fail_processor=None, fail_enable=False):
+        self.events = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rolled_back = []
+        self.fail_processor = fail_processor
+        self.fail_enable = fail_enable
+
+    async def _call(self, label):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.events.append(label)
+
+    async def create_controller_services(self, services, process_group_id):
+        await self._call(("service", services[0]["name"]))
+        return [{"status": "success", "entity": {"id": f"id-{services[0]['name']}"}}]
+
+    async def create_nifi_processors(self, processors, process_group_id=None):
+        name = processors[0]["name"]
+        await self._call(("processor", name))
+        if name == self.fail_processor:
+            raise RuntimeError("NiFi rejected the processor")
+        return [{"status": "success", "entity": {"id": f"id-{name}"}, "properties": processors[0]["properties"]}]
+
+    async def create_connection(self, source_id, target_id, relationships):
+        await self._call(("connection", source_id, target_id))
+        return {"status": "success", "entity": {"id": f"conn-{source_id}-{target_id}"}}
+
+    async def operate(self, requests):
+        await self._call(("enable", len(requests)))
+        if self.fail_enable:
+            raise ConnectionError("NiFi is unreachable")
+        return [{"status": "success"} for _ in requests]
+
+    async def update_relationships(self, processor_id, auto_terminated_relationships):
+        await self._call(("terminate", processor_id))
+        return {"status": "success"}
+
+    async def analyze(self, nifi_objects, id_map, **kwargs):
+        return [
+            {"processor_id": proc_id, "processor_name": name, "relationships_to_terminate": ["failure"]}
+            for name, proc_id in id_map.items()
+        ]
+
+    async def rollback(self, created_objects, *args):
+        self.rolled_back = [obj["id"] for obj in created_objects]
+        return {"status": "success"}
+
+
+@pytest.fixture
+def fake_build(monkeypatch):
+    def install(**kwargs):
+        fake = FakeBuild(**kwargs)
+
+        async def no_existing(**kwargs):
+            return []
+
+        async def types_ok(*args):
+            return True, {}
+
+        async def schema_ok(processor_type, properties, **kwargs):
+            return properties, [], []
+
+        async def phase2b_ok(processor_type, properties, logger):
+            return properties, []
+
+        async def resolve(processor_type, properties, service_map, **kwargs):
+            resolved = {k: service_map.get(v[1:], v) if isinstance(v, str) and v.startswith("@") else v
+                        for k, v in properties.items()}
+            return resolved, [], []
+
+        async def flow_valid(*args):
+            return {"status": "valid"}
+
+        monkeypatch.setattr(creation, "list_nifi_objects", no_existing)
+        monkeypatch.setattr(creation, "_validate_and_suggest_types_upfront", types_ok)
+        monkeypatch.setattr(creation, "_validate_processor_properties_upfront", schema_ok)
+        monkeypatch.setattr(creation, "_validate_processor_properties_phase2b", phase2b_ok)
+        monkeypatch.setattr(creation, "_validate_and_fix_processor_properties", resolve)
+        monkeypatch.setattr(creation, "_validate_complete_flow", flow_valid)
+        monkeypatch.setattr(creation, "create_controller_services", fake.create_controller_services)
+        monkeypatch.setattr(creation, "create_nifi_processors", fake.create_nifi_processors)
+        monkeypatch.setattr(creation, "_create_nifi_connection_single", fake.create_connection)
+        monkeypatch.setattr(creation, "operate_nifi_objects", fake.operate)
+        monkeypatch.setattr(creation, "update_nifi_processor_relationships", fake.update_relationships)
+        monkeypatch.setattr(creation, "_analyze_and_auto_terminate_relationships", fake.analyze)
+        monkeypatch.setattr(creation, "_rollback_created_objects", fake.rollback)
+        monkeypatch.setattr(creation.mcp_settings, "get_nifi_flow_build_max_concurrency", lambda: 4)
+        return fake
+
+    token = current_nifi_client.set(object())
+    yield install
+    current_nifi_client.reset(token)
+
+
+def _flow(processor_count):
+    objects = [{"type": "controller_service", "service_type": "org.example.Reader", "name": f"Svc{i}"} for i in range(2)]
+    objects += [
+        {
+            "type": "processor",
+            "processor_type": "org.example.Proc",
+            "name": f"P{i}",
+            "position": {"x": i * 100, "y": 0},
+            "properties": {"Record Reader": "@Svc0"},
+        }
+        for i in range(processor_count)
+    ]
+    objects += [
+        {"type": "connection", "source": f"P{i}", "target": f"P{i + 1}", "relationships": ["success"]}
+        for i in range(processor_count - 1)
+    ]
+    return objects
+
+
+@pytest.mark.anyio
+async def test_flow_is_built_in_concurrent_dependency_waves(fake_build):
+    fake = fake_build()
+
+    result = await creation.create_complete_nifi_flow(_flow(12), process_group_id="pg-1")
+
+    assert result["status"] == "warning"  # auto-termination is reported as a warning
+    summary = result["summary"]
+    assert summary["controller_services_created"] == 2
+    assert summary["controller_services_enabled"] == 2
+    assert summary["processors_created"] == 12
+    assert summary["connections_created"] == 11
+    assert 1 < fake.peak_in_flight <= 4 + 1  # one wave at the cap, plus the enable batch
+
+    kinds = [event[0] for event in fake.events]
+    last_service = max(i for i, kind in enumerate(kinds) if kind == "service")
+    first_processor = kinds.index("processor")
+    last_processor = max(i for i, kind in enumerate(kinds) if kind == "processor")
+    first_connection = kinds.index("connection")
+    last_connection = max(i for i, kind in enumerate(kinds) if kind == "connection")
+    assert last_service < first_processor
+    assert last_processor < first_connection
+    assert last_connection < kinds.index("terminate")
+
+    # Results keep definition order regardless of completion order
+    processor_names = [r["name"] for r in result["detailed_results"] if r.get("object_type") == "processor"]
+    assert processor_names == [f"P{i}" for i in range(12)]
+    created = next(r for r in result["detailed_results"] if r.get("name") == "P3")
+    assert created["properties"] == {"Record Reader": "id-Svc0"}
+
+
+@pytest.mark.anyio
+async def test_wave_failure_rolls_back_everything_created(fake_build, monkeypatch):
+    fake = fake_build(fail_processor="P2")
+
+    async def create_pg(name, position_x, position_y, parent_process_group_id):
+        return {"status": "success", "entity": {"id": "new-pg"}}
+
+    monkeypatch.setattr(creation, "create_nifi_process_group", create_pg)
+
+    result = await creation.create_complete_nifi_flow(
+        _flow(6), process_group_id="pg-1", create_process_group={"name": "Built"}
+    )
+
+    assert result["status"] == "error"
+    assert result["rollback_performed"]
+    # The failing processor's siblings in the same wave are rolled back too
+    assert fake.rolled_back == ["new-pg", "id-Svc0", "id-Svc1", "id-P0", "id-P1", "id-P3", "id-P4", "id-P5"]
+    assert not any(event[0] == "connection" for event in fake.events)
+
+
+@pytest.mark.anyio
+async def test_enable_failure_rolls_back_processors_of_the_same_wave(fake_build, monkeypatch):
+    fake = fake_build(fail_enable=True)
+
+    async def create_pg(name, position_x, position_y, parent_process_group_id):
+        return {"status": "success", "entity": {"id": "new-pg"}}
+
+    monkeypatch.setattr(creation, "create_nifi_process_group", create_pg)
+
+    result = await creation.create_complete_nifi_flow(
+        _flow(3), process_group_id="pg-1", create_process_group={"name": "Built"}
+    )
+
+    assert result["status"] == "error" and "enable controller services" in result["message"]
+    assert result["rollback_performed"]
+    assert fake.rolled_back == ["new-pg", "id-Svc0", "id-Svc1", "id-P0", "id-P1", "id-P2"]
+    assert not any(event[0] == "connection" for event in fake.events)
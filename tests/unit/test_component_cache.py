@@ -0,0 +1,109 @@
+"""
+Unit tests for the shared NiFi component cache.
+"""
+
+import httpx
+import pytest
+
+from nifi_mcp_server.component_cache import ComponentCache, cache_bypass_requested, component_cache
+from nifi_mcp_server.flow_snapshot import fetch_group_node
+from nifi_mcp_server.nifi_client import NiFiClient
+
+
+def _entity(entity_id, version):
+    return {"id": entity_id, "revision": {"version": version}}
+
+
+def test_lru_eviction():
+    cache = ComponentCache(ttl_seconds=60, max_entries=2, enabled=True)
+    cache.put("s1", "processor", "a", _entity("a", 0))
+    cache.put("s1", "processor", "b", _entity("b", 0))
+    assert cache.get("s1", "processor", "a") is not None  # "a" becomes most recently used
+    cache.put("s1", "processor", "c", _entity("c", 0))
+
+    assert cache.get("s1", "processor", "b") is None
+    assert cache.get("s1", "processor", "a") is not None
+    assert len(cache) == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("nifi_mcp_server.component_cache.time.monotonic", lambda: now[0])
+    cache = ComponentCache(ttl_seconds=10, max_entries=10, enabled=True)
+    cache.put("s1", "processor", "a", _entity("a", 0))
+
+    now[0] += 5
+    assert cache.get("s1", "processor", "a") is not None
+    now[0] += 6
+    assert cache.get("s1", "processor", "a") is None
+
+
+def test_older_revision_does_not_replace_newer():
+    cache = ComponentCache(ttl_seconds=60, max_entries=10, enabled=True)
+    assert cache.put("s1", "processor", "a", _entity("a", 3))
+    assert not cache.put("s1", "processor", "a", _entity("a", 2))
+    assert cache.get("s1", "processor", "a")["revision"]["version"] == 3
+
+
+@pytest.mark.anyio
+async def test_read_racing_an_invalidation_is_not_stored():
+    cache = ComponentCache(ttl_seconds=60, max_entries=10, enabled=True)
+
+    async def fetch():
+        cache.invalidate("s1")  # a mutation lands while the read is in flight
+        return _entity("a", 1)
+
+    value = await cache.get_or_fetch("s1", "processor", "a", fetch)
+    assert value["id"] == "a"
+    assert cache.get("s1", "processor", "a") is None
+
+
+def test_invalidation_is_scoped_to_server():
+    cache = ComponentCache(ttl_seconds=60, max_entries=10, enabled=True)
+    cache.put("s1", "processor", "a", _entity("a", 0))
+    cache.put("s2", "processor", "a", _entity("a", 0))
+    cache.invalidate("s1")
+
+    assert cache.get("s1", "processor", "a") is None
+    assert cache.get("s2", "processor", "a") is not None
+
+
+def test_bypass_header():
+    assert cache_bypass_requested({"X-Mcp-Cache-Bypass": "true"})
+    assert not cache_bypass_requested({"X-Mcp-Cache-Bypass": "false"})
+    assert not cache_bypass_requested({})
+
+
+@pytest.mark.anyio
+async def test_client_mutations_invalidate_server_entries():
+    flow_calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access/token"):
+            return httpx.Response(201, text="token")
+        if request.url.path.startswith("/nifi-api/flow/process-groups/"):
+            flow_calls.append(request.url.path)
+            return httpx.Response(200, json={"processGroupFlow": {"id": "pg-1", "flow": {}}})
+        return httpx.Response(200, json={})
+
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(handler), server_id="s1")
+    await client.authenticate()
+    http = await client._get_client()
+
+    await fetch_group_node(client, "pg-1")
+    await fetch_group_node(client, "pg-1")
+    assert len(flow_calls) == 1
+
+    # Read-only POSTs (provenance queries) keep the cache
+    await http.post("/provenance", json={})
+    await fetch_group_node(client, "pg-1")
+    assert len(flow_calls) == 1
+
+    await http.put("/processors/p-1", json={})
+    await fetch_group_node(client, "pg-1")
+    assert len(flow_calls) == 2
+
+    await fetch_group_node(client, "pg-1", use_cache=False)
+    assert len(flow_calls) == 3
+    assert component_cache.generation("s1") == 1
+    await client.close()
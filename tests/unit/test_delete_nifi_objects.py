@@ -0,0 +1,94 @@
+"""
+Unit tests for delete_nifi_objects' dependency-ordered, concurrent batch deletion.
+"""
+
+import time
+
+import pytest
+
+from config.logging_setup import request_context
+from nifi_mcp_server.api_tools import modification
+from nifi_mcp_server.api_tools.modification import delete_nifi_objects
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+
+def _requests(simulator, group_id, kind, object_type):
+    return [{"object_type": object_type, "object_id": component_id} for component_id in simulator.component_ids(kind, group_id)]
+
+
+@pytest.mark.anyio
+async def test_running_group_with_queued_data_is_torn_down_in_one_batch(simulated_nifi):
+    spec = CanvasSpec(depth=1, groups_per_group=1, processors_per_group=45, queued_flowfiles=2, running=True)
+    simulator = NiFiSimulator(spec, latency_seconds=0.002)
+    await simulated_nifi(simulator)
+    group_id = simulator.component_ids("processGroups", simulator.root_id)[0]
+
+    # Every processor, half of the connections (Auto-Delete finds the rest), the ports, the service, then the group
+    objects = (
+        [{"object_type": "process_group", "object_id": group_id}]
+        + _requests(simulator, group_id, "controllerServices", "controller_service")
+        + _requests(simulator, group_id, "processors", "processor")
+        + _requests(simulator, group_id, "connections", "connection")[::2]
+        + _requests(simulator, group_id, "inputPorts", "port")
+        + _requests(simulator, group_id, "outputPorts", "port")
+    )
+    simulator.reset_stats()
+
+    started = time.perf_counter()
+    results = await delete_nifi_objects(objects)
+    elapsed = time.perf_counter() - started
+
+    assert [r["request_index"] for r in results] == list(range(len(objects)))
+    assert [r["message"] for r in results if r["status"] != "success"] == []
+    assert group_id not in simulator.component_ids("processGroups", simulator.root_id)
+    # Stopped with one call for the whole group, and every queue purged in one batch
+    assert simulator.stats.by_route["PUT /flow/process-groups/{group_id}"] == 1
+    assert simulator.stats.by_route["POST /flowfile-queues/{connection_id}/drop-requests"] == 44
+    assert simulator.open_async_requests == 0
+    assert elapsed < 5
+
+
+@pytest.mark.anyio
+async def test_processor_with_connections_is_kept_when_auto_delete_is_disabled(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=0, processors_per_group=3))
+    await simulated_nifi(simulator)
+    first, middle, last = simulator.component_ids("processors")
+    token = request_context.set({"headers": {"X-Mcp-Auto-Delete-Enabled": "false"}})
+    try:
+        results = await delete_nifi_objects([
+            {"object_type": "processor", "object_id": middle, "name": "Middle"},
+            {"object_type": "connection", "object_id": simulator.component_ids("connections")[0]},
+        ])
+    finally:
+        request_context.reset(token)
+
+    assert results[0]["status"] == "error"
+    assert "Auto-Delete is disabled" in results[0]["message"]
+    assert results[1]["status"] == "success"
+    assert simulator.component_ids("processors") == [first, middle, last]
+    assert len(simulator.component_ids("connections")) == 1
+
+
+@pytest.mark.anyio
+async def test_failed_stop_poll_fails_only_that_groups_objects(simulated_nifi, monkeypatch):
+    simulator = NiFiSimulator(CanvasSpec(depth=1, groups_per_group=2, processors_per_group=1, running=True))
+    await simulated_nifi(simulator)
+    failing_group, healthy_group = simulator.component_ids("processGroups", simulator.root_id)
+    wait_for_state = modification._wait_for_state
+
+    async def flaky_wait(description, fetch, is_settled, logger, **kwargs):
+        if failing_group in description:
+            raise ConnectionError("poll failed")
+        return await wait_for_state(description, fetch, is_settled, logger, **kwargs)
+
+    monkeypatch.setattr(modification, "_wait_for_state", flaky_wait)
+
+    results = await delete_nifi_objects(
+        _requests(simulator, failing_group, "processors", "processor")
+        + _requests(simulator, healthy_group, "processors", "processor")
+    )
+
+    assert results[0]["status"] == "error"
+    assert "Failed to auto-stop processor: poll failed" in results[0]["message"]
+    assert results[1]["status"] == "success"
+    assert simulator.component_ids("processors", healthy_group) == []
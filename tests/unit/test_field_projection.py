@@ -0,0 +1,89 @@
+"""
+Unit tests for field projection and the detail_level/fields arguments of the read tools.
+"""
+
+import json
+
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+
+from nifi_mcp_server.api_tools.review import get_nifi_object_details, get_process_group_status, list_nifi_objects
+from nifi_mcp_server.field_projection import project
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+SPEC = CanvasSpec(depth=1, groups_per_group=2, processors_per_group=3, bulletins_per_group=2)
+
+
+@pytest.fixture
+async def simulated_client(simulated_nifi):
+    simulator = NiFiSimulator(SPEC)
+    return simulator, await simulated_nifi(simulator)
+
+
+def test_paths_select_nested_keys_through_lists_without_mutating():
+    entity = {
+        "id": "p1",
+        "component": {"name": "Fetch", "config": {"properties": {"URL": "x"}, "descriptors": {"URL": {}}}},
+        "relationships": [{"name": "success", "autoTerminate": False}, {"name": "failure", "autoTerminate": True}],
+    }
+
+    projected = project(entity, ["id", "component.config.properties", "relationships.name", "missing.key"])
+
+    assert projected == {
+        "id": "p1",
+        "component": {"config": {"properties": {"URL": "x"}}},
+        "relationships": [{"name": "success"}, {"name": "failure"}],
+    }
+    # A shorter path keeps its whole subtree, whatever order the paths come in
+    assert project(entity, ["component.name", "component"])["component"] == entity["component"]
+    assert "descriptors" in entity["component"]["config"]
+
+
+@pytest.mark.anyio
+async def test_details_presets_and_explicit_fields(simulated_client):
+    simulator, _ = simulated_client
+    processor_id = simulator.component_ids("processors")[0]
+    full = await get_nifi_object_details("processor", processor_id)
+
+    config = await get_nifi_object_details("processor", processor_id, detail_level="config")
+    fields = await get_nifi_object_details("processor", processor_id,
+                                           detail_level="ids", fields=["revision.version", "status.runStatus"])
+
+    assert set(config) == {"id", "revision", "component"}
+    assert config["component"]["config"]["properties"] == full["component"]["config"]["properties"]
+    assert "position" not in config and "uri" not in config
+    assert len(json.dumps(config)) < len(json.dumps(full))
+    assert fields == {"revision": full["revision"], "status": {"runStatus": full["status"]["runStatus"]}}
+    # The cached entity is still complete
+    assert await get_nifi_object_details("processor", processor_id) == full
+
+
+@pytest.mark.anyio
+async def test_listing_projects_objects_and_keeps_recursive_progress(simulated_client):
+    listed = await list_nifi_objects("processors", detail_level="ids", bypass_cache=True)
+    recursive = await list_nifi_objects("connections", search_scope="recursive", fields=["id", "sourceName"],
+                                        bypass_cache=True)
+
+    assert len(listed) == SPEC.processors_per_group
+    assert all(set(summary) == {"id", "name", "type"} for summary in listed)
+    assert recursive["completed"] and len(recursive["results"]) == SPEC.group_count
+    assert {"process_group_id", "process_group_name"} <= set(recursive["results"][0])
+    assert all(set(obj) == {"id", "sourceName"} for group in recursive["results"] for obj in group["objects"])
+
+    with pytest.raises(ToolError, match="detail_level"):
+        await list_nifi_objects("processors", detail_level="everything")
+
+
+@pytest.mark.anyio
+async def test_status_summary_trims_bulletins_and_ids_skips_fetching_them(simulated_client):
+    simulator, _ = simulated_client
+    summary = await get_process_group_status(detail_level="summary")
+
+    assert summary["bulletins"] and all(set(b) <= {"timestamp", "sourceId", "bulletin"} for b in summary["bulletins"])
+    assert set(summary["queue_summary"]) == {"total_queued_count", "total_queued_size_human"}
+
+    simulator.stats.by_route.clear()
+    ids = await get_process_group_status(detail_level="ids")
+
+    assert set(ids) == {"process_group_id", "process_group_name"}
+    assert simulator.stats.by_route["GET /flow/bulletin-board"] == 0
@@ -0,0 +1,66 @@
+"""
+Unit tests for document_nifi_flow_simplified's processor detail fetching.
+"""
+
+import pytest
+
+from nifi_mcp_server.flow_documenter_improved import document_nifi_flow_simplified, processor_needs_details
+
+
+def _processor(proc_id, complete=True):
+    if not complete:
+        return {"id": proc_id, "component": {"name": proc_id}}
+    return {
+        "id": proc_id,
+        "component": {
+            "name": proc_id,
+            "type": "org.apache.nifi.processors.standard.LogAttribute",
+            "state": "STOPPED",
+            "config": {"properties": {"Log Level": "info"}},
+            "relationships": [{"name": "success", "autoTerminate": True}],
+        },
+    }
+
+
+def _connection(conn_id, source_id, dest_id):
+    return {
+        "id": conn_id,
+        "component": {
+            "source": {"id": source_id, "name": source_id, "type": "PROCESSOR"},
+            "destination": {"id": dest_id, "name": dest_id, "type": "PROCESSOR"},
+            "selectedRelationships": ["success"],
+        },
+    }
+
+
+class RecordingClient:
+    """Stands in for NiFiClient.get_processor_details and records which IDs were requested."""
+
+    def __init__(self):
+        self.requested = []
+
+    async def get_processor_details(self, processor_id):
+        self.requested.append(processor_id)
+        return _processor(processor_id)
+
+
+def test_processor_needs_details():
+    assert not processor_needs_details(_processor("p1"))
+    assert processor_needs_details(_processor("p1", complete=False))
+    assert processor_needs_details({"id": "p1"})
+
+
+@pytest.mark.anyio
+async def test_only_incomplete_processors_are_fetched():
+    client = RecordingClient()
+    processors = [_processor(f"p{i}") for i in range(50)] + [_processor("partial", complete=False)]
+    connections = [_connection("c1", "p0", "p1"), _connection("c2", "p1", "partial")]
+
+    doc = await document_nifi_flow_simplified(processors, connections, [], [], nifi_client=client)
+
+    assert client.requested == ["partial"]
+    documented = doc["components"]["processors"]
+    assert documented["partial"]["properties"] == {"Log Level": "info"}
+    assert documented["p1"]["incoming_connections"][0]["source_id"] == "p0"
+    assert documented["p1"]["outgoing_connections"][0]["destination_id"] == "partial"
+    assert documented["p0"]["auto_terminated_relationships"] == [{"relationship": "success"}]
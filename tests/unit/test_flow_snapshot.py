@@ -0,0 +1,209 @@
+"""
+Unit tests for the flow snapshot engine and the review listings built on it.
+
+The canvas is served by an httpx.MockTransport so no NiFi instance is required.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from nifi_mcp_server import flow_snapshot
+from nifi_mcp_server.flow_snapshot import decode_continuation_token, fetch_flow_snapshot, iter_flow_groups, start_traversal
+from nifi_mcp_server.nifi_client import NiFiClient
+from nifi_mcp_server.request_context import current_nifi_client
+from nifi_mcp_server.api_tools.review import (
+    _list_components_from_snapshot,
+    _hierarchy_from_snapshot,
+)
+
+# parent -> children
+TREE = {
+    "root-id": ["pg-a", "pg-b"],
+    "pg-a": ["pg-a1"],
+    "pg-b": [],
+    "pg-a1": [],
+}
+NAMES = {"root-id": "NiFi Flow", "pg-a": "A", "pg-b": "B", "pg-a1": "A1"}
+
+
+def _flow(pg_id):
+    return {
+        "processGroupFlow": {
+            "id": pg_id,
+            "breadcrumb": {"breadcrumb": {"id": pg_id, "name": NAMES[pg_id]}},
+            "flow": {
+                "processors": [{"id": f"{pg_id}-proc", "component": {"name": f"{NAMES[pg_id]} proc", "config": {}}, "status": {}}],
+                "connections": [],
+                "inputPorts": [{"id": f"{pg_id}-in", "component": {"name": "in"}}],
+                "outputPorts": [],
+                "processGroups": [{"id": child, "component": {"name": NAMES[child]}} for child in TREE[pg_id]],
+            },
+        }
+    }
+
+
+class Canvas:
+    """Serves TREE over /flow/process-groups with optional latency, tracking concurrency."""
+
+    def __init__(self):
+        self.seen = []
+        self.latency = 0.0
+        self.slow_groups = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access/token"):
+            return httpx.Response(201, text="token")
+        self.seen.append(request.url.path)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            pg_id = request.url.path.rsplit("/", 1)[-1]
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if pg_id in self.slow_groups:
+                await asyncio.sleep(10)
+            if "/flow/process-groups/" in request.url.path:
+                pg_id = "root-id" if pg_id == "root" else pg_id
+                if pg_id in TREE:
+                    return httpx.Response(200, json=_flow(pg_id))
+            return httpx.Response(404)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def canvas():
+    canvas = Canvas()
+    return canvas.seen, httpx.MockTransport(canvas.handler), canvas
+
+
+@pytest.fixture
+async def nifi_client(canvas):
+    _, transport, _ = canvas
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=transport)
+    await client.authenticate()
+    token = current_nifi_client.set(client)
+    yield client
+    current_nifi_client.reset(token)
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_snapshot_fetches_each_group_once(canvas, nifi_client):
+    seen, _, _ = canvas
+    seen.clear()
+
+    snapshot = await fetch_flow_snapshot(nifi_client, "root")
+
+    assert snapshot.root_id == "root-id"
+    assert list(snapshot.groups) == ["root-id", "pg-a", "pg-b", "pg-a1"]
+    assert len(seen) == len(TREE)
+    assert snapshot.groups["pg-a1"].depth == 2
+    assert snapshot.get_component("pg-a1-proc").group_id == "pg-a1"
+    assert snapshot.completed
+
+
+@pytest.mark.anyio
+async def test_snapshot_respects_max_depth(nifi_client):
+    snapshot = await fetch_flow_snapshot(nifi_client, "root-id", max_depth=1)
+
+    assert set(snapshot.groups) == {"root-id", "pg-a", "pg-b"}
+
+
+@pytest.mark.anyio
+async def test_recursive_listing_uses_one_call_per_group(canvas, nifi_client):
+    seen, _, _ = canvas
+    seen.clear()
+
+    snapshot = await fetch_flow_snapshot(nifi_client, "root-id", max_depth=10)
+    results = await _list_components_from_snapshot("ports", snapshot)
+
+    assert len(seen) == len(TREE)
+    assert [r["process_group_name"] for r in results] == ["NiFi Flow", "A", "B", "A1"]
+    assert results[0]["objects"][0]["type"] == "INPUT_PORT"
+
+
+@pytest.mark.anyio
+async def test_hierarchy_views(nifi_client):
+    recursive = _hierarchy_from_snapshot(await fetch_flow_snapshot(nifi_client, "root-id"), recursive_search=True)
+    assert recursive["completed"]
+    assert recursive["processed_count"] == 4
+    assert "continuation_token" not in recursive
+    assert recursive["child_process_groups"][0] == {
+        "id": "pg-a", "name": "A", "children": [{"id": "pg-a1", "name": "A1", "children": []}]
+    }
+
+    direct = _hierarchy_from_snapshot(await fetch_flow_snapshot(nifi_client, "root-id", max_depth=1), recursive_search=False)
+    assert direct["child_process_groups"][0] == {
+        "id": "pg-a", "name": "A",
+        "counts": {"processors": 1, "connections": 0, "ports": 1, "process_groups": 1},
+    }
+
+
+@pytest.mark.anyio
+async def test_timeout_returns_pending_groups(nifi_client):
+    snapshot = await fetch_flow_snapshot(nifi_client, "root-id", timeout_seconds=1, start_time=0)
+
+    assert snapshot.timeout_occurred
+    assert not snapshot.groups
+    state = decode_continuation_token(snapshot.continuation_token)
+    assert [entry.id for entry in state.pending] == ["root-id"]
+    assert state.visited == set()
+
+
+@pytest.mark.anyio
+async def test_concurrency_is_capped(canvas, nifi_client, monkeypatch):
+    _, _, fake = canvas
+    fake.latency = 0.02
+    monkeypatch.setattr(flow_snapshot, "get_nifi_traversal_max_concurrency", lambda: 1)
+
+    snapshot = await fetch_flow_snapshot(nifi_client, "root-id")
+
+    assert len(snapshot.groups) == len(TREE)
+    assert fake.peak_in_flight == 1
+
+
+@pytest.mark.anyio
+async def test_continuation_token_resumes_without_revisiting(canvas, nifi_client, monkeypatch):
+    seen, _, fake = canvas
+    fake.latency = 0.05
+    monkeypatch.setattr(flow_snapshot, "get_nifi_traversal_max_concurrency", lambda: 1)
+    seen.clear()
+
+    first = await fetch_flow_snapshot(nifi_client, "root-id", timeout_seconds=0.12)
+    assert first.timeout_occurred
+    fake.latency = 0.0
+
+    second = await fetch_flow_snapshot(nifi_client, "root-id", continuation_token=first.continuation_token)
+
+    assert second.completed
+    assert set(first.groups).isdisjoint(second.groups)
+    assert set(first.groups) | set(second.groups) == set(TREE)
+    assert second.visited == set(TREE)
+
+
+@pytest.mark.anyio
+async def test_closing_the_iterator_settles_in_flight_fetches(canvas, nifi_client):
+    _, _, fake = canvas
+    fake.slow_groups.add("pg-a")
+    snapshot = start_traversal("root-id")
+    groups = iter_flow_groups(nifi_client, snapshot, use_cache=False)
+
+    assert (await groups.__anext__()).id == "root-id"
+    assert (await groups.__anext__()).id == "pg-b"
+    await groups.aclose()
+
+    assert fake.in_flight == 0
+    assert [entry.id for entry in snapshot.pending] == ["pg-a"]
+
+
+def test_legacy_continuation_token_is_accepted():
+    state = decode_continuation_token("pg-a:1")
+    assert state.pending[0].id == "pg-a"
+    assert state.pending[0].depth == 1
+    with pytest.raises(ValueError):
+        decode_continuation_token("not-a-token")
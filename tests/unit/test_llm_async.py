@@ -0,0 +1,126 @@
+"""
+Unit tests for the async LLM path: streamed completion assembly, the shared HTTP pool and
+ChatManager.get_llm_response_async.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from nifi_chat_ui.llm.base import LLMProvider, LLMResponse
+from nifi_chat_ui.llm.chat_manager import ChatManager
+from nifi_chat_ui.llm.utils.http_pool import close_llm_http_client, get_llm_http_client
+from nifi_chat_ui.llm.utils.streaming import collect_chat_completion_stream
+
+
+def _chunk(content=None, tool_calls=None, usage=None):
+    choices = [] if content is None and tool_calls is None else [
+        SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))
+    ]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def _tool_fragment(index, call_id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=call_id, type="function" if call_id else None,
+                           function=SimpleNamespace(name=name, arguments=arguments))
+
+
+async def _stream(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class _BlockingProvider(LLMProvider):
+    """Provider without an async SDK, so it uses the base class send_message_async."""
+
+    def __init__(self):
+        super().__init__("key")
+        self.calls = []
+
+    def send_message(self, messages, system_prompt, model_name, tools=None, user_request_id=None, action_id=None):
+        self.calls.append((threading.current_thread(), system_prompt, tools))
+        return LLMResponse(content="Flow looks healthy.", tool_calls=None, token_count_in=12, token_count_out=4)
+
+    def format_tools(self, tools):
+        return tools
+
+    def is_configured(self):
+        return True
+
+    def get_available_models(self):
+        return ["blocking-1"]
+
+
+@pytest.mark.anyio
+async def test_streamed_completion_forwards_text_and_merges_tool_calls():
+    chunks = [
+        _chunk(content="Listing "),
+        _chunk(content="processors."),
+        _chunk(tool_calls=[_tool_fragment(0, "call-a", "list_nifi_objects", '{"object_')]),
+        _chunk(tool_calls=[_tool_fragment(1, "call-b", "get_nifi_object_details", "{}")]),
+        _chunk(tool_calls=[_tool_fragment(0, arguments='type": "processors"}')]),
+        _chunk(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30)),
+    ]
+    tokens = []
+
+    async def on_token(text):
+        tokens.append(text)
+
+    completion = await collect_chat_completion_stream(_stream(chunks), on_token)
+
+    assert tokens == ["Listing ", "processors."]
+    assert completion.content == "Listing processors."
+    assert completion.tool_calls == [
+        {"id": "call-a", "type": "function",
+         "function": {"name": "list_nifi_objects", "arguments": '{"object_type": "processors"}'}},
+        {"id": "call-b", "type": "function", "function": {"name": "get_nifi_object_details", "arguments": "{}"}},
+    ]
+    assert (completion.token_count_in, completion.token_count_out) == (120, 30)
+
+
+@pytest.mark.anyio
+async def test_groq_usage_is_read_from_x_groq():
+    final = SimpleNamespace(choices=[], usage=None,
+                            x_groq=SimpleNamespace(usage=SimpleNamespace(prompt_tokens=7, completion_tokens=2)))
+
+    completion = await collect_chat_completion_stream(_stream([_chunk(content="ok"), final]))
+
+    assert completion.content == "ok" and completion.tool_calls is None
+    assert (completion.token_count_in, completion.token_count_out) == (7, 2)
+
+
+@pytest.mark.anyio
+async def test_http_pool_is_shared_per_loop_until_closed():
+    first = get_llm_http_client()
+    assert get_llm_http_client() is first
+
+    await close_llm_http_client()
+
+    assert first.is_closed
+    second = get_llm_http_client()
+    assert second is not first
+    await close_llm_http_client()
+
+
+@pytest.mark.anyio
+async def test_chat_manager_async_path_falls_back_to_worker_thread():
+    manager = ChatManager({})
+    provider = _BlockingProvider()
+    manager.providers["blocking"] = provider
+    tools = [{"type": "function", "function": {"name": "list_nifi_objects"}}]
+    tokens = []
+
+    result = await manager.get_llm_response_async(
+        [{"role": "user", "content": "How is my flow?"}], "You are a NiFi expert.", "blocking", "blocking-1",
+        tools=tools, on_token=tokens.append
+    )
+
+    assert result["content"] == "Flow looks healthy." and result["token_count_in"] == 12
+    assert tokens == ["Flow looks healthy."]
+    thread, system_prompt, sent_tools = provider.calls[0]
+    assert thread is not threading.current_thread()
+    assert sent_tools == tools and system_prompt == "You are a NiFi expert."
+
+    missing = await manager.get_llm_response_async([], "", "unknown", "model", tools=None)
+    assert "not available" in missing["error"]
@@ -0,0 +1,138 @@
+"""
+Unit tests for the pooled sync and async transports of the chat UI's MCP handler, and
+its cache of tool definitions.
+
+A local HTTP/1.1 server stands in for the MCP API server and records which client
+connection each request arrived on.
+"""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("streamlit")
+mcp_handler = pytest.importorskip("nifi_chat_ui.mcp_handler")
+
+
+class _APIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-Tool-Catalog-Version", self.server.catalog_version)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.server.tool_requests.append(self.headers.get("If-None-Match"))
+        etag = f'"{self.server.catalog_version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send_json(304, None, {"ETag": etag})
+        else:
+            self._send_json(200, [{"type": "function", "function": {"name": "list_nifi_objects"}}], {"ETag": etag})
+
+    def do_POST(self):
+        self.server.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/broken_tool"):
+            self._send_json(400, {"detail": "field required: object_id"})
+        else:
+            self._send_json(200, {"echo": body["arguments"], "server_id": self.headers.get("X-Nifi-Server-Id")})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _APIHandler)
+    server.connections = set()
+    server.tool_requests = []
+    server.catalog_version = "v1"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(mcp_handler, "API_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    mcp_handler.close_mcp_session()
+    mcp_handler.clear_tools_cache()
+    yield server
+    mcp_handler.close_mcp_session()
+    mcp_handler.clear_tools_cache()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_calls_share_one_keep_alive_connection(api_server):
+    for index in range(5):
+        result = mcp_handler.execute_mcp_tool("list_nifi_objects", {"index": index}, "nifi-local", "req-1")
+        assert result == {"echo": {"index": index}, "server_id": "nifi-local"}
+    assert len(mcp_handler.get_available_tools("nifi-local")) == 1
+
+    assert len(api_server.connections) == 1
+
+
+@pytest.mark.anyio
+async def test_async_calls_share_one_keep_alive_connection(api_server):
+    pool = mcp_handler.get_mcp_async_client()._transport._pool
+    client_config = mcp_handler.config.get_mcp_api_client_config()
+    assert pool._max_connections == client_config["max_connections"]
+    assert pool._max_keepalive_connections == client_config["max_keepalive_connections"]
+    assert pool._keepalive_expiry == client_config["keepalive_expiry"]
+    try:
+        for index in range(5):
+            result = await mcp_handler.execute_mcp_tool_async("list_nifi_objects", {"index": index}, "nifi-local")
+            assert result["echo"] == {"index": index}
+        assert len(await mcp_handler.get_available_tools_async("nifi-local", phase="Review")) == 1
+        assert len(await mcp_handler.get_available_tools_async("nifi-local", phase="Review")) == 1
+        validation = await mcp_handler.execute_mcp_tool_async("broken_tool", {}, "nifi-local")
+    finally:
+        await mcp_handler.close_mcp_async_client()
+
+    assert validation["validation_error"] and "field required" in validation["details"]
+    assert len(api_server.connections) == 1
+
+
+@pytest.mark.anyio
+async def test_unreachable_server_is_reported_not_raised(monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    monkeypatch.setattr(mcp_handler, "API_BASE_URL", f"http://127.0.0.1:{port}")
+    try:
+        result = await mcp_handler.execute_mcp_tool_async("list_nifi_objects", {}, "nifi-local")
+    finally:
+        await mcp_handler.close_mcp_async_client()
+
+    assert result.startswith("Connection Error")
+
+
+def test_tool_definitions_are_cached_until_the_catalog_version_changes(api_server):
+    first = mcp_handler.get_available_tools("nifi-local", phase="Review")
+    first.append("mutated by caller")
+    assert len(mcp_handler.get_available_tools("nifi-local", phase="Review")) == 1
+    # A tool call sees a newer catalog, so the next fetch revalidates and downloads it
+    api_server.catalog_version = "v2"
+    mcp_handler.execute_mcp_tool("list_nifi_objects", {}, "nifi-local")
+    assert len(mcp_handler.get_available_tools("nifi-local", phase="Review")) == 1
+
+    assert api_server.tool_requests == [None, '"v1"']
+    assert mcp_handler.get_cached_tools_etag("Review") == '"v2"'
+
+
+def test_stale_cache_is_revalidated_with_its_etag(api_server, monkeypatch):
+    mcp_handler.get_available_tools("nifi-local")
+    monkeypatch.setattr(mcp_handler.config, "get_mcp_api_client_config",
+                        lambda: {**mcp_handler.config.DEFAULT_APP_CONFIG["mcp_api_client"], "tools_cache_ttl_seconds": 0})
+
+    tools = mcp_handler.get_available_tools("nifi-local")
+
+    assert [t["function"]["name"] for t in tools] == ["list_nifi_objects"]
+    assert api_server.tool_requests == [None, '"v1"']
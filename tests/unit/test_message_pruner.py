@@ -0,0 +1,91 @@
+"""
+Unit tests for the turn-group conversation pruner shared by the chat UI and workflow nodes.
+"""
+
+import time
+
+from loguru import logger
+
+from nifi_chat_ui.llm.utils.token_counter import TokenCounter
+from nifi_chat_ui.message_pruner import index_turn_groups, prune_messages, validate_message_structure
+
+# Anthropic counts are len(content) // 4, which keeps the token arithmetic in these tests exact
+PROVIDER = "anthropic"
+
+
+def _turn(turn, tool_calls=1, size=40):
+    messages = [{"role": "user", "content": f"u{turn:03d}".ljust(size)}]
+    calls = [{"id": f"call-{turn}-{n}", "type": "function",
+              "function": {"name": "list_nifi_objects", "arguments": "{}"}} for n in range(tool_calls)]
+    if calls:
+        messages.append({"role": "assistant", "content": None, "tool_calls": calls})
+        messages.extend({"role": "tool", "tool_call_id": call["id"], "content": "x" * size} for call in calls)
+    messages.append({"role": "assistant", "content": f"a{turn:03d}".ljust(size)})
+    return messages
+
+
+def _conversation(turns, **kwargs):
+    messages = [{"role": "system", "content": "s" * 40}]
+    for turn in range(turns):
+        messages.extend(_turn(turn, **kwargs))
+    return messages
+
+
+def test_tool_results_stay_with_their_call():
+    messages = _conversation(3, tool_calls=2)
+
+    groups = index_turn_groups(messages, start=1)
+
+    assert [(group.start, group.end) for group in groups] == [(1, 6), (6, 11), (11, 16)]
+
+
+def test_late_tool_result_merges_the_turns_it_spans():
+    messages = [{"role": "system", "content": "s"}] + _turn(0) + _turn(1, tool_calls=0)
+    # A result for turn 0's call that arrives after turn 1 started
+    messages.insert(5, {"role": "user", "content": "meanwhile"})
+    messages.insert(6, {"role": "tool", "tool_call_id": "call-0-0", "content": "late"})
+
+    groups = index_turn_groups(messages, start=1)
+
+    assert (groups[0].start, groups[0].end) == (1, 7)
+
+
+def test_drops_oldest_turns_until_under_limit():
+    messages = _conversation(10)
+    counter = TokenCounter()
+    turn_tokens = counter.calculate_input_tokens(_turn(0), PROVIDER, "claude")
+    total = counter.calculate_input_tokens(messages, PROVIDER, "claude")
+
+    pruned = prune_messages(messages, total - 3 * turn_tokens, PROVIDER, "claude", None, counter)
+
+    assert pruned[0] == messages[0]
+    assert pruned[1:] == messages[1 + 3 * len(_turn(0)):]
+    assert validate_message_structure(pruned, logger)
+    assert prune_messages(messages, total, PROVIDER, "claude", None, counter) is messages
+
+
+def test_recent_turns_are_preserved_even_when_over_limit():
+    messages = _conversation(6)
+    counter = TokenCounter()
+    turn_length = len(_turn(0))
+
+    # More than twice over the limit: only the last turn is kept
+    assert prune_messages(messages, 1, PROVIDER, "claude", None, counter)[1:] == messages[-turn_length:]
+    # Over the limit, but by less than 2x once pruned: the last two turns are kept
+    two_turns = counter.calculate_input_tokens(messages[:1] + messages[-2 * turn_length:], PROVIDER, "claude")
+    pruned = prune_messages(messages, two_turns - 1, PROVIDER, "claude", None, counter)
+    assert pruned[1:] == messages[-2 * turn_length:]
+
+
+def test_long_sessions_prune_in_linear_time():
+    counter = TokenCounter()
+    messages = _conversation(125)  # 501 messages
+    limit = counter.calculate_input_tokens(messages, PROVIDER, "claude") // 2
+
+    start = time.perf_counter()
+    for _ in range(20):
+        pruned = prune_messages(messages, limit, PROVIDER, "claude", None, counter)
+    per_call = (time.perf_counter() - start) / 20
+
+    assert len(pruned) < len(messages) and validate_message_structure(pruned, logger)
+    assert per_call < 0.005
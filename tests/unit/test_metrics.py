@@ -0,0 +1,95 @@
+"""
+Unit tests for the NiFi API, tool and workflow step metrics and the /metrics endpoint.
+"""
+
+import httpx
+import pytest
+
+from nifi_mcp_server import fastmcp_sse_server, metrics
+from nifi_mcp_server.metrics import endpoint_template, track_workflow_step
+from nifi_mcp_server.workflows.core.executor import GuidedWorkflowExecutor
+from nifi_mcp_server.workflows.nodes.base_node import WorkflowNode
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+
+
+@pytest.fixture
+async def simulated_client(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=1, groups_per_group=2, processors_per_group=2))
+    return simulator, await simulated_nifi(simulator, set_context=False, server_id="sim")
+
+
+def test_endpoint_template_replaces_ids():
+    assert endpoint_template(
+        "/nifi-api/flow/process-groups/0f3c1a2b-0000-1000-8000-00000000abcd", "/nifi-api"
+    ) == "/flow/process-groups/{id}"
+    assert endpoint_template("/nifi-api/provenance-events/42/content/input", "/nifi-api") == "/provenance-events/{id}/content/input"
+    assert endpoint_template("/nifi-api/flow/process-groups/root", "/nifi-api") == "/flow/process-groups/root"
+
+
+@pytest.mark.anyio
+async def test_nifi_calls_are_counted_per_endpoint_template(simulated_client):
+    simulator, client = simulated_client
+    for group_id in simulator.component_ids("processGroups"):
+        await client.get_process_group_flow(group_id)
+
+    labels = {"server": "sim", "method": "GET", "endpoint": "/flow/process-groups/{id}"}
+    assert metrics.NIFI_REQUESTS.value(status="200", **labels) == 3
+    assert metrics.NIFI_REQUEST_SECONDS.count(**labels) == 3
+    assert metrics.NIFI_RESPONSE_BYTES.count(**labels) == 3
+    assert metrics.NIFI_REQUESTS.value(server="sim", method="POST", endpoint="/access/token", status="201") == 1
+
+
+def test_failed_workflow_step_is_counted_as_error():
+    with pytest.raises(RuntimeError):
+        with track_workflow_step("build_new", "plan"):
+            raise RuntimeError("boom")
+
+    assert metrics.WORKFLOW_STEPS.value(workflow="build_new", step="plan", outcome="error") == 1
+    assert metrics.WORKFLOW_STEP_SECONDS.count(workflow="build_new", step="plan") == 1
+
+
+class _EchoNode(WorkflowNode):
+    def exec(self, prep_res):
+        return {"status": "success"}
+
+
+def test_workflow_steps_are_labelled_with_the_executing_workflow():
+    GuidedWorkflowExecutor("build_new", [_EchoNode(name="echo")]).execute()
+
+    assert metrics.WORKFLOW_STEPS.value(workflow="build_new", step="echo", outcome="success") == 1
+    assert metrics.WORKFLOW_STEP_SECONDS.count(workflow="build_new", step="echo") == 1
+    assert metrics.WORKFLOW_STEP_SECONDS.count(workflow="unknown", step="echo") == 0
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_exposes_tool_and_nifi_metrics(simulated_client, monkeypatch):
+    simulator, client = simulated_client
+
+    async def get_client(server_id, bound_logger=None):
+        return client
+
+    monkeypatch.setattr(fastmcp_sse_server, "get_nifi_servers", lambda: [{"id": "sim"}])
+    monkeypatch.setattr(fastmcp_sse_server, "get_nifi_client", get_client)
+    transport = httpx.ASGITransport(app=fastmcp_sse_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://mcp") as api:
+        response = await api.post(
+            "/tools/list_nifi_objects",
+            json={"arguments": {"object_type": "processors", "process_group_id": simulator.root_id}},
+            headers={"X-Nifi-Server-Id": "sim"},
+        )
+        assert response.status_code == 200
+        exposition = await api.get("/metrics")
+
+    assert exposition.headers["content-type"].startswith("text/plain")
+    text = exposition.text
+    assert '# TYPE mcp_tool_call_duration_seconds histogram' in text
+    assert 'mcp_tool_calls_total{server="sim",tool="list_nifi_objects",outcome="success"} 1' in text
+    assert 'mcp_tool_call_duration_seconds_bucket{server="sim",tool="list_nifi_objects",le="+Inf"} 1' in text
+    assert 'nifi_api_requests_total{server="sim",method="GET",endpoint="/flow/process-groups/{id}",status="200"}' in text
@@ -0,0 +1,81 @@
+"""
+Unit tests for the pooled HTTP client inside NiFiClient.
+
+These tests use an httpx.MockTransport so no NiFi instance is required.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from nifi_mcp_server.nifi_client import NiFiClient
+
+
+def _make_handler(seen_requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_requests.append(request)
+        if request.url.path.endswith("/access/token"):
+            return httpx.Response(201, text="token-123")
+        if request.url.path.endswith("/processors"):
+            return httpx.Response(200, json={"processors": [{"id": "p1"}]})
+        if request.url.path.endswith("/process-groups/root"):
+            return httpx.Response(200, json={"processGroupFlow": {"id": "root-id"}})
+        return httpx.Response(404)
+    return handler
+
+
+@pytest.mark.anyio
+async def test_client_is_reused_across_calls():
+    seen = []
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(_make_handler(seen)))
+    await client.authenticate()
+
+    first = await client._get_client()
+    await client.list_processors("pg-1")
+    await client.get_root_process_group_id()
+    second = await client._get_client()
+
+    assert first is second
+    assert not first.is_closed
+    await client.close()
+    assert first.is_closed
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_open_client():
+    seen = []
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(_make_handler(seen)))
+    await client.authenticate()
+
+    results = await asyncio.gather(*(client.list_processors(f"pg-{i}") for i in range(10)))
+
+    assert all(r == [{"id": "p1"}] for r in results)
+    assert not (await client._get_client()).is_closed
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_token_is_swapped_in_place():
+    seen = []
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(_make_handler(seen)))
+    await client.authenticate()
+    pooled = await client._get_client()
+
+    await client.list_processors("pg-1")
+    assert seen[-1].headers["Authorization"] == "Bearer token-123"
+
+    # Re-authenticating must not send the old token and must keep the same pooled client
+    await client.authenticate()
+    assert "Authorization" not in seen[-1].headers
+    assert await client._get_client() is pooled
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_operation_timeout_overrides():
+    client = NiFiClient("https://nifi.test/nifi-api", timeout=5.0, connect_timeout=2.0, operation_timeouts={"search": 90.0})
+
+    assert client._operation_timeout("search").read == 90.0
+    assert client._operation_timeout("search").connect == 2.0
+    assert client._operation_timeout("unknown").read == 5.0
@@ -0,0 +1,106 @@
+"""
+Unit tests for the process-wide NiFi client registry and token handling.
+
+No NiFi instance is required: server configuration is patched and requests are
+served by an httpx.MockTransport.
+"""
+
+import base64
+import json
+import time
+
+import httpx
+import pytest
+
+from nifi_mcp_server import client_registry
+from nifi_mcp_server.client_registry import NiFiClientRegistry
+from nifi_mcp_server.nifi_client import NiFiClient, _decode_token_expiry
+
+
+def _jwt(exp: float) -> str:
+    def segment(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{segment({'alg': 'none'})}.{segment({'sub': 'user', 'exp': int(exp)})}.signature"
+
+
+class FakeNiFi:
+    """Minimal token endpoint plus one protected endpoint."""
+
+    def __init__(self, token_lifetime: float = 3600):
+        self.token_lifetime = token_lifetime
+        self.logins = 0
+        self.valid_tokens = set()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access/token"):
+            self.logins += 1
+            token = _jwt(time.time() + self.token_lifetime) + str(self.logins)
+            self.valid_tokens.add(token)
+            return httpx.Response(201, text=token)
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token not in self.valid_tokens:
+            return httpx.Response(401, text="Unauthorized")
+        return httpx.Response(200, json={"processors": []})
+
+
+@pytest.fixture
+def fake_nifi(monkeypatch):
+    fake = FakeNiFi()
+    server_conf = {"id": "test-server", "url": "https://nifi.test/nifi-api", "username": "user", "password": "pass"}
+    monkeypatch.setattr(client_registry, "get_nifi_server_config", lambda server_id: server_conf if server_id == "test-server" else None)
+    monkeypatch.setattr(client_registry, "get_nifi_http_client_config", lambda server_id=None: {"transport": httpx.MockTransport(fake.handler)})
+    return fake
+
+
+def test_decode_token_expiry():
+    exp = time.time() + 100
+    assert _decode_token_expiry(_jwt(exp)) == int(exp)
+    assert _decode_token_expiry("not-a-jwt") is None
+    assert _decode_token_expiry(None) is None
+
+
+@pytest.mark.anyio
+async def test_registry_authenticates_once_per_server(fake_nifi):
+    registry = NiFiClientRegistry(refresh_margin_seconds=60)
+
+    first = await registry.get_client("test-server")
+    second = await registry.get_client("test-server")
+
+    assert first is second
+    assert fake_nifi.logins == 1
+    await registry.close_all()
+
+
+@pytest.mark.anyio
+async def test_registry_refreshes_token_before_expiry(fake_nifi):
+    fake_nifi.token_lifetime = 30
+    registry = NiFiClientRegistry(refresh_margin_seconds=60)
+
+    client = await registry.get_client("test-server")
+    assert client.token_expires_within(60)
+
+    same_client = await registry.get_client("test-server")
+    assert same_client is client
+    assert fake_nifi.logins == 2
+    await registry.close_all()
+
+
+@pytest.mark.anyio
+async def test_registry_unknown_server_raises(fake_nifi):
+    registry = NiFiClientRegistry()
+    with pytest.raises(ValueError):
+        await registry.get_client("missing")
+
+
+@pytest.mark.anyio
+async def test_client_reauthenticates_once_on_401(fake_nifi):
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(fake_nifi.handler))
+    await client.authenticate()
+
+    # Simulate the server revoking the token
+    fake_nifi.valid_tokens.clear()
+    processors = await client.list_processors("pg-1")
+
+    assert processors == []
+    assert fake_nifi.logins == 2
+    await client.close()
@@ -0,0 +1,86 @@
+"""
+Unit tests for the in-process NiFi REST API simulator, driven through a real NiFiClient.
+"""
+
+import pytest
+
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+
+def test_sized_canvas_matches_requested_component_count():
+    spec = CanvasSpec.sized(10_000)
+    simulator = NiFiSimulator(spec)
+
+    assert 10_000 <= spec.component_count < 10_000 + 2 * spec.group_count
+    # Every component plus the root group
+    assert len(simulator._nodes) == spec.component_count + 1
+
+
+@pytest.mark.anyio
+async def test_client_walks_the_canvas(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=1, groups_per_group=2, processors_per_group=3))
+    client = await simulated_nifi(simulator)
+
+    root_id = await client.get_root_process_group_id()
+    flow = (await client.get_process_group_flow(root_id))["processGroupFlow"]["flow"]
+
+    assert len(flow["processors"]) == 3
+    assert len(flow["connections"]) == 2
+    assert len(flow["processGroups"]) == 2
+    child_id = flow["processGroups"][0]["id"]
+    assert len(await client.get_input_ports(child_id)) == 1
+    assert simulator.stats.by_route["GET /flow/process-groups/{group_id}"] == 2
+    assert simulator.stats.bytes_sent > 0
+
+
+@pytest.mark.anyio
+async def test_stale_revision_is_rejected_and_the_client_retries(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=0, processors_per_group=1))
+    processor_id = simulator.component_ids("processors")[0]
+    first = await simulated_nifi(simulator)
+    second = await simulated_nifi(simulator)
+
+    await second.get_processor_details(processor_id)  # remembers version 1
+    await first.update_processor_state(processor_id, "RUNNING")  # bumps to version 2
+    simulator.reset_stats()
+
+    updated = await second.update_processor_state(processor_id, "STOPPED")
+
+    assert updated["component"]["state"] == "STOPPED"
+    assert updated["revision"]["version"] == 3
+    assert simulator.stats.by_route["PUT /processors/{component_id}/run-status"] == 2  # 409, then the retry
+
+
+@pytest.mark.anyio
+async def test_delete_of_a_running_processor_conflicts(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=0, processors_per_group=1, running=True))
+    processor_id = simulator.component_ids("processors")[0]
+    client = await simulated_nifi(simulator)
+
+    with pytest.raises(ValueError, match="Conflict deleting processor"):
+        await client.delete_processor(processor_id, version=1)
+    assert processor_id in simulator.component_ids("processors")
+
+
+@pytest.mark.anyio
+async def test_drop_request_empties_the_queue(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=0, processors_per_group=2, queued_flowfiles=5))
+    connection_id = simulator.component_ids("connections")[0]
+    client = await simulated_nifi(simulator)
+
+    result = await client.handle_drop_request(connection_id)
+
+    assert result["success"]
+    assert result["dropped_count"] == "5 / 5120 bytes"
+    assert simulator.component(connection_id)["status"]["aggregateSnapshot"]["flowFilesQueued"] == 0
+    assert simulator.open_async_requests == 0
+
+
+@pytest.mark.anyio
+async def test_injected_errors_surface_as_connection_errors(simulated_nifi):
+    simulator = NiFiSimulator(CanvasSpec(depth=0), error_rate=1.0)
+    client = await simulated_nifi(simulator)  # /access/token is never failed
+
+    with pytest.raises(ConnectionError, match="503"):
+        await client.get_processor_types()
+    assert simulator.stats.injected_errors == 1
@@ -0,0 +1,212 @@
+"""
+Unit tests for operate_nifi_objects' phased, concurrent batch execution.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from nifi_mcp_server.api_tools.operation import operate_nifi_objects
+from nifi_mcp_server.nifi_client import NiFiClient
+from nifi_mcp_server.request_context import current_nifi_client
+
+
+class FakeNiFi:
+    """Minimal NiFi API holding processor and controller service state."""
+
+    def __init__(self, processor_ids, group_id="pg-1", services=None):
+        self.group_id = group_id
+        self.processors = {
+            pid: {"name": pid, "state": "STOPPED", "validationStatus": "VALID", "version": 1}
+            for pid in processor_ids
+        }
+        self.services = {
+            sid: {"name": sid, "state": "DISABLED", "validationStatus": "VALID", "version": 1, "properties": properties}
+            for sid, properties in (services or {"cs-1": {}}).items()
+        }
+        self.requests = []
+
+    def _processor_entity(self, pid):
+        proc = self.processors[pid]
+        return {
+            "id": pid,
+            "revision": {"version": proc["version"]},
+            "component": {"id": pid, "parentGroupId": self.group_id, "name": proc["name"], "state": proc["state"],
+                          "validationStatus": proc["validationStatus"]},
+        }
+
+    def _service_entity(self, sid):
+        svc = self.services[sid]
+        return {"id": sid, "revision": {"version": svc["version"]}, "component": {"id": sid, **svc}}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.replace("/nifi-api", "")
+        if path == "/access/token":
+            return httpx.Response(201, text="token")
+        self.requests.append((request.method, path))
+        body = json.loads(request.content) if request.content else {}
+
+        if path == f"/flow/process-groups/{self.group_id}":
+            if request.method == "PUT":
+                for pid in body.get("components", self.processors):
+                    self.processors[pid]["state"] = body["state"]
+                    self.processors[pid]["version"] += 1
+                return httpx.Response(200, json={"id": self.group_id, "state": body["state"]})
+            return httpx.Response(200, json={"processGroupFlow": {
+                "id": self.group_id,
+                "breadcrumb": {"breadcrumb": {"name": "Group"}},
+                "flow": {"processors": [self._processor_entity(pid) for pid in self.processors]},
+            }})
+
+        kind, object_id, *rest = path.strip("/").split("/")
+        if kind == "processors":
+            if request.method == "PUT":
+                proc = self.processors[object_id]
+                assert body["revision"]["version"] == proc["version"]
+                proc["state"] = body["state"]
+                proc["version"] += 1
+            return httpx.Response(200, json=self._processor_entity(object_id))
+        if kind == "controller-services":
+            if request.method == "PUT":
+                self.services[object_id]["state"] = body["state"]
+                self.services[object_id]["version"] += 1
+            return httpx.Response(200, json=self._service_entity(object_id))
+        return httpx.Response(404)
+
+
+@pytest.fixture
+async def fake_nifi():
+    fakes = []
+
+    async def install(processor_ids, **kwargs):
+        fake = FakeNiFi(processor_ids, **kwargs)
+        client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(fake.handler))
+        await client.authenticate()
+        token = current_nifi_client.set(client)
+        fakes.append((client, token))
+        fake.client = client
+        return fake
+
+    yield install
+    for client, token in fakes:
+        current_nifi_client.reset(token)
+        await client.close()
+
+
+@pytest.mark.anyio
+async def test_services_are_enabled_before_processors_start(fake_nifi):
+    fake = await fake_nifi(["p1", "p2"])
+
+    results = await operate_nifi_objects([
+        {"object_type": "processor", "object_id": "p1", "operation_type": "start"},
+        {"object_type": "processor", "object_id": "p2", "operation_type": "start"},
+        {"object_type": "controller_service", "object_id": "cs-1", "operation_type": "enable"},
+    ])
+
+    assert [r["request_index"] for r in results] == [0, 1, 2]
+    assert all(r["status"] == "success" for r in results)
+    puts = [path for method, path in fake.requests if method == "PUT"]
+    assert puts[0] == "/controller-services/cs-1/run-status"
+    # Each start reuses the pre-check revision: one GET and one PUT per processor
+    assert sum(1 for _, path in fake.requests if path == "/processors/p1") == 1
+    assert len(fake.requests) == 2 + 2 * 2
+
+
+@pytest.mark.anyio
+async def test_whole_group_start_is_one_scheduling_call(fake_nifi):
+    processor_ids = [f"p{i}" for i in range(20)]
+    fake = await fake_nifi(processor_ids)
+
+    results = await operate_nifi_objects([
+        {"object_type": "processor", "object_id": pid, "operation_type": "start", "process_group_id": "pg-1"}
+        for pid in processor_ids
+    ])
+
+    assert all(r["status"] == "success" for r in results)
+    assert [r["object_id"] for r in results] == processor_ids
+    assert fake.requests == [
+        ("GET", "/flow/process-groups/pg-1"),
+        ("PUT", "/flow/process-groups/pg-1"),
+        ("GET", "/flow/process-groups/pg-1"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_partial_group_falls_back_to_per_processor_calls(fake_nifi):
+    fake = await fake_nifi(["p1", "p2", "p3"])
+
+    results = await operate_nifi_objects([
+        {"object_type": "processor", "object_id": pid, "operation_type": "stop", "process_group_id": "pg-1"}
+        for pid in ["p1", "p2"]
+    ])
+
+    assert all(r["status"] == "success" for r in results)
+    assert ("PUT", "/flow/process-groups/pg-1") not in fake.requests
+    assert fake.processors["p3"]["state"] == "STOPPED"
+    assert sorted(path for method, path in fake.requests if method == "PUT") == [
+        "/processors/p1/run-status", "/processors/p2/run-status"
+    ]
+
+
+@pytest.mark.anyio
+async def test_known_parent_group_is_collapsed_without_a_hint(fake_nifi):
+    fake = await fake_nifi(["p1", "p2", "p3"])
+    for pid in fake.processors:
+        await fake.client.get_processor_details(pid)
+    fake.requests.clear()
+
+    results = await operate_nifi_objects([
+        {"object_type": "processor", "object_id": pid, "operation_type": "start"} for pid in fake.processors
+    ])
+
+    assert all(r["status"] == "success" for r in results)
+    assert ("PUT", "/flow/process-groups/pg-1") in fake.requests
+    assert not any(path.startswith("/processors/") for _, path in fake.requests)
+
+
+@pytest.mark.anyio
+async def test_repeated_operations_on_one_object_keep_the_given_order(fake_nifi):
+    fake = await fake_nifi([])
+
+    results = await operate_nifi_objects([
+        {"object_type": "controller_service", "object_id": "cs-1", "operation_type": "enable"},
+        {"object_type": "controller_service", "object_id": "cs-1", "operation_type": "disable"},
+    ])
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert fake.services["cs-1"]["state"] == "DISABLED"
+
+
+@pytest.mark.anyio
+async def test_referenced_services_are_enabled_first_and_disabled_last(fake_nifi):
+    fake = await fake_nifi([], services={"cs-writer": {"Schema Registry": "cs-registry"}, "cs-registry": {}})
+    operations = [
+        {"object_type": "controller_service", "object_id": sid, "operation_type": "enable"}
+        for sid in ["cs-writer", "cs-registry"]
+    ]
+
+    await operate_nifi_objects(operations)
+    enabled = [path for method, path in fake.requests if method == "PUT"]
+    fake.requests.clear()
+    await operate_nifi_objects([{**op, "operation_type": "disable"} for op in reversed(operations)])
+    disabled = [path for method, path in fake.requests if method == "PUT"]
+
+    assert enabled == ["/controller-services/cs-registry/run-status", "/controller-services/cs-writer/run-status"]
+    assert disabled == ["/controller-services/cs-writer/run-status", "/controller-services/cs-registry/run-status"]
+
+
+@pytest.mark.anyio
+async def test_services_read_for_ordering_are_not_fetched_again(fake_nifi):
+    fake = await fake_nifi([], services={"cs-writer": {"Schema Registry": "cs-registry"}, "cs-registry": {}, "cs-cache": {}})
+    operations = [
+        {"object_type": "controller_service", "object_id": sid, "operation_type": operation}
+        for operation in ("enable", "disable") for sid in fake.services
+    ]
+
+    results = await operate_nifi_objects(operations[:3])
+    results += await operate_nifi_objects(operations[3:])
+
+    assert [r["status"] for r in results] == ["success"] * 6
+    assert [method for method, _ in fake.requests].count("GET") == 6
+    assert [method for method, _ in fake.requests].count("PUT") == 6
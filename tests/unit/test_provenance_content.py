@@ -0,0 +1,115 @@
+"""
+Unit tests for streamed, bounded-memory provenance content sampling and get_flowfile_event_details.
+"""
+
+import hashlib
+import tracemalloc
+
+import pytest
+
+from nifi_mcp_server.api_tools.review import get_flowfile_event_details
+from nifi_mcp_server.async_request_poller import PollSchedule, run_async_request
+from nifi_mcp_server.provenance_content import decode_content, sample_content
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+MIB = 1024 * 1024
+
+
+async def _chunks(count, size=MIB, consumed=None):
+    for index in range(count):
+        if consumed is not None:
+            consumed.append(index)
+        yield bytes([index % 256]) * size
+
+
+@pytest.mark.anyio
+async def test_large_stream_is_sampled_and_hashed_in_bounded_memory():
+    expected = hashlib.sha256()
+    for index in range(64):
+        expected.update(bytes([index % 256]) * MIB)
+
+    tracemalloc.start()
+    try:
+        sample = await sample_content(_chunks(64), head_bytes=4096, tail_bytes=4096, hash_content=True)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert sample.complete and sample.bytes_read == 64 * MIB
+    assert sample.head == b"\x00" * 4096 and sample.tail == bytes([63]) * 4096
+    assert sample.sha256 == expected.hexdigest()
+    # A couple of chunks at most, never the 64 MiB body
+    assert peak < 4 * MIB
+
+
+@pytest.mark.anyio
+async def test_head_only_sample_stops_downloading():
+    consumed = []
+
+    sample = await sample_content(_chunks(100, size=1024, consumed=consumed), head_bytes=1500)
+
+    assert len(sample.head) == 1500
+    assert consumed == [0, 1]
+    assert sample.truncated
+
+
+def test_cut_multibyte_character_does_not_force_base64():
+    data = "naïve café".encode("utf-8")
+
+    assert decode_content(data[:-1], truncated=True) == "naïve caf"
+    assert decode_content(b"\xff\xfe\x00\x01") == "//4AAQ=="
+
+
+@pytest.fixture
+async def provenance_events(simulated_nifi):
+    async def install(content_bytes):
+        simulator = NiFiSimulator(CanvasSpec(depth=0, processors_per_group=1, provenance_content_bytes=content_bytes))
+        client = await simulated_nifi(simulator)
+        payload = {"processor_id": simulator.component_ids("processors")[0], "max_results": 5}
+        events = await run_async_request(
+            "provenance query",
+            submit=lambda: client.submit_provenance_query(payload),
+            get_status=client.get_provenance_query,
+            delete=client.delete_provenance_query,
+            timeout_seconds=5,
+            schedule=PollSchedule(initial_interval=0.001, max_interval=0.01),
+        )
+        simulator.reset_stats()
+        return simulator, {event["eventType"]: event["eventId"] for event in events["results"]["provenanceEvents"]}
+
+    return install
+
+
+@pytest.mark.anyio
+async def test_shared_content_claim_reads_content_once(provenance_events):
+    simulator, event_ids = await provenance_events(1024)
+
+    details = await get_flowfile_event_details(event_ids["ATTRIBUTES_MODIFIED"])
+
+    assert details["content_identical"] and details["content_comparison"] == "content_claim"
+    assert len(details["content"]) == 1024
+    assert simulator.stats.by_route["GET /provenance-events/{event_id}/content/{direction}"] == 1
+
+
+@pytest.mark.anyio
+async def test_different_content_is_compared_by_hash(provenance_events):
+    _, event_ids = await provenance_events(1024)
+
+    details = await get_flowfile_event_details(event_ids["CONTENT_MODIFIED"])
+
+    assert details["content_comparison"] == "sha256"
+    assert not details["content_identical"]
+    assert set(details["content"]) == {"input", "output"}
+
+
+@pytest.mark.anyio
+async def test_large_content_returns_a_head_and_tail_preview(provenance_events):
+    _, event_ids = await provenance_events(100_000)
+
+    details = await get_flowfile_event_details(event_ids["ATTRIBUTES_MODIFIED"], max_content_bytes=1000,
+                                               large_content_preview="head_and_tail")
+
+    assert details["content_too_large"] and details["content"] is None
+    preview = details["content_preview"]
+    assert len(preview["head"]) == 500 and len(preview["tail"]) == 500
+    assert preview["omitted_bytes"] == 99_000
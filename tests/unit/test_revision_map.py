@@ -0,0 +1,166 @@
+"""
+Unit tests for the per-client revision map and optimistic writes.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from nifi_mcp_server.nifi_client import NiFiClient
+from nifi_mcp_server.revision_map import RevisionMap, is_entity_path, is_listing_path, is_stale_revision_conflict
+
+
+def _entity(component_id, version, parent=None):
+    return {"id": component_id, "revision": {"version": version}, "component": {"id": component_id, "parentGroupId": parent}}
+
+
+def test_older_revisions_never_replace_newer():
+    revisions = RevisionMap()
+    revisions.remember(_entity("p1", 3, parent="pg"))
+    revisions.remember(_entity("p1", 2))
+    assert revisions.get("p1")["version"] == 3
+    assert revisions.parent_group_id("p1") == "pg"
+
+
+def test_forget_group_is_transitive():
+    revisions = RevisionMap()
+    revisions.remember(_entity("child-pg", 1, parent="root"))
+    revisions.remember(_entity("p1", 1, parent="child-pg"))
+    revisions.remember(_entity("p2", 1, parent="other"))
+    revisions.forget_group("root")
+    assert revisions.get("child-pg") is None
+    assert revisions.get("p1") is None
+    assert revisions.get("p2") is not None
+
+
+def test_flow_responses_and_paths():
+    revisions = RevisionMap()
+    revisions.remember_response({"processGroupFlow": {"flow": {
+        "processors": [_entity("p1", 4, parent="pg")],
+        "connections": [_entity("c1", 2, parent="pg")],
+    }}})
+    assert revisions.get("c1")["version"] == 2
+    assert is_entity_path("/nifi-api/processors/p1/run-status")
+    assert is_entity_path("/nifi-api/process-groups/pg/processors")
+    assert not is_entity_path("/nifi-api/flow/process-groups/pg")
+    assert is_listing_path("/nifi-api/process-groups/pg/processors")
+    assert not is_listing_path("/nifi-api/process-groups/pg")
+    assert is_stale_revision_conflict(409, "Error: 3 is not the most up-to-date revision.")
+    assert not is_stale_revision_conflict(409, "Processor is running")
+
+
+class FakeProcessorApi:
+    """Serves one component whose revision can be bumped behind the client's back."""
+
+    def __init__(self):
+        self.version = 0
+        self.state = "STOPPED"
+        self.requests = []
+        self.conflict_message = None
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access/token"):
+            return httpx.Response(201, text="token")
+        self.requests.append(request.method)
+        if request.method == "PUT":
+            body = json.loads(request.content)
+            if self.conflict_message:
+                return httpx.Response(409, text=self.conflict_message)
+            if body["revision"]["version"] != self.version:
+                return httpx.Response(409, text=f"{body['revision']['version']} is not the most up-to-date revision.")
+            self.version += 1
+            self.state = body.get("state", self.state)
+        elif request.method == "DELETE":
+            version = int(request.url.params["version"])
+            if version != self.version:
+                return httpx.Response(409, text=f"{version} is not the most up-to-date revision.")
+        component_id = request.url.path.rstrip("/").split("/")[-1]
+        if component_id == "run-status":
+            component_id = request.url.path.rstrip("/").split("/")[-2]
+        return httpx.Response(200, json={
+            "id": component_id,
+            "revision": {"version": self.version},
+            "component": {"id": component_id, "parentGroupId": "pg-1", "state": self.state},
+        })
+
+
+@pytest.fixture
+async def processor_api():
+    api = FakeProcessorApi()
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(api.handler))
+    await client.authenticate()
+    yield api, client
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_known_revision_skips_the_get(processor_api):
+    api, client = processor_api
+
+    await client.update_processor_state("p1", "RUNNING")  # unknown: GET + PUT
+    await client.update_processor_state("p1", "STOPPED")  # revision from the last response
+    await client.update_processor_config("p1", "properties", {"Log Level": "warn"})
+
+    assert api.requests == ["GET", "PUT", "PUT", "PUT"]
+    assert client.revisions.get("p1")["version"] == 3
+    assert client.revisions.parent_group_id("p1") == "pg-1"
+
+
+@pytest.mark.anyio
+async def test_stale_revision_is_refetched_and_retried_once(processor_api):
+    api, client = processor_api
+    await client.get_processor_details("p1")
+    api.version = 5  # another client changed the processor
+
+    updated = await client.update_processor_state("p1", "RUNNING")
+
+    assert updated["component"]["state"] == "RUNNING"
+    assert api.requests == ["GET", "PUT", "GET", "PUT"]
+
+
+@pytest.mark.anyio
+async def test_state_conflicts_are_not_retried(processor_api):
+    api, client = processor_api
+    await client.get_processor_details("p1")
+    api.conflict_message = "Processor p1 is currently running"
+
+    with pytest.raises(ValueError):
+        await client.update_processor_config("p1", "properties", {"Log Level": "warn"})
+    assert api.requests == ["GET", "PUT"]
+
+
+@pytest.mark.anyio
+async def test_stale_revision_delete_is_refetched_and_retried_once(processor_api):
+    api, client = processor_api
+    await client.get_processor_details("p1")
+    api.version = 2  # another client changed the processor
+
+    assert await client.delete_processor("p1")
+    assert api.requests == ["GET", "DELETE", "GET", "DELETE"]
+    assert client.revisions.get("p1") is None
+
+
+@pytest.mark.anyio
+async def test_explicit_delete_version_is_not_retried(processor_api):
+    api, client = processor_api
+    api.version = 2
+
+    with pytest.raises(ValueError, match="Conflict deleting processor"):
+        await client.delete_processor("p1", version=1)
+    assert api.requests == ["DELETE"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fetch, delete", [
+    ("get_process_group_details", "delete_process_group"),
+    ("get_controller_service_details", "delete_controller_service"),
+])
+async def test_stale_revision_group_and_service_deletes_are_retried(processor_api, fetch, delete):
+    api, client = processor_api
+    await getattr(client, fetch)("c1")
+    api.version = 4
+
+    assert await getattr(client, delete)("c1")
+    assert api.requests == ["GET", "DELETE", "GET", "DELETE"]
+    assert client.revisions.get("c1") is None
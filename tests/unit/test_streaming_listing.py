@@ -0,0 +1,81 @@
+"""
+Unit tests for the incremental recursive listing behind list_nifi_objects_with_streaming
+and its forwarding by the SSE endpoint.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from nifi_mcp_server import fastmcp_sse_server
+from nifi_mcp_server.api_tools.review import list_nifi_objects_with_streaming, open_nifi_objects_stream
+from tests.utils.nifi_simulator import CanvasSpec, NiFiSimulator
+
+SPEC = CanvasSpec(depth=2, groups_per_group=3, processors_per_group=2)
+
+
+@pytest.fixture
+async def simulated_client(simulated_nifi):
+    simulator = NiFiSimulator(SPEC, latency_seconds=0.002)
+    return simulator, await simulated_nifi(simulator)
+
+
+@pytest.mark.anyio
+async def test_first_group_arrives_before_traversal_finishes_and_can_resume(simulated_client):
+    simulator, _ = simulated_client
+    stream = await open_nifi_objects_stream("processors", bypass_cache=True)
+    chunks = stream.chunks()
+
+    first = await chunks.__anext__()
+    await chunks.aclose()
+
+    assert len(first["objects"]) == SPEC.processors_per_group
+    summary = stream.summary()
+    assert not summary["completed"] and summary["continuation_token"]
+    assert summary["processed_count"] < SPEC.group_count
+
+    resumed = await open_nifi_objects_stream("processors", continuation_token=summary["continuation_token"],
+                                             bypass_cache=True)
+    rest = [chunk async for chunk in resumed.chunks()]
+    assert resumed.summary()["completed"]
+    group_ids = [first["process_group_id"]] + [chunk["process_group_id"] for chunk in rest]
+    assert sorted(group_ids) == sorted(simulator.component_ids("processGroups"))
+
+
+@pytest.mark.anyio
+async def test_tool_result_keeps_its_shape(simulated_client):
+    result = await list_nifi_objects_with_streaming("processors", bypass_cache=True)
+
+    assert result["completed"] and result["processed_count"] == SPEC.group_count
+    assert len(result["results"]) == SPEC.group_count
+    assert {"process_group_id", "process_group_name", "objects"} <= set(result["results"][0])
+    assert result["progress_info"]["object_type"] == "processors"
+
+    groups = await list_nifi_objects_with_streaming("process_groups", bypass_cache=True)
+    assert groups["completed"]
+    assert len(groups["results"]["child_process_groups"]) == SPEC.groups_per_group
+
+
+@pytest.mark.anyio
+async def test_sse_endpoint_sends_each_group_as_its_own_event(simulated_client, monkeypatch):
+    _, client = simulated_client
+
+    async def get_client(server_id, bound_logger=None):
+        return client
+
+    monkeypatch.setattr(fastmcp_sse_server, "get_nifi_servers", lambda: [{"id": "sim"}])
+    monkeypatch.setattr(fastmcp_sse_server, "get_nifi_client", get_client)
+    transport = httpx.ASGITransport(app=fastmcp_sse_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://mcp") as api:
+        response = await api.get(
+            "/sse/tools/list_nifi_objects_with_streaming",
+            params={"arguments": json.dumps({"object_type": "processors", "bypass_cache": True})},
+            headers={"X-Nifi-Server-Id": "sim"},
+        )
+
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    chunks = [event["chunk"] for event in events if "chunk" in event]
+    assert len(chunks) == SPEC.group_count
+    assert events[-1]["type"] == "complete"
+    assert events[-1]["result"]["completed"] and "results" not in events[-1]["result"]
@@ -0,0 +1,105 @@
+"""
+Unit tests for the memoized token counting and the per-conversation token ledger.
+"""
+
+import pytest
+
+from nifi_chat_ui.llm.utils import token_counter as token_counter_module
+from nifi_chat_ui.llm.utils.token_counter import TokenCounter
+
+MODEL = "gpt-test"
+
+
+class _WordEncoding:
+    """Stands in for a tiktoken encoding: one token per word, counting encode calls."""
+    name = "word_test"
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    token_counter_module._message_token_cache.clear()
+    token_counter_module._tool_token_cache.clear()
+    encoding = _WordEncoding()
+    monkeypatch.setitem(token_counter_module._encoders, MODEL, encoding)
+    yield encoding
+    token_counter_module._message_token_cache.clear()
+    token_counter_module._tool_token_cache.clear()
+
+
+def _conversation(turns):
+    messages = [{"role": "system", "content": "You are a NiFi expert."}]
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"List the processors of group {turn}"})
+        messages.append({"role": "assistant", "content": None, "tool_calls": [
+            {"id": f"call-{turn}", "type": "function",
+             "function": {"name": "list_nifi_objects", "arguments": '{"object_type": "processors"}'}}]})
+        messages.append({"role": "tool", "tool_call_id": f"call-{turn}", "content": "GenerateFlowFile, LogAttribute"})
+    return messages
+
+
+TOOLS = [{"type": "function", "function": {"name": "list_nifi_objects", "description": "Lists objects",
+                                           "parameters": {"type": "object", "properties": {}}}}]
+
+
+def test_messages_and_tools_are_tokenized_once(encoding):
+    counter = TokenCounter()
+    messages = _conversation(20)
+
+    first = counter.calculate_input_tokens(messages, "openai", MODEL, TOOLS)
+    encoded_after_first = len(encoding.encoded)
+    messages.append({"role": "user", "content": "And the connections?"})
+    second = counter.calculate_input_tokens(messages, "openai", MODEL, TOOLS)
+
+    assert second == first + 3
+    # Only the new message is encoded again; the history and the tool definitions come from the caches
+    assert encoding.encoded[encoded_after_first:] == ["And the connections?"]
+    assert counter.tool_tokens(TOOLS, "openai", MODEL) == counter.count_tokens_openai(
+        token_counter_module.json.dumps(TOOLS), MODEL)
+
+
+def test_changed_tool_parameters_are_recounted(encoding):
+    counter = TokenCounter()
+    before = counter.tool_tokens(TOOLS, "openai", MODEL)
+    changed = [{"type": "function", "function": {"name": "list_nifi_objects", "description": "Lists objects",
+                                                 "parameters": {"type": "object", "properties": {
+                                                     "object_type": {"type": "string"}}}}}]
+
+    after = counter.tool_tokens(changed, "openai", MODEL)
+
+    assert after == counter.count_tokens_openai(token_counter_module.json.dumps(changed), MODEL)
+    assert after != before
+
+
+def test_ledger_prefix_sums_match_full_count(encoding):
+    counter = TokenCounter()
+    messages = _conversation(5)
+
+    ledger = counter.ledger(messages, "openai", MODEL, TOOLS)
+
+    assert ledger.total == counter.calculate_input_tokens(messages, "openai", MODEL, TOOLS)
+    assert ledger.tokens(1, 4) == sum(counter.message_tokens(m, "openai", MODEL) for m in messages[1:4])
+    assert ledger.tokens(len(messages)) == 0
+
+    added = ledger.append({"role": "user", "content": "Start them all"})
+    assert added == 3 and ledger.tokens(len(messages)) == 3 and len(ledger) == len(messages) + 1
+
+
+def test_approximated_counts_are_not_reused_once_the_tokenizer_loads(encoding, monkeypatch):
+    counter = TokenCounter()
+    message = {"role": "user", "content": "Show me the bulletins"}
+    monkeypatch.delitem(token_counter_module._encoders, MODEL)
+    monkeypatch.setitem(token_counter_module._encoder_failures, MODEL, token_counter_module.time.monotonic())
+    monkeypatch.setattr(_WordEncoding, "encode", lambda self, text: list(text))
+
+    approximated = counter.message_tokens(message, "openai", MODEL)
+    token_counter_module._encoders[MODEL] = encoding
+
+    assert approximated == 4
+    assert counter.message_tokens(message, "openai", MODEL) == len("Show me the bulletins")
@@ -0,0 +1,78 @@
+"""
+Unit tests for the precomputed /tools catalog.
+"""
+
+from types import SimpleNamespace
+
+import nifi_mcp_server.api_tools.review  # noqa: F401  (registers the review tools)
+from nifi_mcp_server.api_tools.utils import _tool_phase_registry
+from nifi_mcp_server.core import mcp
+from nifi_mcp_server.tool_catalog import ToolCatalog, build_tool_catalog, etag_matches, format_tool_definition
+
+
+def _tool(name, docstring, parameters=None):
+    return SimpleNamespace(name=name, description=docstring, parameters=parameters or {})
+
+
+def test_definition_keeps_description_example_and_parameter_docs():
+    docstring = """Lists things.
+
+    Example:
+        list_things(limit=5)
+
+    Args:
+        limit: How many to return.
+
+    Returns:
+        The things.
+    """
+    parameters = {
+        "properties": {"limit": {"type": "integer", "title": "Limit", "default": 10, "enum": [5, 10]}},
+        "required": ["limit"],
+    }
+
+    definition = format_tool_definition(_tool("list_things", docstring, parameters), ["Review"])
+
+    function = definition["function"]
+    assert function["description"].startswith("Lists things.")
+    assert "**Example:**\nlist_things(limit=5)" in function["description"]
+    assert function["description"].endswith("**Returns:**\nThe things.")
+    assert function["parameters"] == {
+        "type": "object",
+        "properties": {"limit": {"type": "integer", "enum": ["5", "10"], "description": "How many to return."}},
+        "required": ["limit"],
+    }
+    assert definition["phases"] == ["Review"]
+
+
+def test_phase_lists_are_precomputed_and_versioned():
+    catalog = ToolCatalog([
+        format_tool_definition(_tool("review_tool", "Reviews."), ["Review"]),
+        format_tool_definition(_tool("shared_tool", "Shared."), ["Review", "Modify"]),
+        format_tool_definition(_tool("untagged_tool", "Untagged."), []),
+    ])
+
+    review = catalog.for_phase("review")
+    assert [t["function"]["name"] for t in review.tools] == ["review_tool", "shared_tool"]
+    assert catalog.for_phase("Review") is review
+    assert len(catalog.for_phase(None).tools) == len(catalog.for_phase("All").tools) == 3
+    assert catalog.for_phase("Unknown").tools == []
+    assert review.etag == f'"{catalog.version}-review"'
+    assert ToolCatalog(catalog.tools).version == catalog.version
+    assert ToolCatalog(catalog.tools[:2]).version != catalog.version
+
+
+def test_etag_comparison_accepts_lists_and_weak_tags():
+    assert etag_matches('"abc-all"', '"abc-all"')
+    assert etag_matches('"old-all", W/"abc-all"', '"abc-all"')
+    assert etag_matches("*", '"abc-all"')
+    assert not etag_matches(None, '"abc-all"')
+    assert not etag_matches('"old-all"', '"abc-all"')
+
+
+def test_registered_tools_are_formatted_once():
+    catalog = build_tool_catalog(mcp._tool_manager, _tool_phase_registry)
+
+    names = [tool["function"]["name"] for tool in catalog.for_phase(None).tools]
+    assert "list_nifi_objects" in names
+    assert all(isinstance(tool["function"]["description"], str) for tool in catalog.tools)
@@ -0,0 +1,90 @@
+"""
+Unit tests for the per-turn tool-call scheduler of the chat UI.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import nifi_mcp_server.api_tools.modification  # noqa: F401  (registers the modification tools)
+import nifi_mcp_server.api_tools.review  # noqa: F401  (registers the review tools)
+from nifi_chat_ui.tool_scheduler import plan_batches, read_only_tool_names, run_tool_calls, run_tool_calls_async
+from nifi_mcp_server.api_tools.utils import _tool_phase_registry
+from nifi_mcp_server.core import mcp
+from nifi_mcp_server.tool_catalog import build_tool_catalog
+
+READ_ONLY = {"list_nifi_objects", "get_nifi_object_details"}
+
+
+def _call(name, call_id=None):
+    return {"id": call_id or name, "type": "function", "function": {"name": name, "arguments": "{}"}}
+
+
+def test_review_tools_are_read_only():
+    tools = build_tool_catalog(mcp._tool_manager, _tool_phase_registry).tools
+
+    read_only = read_only_tool_names(tools)
+
+    assert {"list_nifi_objects", "get_nifi_object_details", "search_nifi_flow"} <= read_only
+    assert "delete_nifi_objects" not in read_only and "update_nifi_connection" not in read_only
+
+
+def test_reads_are_batched_between_writes():
+    calls = [_call("list_nifi_objects", "a"), _call("get_nifi_object_details", "b"), _call("delete_nifi_objects", "c"),
+             _call("delete_nifi_objects", "d"), _call("list_nifi_objects", "e"), _call("unknown_tool", "f")]
+
+    assert plan_batches(calls, READ_ONLY) == [[0, 1], [2], [3], [4], [5]]
+
+
+@pytest.mark.anyio
+async def test_lookups_overlap_and_results_keep_call_order():
+    calls = [_call("list_nifi_objects", f"call-{index}") for index in range(5)]
+    delays = [0.1, 0.05, 0.02, 0.08, 0.01]
+
+    async def execute(index, tool_call):
+        await asyncio.sleep(delays[index])
+        return tool_call["id"]
+
+    start = time.perf_counter()
+    results = await run_tool_calls_async(calls, execute, READ_ONLY, max_concurrency=5)
+
+    assert time.perf_counter() - start < sum(delays) / 2
+    assert results == [f"call-{index}" for index in range(5)]
+
+
+@pytest.mark.anyio
+async def test_mutating_call_runs_alone():
+    calls = [_call("list_nifi_objects", "before"), _call("delete_nifi_objects", "write"), _call("list_nifi_objects", "after")]
+    events = []
+
+    async def execute(index, tool_call):
+        events.append(("start", tool_call["id"]))
+        await asyncio.sleep(0.01)
+        events.append(("end", tool_call["id"]))
+        return index
+
+    assert await run_tool_calls_async(calls, execute, READ_ONLY, max_concurrency=4) == [0, 1, 2]
+    assert events == [("start", "before"), ("end", "before"), ("start", "write"), ("end", "write"),
+                      ("start", "after"), ("end", "after")]
+
+
+def test_threaded_lookups_overlap_and_stop_between_batches():
+    calls = [_call("list_nifi_objects", "a"), _call("get_nifi_object_details", "b"), _call("delete_nifi_objects", "c")]
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def execute(index, tool_call):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return tool_call["id"]
+
+    stopped = iter([False, True])
+    results = run_tool_calls(calls, execute, READ_ONLY, max_concurrency=4, should_stop=lambda: next(stopped))
+
+    assert results == ["a", "b", None]
+    assert peak[0] == 2
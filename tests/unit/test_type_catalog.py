@@ -0,0 +1,97 @@
+"""
+Unit tests for the per-server NiFi type catalog.
+"""
+
+import httpx
+import pytest
+
+from nifi_mcp_server.nifi_client import NiFiClient
+from nifi_mcp_server.type_catalog import TypeCatalog, TypeCatalogRegistry
+from nifi_mcp_server.api_tools import creation
+
+PROCESSOR_TYPES = [
+    {
+        "type": "org.apache.nifi.processors.standard.GenerateFlowFile",
+        "title": "GenerateFlowFile",
+        "description": "Creates FlowFiles with random data",
+        "tags": ["test", "random", "generate"],
+        "bundle": {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "1.0"},
+    },
+    {
+        "type": "org.apache.nifi.processors.standard.LogAttribute",
+        "title": "LogAttribute",
+        "description": "Emits attributes of the FlowFile at the specified log level",
+        "tags": ["attributes", "logging"],
+        "bundle": {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "1.0"},
+    },
+    {
+        "type": "org.apache.nifi.processors.kafka.PublishKafka",
+        "title": "PublishKafka",
+        "description": "Sends FlowFile contents to Kafka",
+        "tags": ["kafka", "put", "send"],
+        "bundle": {"group": "org.apache.nifi", "artifact": "nifi-kafka-nar", "version": "1.0"},
+    },
+]
+
+
+@pytest.fixture
+def catalog():
+    return TypeCatalog.from_types("processor", PROCESSOR_TYPES)
+
+
+def test_exact_type_lookup(catalog):
+    assert catalog.has_type("org.apache.nifi.processors.standard.LogAttribute")
+    assert not catalog.has_type("LogAttribute")
+    assert catalog.by_simple_name("logattribute")[0]["title"] == "LogAttribute"
+
+
+def test_search_matches_linear_scan_semantics(catalog):
+    def linear(query, artifact=None):
+        q = query.lower()
+        return [
+            t for t in PROCESSOR_TYPES
+            if (q in t["title"].lower() or q in t["type"].lower() or q in t["description"].lower()
+                or any(q in tag.lower() for tag in t["tags"]))
+            and (artifact is None or t["bundle"]["artifact"] == artifact)
+        ]
+
+    for query in ["log", "FLOWFILE", "kafka", "ra", "attr", "nothing-here", "standard"]:
+        assert catalog.search(query) == linear(query)
+    assert catalog.search("flowfile", bundle_artifact="NIFI-KAFKA-NAR") == linear("flowfile", "nifi-kafka-nar")
+
+
+def test_indexes(catalog):
+    assert [t["title"] for t in catalog.by_tag("Kafka")] == ["PublishKafka"]
+    assert len(catalog.by_artifact("nifi-standard-nar")) == 2
+
+
+def test_suggestions_rank_misspellings(catalog):
+    suggestions = catalog.suggest("LogAtribute", limit=2)
+    assert suggestions[0]["title"] == "LogAttribute"
+
+
+@pytest.mark.anyio
+async def test_catalog_is_fetched_once_per_server(monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access/token"):
+            return httpx.Response(201, text="token")
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"processorTypes": PROCESSOR_TYPES})
+
+    client = NiFiClient("https://nifi.test/nifi-api", "user", "pass", transport=httpx.MockTransport(handler), server_id="s1")
+    await client.authenticate()
+    registry = TypeCatalogRegistry()
+    monkeypatch.setattr(creation, "type_catalog_registry", registry)
+
+    for _ in range(40):
+        assert await creation._validate_processor_type_exists("org.apache.nifi.processors.standard.LogAttribute", client, "-", "-")
+    suggestions = await creation._get_processor_type_suggestions("GenerateFlow", client)
+
+    assert suggestions[0]["type"] == "org.apache.nifi.processors.standard.GenerateFlowFile"
+    assert calls == ["/nifi-api/flow/processor-types"]
+
+    await registry.get_processor_catalog(client, refresh=True)
+    assert len(calls) == 2
+    await client.close()
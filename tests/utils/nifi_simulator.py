@@ -0,0 +1,1214 @@
+"""
+In-process, stateful simulator of the NiFi REST API.
+
+The simulator implements the endpoints NiFiClient uses (flows, process groups, processors,
+ports, connections, controller services, queue drop and listing requests, provenance
+queries, bulletins, search, type listings and /access/token) on top of an in-memory
+canvas. Writes follow NiFi's optimistic locking: every entity carries a revision, a stale
+revision gets a 409, and deletes fail while components run or queues hold data.
+
+It is an ASGI app, so tests and benchmarks can drive a real NiFiClient against it without
+a network or a NiFi install:
+
+    simulator = NiFiSimulator(CanvasSpec.sized(10_000), latency_seconds=0.002)
+    client = NiFiClient(SIMULATOR_BASE_URL, "admin", "password", transport=simulator.transport())
+
+It can also be served for manual testing, with the MCP server's config.yaml pointing at
+http://localhost:8089/nifi-api:
+
+    python -m tests.utils.nifi_simulator --components 10000 --port 8089
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+SIMULATOR_BASE_URL = "http://nifi-simulator/nifi-api"
+API_PREFIX = "/nifi-api"
+
+_PROCESSOR_TYPES = [
+    ("org.apache.nifi.processors.standard.GenerateFlowFile", ["test", "random", "generate"]),
+    ("org.apache.nifi.processors.standard.LogAttribute", ["attributes", "logging"]),
+    ("org.apache.nifi.processors.standard.UpdateAttribute", ["attributes", "modification"]),
+    ("org.apache.nifi.processors.standard.RouteOnAttribute", ["attributes", "routing"]),
+    ("org.apache.nifi.processors.standard.ConvertRecord", ["record", "convert"]),
+    ("org.apache.nifi.processors.standard.InvokeHTTP", ["http", "rest", "client"]),
+    ("org.apache.nifi.processors.standard.HandleHttpRequest", ["http", "ingress", "web service"]),
+    ("org.apache.nifi.processors.standard.HandleHttpResponse", ["http", "egress", "web service"]),
+    ("org.apache.nifi.processors.standard.EvaluateJsonPath", ["json", "evaluate", "jsonpath"]),
+    ("org.apache.nifi.processors.standard.PutFile", ["put", "local", "files", "filesystem"]),
+]
+_CONTROLLER_SERVICE_TYPES = [
+    ("org.apache.nifi.json.JsonTreeReader", ["json", "reader", "record"]),
+    ("org.apache.nifi.json.JsonRecordSetWriter", ["json", "writer", "record"]),
+    ("org.apache.nifi.http.StandardHttpContextMap", ["http", "request", "response"]),
+]
+_BUNDLE = {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "1.28.0"}
+
+# Entity kinds, keyed the way NiFi names them in /flow/process-groups responses
+_PROCESSORS = "processors"
+_INPUT_PORTS = "inputPorts"
+_OUTPUT_PORTS = "outputPorts"
+_CONNECTIONS = "connections"
+_GROUPS = "processGroups"
+_SERVICES = "controllerServices"
+_CHILD_KINDS = (_PROCESSORS, _INPUT_PORTS, _OUTPUT_PORTS, _CONNECTIONS, _GROUPS, _SERVICES)
+
+# URL segment -> entity kind
+_KIND_SEGMENTS = {
+    "processors": _PROCESSORS,
+    "input-ports": _INPUT_PORTS,
+    "output-ports": _OUTPUT_PORTS,
+    "connections": _CONNECTIONS,
+    "process-groups": _GROUPS,
+    "controller-services": _SERVICES,
+}
+
+
+@dataclass
+class CanvasSpec:
+    """Shape of the generated canvas. Every group gets the same contents."""
+    depth: int = 1  # Levels of nested groups below root
+    groups_per_group: int = 2
+    processors_per_group: int = 10  # Chained by connections: P0 -> P1 -> ...
+    ports_per_group: int = 1  # Input and output ports in each non-root group
+    controller_services_per_group: int = 1
+    queued_flowfiles: int = 0  # Flowfiles initially queued on every connection
+    flowfile_size: int = 1024
+    running: bool = False  # Start processors and ports as RUNNING
+    bulletins_per_group: int = 0
+    provenance_events_per_query: int = 10
+    provenance_content_bytes: int = 1024
+    seed: int = 0
+
+    @property
+    def group_count(self) -> int:
+        return sum(self.groups_per_group ** level for level in range(self.depth + 1))
+
+    @property
+    def component_count(self) -> int:
+        """Processors, ports, connections, services and groups on the generated canvas."""
+        per_group = (
+            self.processors_per_group
+            + max(self.processors_per_group - 1, 0)
+            + self.controller_services_per_group
+        )
+        ports = 2 * self.ports_per_group * (self.group_count - 1)
+        return self.group_count * per_group + ports + (self.group_count - 1)
+
+    @classmethod
+    def sized(cls, components: int, depth: int = 2, groups_per_group: int = 4, **kwargs) -> "CanvasSpec":
+        """Returns a spec whose canvas holds roughly `components` components."""
+        spec = cls(depth=depth, groups_per_group=groups_per_group, processors_per_group=1, **kwargs)
+        spare = components - spec.component_count
+        # Each extra processor per group adds a processor and a connection in every group
+        spec.processors_per_group += max(0, math.ceil(spare / (2 * spec.group_count)))
+        return spec
+
+
+@dataclass
+class SimulatorStats:
+    """Traffic seen by the simulator since the last reset."""
+    requests: int = 0
+    bytes_received: int = 0
+    bytes_sent: int = 0
+    injected_errors: int = 0
+    by_route: Counter = field(default_factory=Counter)  # "GET /processors/{component_id}" -> count
+
+    @property
+    def writes(self) -> int:
+        return sum(count for route, count in self.by_route.items() if not route.startswith("GET "))
+
+
+@dataclass
+class _Node:
+    kind: str
+    id: str
+    parent_group_id: Optional[str]
+    component: Dict[str, Any]
+    version: int = 0
+    queued_count: int = 0  # Connections only
+    queued_bytes: int = 0
+
+
+@dataclass
+class _AsyncRequest:
+    """A drop request, queue listing or provenance query that completes after some polls."""
+    id: str
+    target_id: str
+    polls_remaining: int
+    submitted_at: float
+    original_count: int = 0
+    original_bytes: int = 0
+    finished: bool = False
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+class SimulatedNiFiError(Exception):
+    """Raised by request handlers to produce a NiFi-style plain-text error response."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class NiFiSimulator:
+    """
+    Stateful fake NiFi, served as an ASGI app.
+
+    Args:
+        spec: Canvas to generate at startup.
+        latency_seconds: Delay added to every request.
+        latency_jitter_seconds: Extra random delay of up to this many seconds per request.
+        error_rate: Probability (0-1) that a request fails with `error_status` instead of being
+            handled. /access/token is never failed.
+        error_status: Status code of injected failures.
+        async_request_polls: Status polls a drop request, listing request or provenance query
+            needs before it reports finished.
+        require_auth: Reject requests without a bearer token issued by /access/token.
+        token_ttl_seconds: Lifetime encoded in the `exp` claim of issued tokens.
+    """
+
+    def __init__(
+        self,
+        spec: Optional[CanvasSpec] = None,
+        latency_seconds: float = 0.0,
+        latency_jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        async_request_polls: int = 1,
+        require_auth: bool = True,
+        token_ttl_seconds: int = 3600,
+    ):
+        self.spec = spec or CanvasSpec()
+        self.latency_seconds = latency_seconds
+        self.latency_jitter_seconds = latency_jitter_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.async_request_polls = async_request_polls
+        self.require_auth = require_auth
+        self.token_ttl_seconds = token_ttl_seconds
+        self.stats = SimulatorStats()
+
+        self._random = random.Random(self.spec.seed)
+        self._fault_random = random.Random(self.spec.seed + 1)
+        self._nodes: Dict[str, _Node] = {}
+        # group ID -> kind -> child IDs (a dict keeps insertion order and O(1) removal)
+        self._children: Dict[str, Dict[str, Dict[str, None]]] = {}
+        self._tokens: set = set()
+        self._drop_requests: Dict[str, _AsyncRequest] = {}
+        self._listing_requests: Dict[str, _AsyncRequest] = {}
+        self._provenance_queries: Dict[str, _AsyncRequest] = {}
+        self._provenance_events: Dict[int, Dict[str, Any]] = {}
+        self._next_event_id = 1
+        self._bulletins: List[Dict[str, Any]] = []
+
+        self.root_id = self._new_id()
+        self._add_node(_GROUPS, self.root_id, None, {"name": "NiFi Flow", "position": {"x": 0.0, "y": 0.0}})
+        self._generate_group(self.root_id, level=0)
+
+        self.app = self._build_app()
+
+    # --- Public helpers ---
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def counting_receive():
+            message = await receive()
+            self.stats.bytes_received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.body":
+                self.stats.bytes_sent += len(message.get("body", b""))
+            await send(message)
+
+        self.stats.requests += 1
+        delay = self.latency_seconds + self._fault_random.uniform(0, self.latency_jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        path = scope["path"]
+        if self.error_rate and not path.endswith("/access/token") and self._fault_random.random() < self.error_rate:
+            self.stats.injected_errors += 1
+            self.stats.by_route[f"{scope['method']} <injected error>"] += 1
+            response = PlainTextResponse("Simulated NiFi failure", status_code=self.error_status)
+            await response(scope, counting_receive, counting_send)
+            return
+
+        await self.app(scope, counting_receive, counting_send)
+        route = scope.get("route")
+        template = route.path[len(API_PREFIX):] if route is not None else "<unmatched>"
+        # Name the generic component routes after their segment: "/processors/{component_id}"
+        template = template.replace("{segment}", scope.get("path_params", {}).get("segment", "{segment}"))
+        self.stats.by_route[f"{scope['method']} {template}"] += 1
+
+    def transport(self) -> httpx.ASGITransport:
+        """httpx transport that sends requests straight to this simulator."""
+        return httpx.ASGITransport(app=self)
+
+    def reset_stats(self):
+        self.stats = SimulatorStats()
+
+    def expire_tokens(self):
+        """Invalidates every issued token, so the next request of each client gets a 401."""
+        self._tokens.clear()
+
+    @property
+    def open_async_requests(self) -> int:
+        """Drop requests, listing requests and provenance queries that have not been deleted."""
+        return len(self._drop_requests) + len(self._listing_requests) + len(self._provenance_queries)
+
+    def component_ids(self, kind: str, group_id: Optional[str] = None) -> List[str]:
+        """IDs of all components of `kind` ("processors", "connections", ...), optionally within one group."""
+        if group_id is not None:
+            return list(self._children[group_id][kind])
+        return [node.id for node in self._nodes.values() if node.kind == kind]
+
+    def component(self, component_id: str) -> Dict[str, Any]:
+        """The current entity for a component, as NiFi would return it."""
+        return self._entity(self._node(component_id))
+
+    def queue_flowfiles(self, connection_id: str, count: int, size: Optional[int] = None):
+        node = self._node(connection_id, _CONNECTIONS)
+        node.queued_count += count
+        node.queued_bytes += count * (self.spec.flowfile_size if size is None else size)
+
+    # --- Canvas generation ---
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _add_node(self, kind: str, node_id: str, parent_group_id: Optional[str], component: Dict[str, Any]) -> _Node:
+        node = _Node(kind=kind, id=node_id, parent_group_id=parent_group_id, component=component, version=1)
+        self._nodes[node_id] = node
+        if kind == _GROUPS:
+            self._children[node_id] = {child_kind: {} for child_kind in _CHILD_KINDS}
+        if parent_group_id is not None:
+            self._children[parent_group_id][kind][node_id] = None
+        return node
+
+    def _generate_group(self, group_id: str, level: int):
+        spec = self.spec
+        state = "RUNNING" if spec.running else "STOPPED"
+        group_name = self._nodes[group_id].component["name"]
+
+        service_ids = []
+        for index in range(spec.controller_services_per_group):
+            service_type = _CONTROLLER_SERVICE_TYPES[index % len(_CONTROLLER_SERVICE_TYPES)][0]
+            service_id = self._new_id()
+            self._add_node(_SERVICES, service_id, group_id, {
+                "name": f"{group_name} Service {index}",
+                "type": service_type,
+                "state": "ENABLED" if spec.running else "DISABLED",
+                "properties": {},
+            })
+            service_ids.append(service_id)
+
+        if group_id != self.root_id:
+            for index in range(spec.ports_per_group):
+                for kind, label in ((_INPUT_PORTS, "In"), (_OUTPUT_PORTS, "Out")):
+                    self._add_node(kind, self._new_id(), group_id, {
+                        "name": f"{group_name} {label} {index}",
+                        "state": state,
+                        "position": {"x": float(index * 200), "y": -200.0},
+                    })
+
+        previous_id = None
+        for index in range(spec.processors_per_group):
+            processor_type = _PROCESSOR_TYPES[index % len(_PROCESSOR_TYPES)][0]
+            processor_id = self._new_id()
+            properties = {"Record Reader": service_ids[0]} if service_ids and index == 0 else {}
+            self._add_node(_PROCESSORS, processor_id, group_id, {
+                "name": f"{group_name} {processor_type.rsplit('.', 1)[-1]} {index}",
+                "type": processor_type,
+                "state": state,
+                "position": {"x": float(index * 400), "y": 0.0},
+                "config": {
+                    "properties": properties,
+                    "autoTerminatedRelationships": [],
+                    "schedulingStrategy": "TIMER_DRIVEN",
+                    "schedulingPeriod": "0 sec",
+                    "concurrentlySchedulableTaskCount": 1,
+                },
+            })
+            if previous_id is not None:
+                connection = self._add_connection(group_id, previous_id, processor_id, ["success"])
+                connection.queued_count = spec.queued_flowfiles
+                connection.queued_bytes = spec.queued_flowfiles * spec.flowfile_size
+            previous_id = processor_id
+
+        for index in range(spec.bulletins_per_group):
+            processor_ids = list(self._children[group_id][_PROCESSORS])
+            if processor_ids:
+                source = self._nodes[processor_ids[index % len(processor_ids)]]
+                self._add_bulletin(source, "WARNING", f"Simulated warning {index} from {source.component['name']}")
+
+        if level < spec.depth:
+            for index in range(spec.groups_per_group):
+                child_id = self._new_id()
+                name = f"Group {level + 1}.{index}" if group_id == self.root_id else f"{group_name}.{index}"
+                self._add_node(_GROUPS, child_id, group_id, {
+                    "name": name,
+                    "position": {"x": float(index * 600), "y": 600.0},
+                })
+                self._generate_group(child_id, level + 1)
+
+    def _add_connection(self, group_id: str, source_id: str, destination_id: str,
+                        relationships: List[str], name: str = "") -> _Node:
+        return self._add_node(_CONNECTIONS, self._new_id(), group_id, {
+            "name": name,
+            "sourceId": source_id,
+            "destinationId": destination_id,
+            "selectedRelationships": list(relationships),
+            "backPressureObjectThreshold": 10000,
+            "backPressureDataSizeThreshold": "1 GB",
+        })
+
+    def _add_bulletin(self, source: _Node, level: str, message: str):
+        bulletin_id = len(self._bulletins) + 1
+        timestamp = time.strftime("%H:%M:%S UTC", time.gmtime())
+        self._bulletins.append({
+            "id": bulletin_id,
+            "groupId": source.parent_group_id,
+            "sourceId": source.id,
+            "timestamp": timestamp,
+            "canRead": True,
+            "bulletin": {
+                "id": bulletin_id,
+                "category": "Log Message",
+                "groupId": source.parent_group_id,
+                "sourceId": source.id,
+                "sourceName": source.component.get("name"),
+                "level": level,
+                "message": message,
+                "timestamp": timestamp,
+            },
+        })
+
+    # --- Entity rendering ---
+
+    def _node(self, component_id: str, kind: Optional[str] = None) -> _Node:
+        if component_id == "root":
+            component_id = self.root_id
+        node = self._nodes.get(component_id)
+        if node is None or (kind is not None and node.kind != kind):
+            raise SimulatedNiFiError(404, f"Unable to find component with id '{component_id}'.")
+        return node
+
+    def _descendants(self, group_id: str) -> Iterator[_Node]:
+        for kind in _CHILD_KINDS:
+            for child_id in self._children[group_id][kind]:
+                yield self._nodes[child_id]
+                if kind == _GROUPS:
+                    yield from self._descendants(child_id)
+
+    def _connection_endpoint(self, component_id: str) -> Dict[str, Any]:
+        node = self._nodes.get(component_id)
+        if node is None:
+            return {"id": component_id}
+        endpoint_type = {_PROCESSORS: "PROCESSOR", _INPUT_PORTS: "INPUT_PORT", _OUTPUT_PORTS: "OUTPUT_PORT"}.get(node.kind, "FUNNEL")
+        return {
+            "id": node.id,
+            "groupId": node.parent_group_id,
+            "name": node.component.get("name"),
+            "type": endpoint_type,
+            "running": node.component.get("state") == "RUNNING",
+        }
+
+    def _group_counts(self, group_id: str) -> Dict[str, int]:
+        counts = {"runningCount": 0, "stoppedCount": 0, "invalidCount": 0, "disabledCount": 0,
+                  "flowFilesQueued": 0, "bytesQueued": 0}
+        for node in self._descendants(group_id):
+            if node.kind in (_PROCESSORS, _INPUT_PORTS, _OUTPUT_PORTS):
+                counts["runningCount" if node.component["state"] == "RUNNING" else "stoppedCount"] += 1
+            elif node.kind == _CONNECTIONS:
+                counts["flowFilesQueued"] += node.queued_count
+                counts["bytesQueued"] += node.queued_bytes
+        return counts
+
+    def _entity(self, node: _Node) -> Dict[str, Any]:
+        component = {"id": node.id, "parentGroupId": node.parent_group_id, **node.component}
+        entity = {
+            "id": node.id,
+            "uri": f"{SIMULATOR_BASE_URL}/{_segment_for(node.kind)}/{node.id}",
+            "revision": {"version": node.version},
+            "permissions": {"canRead": True, "canWrite": True},
+            "component": component,
+        }
+        if "position" in node.component:
+            entity["position"] = node.component["position"]
+
+        if node.kind == _PROCESSORS:
+            auto_terminated = set(node.component["config"].get("autoTerminatedRelationships") or [])
+            component["relationships"] = [
+                {"name": name, "autoTerminate": name in auto_terminated, "description": f"{name} relationship"}
+                for name in ("success", "failure")
+            ]
+            component["validationStatus"] = "VALID"
+            component["validationErrors"] = []
+            entity["status"] = {
+                "runStatus": "Running" if node.component["state"] == "RUNNING" else "Stopped",
+                "aggregateSnapshot": {"activeThreadCount": 0, "flowFilesIn": 0, "flowFilesOut": 0},
+            }
+        elif node.kind in (_INPUT_PORTS, _OUTPUT_PORTS):
+            component["type"] = "INPUT_PORT" if node.kind == _INPUT_PORTS else "OUTPUT_PORT"
+            component["concurrentlySchedulableTaskCount"] = 1
+            component["validationStatus"] = "VALID"
+            entity["portType"] = component["type"]
+            entity["status"] = {
+                "runStatus": "Running" if node.component["state"] == "RUNNING" else "Stopped",
+                "aggregateSnapshot": {"activeThreadCount": 0, "flowFilesQueued": 0, "bytesQueued": 0},
+            }
+        elif node.kind == _CONNECTIONS:
+            source = self._connection_endpoint(node.component["sourceId"])
+            destination = self._connection_endpoint(node.component["destinationId"])
+            component.pop("sourceId")
+            component.pop("destinationId")
+            component["source"] = source
+            component["destination"] = destination
+            component["availableRelationships"] = ["success", "failure"]
+            entity.update({
+                "sourceId": source["id"],
+                "sourceGroupId": source.get("groupId"),
+                "sourceType": source.get("type"),
+                "destinationId": destination["id"],
+                "destinationGroupId": destination.get("groupId"),
+                "destinationType": destination.get("type"),
+            })
+            entity["status"] = {"aggregateSnapshot": self._connection_snapshot(node)}
+        elif node.kind == _GROUPS:
+            counts = self._group_counts(node.id)
+            component.update({key: counts[key] for key in ("runningCount", "stoppedCount", "invalidCount", "disabledCount")})
+            entity.update({key: counts[key] for key in ("runningCount", "stoppedCount", "invalidCount", "disabledCount")})
+            entity["status"] = {"aggregateSnapshot": {
+                **counts,
+                "id": node.id,
+                "name": node.component["name"],
+                "queued": f"{counts['flowFilesQueued']} ({counts['bytesQueued']} bytes)",
+                "activeRemotePortCount": 0,
+                "inactiveRemotePortCount": 0,
+            }}
+        elif node.kind == _SERVICES:
+            component["validationStatus"] = "VALID"
+            component["referencingComponents"] = []
+            component["bundle"] = dict(_BUNDLE)
+        return entity
+
+    def _connection_snapshot(self, node: _Node) -> Dict[str, Any]:
+        return {
+            "id": node.id,
+            "groupId": node.parent_group_id,
+            "name": node.component.get("name", ""),
+            "sourceName": self._nodes[node.component["sourceId"]].component.get("name") if node.component["sourceId"] in self._nodes else None,
+            "destinationName": self._nodes[node.component["destinationId"]].component.get("name") if node.component["destinationId"] in self._nodes else None,
+            "flowFilesQueued": node.queued_count,
+            "bytesQueued": node.queued_bytes,
+            "queuedCount": str(node.queued_count),
+            "queuedSize": f"{node.queued_bytes} bytes",
+            "queued": f"{node.queued_count} ({node.queued_bytes} bytes)",
+        }
+
+    def _flow(self, group_id: str) -> Dict[str, Any]:
+        group = self._node(group_id, _GROUPS)
+        parent = self._nodes.get(group.parent_group_id) if group.parent_group_id else None
+        breadcrumb = {"id": group.id, "breadcrumb": {"id": group.id, "name": group.component["name"]}}
+        if parent is not None:
+            breadcrumb["parentBreadcrumb"] = {"id": parent.id, "breadcrumb": {"id": parent.id, "name": parent.component["name"]}}
+        flow = {
+            kind: [self._entity(self._nodes[child_id]) for child_id in self._children[group.id][kind]]
+            for kind in (_PROCESSORS, _INPUT_PORTS, _OUTPUT_PORTS, _CONNECTIONS, _GROUPS)
+        }
+        flow.update({"funnels": [], "labels": [], "remoteProcessGroups": []})
+        return {"processGroupFlow": {
+            "id": group.id,
+            "uri": f"{SIMULATOR_BASE_URL}/flow/process-groups/{group.id}",
+            "parentGroupId": group.parent_group_id,
+            "breadcrumb": breadcrumb,
+            "flow": flow,
+            "lastRefreshed": time.strftime("%H:%M:%S UTC", time.gmtime()),
+        }}
+
+    def _group_status(self, group_id: str, recursive: bool) -> Dict[str, Any]:
+        group = self._node(group_id, _GROUPS)
+        counts = self._group_counts(group.id)
+        children = self._children[group.id]
+        snapshot = {
+            "id": group.id,
+            "name": group.component["name"],
+            "flowFilesQueued": counts["flowFilesQueued"],
+            "bytesQueued": counts["bytesQueued"],
+            "queued": f"{counts['flowFilesQueued']} ({counts['bytesQueued']} bytes)",
+            "activeThreadCount": 0,
+            "connectionStatusSnapshots": [
+                {"id": connection_id, "connectionStatusSnapshot": self._connection_snapshot(self._nodes[connection_id])}
+                for connection_id in children[_CONNECTIONS]
+            ],
+            "processorStatusSnapshots": [
+                {"id": processor_id, "processorStatusSnapshot": {
+                    "id": processor_id,
+                    "groupId": group.id,
+                    "name": self._nodes[processor_id].component["name"],
+                    "type": self._nodes[processor_id].component["type"].rsplit(".", 1)[-1],
+                    "runStatus": "Running" if self._nodes[processor_id].component["state"] == "RUNNING" else "Stopped",
+                    "activeThreadCount": 0,
+                }}
+                for processor_id in children[_PROCESSORS]
+            ],
+            "processGroupStatusSnapshots": [
+                {"id": child_id, "processGroupStatusSnapshot": self._group_status(child_id, recursive)["aggregateSnapshot"]}
+                for child_id in children[_GROUPS]
+            ] if recursive else [],
+        }
+        return {"id": group.id, "name": group.component["name"], "aggregateSnapshot": snapshot}
+
+    # --- Writes ---
+
+    def _check_revision(self, node: _Node, revision: Optional[Dict[str, Any]]):
+        if revision is None or revision.get("version") is None:
+            raise SimulatedNiFiError(400, "Revision must be specified.")
+        if int(revision["version"]) != node.version:
+            raise SimulatedNiFiError(
+                409,
+                f"Error: [{revision.get('version')}, {revision.get('clientId')}, {node.id}] is not the most "
+                f"up-to-date revision. This component appears to have been modified",
+            )
+
+    def _bump(self, node: _Node) -> Dict[str, Any]:
+        node.version += 1
+        return self._entity(node)
+
+    def _create(self, kind: str, group_id: str, body: Dict[str, Any]) -> _Node:
+        group = self._node(group_id, _GROUPS)
+        component = dict(body.get("component") or {})
+        component.pop("id", None)
+        component.pop("parentGroupId", None)
+        if kind == _CONNECTIONS:
+            source_id = (component.pop("source", None) or {}).get("id")
+            destination_id = (component.pop("destination", None) or {}).get("id")
+            for endpoint_id in (source_id, destination_id):
+                if endpoint_id not in self._nodes:
+                    raise SimulatedNiFiError(400, f"Unable to find the specified source or destination '{endpoint_id}'.")
+            return self._add_connection(
+                group.id, source_id, destination_id,
+                component.get("selectedRelationships") or [], component.get("name") or "",
+            )
+        if kind == _PROCESSORS:
+            if not component.get("type"):
+                raise SimulatedNiFiError(400, "The type of processor to create must be specified.")
+            component.setdefault("config", {})
+            component["config"].setdefault("properties", {})
+            component["config"].setdefault("autoTerminatedRelationships", [])
+            component["state"] = "STOPPED"
+        elif kind in (_INPUT_PORTS, _OUTPUT_PORTS):
+            component["state"] = "STOPPED"
+        elif kind == _SERVICES:
+            component.setdefault("properties", {})
+            component["state"] = "DISABLED"
+        component.setdefault("name", component.get("type", kind).rsplit(".", 1)[-1])
+        return self._add_node(kind, self._new_id(), group.id, component)
+
+    def _update(self, node: _Node, body: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_revision(node, body.get("revision"))
+        changes = body.get("component") or {}
+        if node.kind == _PROCESSORS and node.component["state"] == "RUNNING" and "config" in changes:
+            raise SimulatedNiFiError(409, f"{node.id} is not stopped.")
+        for key, value in changes.items():
+            if key in ("id", "parentGroupId", "state"):
+                continue
+            if key == "config" and isinstance(value, dict):
+                config = node.component.setdefault("config", {})
+                for config_key, config_value in value.items():
+                    if config_key == "properties" and isinstance(config_value, dict):
+                        properties = config.setdefault("properties", {})
+                        for name, prop_value in config_value.items():
+                            if prop_value is None:
+                                properties.pop(name, None)
+                            else:
+                                properties[name] = prop_value
+                    else:
+                        config[config_key] = config_value
+            elif key == "properties" and isinstance(value, dict):
+                properties = node.component.setdefault("properties", {})
+                for name, prop_value in value.items():
+                    if prop_value is None:
+                        properties.pop(name, None)
+                    else:
+                        properties[name] = prop_value
+            elif key in ("source", "destination"):
+                continue
+            else:
+                node.component[key] = value
+        return self._bump(node)
+
+    def _set_run_status(self, node: _Node, body: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_revision(node, body.get("revision"))
+        state = (body.get("state") or "").upper()
+        allowed = ("ENABLED", "DISABLED") if node.kind == _SERVICES else ("RUNNING", "STOPPED", "DISABLED")
+        if state not in allowed:
+            raise SimulatedNiFiError(400, f"The run status '{state}' is not valid.")
+        if node.kind == _SERVICES and state == "DISABLED":
+            for referencing in self._descendants(node.parent_group_id):
+                if (referencing.kind == _PROCESSORS and referencing.component["state"] == "RUNNING"
+                        and node.id in (referencing.component["config"].get("properties") or {}).values()):
+                    raise SimulatedNiFiError(409, f"Cannot disable {node.id} because it is referenced by running component {referencing.id}.")
+        node.component["state"] = state
+        return self._bump(node)
+
+    def _delete(self, node: _Node, version: Optional[str]) -> Dict[str, Any]:
+        self._check_revision(node, {"version": version} if version is not None else None)
+        if node.kind in (_PROCESSORS, _INPUT_PORTS, _OUTPUT_PORTS):
+            if node.component["state"] == "RUNNING":
+                raise SimulatedNiFiError(409, f"{node.id} is currently RUNNING. Stop it before deleting.")
+            for connection_id in self._children[node.parent_group_id][_CONNECTIONS]:
+                connection = self._nodes[connection_id].component
+                if node.id in (connection["sourceId"], connection["destinationId"]):
+                    raise SimulatedNiFiError(409, f"Cannot delete {node.id} because it has incoming or outgoing connections.")
+        elif node.kind == _CONNECTIONS:
+            if node.queued_count:
+                raise SimulatedNiFiError(409, f"Cannot delete connection {node.id} because its queue is not empty.")
+            source = self._nodes.get(node.component["sourceId"])
+            if source is not None and source.component.get("state") == "RUNNING":
+                raise SimulatedNiFiError(409, f"Cannot delete connection {node.id} because its source is running.")
+        elif node.kind == _SERVICES:
+            if node.component["state"] == "ENABLED":
+                raise SimulatedNiFiError(409, f"Controller service {node.id} must be disabled before it can be removed.")
+        elif node.kind == _GROUPS:
+            if node.id == self.root_id:
+                raise SimulatedNiFiError(409, "The root process group cannot be deleted.")
+            for descendant in self._descendants(node.id):
+                if descendant.component.get("state") in ("RUNNING", "ENABLED"):
+                    raise SimulatedNiFiError(409, f"Cannot delete process group {node.id} because {descendant.id} is running or enabled.")
+                if descendant.kind == _CONNECTIONS and descendant.queued_count:
+                    raise SimulatedNiFiError(409, f"Cannot delete process group {node.id} because connection {descendant.id} has queued data.")
+
+        entity = self._entity(node)
+        doomed = [node] + (list(self._descendants(node.id)) if node.kind == _GROUPS else [])
+        for doomed_node in doomed:
+            self._nodes.pop(doomed_node.id, None)
+            self._children.pop(doomed_node.id, None)
+        del self._children[node.parent_group_id][node.kind][node.id]
+        return entity
+
+    def _schedule_group(self, group_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        group = self._node(group_id, _GROUPS)
+        state = (body.get("state") or "").upper()
+        if state not in ("RUNNING", "STOPPED"):
+            raise SimulatedNiFiError(400, f"The scheduled state '{state}' is not valid.")
+        requested = body.get("components")
+        if requested is not None:
+            targets = []
+            for component_id, revision in requested.items():
+                node = self._node(component_id)
+                self._check_revision(node, revision)
+                targets.append(node)
+        else:
+            targets = [node for node in self._descendants(group.id) if node.kind in (_PROCESSORS, _INPUT_PORTS, _OUTPUT_PORTS)]
+
+        updated = {}
+        for node in targets:
+            if node.component.get("state") != state:
+                node.component["state"] = state
+                node.version += 1
+            updated[node.id] = {"version": node.version}
+        return {"id": group.id, "state": state, "components": updated if requested is not None else {}}
+
+    # --- Async requests (drop, listing, provenance) ---
+
+    def _new_async_request(self, target_id: str, original_count: int = 0, original_bytes: int = 0,
+                           payload: Optional[Dict[str, Any]] = None) -> _AsyncRequest:
+        return _AsyncRequest(
+            id=self._new_id(),
+            target_id=target_id,
+            polls_remaining=self.async_request_polls,
+            submitted_at=time.time(),
+            original_count=original_count,
+            original_bytes=original_bytes,
+            payload=payload or {},
+        )
+
+    def _advance(self, request: _AsyncRequest, on_finish):
+        if not request.finished:
+            request.polls_remaining -= 1
+            if request.polls_remaining <= 0:
+                request.finished = True
+                on_finish(request)
+
+    def _percent(self, request: _AsyncRequest) -> int:
+        if request.finished:
+            return 100
+        polls = max(self.async_request_polls, 1)
+        return int(100 * (polls - request.polls_remaining) / polls)
+
+    def _finish_drop(self, request: _AsyncRequest):
+        node = self._nodes.get(request.target_id)
+        if node is not None:
+            node.queued_count = 0
+            node.queued_bytes = 0
+
+    def _drop_entity(self, connection_id: str, request: _AsyncRequest) -> Dict[str, Any]:
+        dropped_count = request.original_count if request.finished else 0
+        dropped_bytes = request.original_bytes if request.finished else 0
+        return {"dropRequest": {
+            "id": request.id,
+            "uri": f"{SIMULATOR_BASE_URL}/flowfile-queues/{connection_id}/drop-requests/{request.id}",
+            "submissionTime": time.strftime("%m/%d/%Y %H:%M:%S UTC", time.gmtime(request.submitted_at)),
+            "lastUpdated": time.strftime("%H:%M:%S UTC", time.gmtime()),
+            "percentCompleted": self._percent(request),
+            "finished": request.finished,
+            "originalCount": request.original_count,
+            "originalSize": request.original_bytes,
+            "original": f"{request.original_count} / {request.original_bytes} bytes",
+            "currentCount": request.original_count - dropped_count,
+            "currentSize": request.original_bytes - dropped_bytes,
+            "current": f"{request.original_count - dropped_count} / {request.original_bytes - dropped_bytes} bytes",
+            "droppedCount": dropped_count,
+            "droppedSize": dropped_bytes,
+            "dropped": f"{dropped_count} / {dropped_bytes} bytes",
+            "state": "Completed" if request.finished else "Dropping FlowFiles",
+        }}
+
+    def _finish_listing(self, request: _AsyncRequest):
+        shown = min(request.original_count, 100)
+        request.payload["flowFileSummaries"] = [
+            {
+                "uuid": str(uuid.UUID(int=self._random.getrandbits(128), version=4)),
+                "filename": f"flowfile-{position}.json",
+                "position": position,
+                "size": self.spec.flowfile_size,
+                "queuedDuration": 1000 * position,
+                "lineageDuration": 2000 * position,
+                "penalized": False,
+                "clusterNodeId": None,
+            }
+            for position in range(1, shown + 1)
+        ]
+
+    def _listing_entity(self, connection_id: str, request: _AsyncRequest) -> Dict[str, Any]:
+        listing = {
+            "id": request.id,
+            "uri": f"{SIMULATOR_BASE_URL}/flowfile-queues/{connection_id}/listing-requests/{request.id}",
+            "submissionTime": time.strftime("%m/%d/%Y %H:%M:%S UTC", time.gmtime(request.submitted_at)),
+            "lastUpdated": time.strftime("%H:%M:%S UTC", time.gmtime()),
+            "percentCompleted": self._percent(request),
+            "finished": request.finished,
+            "maxResults": 100,
+            "state": "Completed" if request.finished else "Searching",
+            "queueSize": {"objectCount": request.original_count, "byteCount": request.original_bytes},
+            "sourceRunning": False,
+            "destinationRunning": False,
+        }
+        if request.finished:
+            listing["flowFileSummaries"] = request.payload.get("flowFileSummaries", [])
+        return {"listingRequest": listing}
+
+    def _finish_provenance(self, request: _AsyncRequest):
+        processor = self._nodes.get(request.target_id)
+        count = min(self.spec.provenance_events_per_query, request.payload.get("maxResults", 1000))
+        events = []
+        for index in range(count):
+            event_id = self._next_event_id
+            self._next_event_id += 1
+            event = {
+                "id": str(event_id),
+                "eventId": event_id,
+                "eventTime": time.strftime("%m/%d/%Y %H:%M:%S.000 UTC", time.gmtime(time.time() - index)),
+                "eventType": ("DROP" if index % 5 == 4 else "ATTRIBUTES_MODIFIED" if index % 5 == 3
+                              else "CONTENT_MODIFIED"),
+                "flowFileUuid": str(uuid.UUID(int=self._random.getrandbits(128), version=4)),
+                "fileSize": f"{self.spec.provenance_content_bytes} bytes",
+                "fileSizeBytes": self.spec.provenance_content_bytes,
+                "groupId": processor.parent_group_id if processor else None,
+                "componentId": request.target_id,
+                "componentType": processor.component["type"].rsplit(".", 1)[-1] if processor else None,
+                "componentName": processor.component["name"] if processor else None,
+                "attributes": [
+                    {"name": "filename", "value": f"flowfile-{event_id}.json", "previousValue": None},
+                    {"name": "mime.type", "value": "application/json", "previousValue": None},
+                ],
+                "inputContentAvailable": True,
+                "outputContentAvailable": True,
+                "inputContentClaimFileSizeBytes": self.spec.provenance_content_bytes,
+                "outputContentClaimFileSizeBytes": self.spec.provenance_content_bytes,
+                "relationship": "success",
+            }
+            # Only content modifications write a new claim; other events pass the input claim through
+            output_claim = f"{event_id}-output" if event["eventType"] == "CONTENT_MODIFIED" else f"{event_id}-input"
+            for direction, claim_id in (("input", f"{event_id}-input"), ("output", output_claim)):
+                event.update({
+                    f"{direction}ContentClaimContainer": "default",
+                    f"{direction}ContentClaimSection": str(event_id % 1024),
+                    f"{direction}ContentClaimIdentifier": claim_id,
+                    f"{direction}ContentClaimOffset": 0,
+                })
+            self._provenance_events[event_id] = event
+            events.append(event)
+        request.payload["events"] = events
+
+    def _provenance_entity(self, request: _AsyncRequest) -> Dict[str, Any]:
+        events = request.payload.get("events", []) if request.finished else []
+        return {"provenance": {
+            "id": request.id,
+            "uri": f"{SIMULATOR_BASE_URL}/provenance/{request.id}",
+            "submissionTime": time.strftime("%m/%d/%Y %H:%M:%S UTC", time.gmtime(request.submitted_at)),
+            "percentCompleted": self._percent(request),
+            "finished": request.finished,
+            "request": request.payload.get("request", {}),
+            "results": {"provenanceEvents": events, "total": str(len(events)), "totalCount": len(events)},
+        }}
+
+    def _event_content(self, event_id: int, direction: str) -> bytes:
+        """Deterministic content of `provenance_content_bytes` bytes for an event's content claim."""
+        claim_id = self._provenance_events[event_id][f"{direction}ContentClaimIdentifier"]
+        seed = hashlib.sha256(claim_id.encode()).hexdigest().encode()
+        size = self.spec.provenance_content_bytes
+        return (seed * (size // len(seed) + 1))[:size]
+
+    # --- Search and types ---
+
+    def _search(self, query: str) -> Dict[str, Any]:
+        query = query.lower()
+        results = {key: [] for key in ("processorResults", "connectionResults", "processGroupResults",
+                                       "inputPortResults", "outputPortResults", "controllerServiceNodeResults",
+                                       "funnelResults", "labelResults", "parameterResults")}
+        result_keys = {
+            _PROCESSORS: "processorResults", _CONNECTIONS: "connectionResults", _GROUPS: "processGroupResults",
+            _INPUT_PORTS: "inputPortResults", _OUTPUT_PORTS: "outputPortResults", _SERVICES: "controllerServiceNodeResults",
+        }
+        for node in self._nodes.values():
+            matches = []
+            name = node.component.get("name") or ""
+            if query in name.lower():
+                matches.append(f"Name: {name}")
+            if query in node.id:
+                matches.append(f"Id: {node.id}")
+            if query in (node.component.get("type") or "").lower():
+                matches.append(f"Type: {node.component['type']}")
+            if not matches:
+                continue
+            parent = self._nodes.get(node.parent_group_id) if node.parent_group_id else None
+            results[result_keys[node.kind]].append({
+                "id": node.id,
+                "name": name,
+                "groupId": node.parent_group_id,
+                "parentGroup": {"id": parent.id, "name": parent.component["name"]} if parent else None,
+                "matches": matches,
+            })
+        return {"searchResultsDTO": results}
+
+    @staticmethod
+    def _types(types) -> List[Dict[str, Any]]:
+        return [
+            {
+                "type": type_name,
+                "bundle": dict(_BUNDLE),
+                "description": f"Simulated {type_name.rsplit('.', 1)[-1]}.",
+                "tags": list(tags),
+                "restricted": False,
+            }
+            for type_name, tags in types
+        ]
+
+    # --- Auth ---
+
+    def _issue_token(self) -> str:
+        def segment(data: Dict[str, Any]) -> str:
+            return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+        claims = {"sub": "admin", "exp": int(time.time()) + self.token_ttl_seconds, "jti": str(uuid.uuid4())}
+        token = f"{segment({'alg': 'none', 'typ': 'JWT'})}.{segment(claims)}.simulated"
+        self._tokens.add(token)
+        return token
+
+    def _check_auth(self, request: Request):
+        if not self.require_auth:
+            return
+        header = request.headers.get("authorization", "")
+        if not header.startswith("Bearer ") or header[len("Bearer "):] not in self._tokens:
+            raise SimulatedNiFiError(401, "Unable to validate the access token.")
+
+    # --- Routes ---
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="NiFi REST API simulator", docs_url=None, redoc_url=None, openapi_url=None)
+        sim = self
+
+        @app.exception_handler(SimulatedNiFiError)
+        async def nifi_error(request: Request, exc: SimulatedNiFiError):
+            return PlainTextResponse(exc.message, status_code=exc.status_code)
+
+        async def body_of(request: Request) -> Dict[str, Any]:
+            raw = await request.body()
+            return json.loads(raw) if raw else {}
+
+        @app.post(API_PREFIX + "/access/token")
+        async def access_token(request: Request):
+            return PlainTextResponse(sim._issue_token(), status_code=201)
+
+        # Flow endpoints
+
+        @app.get(API_PREFIX + "/flow/process-groups/{group_id}")
+        async def get_flow(group_id: str, request: Request):
+            sim._check_auth(request)
+            return JSONResponse(sim._flow(group_id))
+
+        @app.put(API_PREFIX + "/flow/process-groups/{group_id}")
+        async def schedule_group(group_id: str, request: Request):
+            sim._check_auth(request)
+            return JSONResponse(sim._schedule_group(group_id, await body_of(request)))
+
+        @app.get(API_PREFIX + "/flow/process-groups/{group_id}/status")
+        async def group_status(group_id: str, request: Request):
+            sim._check_auth(request)
+            recursive = request.query_params.get("recursive", "false").lower() == "true"
+            return JSONResponse({"processGroupStatus": sim._group_status(group_id, recursive)})
+
+        @app.get(API_PREFIX + "/flow/process-groups/{group_id}/controller-services")
+        async def group_services(group_id: str, request: Request):
+            sim._check_auth(request)
+            group = sim._node(group_id, _GROUPS)
+            services = [sim._entity(sim._nodes[sid]) for sid in sim._children[group.id][_SERVICES]]
+            return JSONResponse({"controllerServices": services})
+
+        @app.get(API_PREFIX + "/flow/bulletin-board")
+        async def bulletin_board(request: Request):
+            sim._check_auth(request)
+            params = request.query_params
+            bulletins = [
+                b for b in sim._bulletins
+                if (not params.get("groupId") or b["groupId"] == params["groupId"])
+                and (not params.get("sourceId") or b["sourceId"] == params["sourceId"])
+            ]
+            limit = int(params.get("limit", 0) or 0)
+            if limit:
+                bulletins = bulletins[-limit:]
+            return JSONResponse({"bulletinBoard": {"bulletins": bulletins, "generated": time.strftime("%H:%M:%S UTC", time.gmtime())}})
+
+        @app.get(API_PREFIX + "/flow/search-results")
+        async def search(request: Request):
+            sim._check_auth(request)
+            return JSONResponse(sim._search(request.query_params.get("q", "")))
+
+        @app.get(API_PREFIX + "/flow/processor-types")
+        async def processor_types(request: Request):
+            sim._check_auth(request)
+            return JSONResponse({"processorTypes": sim._types(_PROCESSOR_TYPES)})
+
+        @app.get(API_PREFIX + "/flow/controller-service-types")
+        async def controller_service_types(request: Request):
+            sim._check_auth(request)
+            return JSONResponse({"controllerServiceTypes": sim._types(_CONTROLLER_SERVICE_TYPES)})
+
+        # Process group children
+
+        @app.get(API_PREFIX + "/process-groups/{group_id}/{segment}")
+        async def list_children(group_id: str, segment: str, request: Request):
+            sim._check_auth(request)
+            kind = _kind_for(segment)
+            group = sim._node(group_id, _GROUPS)
+            return JSONResponse({kind: [sim._entity(sim._nodes[cid]) for cid in sim._children[group.id][kind]]})
+
+        @app.post(API_PREFIX + "/process-groups/{group_id}/{segment}")
+        async def create_child(group_id: str, segment: str, request: Request):
+            sim._check_auth(request)
+            node = sim._create(_kind_for(segment), group_id, await body_of(request))
+            return JSONResponse(sim._entity(node), status_code=201)
+
+        @app.get(API_PREFIX + "/connections")
+        async def all_connections(request: Request):
+            sim._check_auth(request)
+            return JSONResponse({"connections": [sim._entity(sim._nodes[cid]) for cid in sim.component_ids(_CONNECTIONS)]})
+
+        # Queue drop and listing requests
+
+        @app.post(API_PREFIX + "/flowfile-queues/{connection_id}/drop-requests")
+        async def create_drop(connection_id: str, request: Request):
+            sim._check_auth(request)
+            node = sim._node(connection_id, _CONNECTIONS)
+            drop = sim._new_async_request(node.id, node.queued_count, node.queued_bytes)
+            sim._drop_requests[drop.id] = drop
+            if sim.async_request_polls <= 0:
+                drop.finished = True
+                sim._finish_drop(drop)
+            return JSONResponse(sim._drop_entity(node.id, drop), status_code=202)
+
+        @app.get(API_PREFIX + "/flowfile-queues/{connection_id}/drop-requests/{request_id}")
+        async def get_drop(connection_id: str, request_id: str, request: Request):
+            sim._check_auth(request)
+            drop = _lookup(sim._drop_requests, request_id)
+            sim._advance(drop, sim._finish_drop)
+            return JSONResponse(sim._drop_entity(connection_id, drop))
+
+        @app.delete(API_PREFIX + "/flowfile-queues/{connection_id}/drop-requests/{request_id}")
+        async def delete_drop(connection_id: str, request_id: str, request: Request):
+            sim._check_auth(request)
+            drop = _lookup(sim._drop_requests, request_id)
+            del sim._drop_requests[request_id]
+            return JSONResponse(sim._drop_entity(connection_id, drop))
+
+        @app.post(API_PREFIX + "/flowfile-queues/{connection_id}/listing-requests")
+        async def create_listing(connection_id: str, request: Request):
+            sim._check_auth(request)
+            node = sim._node(connection_id, _CONNECTIONS)
+            listing = sim._new_async_request(node.id, node.queued_count, node.queued_bytes)
+            sim._listing_requests[listing.id] = listing
+            if sim.async_request_polls <= 0:
+                listing.finished = True
+                sim._finish_listing(listing)
+            return JSONResponse(sim._listing_entity(node.id, listing), status_code=202)
+
+        @app.get(API_PREFIX + "/flowfile-queues/{connection_id}/listing-requests/{request_id}")
+        async def get_listing(connection_id: str, request_id: str, request: Request):
+            sim._check_auth(request)
+            listing = _lookup(sim._listing_requests, request_id)
+            sim._advance(listing, sim._finish_listing)
+            return JSONResponse(sim._listing_entity(connection_id, listing))
+
+        @app.delete(API_PREFIX + "/flowfile-queues/{connection_id}/listing-requests/{request_id}")
+        async def delete_listing(connection_id: str, request_id: str, request: Request):
+            sim._check_auth(request)
+            listing = _lookup(sim._listing_requests, request_id)
+            del sim._listing_requests[request_id]
+            return JSONResponse(sim._listing_entity(connection_id, listing))
+
+        # Provenance
+
+        @app.post(API_PREFIX + "/provenance")
+        async def submit_provenance(request: Request):
+            sim._check_auth(request)
+            query_request = (await body_of(request)).get("provenance", {}).get("request", {})
+            processor_id = ((query_request.get("searchTerms") or {}).get("ProcessorID") or {}).get("value")
+            query = sim._new_async_request(processor_id, payload={
+                "request": query_request,
+                "maxResults": query_request.get("maxResults", 1000),
+            })
+            sim._provenance_queries[query.id] = query
+            if sim.async_request_polls <= 0:
+                query.finished = True
+                sim._finish_provenance(query)
+            return JSONResponse(sim._provenance_entity(query), status_code=201)
+
+        @app.get(API_PREFIX + "/provenance/{query_id}")
+        async def get_provenance(query_id: str, request: Request):
+            sim._check_auth(request)
+            query = _lookup(sim._provenance_queries, query_id)
+            sim._advance(query, sim._finish_provenance)
+            return JSONResponse(sim._provenance_entity(query))
+
+        @app.get(API_PREFIX + "/provenance/{query_id}/results")
+        async def get_provenance_results(query_id: str, request: Request):
+            sim._check_auth(request)
+            query = _lookup(sim._provenance_queries, query_id)
+            return JSONResponse({"provenanceResults": {"provenanceEvents": query.payload.get("events", [])}})
+
+        @app.delete(API_PREFIX + "/provenance/{query_id}")
+        async def delete_provenance(query_id: str, request: Request):
+            sim._check_auth(request)
+            query = _lookup(sim._provenance_queries, query_id)
+            del sim._provenance_queries[query_id]
+            return JSONResponse(sim._provenance_entity(query))
+
+        @app.get(API_PREFIX + "/provenance-events/{event_id}")
+        async def get_event(event_id: int, request: Request):
+            sim._check_auth(request)
+            return JSONResponse({"provenanceEvent": _lookup(sim._provenance_events, event_id)})
+
+        @app.get(API_PREFIX + "/provenance-events/{event_id}/content/{direction}")
+        async def get_event_content(event_id: int, direction: str, request: Request):
+            sim._check_auth(request)
+            _lookup(sim._provenance_events, event_id)
+            if direction not in ("input", "output"):
+                raise SimulatedNiFiError(404, f"Unknown content direction '{direction}'.")
+            return Response(sim._event_content(event_id, direction), media_type="application/octet-stream")
+
+        # Single components. Registered last: the catch-all segment would shadow the routes above
+
+        @app.get(API_PREFIX + "/{segment}/{component_id}")
+        async def get_component(segment: str, component_id: str, request: Request):
+            sim._check_auth(request)
+            return JSONResponse(sim._entity(sim._node(component_id, _kind_for(segment))))
+
+        @app.put(API_PREFIX + "/{segment}/{component_id}")
+        async def update_component(segment: str, component_id: str, request: Request):
+            sim._check_auth(request)
+            node = sim._node(component_id, _kind_for(segment))
+            return JSONResponse(sim._update(node, await body_of(request)))
+
+        @app.put(API_PREFIX + "/{segment}/{component_id}/run-status")
+        async def run_status(segment: str, component_id: str, request: Request):
+            sim._check_auth(request)
+            node = sim._node(component_id, _kind_for(segment))
+            return JSONResponse(sim._set_run_status(node, await body_of(request)))
+
+        @app.delete(API_PREFIX + "/{segment}/{component_id}")
+        async def delete_component(segment: str, component_id: str, request: Request):
+            sim._check_auth(request)
+            node = sim._node(component_id, _kind_for(segment))
+            return JSONResponse(sim._delete(node, request.query_params.get("version")))
+
+        return app
+
+
+def _segment_for(kind: str) -> str:
+    return next(segment for segment, segment_kind in _KIND_SEGMENTS.items() if segment_kind == kind)
+
+
+def _kind_for(segment: str) -> str:
+    kind = _KIND_SEGMENTS.get(segment)
+    if kind is None:
+        raise SimulatedNiFiError(404, f"The simulator does not implement '/{segment}'.")
+    return kind
+
+
+def _lookup(requests: Dict[Any, Any], key: Any) -> Any:
+    if key not in requests:
+        raise SimulatedNiFiError(404, f"Unable to find request with id '{key}'.")
+    return requests[key]
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a simulated NiFi REST API.")
+    parser.add_argument("--components", type=int, default=1000, help="Approximate canvas size")
+    parser.add_argument("--depth", type=int, default=2, help="Levels of nested process groups")
+    parser.add_argument("--groups-per-group", type=int, default=4)
+    parser.add_argument("--queued-flowfiles", type=int, default=0, help="Flowfiles queued on every connection")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail with 503")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+
+    spec = CanvasSpec.sized(
+        args.components, depth=args.depth, groups_per_group=args.groups_per_group,
+        queued_flowfiles=args.queued_flowfiles,
+    )
+    simulator = NiFiSimulator(
+        spec, latency_seconds=args.latency, latency_jitter_seconds=args.jitter, error_rate=args.error_rate,
+    )
+    print(f"Simulating {spec.component_count} components in {spec.group_count} process groups "
+          f"at http://{args.host}:{args.port}{API_PREFIX}")
+    uvicorn.run(simulator, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()